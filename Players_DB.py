@@ -32,6 +32,7 @@ from db_players import (
     crea_nuovo_giocatore_nel_db,
     generate_player_id,
 )
+from player_search import search_players
 
 VERSION = "4.4.0 (Modulo Tornello)"
 
@@ -40,19 +41,12 @@ VERSION = "4.4.0 (Modulo Tornello)"
 
 
 def find_players_partial(search_term, players_db_dict):
-    matches = []
-    search_lower = search_term.strip().lower()
-    if not search_lower:
-        return matches
-
-    search_terms = search_lower.split()
-
-    for p_data_item in players_db_dict.values():
-        searchable_string = f"{p_data_item.get('first_name', '')} {p_data_item.get('last_name', '')} {p_data_item.get('id', '')} {p_data_item.get('fide_title', '')} {p_data_item.get('fide_id_num_str', '')}".lower()
-        if all(term in searchable_string for term in search_terms):
-            matches.append(p_data_item)
-
-    return matches
+    search_terms = search_term.strip().split()
+    if not search_terms:
+        return []
+    # Tutti i termini devono essere presenti: ricerca tramite l'indice condiviso
+    found_ids = search_players(players_db_dict, " ".join("+" + t for t in search_terms))
+    return [players_db_dict[p_id] for p_id in players_db_dict if p_id in found_ids]
 
 
 def display_player_details(player_data):
@@ -129,11 +123,11 @@ def add_new_player(players_db_main_dict):
     first_name = get_input_with_default(_("Nome: ")).title()
     if not first_name:
         print(_("Nome richiesto."))
-        return False
+        return None
     last_name = get_input_with_default(_("Cognome: ")).title()
     if not last_name:
         print(_("Cognome richiesto."))
-        return False
+        return None
 
     elo_val = dgt(
         f"{_('Elo Corrente')} (default {int(DEFAULT_ELO)})",
@@ -221,8 +215,8 @@ def add_new_player(players_db_main_dict):
     )
     if new_id:
         display_player_details(players_db_main_dict[new_id])
-        return True
-    return False
+        return new_id
+    return None
 
 
 def edit_player_data(player_id_to_edit, players_db_dict_ref):
@@ -525,6 +519,8 @@ def main_interactive_db_tool_loop(players_db_main_dict):
         )
     )
     last_managed_player_id = None
+    # Giocatori aggiunti, modificati o cancellati nella sessione
+    changed_ids = set()
     while True:
         print("\n" + "=" * 40)
         print(_("Giocatori nel database: {num}").format(num=len(players_db_main_dict)))
@@ -542,8 +538,10 @@ def main_interactive_db_tool_loop(players_db_main_dict):
         if search_input_main_val == "s" or not search_input_main_val:
             break
         if search_input_main_val == "a":
-            if add_new_player(players_db_main_dict):
-                save_players_db(players_db_main_dict)
+            new_id = add_new_player(players_db_main_dict)
+            if new_id:
+                changed_ids.add(new_id)
+                save_players_db(players_db_main_dict, changed_ids=[new_id])
             continue
         if search_input_main_val == "l":
             if not players_db_main_dict:
@@ -584,8 +582,10 @@ def main_interactive_db_tool_loop(players_db_main_dict):
                 ).lower()
                 == "s"
             ):
-                if add_new_player(players_db_main_dict):
-                    save_players_db(players_db_main_dict)
+                new_id = add_new_player(players_db_main_dict)
+                if new_id:
+                    changed_ids.add(new_id)
+                    save_players_db(players_db_main_dict, changed_ids=[new_id])
             continue
         elif len(found_players_list_main) == 1:
             player_to_manage_item = found_players_list_main[0]
@@ -622,7 +622,11 @@ def main_interactive_db_tool_loop(players_db_main_dict):
                     ):
                         del players_db_main_dict[current_player_id_main_ops]
                         print(_("Giocatore cancellato."))
-                        save_players_db(players_db_main_dict)
+                        changed_ids.add(current_player_id_main_ops)
+                        save_players_db(
+                            players_db_main_dict,
+                            changed_ids=[current_player_id_main_ops],
+                        )
                         last_managed_player_id = None
                         break
                 elif action_main == "m":
@@ -630,7 +634,10 @@ def main_interactive_db_tool_loop(players_db_main_dict):
                         current_player_id_main_ops, players_db_main_dict
                     )
                     if edit_successful:
-                        save_players_db(players_db_main_dict)
+                        # Un cambio di ID elimina il vecchio record e crea il nuovo
+                        edited_ids = {current_player_id_main_ops, resulting_player_id}
+                        changed_ids.update(edited_ids)
+                        save_players_db(players_db_main_dict, changed_ids=edited_ids)
                         last_managed_player_id = resulting_player_id
                         current_player_id_main_ops = resulting_player_id
         else:
@@ -656,7 +663,7 @@ def main_interactive_db_tool_loop(players_db_main_dict):
                 )
 
     print(_("\nSalvataggio finale del database prima di uscire..."))
-    save_players_db(players_db_main_dict)
+    save_players_db(players_db_main_dict, changed_ids=changed_ids)
     print(_("Uscita dal gestore database giocatori."))
 
 
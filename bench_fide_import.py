@@ -0,0 +1,127 @@
+# ruff: noqa: E402
+"""
+Confronta i tempi di importazione della lista FIDE in formato XML e TXT.
+
+Uso:
+    python bench_fide_import.py [giocatori]
+    python bench_fide_import.py lista.xml lista.txt
+
+Senza file vengono generate due liste equivalenti con il numero di giocatori
+indicato (default 300000). Per ogni formato vengono misurate la sola analisi
+del file e la costruzione completa del DB SQLite in una cartella temporanea.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
+
+import fide_db
+from db_players import iter_fide_txt_batches, iter_fide_xml_batches
+
+_TXT_HEADER = (
+    "ID Number      Name                                                         "
+    "Fed Sex Tit  WTit OTit                                        FOA SRtng SGm SK "
+    "RRtng RGm Rk BRtng BGm BK B-day Flag "
+)
+_TXT_WIDTHS = (15, 61, 4, 4, 5, 5, 44, 4, 6, 4, 3, 6, 4, 3, 6, 4, 3, 6, 5)
+_NAMES = ("Rossi", "Müller", "Carlsen", "Nakamura", "Ivanchuk", "Dubois")
+
+
+def _sample_players(count):
+    for i in range(count):
+        last = _NAMES[i % len(_NAMES)]
+        yield (
+            str(1000000 + i),
+            f"{last}{i // len(_NAMES)}, Player",
+            "ITA",
+            "M" if i % 3 else "F",
+            "FM" if i % 50 == 0 else "",
+            str(1400 + i % 1400),
+            str(i % 40),
+            "20",
+            str(1950 + i % 60),
+        )
+
+
+def genera_liste(count, folder):
+    """Scrive in 'folder' una lista XML e una TXT con gli stessi giocatori."""
+    xml_path = os.path.join(folder, "players_list_xml.xml")
+    txt_path = os.path.join(folder, "players_list_foa.txt")
+    with open(xml_path, "w", encoding="utf-8") as xml_file, open(
+        txt_path, "w", encoding="utf-8"
+    ) as txt_file:
+        xml_file.write('<?xml version="1.0" encoding="utf-8"?>\n<playerslist>\n')
+        txt_file.write(_TXT_HEADER + "\n")
+        for fide_id, name, fed, sex, title, rating, games, k, year in _sample_players(
+            count
+        ):
+            xml_file.write(
+                f"<player><fideid>{fide_id}</fideid><name>{name}</name>"
+                f"<country>{fed}</country><sex>{sex}</sex><title>{title}</title>"
+                "<w_title></w_title><o_title></o_title><foa_title></foa_title>"
+                f"<rating>{rating}</rating><games>{games}</games><k>{k}</k>"
+                "<rapid_rating></rapid_rating><rapid_games></rapid_games>"
+                "<rapid_k></rapid_k><blitz_rating></blitz_rating>"
+                "<blitz_games></blitz_games><blitz_k></blitz_k>"
+                f"<birthday>{year}</birthday><flag></flag></player>\n"
+            )
+            values = (fide_id, name, fed, sex, title, "", "", "", rating, games, k)
+            values += ("",) * 6 + (year, "")
+            txt_file.write(
+                "".join(v.ljust(w) for v, w in zip(values, _TXT_WIDTHS)).rstrip() + "\n"
+            )
+        xml_file.write("</playerslist>\n")
+    return xml_path, txt_path
+
+
+def _batches(list_format, path):
+    if list_format == "txt":
+        return iter_fide_txt_batches(path), None
+    xml_file = open(path, "rb")
+    return iter_fide_xml_batches(xml_file), xml_file
+
+
+def misura(list_format, path, folder):
+    """Secondi per analizzare il file e per costruire il DB, e righe lette."""
+    batches, handle = _batches(list_format, path)
+    start = time.perf_counter()
+    count = sum(len(batch) for batch in batches)
+    parse_time = time.perf_counter() - start
+    if handle is not None:
+        handle.close()
+
+    fide_db.FIDE_DB_LOCAL_FILE = os.path.join(folder, f"fide_{list_format}.db")
+    batches, handle = _batches(list_format, path)
+    start = time.perf_counter()
+    fide_db.build_fide_db(batches)
+    build_time = time.perf_counter() - start
+    if handle is not None:
+        handle.close()
+    fide_db.invalidate_connections()
+    return parse_time, build_time, count
+
+
+def main(argv):
+    with tempfile.TemporaryDirectory() as folder:
+        if len(argv) == 2:
+            xml_path, txt_path = argv
+        else:
+            count = int(argv[0]) if argv else 300000
+            print(f"Generazione di due liste con {count} giocatori...")
+            xml_path, txt_path = genera_liste(count, folder)
+
+        for list_format, path in (("xml", xml_path), ("txt", txt_path)):
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            parse_time, build_time, count = misura(list_format, path, folder)
+            print(
+                f"{list_format.upper()}: {size_mb:.1f} MB, {count} giocatori, "
+                f"analisi {parse_time:.2f}s ({count / parse_time:.0f}/s), "
+                f"DB completo {build_time:.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
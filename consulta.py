@@ -2,6 +2,11 @@
 # Estratto e riadattato da Tornello DEV
 # Data: 22 settembre 2025
 # Modificato in base alla richiesta del 2 ottobre 2025
+#
+# Uso interattivo:  python consulta.py
+# Ricerche da file: python consulta.py --batch query.txt [--limit N]
+#   (una query per riga, '-' legge dallo standard input; i risultati
+#   vengono scritti come righe separate da tabulazioni)
 
 import os
 import sys
@@ -14,10 +19,12 @@ except AttributeError:
     sys.path.insert(0, os.path.join(os.path.abspath(os.path.dirname(__file__)), "src"))
 
 from config import FIDE_DB_LOCAL_FILE
-from db_players import (
-    aggiorna_db_fide_locale,
-    _cerca_giocatore_nel_db_fide as cerca_giocatore_fide,
-)
+from db_players import aggiorna_db_fide_locale
+from fide_db import fide_db_exists, open_search
+from fide_search_service import shared_service
+
+# Giocatori mostrati per ogni pagina del pager
+PAGER_SIZE = 10
 
 
 # --- NUOVE FUNZIONI DI VISUALIZZAZIONE ---
@@ -34,57 +41,69 @@ def stampa_dettagli_giocatore(player):
     print("-" * 30)
 
 
-def gestisci_risultati_con_pager(results):
+def _riga_riepilogo(progressivo, player):
+    """Riga di riepilogo di un giocatore nell'elenco a pagine."""
+    nome_completo = f"{player.get('first_name', '')} {player.get('last_name', '')}"
+    # Usiamo .get(key, 'N/D') per evitare errori se un dato manca
+    elo_std = player.get("elo_standard", "N/D")
+    elo_rapid = player.get("elo_rapid", "N/D")
+    anno = player.get("birth_year", "N/D")
+    nazione = player.get("federation", "N/D")
+    return f"{progressivo:>3}. {nome_completo:<30} | Elo Std: {elo_std:<4} | Elo Rapid: {elo_rapid:<4} | Anno: {anno:<4} | Naz: {nazione}"
+
+
+def _carica_fino_a(search_service, request, count):
+    """
+    Legge dal database le pagine successive della ricerca finché non sono
+    disponibili almeno 'count' risultati o la ricerca è esaurita.
+    """
+    while len(request.results) < count and request.has_more:
+        if not search_service.load_more(request):
+            break
+        request.wait()
+        if request.error is not None:
+            print(f"ERRORE durante la lettura dei risultati: {request.error}")
+            break
+
+
+def gestisci_risultati_con_pager(request, search_service, page_size=PAGER_SIZE):
     """
-    Gestisce la visualizzazione di risultati multipli (da 4 a 100)
-    con un sistema a pagine (pager).
+    Gestisce la visualizzazione di risultati multipli con un sistema a pagine
+    (pager). I risultati arrivano dal cursore della ricerca: la prima pagina
+    viene mostrata subito e le successive vengono lette solo se richieste,
+    quindi anche una ricerca con migliaia di corrispondenze non le carica tutte.
     """
     start_index = 0
-    num_results = len(results)
+    num_results = request.total
+    num_pages = max((num_results + page_size - 1) // page_size, 1)
 
-    while start_index < num_results:
-        # Calcola l'indice di fine per la pagina corrente (massimo 10 risultati)
-        end_index = min(start_index + 10, num_results)
+    while True:
+        # Calcola l'indice di fine per la pagina corrente
+        _carica_fino_a(search_service, request, start_index + page_size)
+        results = request.results
+        end_index = min(start_index + page_size, len(results))
+        if start_index >= end_index:
+            print("Fine dei risultati.")
+            break
 
-        print(
-            "\n--- Pagina "
-            + str(start_index // 10 + 1)
-            + f" di {(num_results + 9) // 10} ---"
-        )
+        print(f"\n--- Pagina {start_index // page_size + 1} di {num_pages} ---")
 
         # Stampa il riepilogo per i giocatori nella pagina corrente
         for i in range(start_index, end_index):
-            player = results[i]
-            progressivo = i + 1
-            nome_completo = (
-                f"{player.get('first_name', '')} {player.get('last_name', '')}"
-            )
-            # Usiamo .get(key, 'N/D') per evitare errori se un dato manca
-            elo_std = player.get("elo_standard", "N/D")
-            elo_rapid = player.get("elo_rapid", "N/D")
-            anno = player.get("birth_year", "N/D")
-            nazione = player.get("federation", "N/D")
-
-            # Formattiamo la riga di riepilogo
-            print(
-                f"{progressivo:>3}. {nome_completo:<30} | Elo Std: {elo_std:<4} | Elo Rapid: {elo_rapid:<4} | Anno: {anno:<4} | Naz: {nazione}"
-            )
+            print(_riga_riepilogo(i + 1, results[i]))
 
         # Chiede all'utente cosa fare
         prompt = "\nInserisci il numero del giocatore per vederne i dettagli,\no premi Invio per la pagina successiva (q per tornare alla ricerca): "
         user_choice = input(prompt).strip()
 
         if not user_choice:  # L'utente ha premuto Invio
-            start_index += 10
-            if start_index >= num_results:
-                print("Fine dei risultati.")
-                break  # Esce dal ciclo del pager
+            start_index += page_size
         elif user_choice.lower() == "q":
             print("Torno alla ricerca...")
             break  # Esce dal ciclo del pager
         elif user_choice.isdigit():
             choice_index = int(user_choice)
-            if 1 <= choice_index <= num_results:
+            if 1 <= choice_index <= len(results):
                 # L'utente ha scelto un giocatore valido, mostriamo i dettagli
                 print(f"\n--- Dettagli per il giocatore #{choice_index} ---")
                 stampa_dettagli_giocatore(
@@ -92,11 +111,94 @@ def gestisci_risultati_con_pager(results):
                 )  # -1 perché la lista parte da 0
                 break  # Esce dal ciclo del pager dopo aver mostrato i dettagli
             else:
-                print(f"ERRORE: Inserisci un numero tra 1 e {num_results}.")
+                print(f"ERRORE: Inserisci un numero tra 1 e {len(results)}.")
         else:
             print("ERRORE: Input non valido.")
 
 
+# --- MODALITÀ BATCH ---
+
+# Colonne stampate per ogni giocatore trovato in modalità --batch
+BATCH_COLUMNS = (
+    "id_fide",
+    "last_name",
+    "first_name",
+    "federation",
+    "title",
+    "elo_standard",
+    "elo_rapid",
+    "elo_blitz",
+    "birth_year",
+)
+
+
+def leggi_query_batch(path):
+    """Query del file indicato (una per riga, '-' per lo standard input), senza righe vuote e commenti '#'."""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+
+
+def esegui_batch(queries, limit=None, out=None):
+    """
+    Esegue le ricerche in sequenza sul thread corrente, quindi su un'unica
+    connessione di lettura al DB FIDE, e scrive una riga separata da
+    tabulazioni per ogni giocatore trovato: la query seguita da BATCH_COLUMNS.
+    I risultati vengono letti e scritti una pagina alla volta; 'limit' limita
+    i giocatori stampati per ogni query. Restituisce il numero di query
+    senza risultati.
+    """
+    out = out or sys.stdout
+    out.write("\t".join(("query",) + BATCH_COLUMNS) + "\n")
+    not_found = 0
+    for query in queries:
+        cursor = open_search(query)
+        printed = 0
+        while cursor.has_more and (limit is None or printed < limit):
+            page = cursor.fetch_page()
+            if limit is not None:
+                page = page[: limit - printed]
+            for player in page:
+                values = [query] + [
+                    "" if player.get(col) is None else str(player.get(col))
+                    for col in BATCH_COLUMNS
+                ]
+                out.write("\t".join(v.replace("\t", " ") for v in values) + "\n")
+            printed += len(page)
+        if printed == 0:
+            not_found += 1
+            print(f"Nessun giocatore trovato per '{query}'.", file=sys.stderr)
+    out.flush()
+    return not_found
+
+
+def main_batch(args):
+    """Gestisce 'consulta.py --batch FILE [--limit N]'. Restituisce il codice di uscita."""
+    usage = "Uso: python consulta.py --batch <file_query|-> [--limit N]"
+    try:
+        path = args[args.index("--batch") + 1]
+        limit = int(args[args.index("--limit") + 1]) if "--limit" in args else None
+    except (IndexError, ValueError):
+        print(usage, file=sys.stderr)
+        return 2
+    if not fide_db_exists():
+        print(
+            "Database FIDE locale assente: avvia consulta.py senza --batch per scaricarlo.",
+            file=sys.stderr,
+        )
+        return 1
+    try:
+        queries = leggi_query_batch(path)
+    except OSError as e:
+        print(f"Impossibile leggere il file delle query: {e}", file=sys.stderr)
+        return 1
+    esegui_batch(queries, limit=limit)
+    return 0
+
+
 def main():
     """
     Funzione principale che orchestra il funzionamento dello script.
@@ -136,6 +238,9 @@ def main():
                 sys.exit(0)
 
     print("\n--- Ricerca Giocatori ---")
+    # Le ricerche recenti restano in cache: una chiave più specifica di una
+    # già cercata (es. "ross" -> "rossi") viene filtrata senza rileggere il DB
+    search_service = shared_service()
     while True:
         search_term = input(
             "Inserisci parte del nome/cognome o ID FIDE (o lascia vuoto per uscire): "
@@ -143,27 +248,29 @@ def main():
         if not search_term:
             break  # Esce dal ciclo se l'utente preme Invio
 
-        results = cerca_giocatore_fide(search_term)
-        num_results = len(results)
+        request = search_service.search(search_term)
+        results = request.wait()
+        num_results = request.total
+        if request.approximate:
+            print(
+                f"Nessuna corrispondenza esatta per '{search_term}', mostro i nomi più simili."
+            )
 
         # --- LOGICA DI VISUALIZZAZIONE MODIFICATA ---
-        if num_results == 0:
+        if request.error is not None:
+            print(f"ERRORE durante la ricerca: {request.error}")
+
+        elif num_results == 0:
             print(f"Nessun giocatore trovato per '{search_term}'.")
 
-        elif num_results <= 3:
+        elif num_results <= 3 and not request.has_more:
             print(f"\nTrovati {num_results} risultati per '{search_term}':")
             for player in results:
                 stampa_dettagli_giocatore(player)  # Uso la nuova funzione
 
-        elif num_results > 100:
-            print(
-                f"\nTrovati {num_results} risultati. Sono troppi per essere visualizzati."
-            )
-            print("Prova con una chiave di ricerca più specifica.")
-
-        else:  # Da 4 a 100 risultati
+        else:
             print(f"\nTrovati {num_results} risultati per '{search_term}'.")
-            gestisci_risultati_con_pager(results)  # Uso la nuova funzione per il pager
+            gestisci_risultati_con_pager(request, search_service)
 
     print("\nGrazie per aver usato FIDE Player Checker. A presto!")
 
@@ -171,4 +278,6 @@ def main():
 # --- Esecuzione dello Script ---
 
 if __name__ == "__main__":
+    if "--batch" in sys.argv[1:]:
+        sys.exit(main_batch(sys.argv[1:]))
     main()
@@ -0,0 +1,483 @@
+"""
+Archivio dei backup deduplicato e compresso.
+
+Ogni istantanea viene identificata dall'hash SHA-256 del suo contenuto:
+contenuti identici vengono memorizzati una sola volta. Le versioni successive
+dello stesso file sorgente vengono salvate, quando conviene, come delta
+(compresso con zlib) rispetto alla versione precedente, formando catene di
+lunghezza limitata. Elenco, ripristino ed eliminazione leggono esclusivamente
+il file indice, senza scansionare la cartella.
+
+Struttura su disco:
+    backup/index.json            indice delle istantanee e degli oggetti
+    backup/objects/ab/abcd...z   oggetti compressi (completi o delta)
+"""
+
+import os
+import re
+import sys
+import json
+import zlib
+import struct
+import hashlib
+import difflib
+import datetime
+
+from serialization import dump_to_file
+
+BACKUP_DIR = "backup"
+INDEX_FILENAME = "index.json"
+OBJECTS_DIRNAME = "objects"
+INDEX_SCHEMA_VERSION = 1
+
+# Lunghezza massima di una catena di delta prima di salvare un oggetto completo
+MAX_DELTA_CHAIN = 16
+# Livello di compressione zlib per gli oggetti
+ZLIB_LEVEL = 9
+
+_KIND_FULL = b"F"
+_KIND_DELTA = b"D"
+_OP_COPY = b"C"
+_OP_INSERT = b"I"
+
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+_LEGACY_NAME_RE = re.compile(
+    r"^(?P<stem>.+?)_(?P<context>pre_[A-Za-z_]+|backup)_(?P<ts>\d{8}_\d{6})(?P<ext>\.\w+)?$"
+)
+
+
+class BackupStoreError(Exception):
+    """Errore di lettura o scrittura dell'archivio dei backup."""
+
+
+def _hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path, data):
+    """Scrive i byte su un file temporaneo e lo sostituisce atomicamente a quello finale."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def encode_delta(base, target):
+    """
+    Codifica 'target' come sequenza di operazioni rispetto a 'base', lavorando per righe.
+    Le operazioni sono COPY (intervallo di righe della base) e INSERT (byte letterali).
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines)
+
+    # Offset in byte dell'inizio di ogni riga della base
+    offsets = [0]
+    for line in base_lines:
+        offsets.append(offsets[-1] + len(line))
+
+    out = bytearray()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            out += _OP_COPY + struct.pack(">II", offsets[i1], offsets[i2] - offsets[i1])
+        elif tag in ("replace", "insert"):
+            chunk = b"".join(target_lines[j1:j2])
+            out += _OP_INSERT + struct.pack(">I", len(chunk)) + chunk
+        # "delete": le righe della base vengono semplicemente saltate
+    return bytes(out)
+
+
+def apply_delta(base, delta):
+    """Ricostruisce il contenuto applicando le operazioni di 'delta' ai byte di 'base'."""
+    out = bytearray()
+    pos = 0
+    length = len(delta)
+    while pos < length:
+        op = delta[pos : pos + 1]
+        pos += 1
+        if op == _OP_COPY:
+            start, size = struct.unpack_from(">II", delta, pos)
+            pos += 8
+            out += base[start : start + size]
+        elif op == _OP_INSERT:
+            (size,) = struct.unpack_from(">I", delta, pos)
+            pos += 4
+            out += delta[pos : pos + size]
+            pos += size
+        else:
+            raise BackupStoreError(f"Operazione delta sconosciuta: {op!r}")
+    return bytes(out)
+
+
+def move_to_trash(path):
+    """Manda il file specificato nel Cestino di sistema se possibile, altrimenti lo elimina direttamente."""
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class SHFILEOPSTRUCTW(ctypes.Structure):
+                _fields_ = [
+                    ("hwnd", wintypes.HWND),
+                    ("wFunc", wintypes.UINT),
+                    ("pFrom", wintypes.LPCWSTR),
+                    ("pTo", wintypes.LPCWSTR),
+                    ("fFlags", ctypes.c_ushort),
+                    ("fAnyOperationsAborted", wintypes.BOOL),
+                    ("hNameMappings", wintypes.LPVOID),
+                    ("lpszProgressTitle", wintypes.LPCWSTR),
+                ]
+
+            FO_DELETE = 3
+            FOF_ALLOWUNDO = 0x0040
+            FOF_NOCONFIRMATION = 0x0010
+            FOF_NOERRORUI = 0x0400
+            FOF_SILENT = 0x0004
+
+            path_abs = os.path.abspath(path)
+            # La Shell API richiede una stringa con doppio carattere nullo di terminazione
+            path_double_null = path_abs + "\0\0"
+
+            fileop = SHFILEOPSTRUCTW()
+            fileop.hwnd = None
+            fileop.wFunc = FO_DELETE
+            fileop.pFrom = path_double_null
+            fileop.pTo = None
+            fileop.fFlags = (
+                FOF_ALLOWUNDO | FOF_NOCONFIRMATION | FOF_NOERRORUI | FOF_SILENT
+            )
+            fileop.fAnyOperationsAborted = False
+            fileop.hNameMappings = None
+            fileop.lpszProgressTitle = None
+
+            result = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(fileop))
+            if result == 0:
+                return True
+        except Exception:
+            pass
+
+    # Fallback su send2trash se installato
+    try:
+        from send2trash import send2trash
+
+        send2trash(path)
+        return True
+    except Exception:
+        pass
+
+    # Fallback finale su eliminazione diretta
+    try:
+        os.remove(path)
+        return True
+    except Exception:
+        return False
+
+
+class BackupStore:
+    """Archivio dei backup indirizzato per contenuto, con indice su file."""
+
+    def __init__(self, backup_dir=BACKUP_DIR):
+        self.backup_dir = backup_dir
+        self.index_path = os.path.join(backup_dir, INDEX_FILENAME)
+        self.objects_dir = os.path.join(backup_dir, OBJECTS_DIRNAME)
+        self._index = None
+
+    # -----------------------------------------------------------------------
+    # Indice
+    # -----------------------------------------------------------------------
+
+    def _empty_index(self):
+        return {"schema_version": INDEX_SCHEMA_VERSION, "entries": [], "objects": {}}
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError) as e:
+                raise BackupStoreError(
+                    f"Indice dei backup illeggibile '{self.index_path}': {e}"
+                )
+        else:
+            self._index = self._empty_index()
+            if os.path.isdir(self.backup_dir):
+                self._import_loose_files()
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        # L'indice è letto solo dal programma: formato compatto, scritto in streaming
+        dump_to_file(self._index, self.index_path, compact=True, fsync=True)
+
+    # -----------------------------------------------------------------------
+    # Oggetti
+    # -----------------------------------------------------------------------
+
+    def _object_path(self, obj_hash):
+        return os.path.join(self.objects_dir, obj_hash[:2], obj_hash + ".z")
+
+    def _write_object(self, obj_hash, kind, compressed):
+        path = self._object_path(obj_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        blob = kind + compressed
+        _write_atomic(path, blob)
+        return len(blob)
+
+    def _read_object(self, obj_hash):
+        try:
+            with open(self._object_path(obj_hash), "rb") as f:
+                blob = f.read()
+        except OSError as e:
+            raise BackupStoreError(f"Oggetto di backup mancante {obj_hash}: {e}")
+        return blob[:1], zlib.decompress(blob[1:])
+
+    def _latest_for_source(self, source):
+        """Restituisce la voce più recente relativa allo stesso file sorgente."""
+        for entry in reversed(self._load_index()["entries"]):
+            if entry["source"] == source:
+                return entry
+        return None
+
+    def _store_content(self, data, base_hash=None):
+        """
+        Memorizza il contenuto se non già presente e ne restituisce l'hash.
+        Se è disponibile una base, prova a salvarlo come delta e lo mantiene
+        solo se più piccolo dell'oggetto completo.
+        """
+        index = self._load_index()
+        objects = index["objects"]
+        obj_hash = _hash_bytes(data)
+        if obj_hash in objects:
+            return obj_hash
+
+        kind, compressed, depth = _KIND_FULL, zlib.compress(data, ZLIB_LEVEL), 0
+
+        base = objects.get(base_hash) if base_hash else None
+        if base is not None and base["depth"] < MAX_DELTA_CHAIN:
+            try:
+                base_data = self._reconstruct(base_hash)
+                delta = zlib.compress(encode_delta(base_data, data), ZLIB_LEVEL)
+                if len(delta) < len(compressed):
+                    kind, compressed, depth = _KIND_DELTA, delta, base["depth"] + 1
+            except BackupStoreError:
+                pass
+
+        stored = self._write_object(obj_hash, kind, compressed)
+        objects[obj_hash] = {
+            "base": base_hash if kind == _KIND_DELTA else None,
+            "depth": depth,
+            "size": len(data),
+            "stored": stored,
+        }
+        return obj_hash
+
+    def _reconstruct(self, obj_hash):
+        """Ricostruisce il contenuto di un oggetto risalendo la sua catena di delta."""
+        objects = self._load_index()["objects"]
+        chain = []
+        current = obj_hash
+        while current is not None:
+            if current not in objects:
+                raise BackupStoreError(f"Oggetto di backup sconosciuto: {current}")
+            chain.append(current)
+            current = objects[current]["base"]
+
+        data = None
+        for h in reversed(chain):
+            kind, payload = self._read_object(h)
+            if kind == _KIND_FULL:
+                data = payload
+            elif kind == _KIND_DELTA and data is not None:
+                data = apply_delta(data, payload)
+            else:
+                raise BackupStoreError(f"Oggetto di backup corrotto: {h}")
+
+        if _hash_bytes(data) != obj_hash:
+            raise BackupStoreError(f"Verifica hash fallita per l'oggetto {obj_hash}")
+        return data
+
+    # -----------------------------------------------------------------------
+    # Operazioni pubbliche
+    # -----------------------------------------------------------------------
+
+    def add(self, filepath, context="backup", when=None):
+        """
+        Aggiunge un'istantanea del file all'archivio.
+        Restituisce la voce d'indice creata.
+        """
+        with open(filepath, "rb") as f:
+            data = f.read()
+
+        index = self._load_index()
+        source = os.path.basename(filepath)
+        when = when or datetime.datetime.now()
+        name, ext = os.path.splitext(source)
+        entry_name = f"{name}_{context}_{when.strftime(_TIMESTAMP_FORMAT)}{ext}"
+
+        previous = self._latest_for_source(source)
+        obj_hash = self._store_content(
+            data, base_hash=previous["hash"] if previous else None
+        )
+
+        entry_id = entry_name
+        existing_ids = {e["id"] for e in index["entries"]}
+        counter = 1
+        while entry_id in existing_ids:
+            counter += 1
+            entry_id = f"{entry_name}#{counter}"
+
+        timestamp = when.isoformat(timespec="seconds")
+        entry = {
+            "id": entry_id,
+            "name": entry_name,
+            "source": source,
+            "context": context,
+            "created": timestamp,
+            "mtime": timestamp,
+            "hash": obj_hash,
+            "size": len(data),
+        }
+        index["entries"].append(entry)
+        self._save_index()
+        return entry
+
+    def list_backups(self):
+        """Restituisce le voci dell'indice ordinate dalla più vecchia alla più recente."""
+        entries = list(self._load_index()["entries"])
+        entries.sort(key=lambda e: e["mtime"])
+        return entries
+
+    def get_entry(self, entry_id):
+        for entry in self._load_index()["entries"]:
+            if entry["id"] == entry_id:
+                return entry
+        return None
+
+    def read(self, entry_id):
+        """Restituisce il contenuto originale (bytes) dell'istantanea indicata."""
+        entry = self.get_entry(entry_id)
+        if entry is None:
+            raise BackupStoreError(f"Backup inesistente: {entry_id}")
+        return self._reconstruct(entry["hash"])
+
+    def restore(self, entry_id, dest_path):
+        """Ripristina l'istantanea indicata scrivendola atomicamente in dest_path."""
+        data = self.read(entry_id)
+        dest_dir = os.path.dirname(os.path.abspath(dest_path))
+        os.makedirs(dest_dir, exist_ok=True)
+        _write_atomic(dest_path, data)
+        return dest_path
+
+    def touch(self, entry_ids, when=None):
+        """Aggiorna la data di riferimento (età) delle voci indicate."""
+        ids = set(entry_ids)
+        timestamp = (when or datetime.datetime.now()).isoformat(timespec="seconds")
+        for entry in self._load_index()["entries"]:
+            if entry["id"] in ids:
+                entry["mtime"] = timestamp
+        self._save_index()
+
+    def older_than(self, limit_date):
+        """Restituisce le voci la cui data di riferimento precede limit_date."""
+        limit = limit_date.isoformat(timespec="seconds")
+        return [e for e in self.list_backups() if e["mtime"] < limit]
+
+    def delete(self, entry_ids):
+        """
+        Elimina le voci indicate dall'indice e rimuove gli oggetti non più
+        raggiungibili. Restituisce il numero di voci eliminate.
+        """
+        ids = set(entry_ids)
+        index = self._load_index()
+        before = len(index["entries"])
+        index["entries"] = [e for e in index["entries"] if e["id"] not in ids]
+        removed = before - len(index["entries"])
+        if removed:
+            self._collect_garbage()
+            self._save_index()
+        return removed
+
+    def stored_size(self):
+        """Dimensione complessiva su disco degli oggetti compressi."""
+        return sum(o["stored"] for o in self._load_index()["objects"].values())
+
+    def _collect_garbage(self):
+        """Rimuove gli oggetti non referenziati da alcuna voce né come base di un delta."""
+        index = self._index
+        objects = index["objects"]
+        reachable = set()
+        for entry in index["entries"]:
+            current = entry["hash"]
+            while current is not None and current not in reachable:
+                reachable.add(current)
+                current = objects.get(current, {}).get("base")
+
+        for obj_hash in [h for h in objects if h not in reachable]:
+            del objects[obj_hash]
+            try:
+                os.remove(self._object_path(obj_hash))
+            except OSError:
+                pass
+
+    def _import_loose_files(self):
+        """
+        Migrazione una tantum: importa nell'archivio i file di backup "sciolti"
+        creati dalle versioni precedenti (copie integrali). Salvato l'indice,
+        ogni originale il cui contenuto si ricostruisce identico dall'archivio
+        viene spostato nel Cestino; gli altri restano al loro posto.
+        """
+        loose = []
+        for filename in os.listdir(self.backup_dir):
+            filepath = os.path.join(self.backup_dir, filename)
+            if not os.path.isfile(filepath) or filename.endswith(".tmp"):
+                continue
+            loose.append((os.path.getmtime(filepath), filename, filepath))
+        if not loose:
+            return
+
+        loose.sort()
+        imported = []
+        for mtime, filename, filepath in loose:
+            match = _LEGACY_NAME_RE.match(filename)
+            if match:
+                source = match.group("stem") + (match.group("ext") or "")
+                context = match.group("context")
+            else:
+                source, context = filename, "backup"
+            with open(filepath, "rb") as f:
+                data = f.read()
+
+            previous = self._latest_for_source(source)
+            obj_hash = self._store_content(
+                data, base_hash=previous["hash"] if previous else None
+            )
+            timestamp = datetime.datetime.fromtimestamp(mtime).isoformat(
+                timespec="seconds"
+            )
+            self._index["entries"].append(
+                {
+                    "id": filename,
+                    "name": filename,
+                    "source": source,
+                    "context": context,
+                    "created": timestamp,
+                    "mtime": timestamp,
+                    "hash": obj_hash,
+                    "size": len(data),
+                }
+            )
+            imported.append((filepath, obj_hash))
+
+        self._save_index()
+        for filepath, obj_hash in imported:
+            # _reconstruct confronta l'hash del contenuto ricostruito con
+            # quello dell'originale: se riesce, la copia sciolta è superflua.
+            try:
+                self._reconstruct(obj_hash)
+            except (OSError, BackupStoreError, zlib.error):
+                continue
+            move_to_trash(filepath)
@@ -127,10 +127,9 @@ class CLIAdapter(UIAdapter):
         tournament: Optional[Tournament] = None,
         sync: bool = False,
     ) -> None:
-        torneo_dict = tournament.to_dict() if tournament else None
-        play_sound(sound_name, torneo_dict, sync=sync)
+        play_sound(sound_name, tournament, sync=sync)
 
     def display_tournament_status(self, tournament: Tournament) -> None:
         from reports import display_status
 
-        display_status(tournament.to_dict())
+        display_status(tournament)
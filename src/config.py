@@ -73,6 +73,7 @@ PLAYER_DB_TXT_FILE = user_data_path("Tornello - Players_db.txt")
 ARCHIVED_TOURNAMENTS_DIR = user_data_path("Closed Tournaments")
 FIDE_DB_LOCAL_FILE = user_data_path("fide_ratings.db")
 FIDE_DB_JSON_LEGACY = user_data_path("fide_ratings_local.json")
+FIDE_HISTORY_FILE = user_data_path("fide_history.db")
 
 # Costanti per l'integrazione con bbpPairings
 BBP_SUBDIR = resource_path("bbppairings")
@@ -87,3 +88,6 @@ DATE_FORMAT_ISO = "%Y-%m-%d"
 DEFAULT_ELO = 1399.0
 DEFAULT_K_FACTOR = 20
 FIDE_XML_DOWNLOAD_URL = "https://ratings.fide.com/download/players_list_xml.zip"
+FIDE_TXT_DOWNLOAD_URL = "https://ratings.fide.com/download/players_list.zip"
+# Formato della lista FIDE da scaricare: "xml" oppure "txt" (colonne fisse)
+FIDE_LIST_FORMAT = "xml"
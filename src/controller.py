@@ -1,11 +1,11 @@
 import os
-import json
 import glob
 from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from models import Tournament, Player, Match, Round, RoundDate, ResultEntry
+from serialization import read_tournament_header
+from models import Tournament, Player, Match, Round, RoundDate, ResultEntry, RoundList
 from config import (
     FIDE_DB_LOCAL_FILE,
     FIDE_DB_JSON_LEGACY,
@@ -19,9 +19,11 @@ from utils import (
     sanitize_filename,
     create_backup,
     parse_flexible_date,
+    get_round,
 )
 from db_players import (
     load_players_db,
+    players_db_file,
     sincronizza_db_personale,
     aggiorna_db_fide_locale,
 )
@@ -234,8 +236,7 @@ class TournamentController:
             single_found_filepath = potential_tournament_files[0]
             single_tournament_name_guess = _("Torneo Sconosciuto")
             try:
-                with open(single_found_filepath, "r", encoding="utf-8") as f_temp:
-                    data_temp = json.load(f_temp)
+                data_temp = read_tournament_header(single_found_filepath)
                 single_tournament_name_guess = data_temp.get(
                     "name",
                     os.path.basename(single_found_filepath)
@@ -299,8 +300,7 @@ class TournamentController:
             tournament_options = []
             for idx, filepath in enumerate(potential_tournament_files):
                 try:
-                    with open(filepath, "r", encoding="utf-8") as f_temp:
-                        data_temp = json.load(f_temp)
+                    data_temp = read_tournament_header(filepath)
                     t_name = data_temp.get("name", _("Nome Sconosciuto"))
                     t_start = data_temp.get("start_date")
                     t_end = data_temp.get("end_date")
@@ -338,8 +338,7 @@ class TournamentController:
                 suspended_tournaments = []
                 for opt in tournament_options:
                     try:
-                        with open(opt["filepath"], "r", encoding="utf-8") as f_temp:
-                            data_temp = json.load(f_temp)
+                        data_temp = read_tournament_header(opt["filepath"])
                         if data_temp.get("creation_suspended", False):
                             suspended_tournaments.append(opt)
                     except Exception:
@@ -408,7 +407,7 @@ class TournamentController:
         if (
             self.tournament
             and self.tournament.schema_version == 1
-            and getattr(self.tournament, "creation_suspended", False)
+            and self.tournament.get("creation_suspended", False)
         ):
             self._resume_suspended_creation()
             deve_creare_nuovo_torneo = True  # Procedi alla generazione del turno 1
@@ -441,11 +440,8 @@ class TournamentController:
             )
             self._exit_program(0)
 
-        # Rimuovi il flag di sospensione
-        # Per le dataclasses possiamo usare setattr o semplicemente rimuovere/azzerare
-        # Nel dizionario salvato era creation_suspended. Nella dataclass non lo salviamo più o lo resettiamo
-        if hasattr(self.tournament, "creation_suspended"):
-            delattr(self.tournament, "creation_suspended")
+        # Rimuovi il flag di sospensione (chiave non modellata, conservata nella vista dizionario)
+        self.tournament.pop("creation_suspended", None)
 
     def _create_new_tournament(self, suggested_name: Optional[str] = None) -> None:
         self.ui.show_message(_("\n--- Creazione Nuovo Torneo ---"))
@@ -687,7 +683,7 @@ class TournamentController:
             self._exit_program(0)
 
         self.tournament.current_round = 1
-        self.tournament.rounds = []
+        self.tournament.rounds = RoundList()
         self.tournament.next_match_id = 1
 
         self.ui.show_message(_("\nGenerazione abbinamenti per il Turno 1..."))
@@ -807,9 +803,7 @@ class TournamentController:
                 )
                 self.ui.display_tournament_status(self.tournament)
 
-                round_data = next(
-                    (r for r in self.tournament.rounds if r.round == curr_round), None
-                )
+                round_data = get_round(self.tournament, curr_round)
                 if not round_data:
                     self.ui.show_error(
                         _("ERRORE CRITICO: Dati turno {round_num} non trovati!").format(
@@ -1003,7 +997,7 @@ class TournamentController:
         self.ui.show_message(
             _("Creazione backup di sicurezza prima dell'archiviazione...")
         )
-        backup_db_ok = create_backup(PLAYER_DB_FILE, "pre_finalize_db")
+        backup_db_ok = create_backup(players_db_file(), "pre_finalize_db")
         backup_torneo_ok = True
         if self.active_filename and os.path.exists(self.active_filename):
             backup_torneo_ok = create_backup(
@@ -1051,11 +1045,9 @@ class TournamentController:
         self.ui.show_message(
             _("Ricalcolo finale Buchholz, ARO, Performance Rating, Variazione Elo...")
         )
-        # Riconvertiamo a dizionario temporaneamente per le vecchie librerie pure di calcolo
-        torneo_dict = self.tournament.to_dict()
-        torneo_dict["players_dict"] = {
-            p.id: p.to_dict() for p in self.tournament.players
-        }
+        # Le librerie di calcolo lavorano sulla vista dizionario del modello, senza conversioni
+        torneo_dict = self.tournament
+        players_dict = self.tournament.players_dict
 
         for p in self.tournament.players:
             if p.withdrawn:
@@ -1069,12 +1061,8 @@ class TournamentController:
             p.buchholz = compute_buchholz(p.id, torneo_dict)
             p.buchholz_cut1 = compute_buchholz_cut1(p.id, torneo_dict)
             p.aro = compute_aro(p.id, torneo_dict)
-            p.performance_rating = calculate_performance_rating(
-                p.to_dict(), torneo_dict["players_dict"]
-            )
-            p.elo_change = calculate_elo_change(
-                p.to_dict(), torneo_dict["players_dict"]
-            )
+            p.performance_rating = calculate_performance_rating(p, players_dict)
+            p.elo_change = calculate_elo_change(p, players_dict)
 
         # Fase 3: Ordinamento dinamico basato sui criteri di spareggio configurati
         self.ui.show_message(_("Ordinamento classifica finale..."))
@@ -1,27 +1,44 @@
+import io
 import os
+import re
+import csv
 import json
+import mmap
+import shutil
+import atexit
+import sqlite3
 import zipfile
-import io
+import hashlib
+import threading
 import requests
 import traceback
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from operator import itemgetter
 from config import (
     FIDE_DB_LOCAL_FILE,
     PLAYER_DB_FILE,
     PLAYER_DB_TXT_FILE,
     DATE_FORMAT_ISO,
     FIDE_XML_DOWNLOAD_URL,
+    FIDE_TXT_DOWNLOAD_URL,
+    FIDE_LIST_FORMAT,
 )
 from fide_db import (
-    create_fide_db,
-    bulk_insert_players,
+    build_fide_db,
+    supports_incremental_update,
+    update_players_incremental,
     cleanup_legacy_json,
     get_player_by_fide_id,
-    search_players_by_name,
+    get_players_by_fide_ids,
+    match_players_bulk,
     fide_db_exists,
     get_player_count,
+    STATS_BUCKET_SIZE,
 )
+from fide_history import archive_current_list, ratings_at
+from players_store import PlayersDb, encode_record as _encode_player
+from player_search import search_players as search_local_players
 from utils import format_date_locale, enter_escape, format_rank_ordinal
 from stats import get_k_factor
 
@@ -57,6 +74,31 @@ def _cerca_giocatore_nel_db_fide(search_term):
     return search_players(search_term, limit=50)
 
 
+def iter_fide_matches(players_db, chunk_size=2000):
+    """
+    Abbina ogni giocatore del DB personale al DB FIDE locale, a blocchi.
+    Restituisce tuple (id, record locale, fide_record, corrispondenze):
+    fide_record è il record FIDE abbinato (per ID FIDE o per omonimo unico),
+    corrispondenze l'elenco degli omonimi trovati cercando per nome.
+    """
+    lookups = (
+        (
+            player_id,
+            player.get("fide_id_num_str", "0"),
+            player.get("first_name", ""),
+            player.get("last_name", ""),
+        )
+        for player_id, player in players_db.items()
+    )
+    for chunk in match_players_bulk(lookups, chunk_size=chunk_size):
+        for player_id, by_fide_id, matches in chunk:
+            if by_fide_id:
+                fide_record, matches = (matches[0] if matches else None), []
+            else:
+                fide_record = matches[0] if len(matches) == 1 else None
+            yield player_id, players_db[player_id], fide_record, matches
+
+
 def sincronizza_db_personale():
     """
     Carica il DB FIDE locale e il DB personale, li confronta, e propone
@@ -98,28 +140,12 @@ def sincronizza_db_personale():
         "k_factor_updates": 0,
     }
 
-    # FASE 1: Colleziona le modifiche in silenzio
-    for player_id, local_player in players_db.items():
-        fide_id_str = local_player.get("fide_id_num_str", "0")
-        fide_record = None
+    # FASE 1: Colleziona le modifiche in silenzio (ricerche FIDE in blocco)
+    for player_id, local_player, fide_record, matches in iter_fide_matches(players_db):
         new_fide_id = None
-        is_ambiguous = False
-        matches = []
-
-        if fide_id_str and fide_id_str != "0":
-            fide_record = get_player_by_fide_id(fide_id_str)
-        else:  # Cerca per nome/cognome
-            p_first_name = local_player.get("first_name", "")
-            p_last_name = local_player.get("last_name", "")
-
-            if p_first_name and p_last_name:
-                matches = search_players_by_name(p_first_name, p_last_name)
-
-                if len(matches) == 1:
-                    new_fide_id = str(matches[0]["id_fide"])
-                    fide_record = matches[0]
-                elif len(matches) > 1:
-                    is_ambiguous = True
+        is_ambiguous = len(matches) > 1
+        if len(matches) == 1:
+            new_fide_id = str(matches[0]["id_fide"])
 
         updates = {}
         if fide_record:
@@ -465,10 +491,515 @@ class ProgressFileObject:
         self.fileobj.close()
 
 
-def aggiorna_db_fide_locale(progress_callback=None, stats_output=None):
+_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+_DOWNLOAD_RETRIES = 3
+_DOWNLOAD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+_FIDE_XML_READ_SIZE = 1 << 20
+_FIDE_XML_BATCH_SIZE = 5000
+_FIDE_RATE_REPORT_ROWS = 100000
+
+# Campi testuali e numerici dell'XML FIDE nell'ordine di fide_db.PLAYER_COLUMNS
+_FIDE_XML_TEXT_TAGS = ("country", "sex", "title", "w_title", "o_title", "foa_title")
+_FIDE_XML_INT_TAGS = (
+    ("rating", 0),
+    ("games", 0),
+    ("k", None),
+    ("rapid_rating", 0),
+    ("rapid_games", 0),
+    ("rapid_k", None),
+    ("blitz_rating", 0),
+    ("blitz_games", 0),
+    ("blitz_k", None),
+    ("birthday", None),
+)
+
+
+class _FideXmlTarget:
+    """
+    Target per xml.etree.ElementTree.XMLParser: raccoglie i campi di ogni
+    <player> in un dizionario tag -> testo con un solo passaggio, senza
+    costruire l'albero degli elementi, e lo converte in riga per fide_db.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self._fields = None
+        self._text = []
+
+    def start(self, tag, attrib):
+        if tag == "player":
+            self._fields = {}
+        self._text.clear()
+
+    def data(self, data):
+        self._text.append(data)
+
+    def end(self, tag):
+        fields = self._fields
+        if fields is not None:
+            if tag == "player":
+                row = _fide_xml_row(fields)
+                if row is not None:
+                    self.rows.append(row)
+                self._fields = None
+            else:
+                fields[tag] = "".join(self._text)
+        self._text.clear()
+
+    def close(self):
+        return None
+
+
+def _fide_xml_row(fields):
+    """Riga in formato fide_db.PLAYER_COLUMNS dai campi di un <player>."""
+    fide_id_str = (fields.get("fideid") or "").strip()
+    if not fide_id_str.isdigit():
+        return None
+    name = fields.get("name") or ""
+    last_name, first_name = name, ""
+    if "," in name:
+        parts = name.split(",", 1)
+        last_name = parts[0].strip()
+        first_name = parts[1].strip()
+
+    row = [int(fide_id_str), first_name, last_name]
+    row.extend(fields.get(tag) or "" for tag in _FIDE_XML_TEXT_TAGS)
+    for tag, default in _FIDE_XML_INT_TAGS:
+        text = fields.get(tag) or ""
+        row.append(int(text) if text.lstrip("-").isdigit() else default)
+    row.append(fields.get("flag") or None)
+    return tuple(row)
+
+
+def iter_fide_xml_batches(xml_file, batch_size=_FIDE_XML_BATCH_SIZE):
+    """
+    Analizza in streaming il file XML della lista FIDE e produce blocchi di
+    righe (liste di tuple nell'ordine di fide_db.PLAYER_COLUMNS).
+    """
+    target = _FideXmlTarget()
+    parser = ET.XMLParser(target=target)
+    while True:
+        data = xml_file.read(_FIDE_XML_READ_SIZE)
+        if not data:
+            break
+        parser.feed(data)
+        if len(target.rows) >= batch_size:
+            yield target.rows
+            target.rows = []
+    parser.close()
+    if target.rows:
+        yield target.rows
+
+
+# Colonne della lista FIDE in formato TXT: intestazione -> campo dell'XML
+_FIDE_TXT_COLUMNS = (
+    ("ID Number", "fideid"),
+    ("Name", "name"),
+    ("Fed", "country"),
+    ("Sex", "sex"),
+    ("Tit", "title"),
+    ("WTit", "w_title"),
+    ("OTit", "o_title"),
+    ("FOA", "foa_title"),
+    ("SRtng", "rating"),
+    ("SGm", "games"),
+    ("SK", "k"),
+    ("RRtng", "rapid_rating"),
+    ("RGm", "rapid_games"),
+    ("Rk", "rapid_k"),
+    ("BRtng", "blitz_rating"),
+    ("BGm", "blitz_games"),
+    ("BK", "blitz_k"),
+    ("B-day", "birthday"),
+    ("Flag", "flag"),
+)
+_EMPTY_COLUMN = slice(0, 0)
+
+
+class _FideTxtLayout:
+    """Intervalli delle colonne di interesse, ricavati dall'intestazione del file TXT."""
+
+    def __init__(self, header):
+        starts = []
+        for label, key in _FIDE_TXT_COLUMNS:
+            match = re.search(r"(?<!\S)" + re.escape(label) + r"(?!\S)", header)
+            if match:
+                starts.append((match.start(), key))
+        starts.sort()
+        spans = {}
+        for i, (start, key) in enumerate(starts):
+            end = starts[i + 1][0] if i + 1 < len(starts) else None
+            spans[key] = slice(start, end)
+        if "fideid" not in spans or "name" not in spans:
+            raise ValueError(_("Intestazione del file TXT FIDE non riconosciuta."))
+        self.fide_id = spans["fideid"]
+        self.name = spans["name"]
+        # itemgetter estrae in un colpo solo tutti gli intervalli di una riga
+        self.text_fields = itemgetter(
+            *(spans.get(tag, _EMPTY_COLUMN) for tag in _FIDE_XML_TEXT_TAGS)
+        )
+        self.int_fields = itemgetter(
+            *(spans.get(tag, _EMPTY_COLUMN) for tag, _default in _FIDE_XML_INT_TAGS)
+        )
+        self.int_defaults = [default for _tag, default in _FIDE_XML_INT_TAGS]
+        self.flag = spans.get("flag", _EMPTY_COLUMN)
+
+
+def _fide_txt_row(line, layout):
+    """
+    Riga in formato fide_db.PLAYER_COLUMNS da una riga del file TXT.
+    Le righe ASCII vengono tagliate direttamente sui byte; le altre vengono
+    prima decodificate, perché i caratteri accentati occupano più byte ma
+    una sola colonna.
+    """
+    if line.isascii():
+        decode = bytes.decode
+    else:
+        try:
+            line = line.decode("utf-8")
+        except UnicodeDecodeError:
+            line = line.decode("latin-1")
+        decode = str
+    fide_id = line[layout.fide_id].strip()
+    if not fide_id.isdigit():
+        return None
+    name = decode(line[layout.name].strip())
+    last_name, first_name = name, ""
+    if "," in name:
+        parts = name.split(",", 1)
+        last_name = parts[0].strip()
+        first_name = parts[1].strip()
+
+    row = [int(fide_id), first_name, last_name]
+    row += [decode(value.strip()) for value in layout.text_fields(line)]
+    for value, default in zip(layout.int_fields(line), layout.int_defaults):
+        value = value.strip()
+        row.append(int(value) if value.isdigit() else default)
+    row.append(decode(line[layout.flag].strip()) or None)
+    return tuple(row)
+
+
+def iter_fide_txt_batches(
+    txt_path, batch_size=_FIDE_XML_BATCH_SIZE, progress_callback=None
+):
+    """
+    Legge la lista FIDE in formato TXT a colonne fisse e produce blocchi di
+    righe come iter_fide_xml_batches. Il file viene mappato in memoria e di
+    ogni riga vengono estratti solo gli intervalli delle colonne usate.
+    """
+    with open(txt_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 3 if mm[:3] == b"\xef\xbb\xbf" else 0
+            end = mm.find(b"\n", pos)
+            if end < 0:
+                end = size
+            layout = _FideTxtLayout(mm[pos:end].decode("latin-1"))
+            pos = end + 1
+            rows = []
+            while pos < size:
+                end = mm.find(b"\n", pos)
+                if end < 0:
+                    end = size
+                row = _fide_txt_row(mm[pos:end], layout)
+                pos = end + 1
+                if row is None:
+                    continue
+                rows.append(row)
+                if len(rows) >= batch_size:
+                    if progress_callback:
+                        try:
+                            progress_callback("processing", pos, size)
+                        except Exception:
+                            pass
+                    yield rows
+                    rows = []
+            if rows:
+                yield rows
+
+
+def _fide_list_member(names, preferred_format):
+    """
+    File della lista FIDE da elaborare nell'archivio e relativo formato
+    ('xml' o 'txt'), preferendo 'preferred_format' se presente.
+    """
+    members = {}
+    for name in names:
+        ext = os.path.splitext(name)[1].lower().lstrip(".")
+        if ext in ("xml", "txt"):
+            members.setdefault(ext, name)
+    for list_format in (preferred_format, "xml", "txt"):
+        if list_format in members:
+            return members[list_format], list_format
+    return None, None
+
+
+def _fide_field_labels():
+    """Etichette delle colonne FIDE nel resoconto dell'aggiornamento."""
+    return {
+        "first_name": _("Nome"),
+        "last_name": _("Cognome"),
+        "federation": _("Federazione"),
+        "sex": _("Sesso"),
+        "title": _("Titolo"),
+        "w_title": _("Titolo femminile"),
+        "o_title": _("Altri titoli"),
+        "foa_title": _("Titolo FOA"),
+        "elo_standard": _("Elo standard"),
+        "games": _("Partite standard"),
+        "k_factor": _("K standard"),
+        "elo_rapid": _("Elo rapid"),
+        "rapid_games": _("Partite rapid"),
+        "rapid_k": _("K rapid"),
+        "elo_blitz": _("Elo blitz"),
+        "blitz_games": _("Partite blitz"),
+        "blitz_k": _("K blitz"),
+        "birth_year": _("Anno di nascita"),
+        "flag": _("Stato"),
+    }
+
+
+def format_fide_update_report(report):
+    """Righe descrittive del resoconto di un aggiornamento incrementale del DB FIDE."""
+    lines = [
+        _(
+            "Aggiornamento incrementale: {added} nuovi, {updated} modificati, {removed} rimossi."
+        ).format(
+            added=report["added"], updated=report["updated"], removed=report["removed"]
+        )
+    ]
+    if report["renamed"]:
+        lines.append(
+            _(" - {num} giocatori con nome, nascita o federazione cambiati").format(
+                num=report["renamed"]
+            )
+        )
+    labels = _fide_field_labels()
+    for column, count in sorted(report["fields"].items(), key=lambda kv: -kv[1]):
+        label = labels.get(column, column)
+        lines.append(_(" - {field}: {num} variazioni").format(field=label, num=count))
+    return lines
+
+
+def format_fide_phase_times(phase_times):
+    """Righe con la durata di ogni fase dell'aggiornamento del DB FIDE."""
+    labels = {
+        "download": _("Download"),
+        "extract": _("Estrazione archivio"),
+        "load": _("Caricamento righe"),
+        "apply": _("Applicazione differenze"),
+        "indexes": _("Creazione indici"),
+        "fts": _("Indice di ricerca"),
+        "optimize": _("Ottimizzazione indice di ricerca"),
+        "stats": _("Statistiche"),
+        "validate": _("Verifica"),
+        "swap": _("Sostituzione database"),
+        "history": _("Storico dei rating"),
+    }
+    lines = [_("Durata delle fasi:")]
+    for phase, seconds in phase_times.items():
+        lines.append(
+            _(" - {phase}: {seconds:.2f}s").format(
+                phase=labels.get(phase, phase), seconds=seconds
+            )
+        )
+    return lines
+
+
+def format_fide_stats(stats, max_federations=20, max_titles=12):
+    """
+    Righe della panoramica del DB FIDE a partire dal risultato di
+    get_fide_stats(): totali, federazioni più numerose, titoli e
+    distribuzione dei rating per categoria.
+    """
+    if not stats:
+        return [
+            _(
+                "Statistiche non disponibili: aggiorna il database FIDE locale "
+                "per calcolarle."
+            )
+        ]
+    total = stats["total"]
+    lines = [
+        _("Giocatori nel database FIDE: {total}").format(total=total),
+        _(" - con rating standard: {rated}").format(rated=stats["rated"]),
+        _(" - con titolo: {titled}").format(titled=stats["titled"]),
+        "",
+        _("Federazioni: {num}").format(num=len(stats["federations"])),
+    ]
+    for fed in stats["federations"][:max_federations]:
+        lines.append(
+            _(
+                " - {fed}: {players} giocatori ({share:.1f}%), {rated} con rating, "
+                "{titled} titolati"
+            ).format(
+                fed=fed["federation"] or "-",
+                players=fed["players"],
+                share=100 * fed["players"] / max(total, 1),
+                rated=fed["rated"],
+                titled=fed["titled"],
+            )
+        )
+    hidden = len(stats["federations"]) - max_federations
+    if hidden > 0:
+        lines.append(_(" - ... altre {num} federazioni").format(num=hidden))
+
+    lines += ["", _("Titoli:")]
+    for title, players in stats["titles"][:max_titles]:
+        lines.append(f" - {title}: {players}")
+
+    category_labels = {
+        "standard": _("Standard"),
+        "rapid": _("Rapid"),
+        "blitz": _("Blitz"),
+    }
+    for category, buckets in stats["ratings"].items():
+        lines += [
+            "",
+            _("Distribuzione rating {category}:").format(
+                category=category_labels.get(category, category)
+            ),
+        ]
+        for bucket, players in buckets:
+            lines.append(
+                _(" - {low}-{high}: {players}").format(
+                    low=bucket, high=bucket + STATS_BUCKET_SIZE - 1, players=players
+                )
+            )
+    return lines
+
+
+def _rimuovi_download_parziale(part_path, meta_path):
+    """Elimina il file .part di un download e i suoi metadati, se presenti."""
+    for path in (part_path, meta_path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _scarica_zip_fide(url, dest_path, progress_callback=None):
+    """
+    Scarica l'archivio FIDE in 'dest_path' scrivendolo su disco a blocchi.
+    I dati arrivano prima in 'dest_path.part': se il download si interrompe,
+    il tentativo successivo (anche in una nuova sessione) riprende con una
+    richiesta Range, purché il server confermi che il file non è cambiato.
+    Restituisce lo SHA-256 del file scaricato come impronta dell'archivio,
+    non come verifica: FIDE non pubblica checksum con cui confrontarlo, e
+    l'integrità è garantita dalla lunghezza dichiarata dal server e dal CRC
+    dei file nello ZIP.
+    """
+    part_path = dest_path + ".part"
+    meta_path = part_path + ".json"
+    attempt = 0
+    while True:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = meta.get("etag") or meta.get("last_modified")
+
+        headers = dict(_DOWNLOAD_HEADERS)
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        try:
+            with requests.get(
+                url, headers=headers, timeout=(30, 600), stream=True
+            ) as response:
+                if response.status_code == 416 and offset:
+                    # Range oltre la fine: il .part è già completo o non più
+                    # valido, quindi lo si scarta e si riparte da zero
+                    _rimuovi_download_parziale(part_path, meta_path)
+                    continue
+                response.raise_for_status()
+                if response.status_code != 206:
+                    # Range ignorato o file remoto cambiato: si riparte da zero
+                    offset = 0
+                length = response.headers.get("content-length")
+                total = offset + int(length) if length is not None else None
+                etag = response.headers.get("ETag", "")
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {
+                            # Gli ETag deboli non sono validi per If-Range
+                            "etag": "" if etag.startswith("W/") else etag,
+                            "last_modified": response.headers.get("Last-Modified"),
+                            "total": total,
+                        },
+                        f,
+                    )
+
+                downloaded = offset
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in response.iter_content(chunk_size=_DOWNLOAD_CHUNK_SIZE):
+                        if not chunk:
+                            continue
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if progress_callback and total:
+                            try:
+                                progress_callback("download", downloaded, total)
+                            except Exception:
+                                pass
+            if total is not None and downloaded != total:
+                raise requests.exceptions.ConnectionError(
+                    _("Download interrotto a {done} di {total} byte.").format(
+                        done=downloaded, total=total
+                    )
+                )
+            break
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout,
+        ) as e:
+            attempt += 1
+            if attempt > _DOWNLOAD_RETRIES:
+                raise
+            print(
+                _("Download interrotto ({error}), ripresa {n} di {max}...").format(
+                    error=e, n=attempt, max=_DOWNLOAD_RETRIES
+                )
+            )
+
+    checksum = _file_sha256(part_path)
+    os.replace(part_path, dest_path)
+    try:
+        os.remove(meta_path)
+    except OSError:
+        pass
+    return checksum
+
+
+def aggiorna_db_fide_locale(
+    progress_callback=None, stats_output=None, list_format=None
+):
     """
-    Scarica l'ultimo rating list FIDE (XML), lo elabora e salva i dati
+    Scarica l'ultimo rating list FIDE, lo elabora e salva i dati
     in un database SQLite locale (fide_ratings.db).
+    'list_format' sceglie l'archivio da scaricare: 'xml' oppure 'txt' (a
+    colonne fisse, più rapido da analizzare); di default FIDE_LIST_FORMAT.
+    Il formato effettivo viene comunque riconosciuto dal contenuto dell'archivio.
     Supporta un callback per notificare il progresso di scaricamento e analisi
     e un dizionario per salvare le statistiche dell'operazione.
     Restituisce True in caso di successo, False altrimenti.
@@ -478,162 +1009,143 @@ def aggiorna_db_fide_locale(progress_callback=None, stats_output=None):
         get_player_count,
     )
 
+    list_format = (list_format or FIDE_LIST_FORMAT).lower()
+    url = FIDE_TXT_DOWNLOAD_URL if list_format == "txt" else FIDE_XML_DOWNLOAD_URL
     old_count = get_player_count()
     start_download = time.time()
+    # L'archivio resta su disco: né il download né l'estrazione lo caricano in memoria
+    zip_path = FIDE_DB_LOCAL_FILE + ".zip"
+    txt_path = FIDE_DB_LOCAL_FILE + ".txt"
 
     try:
-        print(
-            _("Download del file ZIP FIDE da: {url}").format(url=FIDE_XML_DOWNLOAD_URL)
-        )
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        zip_response = requests.get(
-            FIDE_XML_DOWNLOAD_URL, headers=headers, timeout=(30, 600), stream=True
-        )
-        zip_response.raise_for_status()
-
-        total_length = zip_response.headers.get("content-length")
-        chunks = []
-
-        if total_length is None:
-            # Nessun content-length disponibile, scarica normalmente
-            chunks.append(zip_response.content)
-        else:
-            total_bytes = int(total_length)
-            bytes_downloaded = 0
-            # Usa chunk da 256KB per uno scaricamento efficiente
-            for chunk in zip_response.iter_content(chunk_size=256 * 1024):
-                if chunk:
-                    chunks.append(chunk)
-                    bytes_downloaded += len(chunk)
-                    if progress_callback:
-                        try:
-                            progress_callback("download", bytes_downloaded, total_bytes)
-                        except Exception:
-                            pass
+        print(_("Download del file ZIP FIDE da: {url}").format(url=url))
+        checksum = _scarica_zip_fide(url, zip_path, progress_callback)
 
         download_duration = time.time() - start_download
         print(
             _(
-                "Download completato in {duration:.2f}s. Apertura archivio ZIP in memoria..."
+                "Download completato in {duration:.2f}s. Apertura archivio ZIP..."
             ).format(duration=download_duration)
         )
 
         start_processing = time.time()
-        zip_data = b"".join(chunks)
 
-        with zipfile.ZipFile(io.BytesIO(zip_data)) as zf:
-            xml_filename = next(
-                (name for name in zf.namelist() if name.lower().endswith(".xml")), None
-            )
+        # Il CRC del file viene verificato da zipfile durante la lettura in streaming
+        with zipfile.ZipFile(zip_path) as zf:
+            list_filename, found_format = _fide_list_member(zf.namelist(), list_format)
 
-            if not xml_filename:
-                print(_("ERRORE: Nessun file .xml trovato nell'archivio ZIP."))
+            if not list_filename:
+                print(_("ERRORE: Nessun file .xml o .txt trovato nell'archivio ZIP."))
                 return False
 
-            xml_info = zf.getinfo(xml_filename)
-            xml_size = xml_info.file_size
+            list_size = zf.getinfo(list_filename).file_size
 
             print(
                 _(
-                    "Estrazione ed elaborazione del file XML: {filename} ({size_mb:.1f} MB)..."
-                ).format(filename=xml_filename, size_mb=xml_size / (1024 * 1024))
+                    "Estrazione ed elaborazione del file {format}: {filename} ({size_mb:.1f} MB)..."
+                ).format(
+                    format=found_format.upper(),
+                    filename=list_filename,
+                    size_mb=list_size / (1024 * 1024),
+                )
             )
 
-            # Crea il database SQLite vuoto
-            create_fide_db()
+            # Con un DB già popolato si applicano solo le differenze, altrimenti
+            # il nuovo DB viene costruito a parte e sostituito a quello attuale
+            incremental = supports_incremental_update()
+            phase_times = {"download": download_duration}
+
+            if found_format == "txt":
+                # Il TXT viene estratto su disco per poterlo mappare in memoria
+                start_extract = time.time()
+                with zf.open(list_filename) as src, open(txt_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, _FIDE_XML_READ_SIZE)
+                phase_times["extract"] = time.time() - start_extract
+                list_file = None
+                batches = iter_fide_txt_batches(
+                    txt_path, progress_callback=progress_callback
+                )
+            else:
+                list_file = ProgressFileObject(
+                    zf.open(list_filename), progress_callback, list_size
+                )
+                batches = iter_fide_xml_batches(list_file)
 
-            raw_xml_file = zf.open(xml_filename)
-            progress_xml_file = ProgressFileObject(
-                raw_xml_file, progress_callback, xml_size
-            )
+            # Analisi e scrittura procedono in parallelo: le righe passano a blocchi
+            # al thread di scrittura di fide_db
+            rate_report = {"last": 0}
 
-            # Generatore che produce record giocatori dal file XML
-            def parse_xml_players():
-                context = ET.iterparse(progress_xml_file, events=("end",))
-                parse_count = 0
-
-                for _event, elem in context:
-                    if elem.tag == "player":
-                        fide_id_node = elem.find("fideid")
-                        if fide_id_node is not None and fide_id_node.text:
-                            fide_id_str = fide_id_node.text.strip()
-                            name = (
-                                elem.find("name").text
-                                if elem.find("name") is not None
-                                and elem.find("name").text
-                                else ""
-                            )
-
-                            last_name_fide, first_name_fide = name, ""
-                            if "," in name:
-                                parts = name.split(",", 1)
-                                last_name_fide = parts[0].strip()
-                                first_name_fide = parts[1].strip()
-
-                            def get_text(tag, default=""):
-                                node = elem.find(tag)
-                                return (
-                                    node.text
-                                    if node is not None and node.text
-                                    else default
-                                )
-
-                            def get_int(tag, default=0):
-                                text = get_text(tag, "")
-                                return (
-                                    int(text) if text.lstrip("-").isdigit() else default
-                                )
-
-                            yield {
-                                "fide_id": int(fide_id_str),
-                                "first_name": first_name_fide,
-                                "last_name": last_name_fide,
-                                "federation": get_text("country"),
-                                "sex": get_text("sex"),
-                                "title": get_text("title"),
-                                "w_title": get_text("w_title"),
-                                "o_title": get_text("o_title"),
-                                "foa_title": get_text("foa_title"),
-                                "elo_standard": get_int("rating"),
-                                "games": get_int("games"),
-                                "k_factor": get_int("k", default=None),
-                                "elo_rapid": get_int("rapid_rating"),
-                                "rapid_games": get_int("rapid_games"),
-                                "rapid_k": get_int("rapid_k", default=None),
-                                "elo_blitz": get_int("blitz_rating"),
-                                "blitz_games": get_int("blitz_games"),
-                                "blitz_k": get_int("blitz_k", default=None),
-                                "birth_year": get_int("birthday", default=None),
-                                "flag": get_text("flag", default=None),
-                            }
-                            parse_count += 1
-                            if parse_count % 5000 == 0:
-                                time.sleep(0.001)
-
-                        elem.clear()
-                progress_xml_file.close()
-
-            player_count = bulk_insert_players(
-                parse_xml_players(), progress_callback=None
-            )
+            def report_rows(count):
+                if count - rate_report["last"] >= _FIDE_RATE_REPORT_ROWS:
+                    rate_report["last"] = count
+                    rate = count / max(time.time() - start_processing, 1e-6)
+                    print(
+                        _(
+                            "  {count} giocatori importati ({rate:.0f} al secondo)"
+                        ).format(count=count, rate=rate)
+                    )
+
+            update_report = None
+            try:
+                if incremental:
+                    update_report = update_players_incremental(
+                        batches,
+                        progress_callback=report_rows,
+                        timings=phase_times,
+                    )
+                    player_count = update_report["total"]
+                else:
+                    player_count = build_fide_db(
+                        batches,
+                        progress_callback=report_rows,
+                        timings=phase_times,
+                    )
+            finally:
+                batches.close()
+                if list_file is not None:
+                    list_file.close()
 
             processing_duration = time.time() - start_processing
             new_count = get_player_count()
 
+            # I rating del mese vengono aggiunti allo storico: un errore qui
+            # non invalida il DB FIDE appena aggiornato
+            start_history = time.time()
+            try:
+                archive_current_list()
+                phase_times["history"] = time.time() - start_history
+            except (sqlite3.Error, OSError, ValueError) as e:
+                print(
+                    _(
+                        "Attenzione: storico dei rating FIDE non aggiornato: {error}"
+                    ).format(error=e)
+                )
+
             if stats_output is not None:
                 stats_output["old_count"] = old_count
                 stats_output["new_count"] = new_count
                 stats_output["saved_count"] = player_count
                 stats_output["download_time"] = download_duration
                 stats_output["processing_time"] = processing_duration
+                stats_output["rows_per_second"] = player_count / max(
+                    processing_duration, 1e-6
+                )
+                # Impronta per riconoscere l'archivio, non una verifica
+                stats_output["download_sha256"] = checksum
+                stats_output["list_format"] = found_format
+                stats_output["update_report"] = update_report
+                stats_output["phase_times"] = phase_times
 
             print(
                 _(
                     "Elaborazione completata. Trovati e salvati {count} giocatori FIDE."
                 ).format(count=player_count)
             )
+            if update_report is not None:
+                for line in format_fide_update_report(update_report):
+                    print(line)
+            for line in format_fide_phase_times(phase_times):
+                print(line)
 
             # Elimina il vecchio file JSON se presente
             if cleanup_legacy_json():
@@ -655,89 +1167,135 @@ def aggiorna_db_fide_locale(progress_callback=None, stats_output=None):
         )
         traceback.print_exc()
         return False
+    finally:
+        # Un download interrotto resta nel file '.part' per essere ripreso
+        for path in (zip_path, txt_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def players_db_file():
+    """Percorso dell'archivio SQLite del DB giocatori, accanto al vecchio file JSON."""
+    return os.path.splitext(PLAYER_DB_FILE)[0] + ".sqlite"
+
+
+def _apply_schema_defaults(p):
+    """Completa un record giocatore con i campi introdotti dagli schemi v1 e v2."""
+    # Campi base v1
+    medals_dict = p.setdefault("medals", {})
+    medals_dict.setdefault("gold", 0)
+    medals_dict.setdefault("silver", 0)
+    medals_dict.setdefault("bronze", 0)
+    medals_dict.setdefault("wood", 0)
+    p.setdefault("tournaments_played", [])
+    p.setdefault("fide_k_factor", None)
+
+    # Nuovi campi v2 (Issue #14)
+    p.setdefault("elo_club", 0.0)
+    p.setdefault("elo_rapid", 0.0)
+    p.setdefault("elo_blitz", 0.0)
+    p.setdefault("fide_rapid_k", None)
+    p.setdefault("fide_blitz_k", None)
+    p.setdefault("fide_standard_games", 0)
+    p.setdefault("fide_rapid_games", 0)
+    p.setdefault("fide_blitz_games", 0)
+    p.setdefault("w_title", "")
+    p.setdefault("o_title", "")
+    p.setdefault("foa_title", "")
+    p.setdefault("flag", "")
+
+
+def _migrate_json_players_db(db_path):
+    """
+    Importa il vecchio DB giocatori JSON (schema v1 o v2) nell'archivio SQLite
+    con un'unica transazione. Il file JSON viene conservato con suffisso
+    '.migrato'. Restituisce True se la migrazione è riuscita.
+    """
+    try:
+        with open(PLAYER_DB_FILE, "r", encoding="utf-8") as f:
+            raw_data = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(
+            _(
+                "Errore durante il caricamento del DB giocatori ({filename}): {error}"
+            ).format(filename=PLAYER_DB_FILE, error=e)
+        )
+        print(_("Verrà creato un nuovo DB vuoto se si aggiungono giocatori."))
+        return False
+
+    if isinstance(raw_data, dict):
+        db_list = raw_data.get("players", [])
+    else:
+        db_list = raw_data
+
+    print(
+        _(
+            "\nInfo: Rilevato database giocatori in formato JSON. Avvio migrazione all'archivio SQLite..."
+        )
+    )
+    for p in db_list:
+        _apply_schema_defaults(p)
+
+    # Costruisce l'archivio in un file temporaneo: un'interruzione non lascia un DB parziale
+    tmp_path = db_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    store = PlayersDb(tmp_path)
+    try:
+        store.replace_all({p["id"]: p for p in db_list})
+    finally:
+        store.close()
+    os.replace(tmp_path, db_path)
+    os.replace(PLAYER_DB_FILE, PLAYER_DB_FILE + ".migrato")
+    print(_("Migrazione completata con successo."))
+    return True
 
 
 def load_players_db():
-    """Carica il database dei giocatori dal file JSON, eseguendo la migrazione se necessario."""
-    if os.path.exists(PLAYER_DB_FILE):
+    """
+    Apre il database dei giocatori, eseguendo la migrazione dal formato JSON
+    se necessario. I record vengono letti dall'archivio solo quando richiesti.
+    """
+    db_path = players_db_file()
+    if not os.path.exists(db_path) and os.path.exists(PLAYER_DB_FILE):
         try:
-            with open(PLAYER_DB_FILE, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
-
-            # Rileva schema
-            schema_version = 1
-            if isinstance(raw_data, dict):
-                schema_version = raw_data.get("schema_version", 1)
-                db_list = raw_data.get("players", [])
-            else:
-                db_list = raw_data
-
-            # Esegui migrazione a schema_version 2 se necessario
-            needs_save = False
-            if schema_version < 2 or isinstance(raw_data, list):
-                print(
-                    _(
-                        "\nInfo: Rilevato database giocatori in formato obsoleto. Avvio migrazione a schema v2..."
-                    )
-                )
-                needs_save = True
-
-            for p in db_list:
-                # Campi base v1
-                medals_dict = p.setdefault("medals", {})
-                medals_dict.setdefault("gold", 0)
-                medals_dict.setdefault("silver", 0)
-                medals_dict.setdefault("bronze", 0)
-                medals_dict.setdefault("wood", 0)
-                p.setdefault("tournaments_played", [])
-                p.setdefault("fide_k_factor", None)
-
-                # Nuovi campi v2 (Issue #14)
-                p.setdefault("elo_club", 0.0)
-                p.setdefault("elo_rapid", 0.0)
-                p.setdefault("elo_blitz", 0.0)
-                p.setdefault("fide_rapid_k", None)
-                p.setdefault("fide_blitz_k", None)
-                p.setdefault("fide_standard_games", 0)
-                p.setdefault("fide_rapid_games", 0)
-                p.setdefault("fide_blitz_games", 0)
-                p.setdefault("w_title", "")
-                p.setdefault("o_title", "")
-                p.setdefault("foa_title", "")
-                p.setdefault("flag", "")
-
-            players_map = {p["id"]: p for p in db_list}
-
-            if needs_save:
-                save_players_db(players_map)
-                print(_("Migrazione completata con successo."))
-
-            return players_map
-        except (json.JSONDecodeError, IOError) as e:
+            _migrate_json_players_db(db_path)
+        except (OSError, sqlite3.Error) as e:
             print(
                 _(
-                    "Errore durante il caricamento del DB giocatori ({filename}): {error}"
+                    "Errore durante la migrazione del DB giocatori ({filename}): {error}"
                 ).format(filename=PLAYER_DB_FILE, error=e)
             )
-            print(_("Verrà creato un nuovo DB vuoto se si aggiungono giocatori."))
             return {}
-    return {}
+    return PlayersDb(db_path)
 
 
-def save_players_db(players_db):
-    """Salva il database dei giocatori nel file JSON e genera il file TXT."""
-    if not players_db:
-        pass  # Procedi a salvare anche se vuoto
+def save_players_db(players_db, changed_ids=None):
+    """
+    Salva il database dei giocatori scrivendo solo le righe aggiunte, modificate
+    o eliminate, e pianifica la rigenerazione del file TXT se qualcosa è cambiato.
+    'changed_ids' limita il controllo ai giocatori indicati.
+    """
     try:
-        data_to_save = {"schema_version": 2, "players": list(players_db.values())}
-        with open(PLAYER_DB_FILE, "w", encoding="utf-8") as f:
-            json.dump(data_to_save, f, indent=1, ensure_ascii=False)
-        save_players_db_txt(players_db)
-    except IOError as e:
+        if isinstance(players_db, PlayersDb):
+            written = players_db.save(changed_ids)
+        else:
+            # Dizionario semplice: rappresenta l'intero database
+            store = PlayersDb(players_db_file())
+            try:
+                written = store.replace_all(players_db)
+            finally:
+                store.close()
+        if written:
+            # Il report leggibile viene rigenerato in background
+            schedule_players_db_txt()
+    except (IOError, sqlite3.Error) as e:
         print(
             _(
                 "Errore durante il salvataggio del DB giocatori ({filename}): {error}"
-            ).format(filename=PLAYER_DB_FILE, error=e)
+            ).format(filename=players_db_file(), error=e)
         )
     except Exception as e:
         print(
@@ -747,152 +1305,175 @@ def save_players_db(players_db):
         )
 
 
-def save_players_db_txt(players_db):
-    """Genera un file TXT leggibile con lo stato del database giocatori,
-    includendo partite giocate totali e K-Factor attuale."""
-    try:
-        with open(
-            PLAYER_DB_TXT_FILE, "w", encoding="utf-8-sig"
-        ) as f:  # Usiamo utf-8-sig
-            now = datetime.now()
-            current_date_iso = now.strftime(
-                DATE_FORMAT_ISO
-            )  # Data corrente per calcolo K
-            f.write(
-                _("Report Database Giocatori Tornello - {date} {time}\n").format(
-                    date=format_date_locale(now.date()), time=now.strftime("%H:%M:%S")
-                )
+# Attesa dopo l'ultimo salvataggio prima di rigenerare il report TXT
+_TXT_IDLE_DELAY = 2.0
+# Protegge solo la richiesta in attesa e il timer, così un salvataggio non
+# aspetta mai la scrittura del report
+_txt_lock = threading.RLock()
+# Serializza la generazione del report e protegge _txt_block_cache
+_txt_render_lock = threading.Lock()
+_txt_timer = None
+# Percorsi (archivio, report) del report da rigenerare, o None
+_txt_pending = None
+# Blocchi già formattati: id -> (testo JSON del record, data di calcolo K, blocco)
+_txt_block_cache = {}
+
+
+def _render_player_txt_block(player, current_date_iso):
+    """Formatta la sezione del report TXT dedicata a un giocatore."""
+    lines = []
+    sesso = str(player.get("sex", "N/D")).upper()
+    federazione_giocatore = str(player.get("federation", "N/D")).upper()
+    fide_id_numerico = str(player.get("fide_id_num_str", "N/D"))
+    titolo_fide = str(player.get("fide_title", "")).strip().upper()
+    titolo_prefix = f"{titolo_fide} " if titolo_fide else ""
+    player_id_display = player.get("id", "N/D")
+    first_name_display = player.get("first_name", "N/D")
+    last_name_display = player.get("last_name", "N/D")
+    elo_display = player.get("current_elo", "N/D")
+    lines.append(
+        f"ID: {player_id_display}, {titolo_prefix}{first_name_display} {last_name_display}\n"
+    )
+
+    extra_titles = [
+        player.get(t)
+        for t in ["fide_w_title", "fide_o_title", "fide_foa_title"]
+        if player.get(t)
+    ]
+    extra_titles_str = (
+        f", Titoli Extra: {', '.join(extra_titles)}" if extra_titles else ""
+    )
+
+    lines.append(
+        _(
+            "\tSesso: {sesso}, Federazione: {federazione}, ID FIDE: {fide_id}, Flag: {flag}{extra}\n"
+        ).format(
+            sesso=sesso,
+            federazione=federazione_giocatore,
+            fide_id=fide_id_numerico,
+            flag=player.get("fide_flag") or "N/D",
+            extra=extra_titles_str,
+        )
+    )
+    lines.append(
+        f"\tElo Standard: {elo_display} (Partite FIDE: {player.get('fide_games', 'N/D')})\n"
+    )
+    lines.append(
+        f"\tElo Rapid: {player.get('fide_elo_rapid', 'N/D')} (Partite FIDE: {player.get('fide_rapid_games', 'N/D')}, K: {player.get('fide_rapid_k', 'N/D')})\n"
+    )
+    lines.append(
+        f"\tElo Blitz: {player.get('fide_elo_blitz', 'N/D')} (Partite FIDE: {player.get('fide_blitz_games', 'N/D')}, K: {player.get('fide_blitz_k', 'N/D')})\n"
+    )
+
+    games_played_total = player.get("games_played", 0)
+    current_k_factor = get_k_factor(player, current_date_iso)
+    registration_date_display = format_date_locale(player.get("registration_date"))
+    lines.append(
+        _(
+            "\tPartite Valutate Totali: {games}, K-Factor Stimato: {k_factor}, Data Iscrizione DB: {reg_date}\n"
+        ).format(
+            games=games_played_total,
+            k_factor=current_k_factor,
+            reg_date=registration_date_display,
+        )
+    )
+    birth_date_val = player.get("birth_date")  # Formato YYYY-MM-DD o None
+    birth_date_display = format_date_locale(birth_date_val) if birth_date_val else "N/D"
+    lines.append(
+        _("\tData Nascita: {birth_date}\n").format(birth_date=birth_date_display)
+    )
+    medals = player.get("medals", {"gold": 0, "silver": 0, "bronze": 0, "wood": 0})
+    lines.append(
+        _(
+            "\tMedagliere: Oro: {gold}, Argento: {silver}, Bronzo: {bronze}, Legno: {wood} in "
+        ).format(
+            gold=medals.get("gold", 0),
+            silver=medals.get("silver", 0),
+            bronze=medals.get("bronze", 0),
+            wood=medals.get("wood", 0),
+        )
+    )
+    tournaments = player.get("tournaments_played", [])
+    lines.append(_("({count}) tornei:\n").format(count=len(tournaments)))
+    if tournaments:
+        try:
+            tournaments_sorted = sorted(
+                tournaments,
+                key=lambda t: datetime.strptime(
+                    t.get("date_completed", "1900-01-01"), DATE_FORMAT_ISO
+                ),
+                reverse=True,
             )
-            f.write("=" * 40 + "\n\n")
-            sorted_players = sorted(
-                players_db.values(),
-                key=lambda p: (p.get("last_name", ""), p.get("first_name", "")),
+        except ValueError:
+            # Mantieni ordine originale se date non valide
+            tournaments_sorted = tournaments
+        for t in tournaments_sorted:
+            rank_val = t.get("rank", "?")
+            t_name = t.get("tournament_name", _("Nome Torneo Mancante"))
+            history_line = _("{rank} su {total} in {name} - {start} - {end}").format(
+                rank=format_rank_ordinal(rank_val),
+                total=t.get("total_players", "?"),
+                name=t_name,
+                start=format_date_locale(t.get("date_started")),
+                end=format_date_locale(t.get("date_completed")),
             )
-            if not sorted_players:
-                f.write(_("Il database dei giocatori è vuoto.\n"))
-                return
-            for player in sorted_players:
-                sesso = str(player.get("sex", "N/D")).upper()
-                federazione_giocatore = str(player.get("federation", "N/D")).upper()
-                fide_id_numerico = str(player.get("fide_id_num_str", "N/D"))
-                titolo_fide = str(player.get("fide_title", "")).strip().upper()
-                titolo_prefix = f"{titolo_fide} " if titolo_fide else ""
-                player_id_display = player.get("id", "N/D")
-                first_name_display = player.get("first_name", "N/D")
-                last_name_display = player.get("last_name", "N/D")
-                elo_display = player.get("current_elo", "N/D")
-                f.write(
-                    f"ID: {player_id_display}, {titolo_prefix}{first_name_display} {last_name_display}\n"
-                )
+            lines.append(f"\t{history_line}\n")
+    else:
+        lines.append(_("\tNessuno\n"))
+    lines.append("\t" + "-" * 30 + "\n")
+    return "".join(lines)
 
-                extra_titles = [
-                    player.get(t)
-                    for t in ["fide_w_title", "fide_o_title", "fide_foa_title"]
-                    if player.get(t)
-                ]
-                extra_titles_str = (
-                    f", Titoli Extra: {', '.join(extra_titles)}" if extra_titles else ""
-                )
 
-                f.write(
-                    _(
-                        "\tSesso: {sesso}, Federazione: {federazione}, ID FIDE: {fide_id}, Flag: {flag}{extra}\n"
-                    ).format(
-                        sesso=sesso,
-                        federazione=federazione_giocatore,
-                        fide_id=fide_id_numerico,
-                        flag=player.get("fide_flag") or "N/D",
-                        extra=extra_titles_str,
-                    )
-                )
-                f.write(
-                    f"\tElo Standard: {elo_display} (Partite FIDE: {player.get('fide_games', 'N/D')})\n"
-                )
-                f.write(
-                    f"\tElo Rapid: {player.get('fide_elo_rapid', 'N/D')} (Partite FIDE: {player.get('fide_rapid_games', 'N/D')}, K: {player.get('fide_rapid_k', 'N/D')})\n"
-                )
-                f.write(
-                    f"\tElo Blitz: {player.get('fide_elo_blitz', 'N/D')} (Partite FIDE: {player.get('fide_blitz_games', 'N/D')}, K: {player.get('fide_blitz_k', 'N/D')})\n"
-                )
+def _write_players_db_txt(entries, txt_path):
+    """
+    Scrive il report TXT a partire da tuple (id, testo JSON, record o None).
+    Solo i giocatori il cui testo è cambiato dall'ultima volta vengono
+    riformattati; gli altri riusano il blocco in cache.
+    """
+    now = datetime.now()
+    current_date_iso = now.strftime(DATE_FORMAT_ISO)  # Data corrente per calcolo K
+    blocks = []
+    for player_id, text, record in entries:
+        cached = _txt_block_cache.get(player_id)
+        if cached is None or cached[0] != text or cached[1] != current_date_iso:
+            if record is None:
+                record = json.loads(text)
+            block = _render_player_txt_block(record, current_date_iso)
+            sort_value = (record.get("last_name", ""), record.get("first_name", ""))
+            cached = (text, current_date_iso, block, sort_value)
+            _txt_block_cache[player_id] = cached
+        blocks.append((cached[3], player_id, cached[2]))
+    blocks.sort(key=lambda b: b[0])
+
+    tmp_path = txt_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8-sig") as f:  # Usiamo utf-8-sig
+        f.write(
+            _("Report Database Giocatori Tornello - {date} {time}\n").format(
+                date=format_date_locale(now.date()), time=now.strftime("%H:%M:%S")
+            )
+        )
+        f.write("=" * 40 + "\n\n")
+        if not blocks:
+            f.write(_("Il database dei giocatori è vuoto.\n"))
+        f.writelines(block for _sort, _id, block in blocks)
+    os.replace(tmp_path, txt_path)
 
-                games_played_total = player.get("games_played", 0)
-                current_k_factor = get_k_factor(
-                    player, current_date_iso
-                )  # Assicurati che get_k_factor sia accessibile
-                registration_date_display = format_date_locale(
-                    player.get("registration_date")
-                )
-                f.write(
-                    _(
-                        "\tPartite Valutate Totali: {games}, K-Factor Stimato: {k_factor}, Data Iscrizione DB: {reg_date}\n"
-                    ).format(
-                        games=games_played_total,
-                        k_factor=current_k_factor,
-                        reg_date=registration_date_display,
-                    )
-                )
-                birth_date_val = player.get("birth_date")  # Formato YYYY-MM-DD o None
-                birth_date_display = (
-                    format_date_locale(birth_date_val) if birth_date_val else "N/D"
-                )
-                f.write(
-                    _("\tData Nascita: {birth_date}\n").format(
-                        birth_date=birth_date_display
-                    )
-                )
-                medals = player.get(
-                    "medals", {"gold": 0, "silver": 0, "bronze": 0, "wood": 0}
-                )
-                f.write(
-                    _(
-                        "\tMedagliere: Oro: {gold}, Argento: {silver}, Bronzo: {bronze}, Legno: {wood} in "
-                    ).format(
-                        gold=medals.get("gold", 0),
-                        silver=medals.get("silver", 0),
-                        bronze=medals.get("bronze", 0),
-                        wood=medals.get("wood", 0),
-                    )
-                )
-                tournaments = player.get("tournaments_played", [])
-                f.write(_("({count}) tornei:\n").format(count=len(tournaments)))
-                if tournaments:
-                    try:
-                        tournaments_sorted = sorted(
-                            tournaments,
-                            key=lambda t: datetime.strptime(
-                                t.get("date_completed", "1900-01-01"), DATE_FORMAT_ISO
-                            ),
-                            reverse=True,
-                        )
-                    except ValueError:
-                        tournaments_sorted = (
-                            tournaments  # Mantieni ordine originale se date non valide
-                        )
-                    for t in tournaments_sorted:  # Non serve più l'indice 'i' separato
-                        rank_val = t.get("rank", "?")
-                        t_name = t.get("tournament_name", _("Nome Torneo Mancante"))
-                        start_date_iso = t.get(
-                            "date_started"
-                        )  # Prende la nuova data ISO di inizio
-                        end_date_iso = t.get("date_completed")  # Data di completamento
-                        rank_formatted = format_rank_ordinal(
-                            rank_val
-                        )  # Usa la nuova funzione helper
-                        start_date_formatted = format_date_locale(start_date_iso)
-                        end_date_formatted = format_date_locale(end_date_iso)
-                        history_line = _(
-                            "{rank} su {total} in {name} - {start} - {end}"
-                        ).format(
-                            rank=rank_formatted,
-                            total=t.get("total_players", "?"),
-                            name=t_name,
-                            start=start_date_formatted,
-                            end=end_date_formatted,
-                        )
-                        f.write(f"\t{history_line}\n")
-                else:
-                    f.write(_("\tNessuno\n"))
-                f.write("\t" + "-" * 30 + "\n")
+    # Dimentica i giocatori eliminati
+    present = {player_id for _sort, player_id, _block in blocks}
+    for player_id in set(_txt_block_cache) - present:
+        del _txt_block_cache[player_id]
+
+
+def save_players_db_txt(players_db):
+    """Genera subito un file TXT leggibile con lo stato del database giocatori,
+    includendo partite giocate totali e K-Factor attuale."""
+    try:
+        with _txt_render_lock:
+            entries = (
+                (player_id, _encode_player(record), record)
+                for player_id, record in players_db.items()
+            )
+            _write_players_db_txt(entries, PLAYER_DB_TXT_FILE)
     except IOError as e:
         print(
             _(
@@ -906,8 +1487,76 @@ def save_players_db_txt(players_db):
         traceback.print_exc()  # Stampa traceback per errori non gestiti
 
 
-def generate_player_id(first_name, last_name, players_db_dict):
-    """Genera ID univoco per un giocatore, gestendo gli omonimi (es. BATGA001, BATGA002, ecc.)."""
+def _run_pending_players_db_txt():
+    """
+    Rigenera il report TXT richiesto, leggendo i record salvati nell'archivio.
+    La richiesta viene prelevata solo dopo aver ottenuto _txt_render_lock:
+    una generazione già in corso si conclude prima e la successiva usa i
+    percorsi più recenti, mentre i salvataggi possono pianificarne altre.
+    """
+    global _txt_pending, _txt_timer
+    with _txt_render_lock:
+        with _txt_lock:
+            pending, _txt_pending = _txt_pending, None
+            if pending is None:
+                return
+            # Un timer pianificato nel frattempo resta valido
+            if _txt_timer is threading.current_thread():
+                _txt_timer = None
+        db_path, txt_path = pending
+        try:
+            conn = sqlite3.connect(db_path)
+            try:
+                rows = conn.execute(
+                    "SELECT id, data FROM players ORDER BY rowid"
+                ).fetchall()
+            finally:
+                conn.close()
+            _write_players_db_txt(((i, t, None) for i, t in rows), txt_path)
+        except (IOError, sqlite3.Error) as e:
+            print(
+                _(
+                    "Errore durante il salvataggio del file TXT del DB giocatori ({filename}): {error}"
+                ).format(filename=txt_path, error=e)
+            )
+        except Exception as e:
+            print(
+                _("Errore imprevisto durante il salvataggio del TXT del DB: {}").format(
+                    e
+                )
+            )
+            traceback.print_exc()
+
+
+def schedule_players_db_txt():
+    """
+    Richiede la rigenerazione del report TXT. Il lavoro viene svolto in un
+    thread separato dopo _TXT_IDLE_DELAY secondi senza ulteriori salvataggi.
+    """
+    global _txt_pending, _txt_timer
+    with _txt_lock:
+        _txt_pending = (players_db_file(), PLAYER_DB_TXT_FILE)
+        if _txt_timer is not None:
+            _txt_timer.cancel()
+        _txt_timer = threading.Timer(_TXT_IDLE_DELAY, _run_pending_players_db_txt)
+        _txt_timer.daemon = True
+        _txt_timer.start()
+
+
+def flush_players_db_txt():
+    """Genera subito il report TXT se ci sono modifiche in attesa."""
+    with _txt_lock:
+        if _txt_timer is not None:
+            _txt_timer.cancel()
+    _run_pending_players_db_txt()
+
+
+# Il timer è un thread daemon: in chiusura il report in attesa va completato qui
+atexit.register(flush_players_db_txt)
+
+
+def _player_id_prefix(first_name, last_name):
+    """Prefisso dell'ID giocatore: 3 lettere del cognome e 2 del nome, o None."""
     norm_first = first_name.strip().title()
     norm_last = last_name.strip().title()
     if not norm_first or not norm_last:
@@ -917,6 +1566,56 @@ def generate_player_id(first_name, last_name, players_db_dict):
     base_id = f"{last_initials}{first_initials}"
     if not base_id or base_id == "XXXXX":
         base_id = "GIOCX"
+    return base_id
+
+
+def generate_player_ids(names, players_db):
+    """
+    Genera gli ID per un elenco di coppie (nome, cognome), riservando in blocco
+    un intervallo di numeri per ciascun prefisso. Per i nomi non validi
+    l'elenco restituito contiene None.
+    """
+    prefixes = [_player_id_prefix(first, last) for first, last in names]
+    if not isinstance(players_db, PlayersDb):
+        # Dizionario semplice: sondaggio classico sugli ID già presenti
+        taken = dict.fromkeys(players_db)
+        result = []
+        for (first, last), prefix in zip(names, prefixes):
+            new_id = generate_player_id(first, last, taken) if prefix else None
+            if new_id is not None:
+                taken[new_id] = None
+            result.append(new_id)
+        return result
+
+    needed = {}
+    for prefix in prefixes:
+        if prefix is not None:
+            needed[prefix] = needed.get(prefix, 0) + 1
+    reserved = {
+        prefix: iter(players_db.reserve_ids(prefix, count))
+        for prefix, count in needed.items()
+    }
+    result = []
+    for prefix in prefixes:
+        if prefix is None:
+            result.append(None)
+            continue
+        new_id = next(reserved[prefix])
+        # ID inseriti a mano oltre il contatore: si riserva il numero successivo
+        while new_id in players_db:
+            new_id = players_db.reserve_ids(prefix)[0]
+        result.append(new_id)
+    return result
+
+
+def generate_player_id(first_name, last_name, players_db_dict):
+    """Genera ID univoco per un giocatore, gestendo gli omonimi (es. BATGA001, BATGA002, ecc.)."""
+    base_id = _player_id_prefix(first_name, last_name)
+    if base_id is None:
+        return None
+    if isinstance(players_db_dict, PlayersDb):
+        # Contatore per prefisso nell'archivio: nessun sondaggio sequenziale
+        return generate_player_ids([(first_name, last_name)], players_db_dict)[0]
     count = 1
     new_id = f"{base_id}{count:03d}"
     max_attempts = 1000
@@ -939,6 +1638,63 @@ def generate_player_id(first_name, last_name, players_db_dict):
     return new_id
 
 
+def _nuovo_record_giocatore(
+    player_id,
+    first_name,
+    last_name,
+    elo,
+    fide_title,
+    sex,
+    federation,
+    fide_id_num_str,
+    birth_date,
+    experienced,
+    elo_club=0,
+    elo_rapid=0,
+    elo_blitz=0,
+    fide_k_factor=None,
+    fide_rapid_k=None,
+    fide_blitz_k=None,
+    fide_standard_games=0,
+    fide_rapid_games=0,
+    fide_blitz_games=0,
+    w_title="",
+    o_title="",
+    foa_title="",
+    flag="",
+):
+    """Record completo di un giocatore appena registrato nel DB personale."""
+    return {
+        "id": player_id,
+        "first_name": first_name,
+        "last_name": last_name,
+        "current_elo": elo,
+        "registration_date": datetime.now().strftime(DATE_FORMAT_ISO),
+        "birth_date": birth_date,
+        "games_played": 0,
+        "medals": {"gold": 0, "silver": 0, "bronze": 0, "wood": 0},
+        "tournaments_played": [],
+        "fide_title": fide_title,
+        "sex": sex,
+        "federation": federation,
+        "fide_id_num_str": fide_id_num_str,
+        "experienced": experienced,
+        "elo_club": elo_club,
+        "elo_rapid": elo_rapid,
+        "elo_blitz": elo_blitz,
+        "fide_k_factor": fide_k_factor,
+        "fide_rapid_k": fide_rapid_k,
+        "fide_blitz_k": fide_blitz_k,
+        "fide_standard_games": fide_standard_games,
+        "fide_rapid_games": fide_rapid_games,
+        "fide_blitz_games": fide_blitz_games,
+        "w_title": w_title,
+        "o_title": o_title,
+        "foa_title": foa_title,
+        "flag": flag,
+    }
+
+
 def crea_nuovo_giocatore_nel_db(
     players_db,
     first_name,
@@ -997,37 +1753,34 @@ def crea_nuovo_giocatore_nel_db(
                 "Creazione nuovo giocatore nel DB principale: {} {} con il nuovo ID: {}"
             ).format(norm_first, norm_last, new_player_id)
         )
-    new_player_data_for_db = {
-        "id": new_player_id,
-        "first_name": norm_first,
-        "last_name": norm_last,
-        "current_elo": elo,
-        "registration_date": datetime.now().strftime(DATE_FORMAT_ISO),
-        "birth_date": birth_date,
-        "games_played": 0,
-        "medals": {"gold": 0, "silver": 0, "bronze": 0, "wood": 0},
-        "tournaments_played": [],
-        "fide_title": fide_title,
-        "sex": sex,
-        "federation": federation,
-        "fide_id_num_str": fide_id_num_str,
-        "experienced": experienced,
-        "elo_club": elo_club,
-        "elo_rapid": elo_rapid,
-        "elo_blitz": elo_blitz,
-        "fide_k_factor": fide_k_factor,
-        "fide_rapid_k": fide_rapid_k,
-        "fide_blitz_k": fide_blitz_k,
-        "fide_standard_games": fide_standard_games,
-        "fide_rapid_games": fide_rapid_games,
-        "fide_blitz_games": fide_blitz_games,
-        "w_title": w_title,
-        "o_title": o_title,
-        "foa_title": foa_title,
-        "flag": flag,
-    }
+    new_player_data_for_db = _nuovo_record_giocatore(
+        new_player_id,
+        norm_first,
+        norm_last,
+        elo=elo,
+        fide_title=fide_title,
+        sex=sex,
+        federation=federation,
+        fide_id_num_str=fide_id_num_str,
+        birth_date=birth_date,
+        experienced=experienced,
+        elo_club=elo_club,
+        elo_rapid=elo_rapid,
+        elo_blitz=elo_blitz,
+        fide_k_factor=fide_k_factor,
+        fide_rapid_k=fide_rapid_k,
+        fide_blitz_k=fide_blitz_k,
+        fide_standard_games=fide_standard_games,
+        fide_rapid_games=fide_rapid_games,
+        fide_blitz_games=fide_blitz_games,
+        w_title=w_title,
+        o_title=o_title,
+        foa_title=foa_title,
+        flag=flag,
+    )
     players_db[new_player_id] = new_player_data_for_db
-    save_players_db(players_db)  # Salva immediatamente il DB principale aggiornato
+    # Salva immediatamente la sola riga del nuovo giocatore
+    save_players_db(players_db, changed_ids=[new_player_id])
     if not silent:
         print(
             _(
@@ -1039,21 +1792,82 @@ def crea_nuovo_giocatore_nel_db(
     return new_player_id
 
 
-def allinea_giocatori_con_database(players_list, players_db, category="standard"):
+def _elo_storico(record, category):
+    """Rating della cadenza da un record dello storico FIDE, con ripiego sullo standard."""
+    if record is None:
+        return 0
+    category = category.lower()
+    elo = 0
+    if category == "blitz":
+        elo = record["elo_blitz"]
+    elif category == "rapid":
+        elo = record["elo_rapid"]
+    return float(elo or record["elo_standard"] or 0)
+
+
+def applica_elo_storici(players, category="standard", as_of=None):
+    """
+    Imposta come initial_elo dei giocatori con ID FIDE (dizionari) il rating
+    in vigore alla data 'as_of' secondo lo storico FIDE, quando presente.
+    Restituisce il numero di giocatori modificati.
+    """
+    if not as_of:
+        return 0
+    try:
+        storico = ratings_at((p.get("fide_id_num_str") for p in players), as_of)
+    except (sqlite3.Error, ValueError):
+        return 0
+    modificati = 0
+    for p in players:
+        fide_id = str(p.get("fide_id_num_str") or "")
+        elo = (
+            _elo_storico(storico.get(int(fide_id)), category)
+            if fide_id.isdigit()
+            else 0
+        )
+        if elo and elo != p.get("initial_elo"):
+            p["initial_elo"] = elo
+            modificati += 1
+    return modificati
+
+
+def allinea_giocatori_con_database(
+    players_list, players_db, category="standard", as_of=None
+):
     """
     Allinea gli initial_elo e i titoli dei giocatori in un torneo con
     l'ultimo stato presente nel database dei giocatori.
+    Con 'as_of' (es. la data di inizio del torneo) per i giocatori con ID
+    FIDE viene usato il rating in vigore a quella data secondo lo storico
+    FIDE, se disponibile.
     Restituisce il numero di giocatori effettivamente aggiornati.
     """
     from stats import get_initial_elo_for_tournament
 
+    storico = {}
+    if as_of:
+        fide_ids = []
+        for tp in players_list:
+            p_id = tp.get("id") if isinstance(tp, dict) else tp.id
+            if p_id in players_db:
+                fide_ids.append(players_db[p_id].get("fide_id_num_str"))
+        try:
+            storico = ratings_at(fide_ids, as_of)
+        except (sqlite3.Error, ValueError):
+            storico = {}
+
     aggiornati = 0
     for tp in players_list:
         # Supporta sia dict (v8) che oggetti Player (v9)
         p_id = tp.get("id") if isinstance(tp, dict) else tp.id
         if p_id in players_db:
             db_p = players_db[p_id]
-            db_elo = get_initial_elo_for_tournament(db_p, category)
+            fide_id = str(db_p.get("fide_id_num_str") or "")
+            db_elo = (
+                _elo_storico(storico.get(int(fide_id)), category)
+                if fide_id.isdigit()
+                else 0
+            ) or get_initial_elo_for_tournament(db_p, category)
             if isinstance(tp, dict):
                 if db_elo > 0 and db_elo != tp.get("initial_elo"):
                     tp["initial_elo"] = db_elo
@@ -1071,3 +1885,261 @@ def allinea_giocatori_con_database(players_list, players_db, category="standard"
                 if db_title and db_title != tp.fide_title:
                     tp.fide_title = db_title
     return aggiornati
+
+
+# --- Iscrizione da file CSV/TSV ---
+
+# Intestazioni riconosciute (minuscole, senza accenti, spazi e trattini)
+_REGISTRATION_COLUMNS = {
+    "fide_id": ("idfide", "fideid", "fide", "id"),
+    "last_name": ("cognome", "lastname", "surname"),
+    "first_name": ("nome", "firstname", "name"),
+    "elo": ("elo", "rating"),
+    "federation": ("federazione", "federation", "fed"),
+    "birth": ("nascita", "datanascita", "annonascita", "birthdate", "birthyear"),
+    "sex": ("sesso", "sex"),
+}
+_REGISTRATION_DELIMITERS = ",;\t|"
+# Elo assegnato ai nuovi giocatori senza rating, come nell'iscrizione manuale
+_DEFAULT_NEW_ELO = 1399
+
+
+def _registration_column(header):
+    key = "".join(c for c in unidecode(str(header)).lower() if c.isalnum())
+    for field, aliases in _REGISTRATION_COLUMNS.items():
+        if key in aliases:
+            return field
+    return None
+
+
+def leggi_file_iscrizioni(filepath):
+    """
+    Legge un elenco di iscritti da un file CSV o TSV (separatore riconosciuto
+    automaticamente tra virgola, punto e virgola, tabulazione e barra).
+    La prima riga può contenere le intestazioni (es. 'ID FIDE', 'Cognome',
+    'Nome', 'Elo'); senza intestazioni le colonne sono ID FIDE, cognome e
+    nome se la prima cella è numerica, altrimenti cognome, nome e ID FIDE.
+    Restituisce una lista di (numero di riga, {campo: valore}).
+    """
+    try:
+        with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
+            text = f.read()
+    except UnicodeDecodeError:
+        # File salvati da Excel con la codifica di Windows
+        with open(filepath, "r", encoding="cp1252", newline="") as f:
+            text = f.read()
+
+    sample = text[:8192]
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=_REGISTRATION_DELIMITERS)
+    except csv.Error:
+        # Una sola colonna (es. solo ID FIDE) o file troppo irregolare
+        dialect = csv.excel_tab if "\t" in sample else csv.excel
+    rows = [
+        (line_no, [cell.strip() for cell in cells])
+        for line_no, cells in enumerate(csv.reader(io.StringIO(text), dialect), 1)
+        if any(cell.strip() for cell in cells)
+    ]
+    if not rows:
+        return []
+
+    header = [_registration_column(cell) for cell in rows[0][1]]
+    if any(header):
+        rows = rows[1:]
+    elif rows[0][1][0].isdigit():
+        header = ["fide_id", "last_name", "first_name"]
+    else:
+        header = ["last_name", "first_name", "fide_id"]
+
+    entries = []
+    for line_no, cells in rows:
+        fields = {}
+        for field, value in zip(header, cells):
+            if field and value and field not in fields:
+                fields[field] = value
+        entries.append((line_no, fields))
+    return entries
+
+
+def _campi_da_record_fide(fide_player):
+    """Argomenti di _nuovo_record_giocatore per un giocatore del DB FIDE."""
+    sex = (
+        "w" if str(fide_player.get("sex") or "").strip().lower() in ("w", "f") else "m"
+    )
+    birth_year = fide_player.get("birth_year")
+    return {
+        "elo": fide_player.get("elo_standard") or _DEFAULT_NEW_ELO,
+        "fide_title": fide_player.get("title") or "",
+        "sex": sex,
+        "federation": fide_player.get("federation") or "",
+        "fide_id_num_str": str(fide_player.get("id_fide")),
+        "birth_date": f"{birth_year}-01-01" if birth_year else None,
+        # Un giocatore con rating FIDE è per definizione "experienced"
+        "experienced": True,
+        "elo_rapid": fide_player.get("elo_rapid") or 0,
+        "elo_blitz": fide_player.get("elo_blitz") or 0,
+        "fide_k_factor": fide_player.get("k_factor"),
+        "fide_rapid_k": fide_player.get("rapid_k"),
+        "fide_blitz_k": fide_player.get("blitz_k"),
+        "fide_standard_games": fide_player.get("games") or 0,
+        "fide_rapid_games": fide_player.get("rapid_games") or 0,
+        "fide_blitz_games": fide_player.get("blitz_games") or 0,
+        "w_title": fide_player.get("w_title") or "",
+        "o_title": fide_player.get("o_title") or "",
+        "foa_title": fide_player.get("foa_title") or "",
+        "flag": fide_player.get("flag") or "",
+    }
+
+
+def _campi_da_riga_iscrizione(fields):
+    """Argomenti di _nuovo_record_giocatore per un giocatore assente dal DB FIDE."""
+    elo = fields.get("elo", "")
+    sex = "w" if fields.get("sex", "").lower() in ("w", "f", "d") else "m"
+    birth = fields.get("birth", "")
+    birth_date = None
+    if len(birth) == 4 and birth.isdigit():
+        birth_date = f"{birth}-01-01"
+    elif birth:
+        from utils import parse_flexible_date
+
+        try:
+            birth_date = parse_flexible_date(birth).strftime(DATE_FORMAT_ISO)
+        except ValueError:
+            birth_date = None
+    fide_id = fields.get("fide_id", "")
+    return {
+        "elo": int(elo) if elo.isdigit() else _DEFAULT_NEW_ELO,
+        "fide_title": "",
+        "sex": sex,
+        "federation": fields.get("federation", "ITA").upper()[:3],
+        "fide_id_num_str": fide_id if fide_id.isdigit() else "0",
+        "birth_date": birth_date,
+        "experienced": False,
+    }
+
+
+def importa_iscrizioni(filepath, players_db, enrolled_players=()):
+    """
+    Iscrive in blocco i giocatori elencati in un file CSV/TSV
+    (vedi leggi_file_iscrizioni).
+
+    Gli ID FIDE del file vengono risolti tutti insieme, sia nel DB personale
+    sia nel DB FIDE locale. Ogni riga diventa, nell'ordine:
+      - il giocatore del DB personale con lo stesso ID FIDE;
+      - un nuovo giocatore del DB personale con i dati del DB FIDE;
+      - il giocatore del DB personale con lo stesso nome e cognome, se unico;
+      - un nuovo giocatore con i dati della riga.
+    I nuovi giocatori vengono salvati in un'unica transazione. I giocatori
+    già presenti in 'enrolled_players' o ripetuti nel file (stesso ID FIDE,
+    anche se sconosciuto, o stesso nome per le righe senza ID) vengono saltati.
+
+    Restituisce (giocatori da iscrivere, report), dove report contiene i
+    conteggi 'from_db', 'from_fide', 'created' e l'elenco 'skipped' di
+    tuple (numero di riga, motivo).
+    """
+    entries = leggi_file_iscrizioni(filepath)
+    report = {"from_db": 0, "from_fide": 0, "created": 0, "skipped": []}
+
+    fide_ids = [f["fide_id"] for _line, f in entries if f.get("fide_id", "").isdigit()]
+    fide_records = get_players_by_fide_ids(fide_ids) if fide_db_exists() else {}
+    if isinstance(players_db, PlayersDb):
+        local_by_fide = players_db.ids_by_fide_id(fide_ids)
+    else:
+        wanted = set(fide_ids)
+        local_by_fide = {}
+        for player_id, p in players_db.items():
+            fide_id = str(p.get("fide_id_num_str") or "")
+            if fide_id in wanted:
+                local_by_fide.setdefault(fide_id, player_id)
+
+    taken_ids = {p.get("id") for p in enrolled_players}
+    taken_fide = {
+        str(p.get("fide_id_num_str"))
+        for p in enrolled_players
+        if str(p.get("fide_id_num_str") or "0") != "0"
+    }
+
+    # Prima passata: ogni riga viene abbinata a un giocatore esistente o da creare
+    resolved = []
+    to_create = []
+    # Nomi dei giocatori senza ID FIDE già destinati alla creazione
+    created_names = set()
+    for line_no, fields in entries:
+        fide_id = fields.get("fide_id", "")
+        first_name = fields.get("first_name", "").strip().title()
+        last_name = fields.get("last_name", "").strip().title()
+        has_fide_id = fide_id.isdigit() and fide_id != "0"
+        if has_fide_id:
+            if fide_id in taken_fide:
+                report["skipped"].append((line_no, _("giocatore già iscritto")))
+                continue
+            if fide_id in local_by_fide:
+                resolved.append((line_no, local_by_fide[fide_id], "from_db"))
+                taken_fide.add(fide_id)
+                continue
+            fide_player = fide_records.get(int(fide_id))
+            if fide_player is not None:
+                names = (fide_player["first_name"], fide_player["last_name"])
+                to_create.append((line_no, names, _campi_da_record_fide(fide_player)))
+                resolved.append((line_no, len(to_create) - 1, "from_fide"))
+                taken_fide.add(fide_id)
+                continue
+        if not first_name or not last_name:
+            reason = (
+                _("ID FIDE {fide_id} non trovato").format(fide_id=fide_id)
+                if fide_id
+                else _("nome o cognome mancante")
+            )
+            report["skipped"].append((line_no, reason))
+            continue
+        if has_fide_id:
+            # ID FIDE sconosciuto: le righe ripetute non creano un altro giocatore
+            taken_fide.add(fide_id)
+        matches = search_local_players(players_db, f"={first_name} {last_name}")
+        same_name = [
+            player_id
+            for player_id in matches
+            if players_db[player_id].get("first_name", "").lower() == first_name.lower()
+            and players_db[player_id].get("last_name", "").lower() == last_name.lower()
+        ]
+        name_key = (first_name.lower(), last_name.lower())
+        if len(same_name) == 1:
+            resolved.append((line_no, same_name[0], "from_db"))
+        elif not has_fide_id and name_key in created_names:
+            report["skipped"].append((line_no, _("giocatore già iscritto")))
+        else:
+            if not has_fide_id:
+                created_names.add(name_key)
+            to_create.append(
+                (line_no, (first_name, last_name), _campi_da_riga_iscrizione(fields))
+            )
+            resolved.append((line_no, len(to_create) - 1, "created"))
+
+    # Seconda passata: ID riservati in blocco e un unico salvataggio
+    new_ids = generate_player_ids([names for _l, names, _f in to_create], players_db)
+    created_ids = []
+    for (line_no, (first_name, last_name), fields), new_id in zip(to_create, new_ids):
+        if new_id is None:
+            created_ids.append(None)
+            continue
+        players_db[new_id] = _nuovo_record_giocatore(
+            new_id, first_name.strip().title(), last_name.strip().title(), **fields
+        )
+        created_ids.append(new_id)
+    if any(created_ids):
+        save_players_db(players_db, changed_ids=[i for i in created_ids if i])
+
+    players = []
+    for line_no, ref, origin in resolved:
+        player_id = ref if origin == "from_db" else created_ids[ref]
+        if player_id is None:
+            report["skipped"].append((line_no, _("impossibile generare l'ID")))
+            continue
+        if player_id in taken_ids:
+            report["skipped"].append((line_no, _("giocatore già iscritto")))
+            continue
+        taken_ids.add(player_id)
+        players.append(players_db[player_id])
+        report[origin] += 1
+    report["skipped"].sort()
+    return players, report
@@ -10,11 +10,28 @@ di risposta nell'ordine dei millisecondi.
 
 import os
 import re
+import json
 import sqlite3
+import time
+import queue
+import hashlib
 import builtins
+import contextlib
+import threading
+import unicodedata
 
 from config import FIDE_DB_LOCAL_FILE, FIDE_DB_JSON_LEGACY
 
+try:
+    from unidecode import unidecode
+except ImportError:
+
+    def unidecode(text):
+        # Senza unidecode vengono tolti almeno gli accenti delle lettere latine
+        decomposed = unicodedata.normalize("NFKD", text)
+        return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
 _ = getattr(builtins, "_", lambda s: s)
 
 
@@ -23,13 +40,227 @@ _ = getattr(builtins, "_", lambda s: s)
 # ---------------------------------------------------------------------------
 
 
-def _get_connection():
-    """Apre una connessione al database SQLite FIDE."""
-    conn = sqlite3.connect(FIDE_DB_LOCAL_FILE)
+# Connessioni di sola lettura riutilizzate, una per thread. Ogni connessione
+# conserva in cache le proprie istruzioni SQL già preparate ed è registrata
+# in _pool_entries, così che invalidate_connections() possa chiuderle tutte.
+_READ_MMAP_SIZE = 256 * 1024 * 1024
+_READ_CACHE_KIB = 16000
+_READ_CACHED_STATEMENTS = 256
+# Secondi tra un'interruzione e l'altra delle query che tengono aperto il
+# vecchio database
+_POOL_WAIT_INTERVAL = 0.5
+
+_pool_local = threading.local()
+_pool_lock = threading.Lock()
+_pool_released = threading.Condition(_pool_lock)
+_pool_entries = set()
+_pool_generation = 0
+# Connessioni in apertura e thread che ha sospeso il pool (vedi _readers_suspended)
+_pool_opening = 0
+_pool_suspended_by = None
+
+
+class _PooledConnection:
+    """Connessione di lettura del pool, con il thread che la usa."""
+
+    __slots__ = ("conn", "path", "generation", "owner", "busy")
+
+    def __init__(self, conn, path, generation):
+        self.conn = conn
+        self.path = path
+        self.generation = generation
+        self.owner = threading.get_ident()
+        # Blocchi _read_connection() aperti dal thread proprietario
+        self.busy = 0
+
+
+def _get_connection(db_path=None):
+    """Apre una connessione al database SQLite FIDE (per scritture e ricostruzioni)."""
+    conn = sqlite3.connect(db_path or FIDE_DB_LOCAL_FILE)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _open_read_connection(path):
+    uri = "file:" + os.path.abspath(path).replace("?", "%3f").replace("#", "%23")
+    conn = sqlite3.connect(
+        uri + "?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=_READ_CACHED_STATEMENTS,
+    )
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size={_READ_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{_READ_CACHE_KIB}")
     return conn
 
 
+def _own_entry():
+    """
+    Restituisce la voce del pool del thread corrente, aprendo la connessione
+    alla prima richiesta o dopo invalidate_connections().
+    """
+    entry = getattr(_pool_local, "entry", None)
+    if entry is not None:
+        with _pool_lock:
+            if entry.busy or (
+                entry in _pool_entries
+                and entry.path == FIDE_DB_LOCAL_FILE
+                and entry.generation == _pool_generation
+            ):
+                return entry
+        _close_own_connection()
+
+    global _pool_opening
+    me = threading.get_ident()
+    with _pool_lock:
+        while _pool_suspended_by not in (None, me):
+            _pool_released.wait()
+        _pool_opening += 1
+    path = FIDE_DB_LOCAL_FILE
+    conn = None
+    try:
+        conn = _open_read_connection(path)
+    finally:
+        with _pool_lock:
+            _pool_opening -= 1
+            if conn is not None:
+                entry = _PooledConnection(conn, path, _pool_generation)
+                _pool_entries.add(entry)
+            _pool_released.notify_all()
+    _pool_local.entry = entry
+    return entry
+
+
+def _get_read_connection():
+    """
+    Restituisce la connessione di sola lettura del thread corrente. Chi la
+    usa per più di una singola istruzione deve passare da _read_connection(),
+    altrimenti invalidate_connections() può chiuderla tra un'istruzione e
+    l'altra.
+    """
+    return _own_entry().conn
+
+
+@contextlib.contextmanager
+def _read_connection():
+    """
+    Connessione di sola lettura del thread corrente, segnata come in uso per
+    la durata del blocco: invalidate_connections() interrompe le sue query
+    invece di chiuderla, e la chiusura avviene all'uscita dal blocco.
+    """
+    while True:
+        entry = _own_entry()
+        with _pool_lock:
+            # La connessione può essere stata chiusa da un altro thread
+            # dopo il controllo di _own_entry()
+            if entry in _pool_entries:
+                entry.busy += 1
+                break
+    try:
+        yield entry.conn
+    finally:
+        with _pool_lock:
+            entry.busy -= 1
+            stale = not entry.busy and entry.generation != _pool_generation
+        if stale:
+            _close_own_connection()
+
+
+def _close_entry(entry):
+    """Chiude e toglie dal pool una connessione (con _pool_lock acquisito)."""
+    _pool_entries.discard(entry)
+    try:
+        entry.conn.close()
+    except Exception:
+        pass
+    _pool_released.notify_all()
+
+
+def _close_own_connection():
+    """Chiude la connessione di lettura del thread corrente, se presente."""
+    entry = getattr(_pool_local, "entry", None)
+    if entry is None:
+        return
+    _pool_local.entry = None
+    with _pool_lock:
+        _close_entry(entry)
+
+
+def invalidate_connections(wait=False):
+    """
+    Chiude le connessioni di lettura di tutti i thread. Va chiamata quando il
+    file del database viene ricreato o sostituito, perché nessuna connessione
+    deve tenere aperto il vecchio file (su Windows ne impedirebbe la
+    sostituzione). Le connessioni inattive vengono chiuse subito; le query in
+    corso su altri thread vengono interrotte e la loro connessione è chiusa
+    dal thread proprietario all'uscita da _read_connection(). Ogni thread ne
+    apre una nuova alla richiesta successiva.
+
+    Con wait=True attende che anche queste ultime siano state chiuse,
+    ripetendo l'interruzione finché serve.
+    """
+    global _pool_generation
+    me = threading.get_ident()
+    with _pool_lock:
+        _pool_generation += 1
+        generation = _pool_generation
+        while True:
+            in_use = False
+            for entry in list(_pool_entries):
+                if entry.generation >= generation:
+                    continue
+                if not entry.busy:
+                    _close_entry(entry)
+                elif entry.owner != me:
+                    entry.conn.interrupt()
+                    in_use = True
+            if not (wait and in_use):
+                return
+            _pool_released.wait(_POOL_WAIT_INTERVAL)
+
+
+@contextlib.contextmanager
+def _readers_suspended():
+    """
+    Chiude le connessioni di lettura di tutti i thread (vedi
+    invalidate_connections) e impedisce di aprirne di nuove per la durata del
+    blocco, nel quale il file del database può essere sostituito o cambiare
+    modalità di journal. Gli altri thread che chiedono una connessione
+    attendono la fine del blocco.
+    """
+    global _pool_suspended_by
+    me = threading.get_ident()
+    with _pool_lock:
+        while _pool_suspended_by not in (None, me):
+            _pool_released.wait()
+        previous = _pool_suspended_by
+        _pool_suspended_by = me
+        # Le connessioni già in apertura vanno registrate per essere chiuse
+        while _pool_opening:
+            _pool_released.wait()
+    try:
+        invalidate_connections(wait=True)
+        yield
+    finally:
+        with _pool_lock:
+            _pool_suspended_by = previous
+            _pool_released.notify_all()
+
+
+def data_generation():
+    """
+    Numero che cambia ogni volta che il database viene ricreato, sostituito
+    o aggiornato: i risultati letti con un valore diverso non sono più validi.
+    """
+    return _pool_generation
+
+
+def is_interrupted(exc):
+    """Vero se 'exc' è l'errore di una query interrotta dal progress handler."""
+    return isinstance(exc, sqlite3.OperationalError) and "interrupt" in str(exc)
+
+
 def _row_to_dict(row):
     """Converte una sqlite3.Row nel formato dizionario compatibile con il vecchio JSON."""
     return {
@@ -66,11 +297,9 @@ def fide_db_exists():
     if not os.path.exists(FIDE_DB_LOCAL_FILE):
         return False
     try:
-        conn = _get_connection()
-        cursor = conn.execute("SELECT COUNT(*) FROM players")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count > 0
+        with _read_connection() as conn:
+            row = conn.execute("SELECT 1 FROM players LIMIT 1").fetchone()
+        return row is not None
     except Exception:
         return False
 
@@ -92,62 +321,374 @@ def cleanup_legacy_json():
 def get_player_count():
     """Restituisce il numero totale di giocatori nel database FIDE."""
     try:
-        conn = _get_connection()
-        cursor = conn.execute("SELECT COUNT(*) FROM players")
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        with _read_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
     except Exception:
         return 0
 
 
+def get_fide_stats():
+    """
+    Statistiche del database FIDE lette dalle tabelle riassuntive, senza
+    scorrere i giocatori. Restituisce None se il database non esiste o è
+    stato creato da una versione che non le calcolava.
+
+    Returns:
+        Dizionario con 'total' (giocatori), 'rated' (con rating standard),
+        'titled' (con titolo), 'federations' (lista di dizionari
+        federation/players/rated/titled, dalla più numerosa), 'titles'
+        (lista di coppie (titolo, giocatori)) e 'ratings' (categoria ->
+        lista di coppie (inizio fascia, giocatori), fasce di
+        STATS_BUCKET_SIZE punti in ordine crescente).
+    """
+    if not os.path.exists(FIDE_DB_LOCAL_FILE):
+        return None
+    try:
+        with _read_connection() as conn:
+            federations = [
+                {
+                    "federation": row["federation"],
+                    "players": row["players"],
+                    "rated": row["rated"],
+                    "titled": row["titled"],
+                }
+                for row in conn.execute(
+                    "SELECT federation, players, rated, titled FROM stats_federation "
+                    "ORDER BY players DESC, federation"
+                )
+            ]
+            titles = [
+                (row["title"], row["players"])
+                for row in conn.execute(
+                    "SELECT title, players FROM stats_title "
+                    "ORDER BY players DESC, title"
+                )
+            ]
+            ratings = {category: [] for category, _column in RATING_CATEGORIES}
+            for row in conn.execute(
+                "SELECT category, bucket, players FROM stats_rating "
+                "ORDER BY category, bucket"
+            ):
+                ratings.setdefault(row["category"], []).append(
+                    (row["bucket"], row["players"])
+                )
+    except sqlite3.Error:
+        return None
+    return {
+        "total": sum(f["players"] for f in federations),
+        "rated": sum(f["rated"] for f in federations),
+        "titled": sum(f["titled"] for f in federations),
+        "federations": federations,
+        "titles": titles,
+        "ratings": ratings,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Creazione e popolazione del database
 # ---------------------------------------------------------------------------
 
 
+# Testo indicizzato da FTS5, calcolato da SQLite (lo stesso di _fts_text)
+_FTS_TEXT_SQL = (
+    "first_name || ' ' || last_name || ' ' || COALESCE(NULLIF(birth_year, 0), '') "
+    "|| ' ' || federation || ' ' || fide_id"
+)
+
+_TABLES_SQL = """
+    CREATE TABLE players (
+        fide_id     INTEGER PRIMARY KEY,
+        first_name  TEXT NOT NULL DEFAULT '',
+        last_name   TEXT NOT NULL DEFAULT '',
+        federation  TEXT NOT NULL DEFAULT '',
+        sex         TEXT NOT NULL DEFAULT '',
+        title       TEXT NOT NULL DEFAULT '',
+        w_title     TEXT NOT NULL DEFAULT '',
+        o_title     TEXT NOT NULL DEFAULT '',
+        foa_title   TEXT NOT NULL DEFAULT '',
+        elo_standard INTEGER NOT NULL DEFAULT 0,
+        games       INTEGER NOT NULL DEFAULT 0,
+        k_factor    INTEGER,
+        elo_rapid   INTEGER NOT NULL DEFAULT 0,
+        rapid_games INTEGER NOT NULL DEFAULT 0,
+        rapid_k     INTEGER,
+        elo_blitz   INTEGER NOT NULL DEFAULT 0,
+        blitz_games INTEGER NOT NULL DEFAULT 0,
+        blitz_k     INTEGER,
+        birth_year  INTEGER,
+        flag        TEXT,
+        name_ascii  TEXT NOT NULL DEFAULT '',
+        row_hash    INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE VIEW players_search(fide_id, search_text) AS
+        SELECT fide_id, {fts_text} FROM players;
+
+    -- Indice FTS a contenuto esterno: il testo non viene salvato una seconda
+    -- volta, FTS5 lo rilegge dalla vista quando serve
+    CREATE VIRTUAL TABLE players_fts USING fts5(
+        search_text,
+        content='players_search',
+        content_rowid='fide_id',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+
+    -- Trigrammi del nome traslitterato in ASCII, per la ricerca approssimata
+    CREATE VIRTUAL TABLE players_trgm USING fts5(
+        name_ascii,
+        content='players',
+        content_rowid='fide_id',
+        tokenize='trigram'
+    );
+""".format(fts_text=_FTS_TEXT_SQL)
+
+_INDEXES_SQL = """
+    CREATE INDEX idx_last_name  ON players(last_name  COLLATE NOCASE);
+    CREATE INDEX idx_first_name ON players(first_name COLLATE NOCASE);
+    CREATE INDEX idx_federation ON players(federation);
+"""
+
+# Tabelle riassuntive per le statistiche, tenute allineate a 'players' a ogni
+# importazione così che la panoramica non debba scorrere tutta la lista
+STATS_TABLES = ("stats_federation", "stats_rating", "stats_title")
+
+_STATS_TABLES_SQL = (
+    """CREATE TABLE IF NOT EXISTS stats_federation (
+        federation TEXT PRIMARY KEY,
+        players    INTEGER NOT NULL,
+        rated      INTEGER NOT NULL,
+        titled     INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS stats_rating (
+        category TEXT NOT NULL,
+        bucket   INTEGER NOT NULL,
+        players  INTEGER NOT NULL,
+        PRIMARY KEY (category, bucket)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS stats_title (
+        title   TEXT PRIMARY KEY,
+        players INTEGER NOT NULL
+    )""",
+)
+
+# Ampiezza delle fasce dell'istogramma dei rating e colonna di ogni categoria
+STATS_BUCKET_SIZE = 100
+RATING_CATEGORIES = (
+    ("standard", "elo_standard"),
+    ("rapid", "elo_rapid"),
+    ("blitz", "elo_blitz"),
+)
+
+
 def create_fide_db():
     """Crea un database FIDE SQLite vuoto, eliminando eventuali tabelle preesistenti."""
     conn = _get_connection()
     conn.execute("DROP TABLE IF EXISTS players_fts")
+    conn.execute("DROP TABLE IF EXISTS players_trgm")
+    conn.execute("DROP VIEW IF EXISTS players_search")
     conn.execute("DROP TABLE IF EXISTS players")
-    conn.executescript(
-        """
-        CREATE TABLE players (
-            fide_id     INTEGER PRIMARY KEY,
-            first_name  TEXT NOT NULL DEFAULT '',
-            last_name   TEXT NOT NULL DEFAULT '',
-            federation  TEXT NOT NULL DEFAULT '',
-            sex         TEXT NOT NULL DEFAULT '',
-            title       TEXT NOT NULL DEFAULT '',
-            w_title     TEXT NOT NULL DEFAULT '',
-            o_title     TEXT NOT NULL DEFAULT '',
-            foa_title   TEXT NOT NULL DEFAULT '',
-            elo_standard INTEGER NOT NULL DEFAULT 0,
-            games       INTEGER NOT NULL DEFAULT 0,
-            k_factor    INTEGER,
-            elo_rapid   INTEGER NOT NULL DEFAULT 0,
-            rapid_games INTEGER NOT NULL DEFAULT 0,
-            rapid_k     INTEGER,
-            elo_blitz   INTEGER NOT NULL DEFAULT 0,
-            blitz_games INTEGER NOT NULL DEFAULT 0,
-            blitz_k     INTEGER,
-            birth_year  INTEGER,
-            flag        TEXT
-        );
-
-        CREATE INDEX idx_last_name  ON players(last_name  COLLATE NOCASE);
-        CREATE INDEX idx_first_name ON players(first_name COLLATE NOCASE);
-        CREATE INDEX idx_federation ON players(federation);
-
-        CREATE VIRTUAL TABLE players_fts USING fts5(
-            search_text,
-            tokenize='unicode61 remove_diacritics 2'
-        );
-    """
-    )
+    for table in STATS_TABLES:
+        conn.execute(f"DROP TABLE IF EXISTS {table}")
+    conn.executescript(_TABLES_SQL + _INDEXES_SQL + ";".join(_STATS_TABLES_SQL))
     conn.commit()
     conn.close()
+    invalidate_connections()
+
+
+# Ordine delle colonne delle righe passate a bulk_insert_rows
+PLAYER_COLUMNS = (
+    "fide_id", "first_name", "last_name", "federation", "sex", "title",
+    "w_title", "o_title", "foa_title",
+    "elo_standard", "games", "k_factor",
+    "elo_rapid", "rapid_games", "rapid_k",
+    "elo_blitz", "blitz_games", "blitz_k",
+    "birth_year", "flag",
+)
+
+_COLUMNS_SQL = ", ".join(PLAYER_COLUMNS)
+_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO players ({_COLUMNS_SQL}, name_ascii, row_hash) "
+    f"VALUES ({', '.join('?' * (len(PLAYER_COLUMNS) + 2))})"
+)
+_FTS_INSERT_SQL = "INSERT INTO players_fts(rowid, search_text) VALUES (?, ?)"
+_TRGM_INSERT_SQL = "INSERT INTO players_trgm(rowid, name_ascii) VALUES (?, ?)"
+
+_INSERT_BATCH_SIZE = 5000
+# Blocchi in attesa tra chi produce le righe e il thread di scrittura
+_INSERT_QUEUE_BATCHES = 8
+_START = object()
+_ABORT = object()
+
+
+def player_row(p):
+    """Converte un dizionario giocatore nella tupla ordinata come PLAYER_COLUMNS."""
+    return (
+        p["fide_id"],
+        p.get("first_name", ""),
+        p.get("last_name", ""),
+        p.get("federation", ""),
+        p.get("sex", ""),
+        p.get("title", ""),
+        p.get("w_title", ""),
+        p.get("o_title", ""),
+        p.get("foa_title", ""),
+        p.get("elo_standard", 0),
+        p.get("games", 0),
+        p.get("k_factor"),
+        p.get("elo_rapid", 0),
+        p.get("rapid_games", 0),
+        p.get("rapid_k"),
+        p.get("elo_blitz", 0),
+        p.get("blitz_games", 0),
+        p.get("blitz_k"),
+        p.get("birth_year"),
+        p.get("flag"),
+    )
+
+
+def _fts_text(row):
+    """Testo indicizzato da FTS5 per una riga in formato PLAYER_COLUMNS."""
+    return f"{row[1]} {row[2]} {row[18] or ''} {row[3]} {row[0]}"
+
+
+def _row_hash(row):
+    """Impronta a 64 bit dei dati di una riga, per riconoscere le righe modificate."""
+    digest = hashlib.blake2b(repr(row[1:]).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _hashed(batch):
+    return [row + (_row_hash(row),) for row in batch]
+
+
+def ascii_name(first_name, last_name):
+    """Nome e cognome traslitterati in ASCII minuscolo (es. 'Müller' -> 'muller')."""
+    text = f"{first_name or ''} {last_name or ''}"
+    if not text.isascii():
+        text = unidecode(text)
+    return text.lower()
+
+
+def _insert_values(batch):
+    """Parametri di _INSERT_SQL: la riga, il nome traslitterato e l'impronta."""
+    return [row + (ascii_name(row[1], row[2]), _row_hash(row)) for row in batch]
+
+
+def _pipelined_write(
+    row_batches,
+    write_batch,
+    finish,
+    progress_callback=None,
+    prepare=None,
+    db_path=None,
+    journal_mode="WAL",
+    synchronous="NORMAL",
+):
+    """
+    Esegue 'write_batch(conn, batch)' per ogni blocco di 'row_batches' in un
+    thread di scrittura dedicato, che riceve i blocchi da una coda limitata:
+    mentre SQLite scrive un blocco, il chiamante produce già il successivo.
+    'prepare(conn)' viene eseguita prima del primo blocco; al termine
+    'finish(conn)' completa la transazione e ne restituisce il risultato.
+    Se l'iterazione di 'row_batches' fallisce, tutto viene annullato.
+    Di default scrive sul database attivo ('db_path' None), in WAL così che
+    le ricerche continuino durante la scrittura; al termine il database torna
+    alla modalità di journal che aveva prima.
+    """
+    batches = queue.Queue(maxsize=_INSERT_QUEUE_BATCHES)
+    state = {"count": 0, "result": None, "error": None}
+
+    def writer():
+        conn = None
+        batch = _START
+        try:
+            conn = _get_connection(db_path)
+            previous_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            conn.execute(f"PRAGMA journal_mode={journal_mode}")
+            conn.execute(f"PRAGMA synchronous={synchronous}")
+            conn.execute("PRAGMA cache_size=-64000")  # 64 MB di cache
+            if prepare is not None:
+                prepare(conn)
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    state["result"] = finish(conn)
+                    conn.commit()
+                    if previous_mode != journal_mode.lower():
+                        # Uscire dal WAL richiede che nessun lettore sia aperto
+                        leaving_wal = journal_mode.lower() == "wal"
+                        with _readers_suspended() if leaving_wal else (
+                            contextlib.nullcontext()
+                        ):
+                            conn.execute(f"PRAGMA journal_mode={previous_mode}")
+                    return
+                if batch is _ABORT:
+                    conn.rollback()
+                    return
+                write_batch(conn, batch)
+                state["count"] += len(batch)
+                if progress_callback:
+                    progress_callback(state["count"])
+        except BaseException as e:
+            state["error"] = e
+            if conn is not None:
+                conn.rollback()
+            # Svuota la coda così che il produttore non resti bloccato
+            while batch is not None and batch is not _ABORT:
+                batch = batches.get()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    thread = threading.Thread(target=writer, name="fide-db-writer", daemon=True)
+    thread.start()
+    completed = False
+    try:
+        for batch in row_batches:
+            if state["error"] is not None:
+                break
+            if batch:
+                batches.put(batch)
+        completed = True
+    finally:
+        batches.put(None if completed else _ABORT)
+        thread.join()
+        invalidate_connections()
+    if state["error"] is not None:
+        raise state["error"]
+    return state["result"]
+
+
+def bulk_insert_rows(row_batches, progress_callback=None):
+    """
+    Inserisce nel database blocchi di righe in formato PLAYER_COLUMNS.
+
+    Le scritture avvengono in un thread dedicato (vedi _pipelined_write), così
+    che il chiamante possa produrre le righe, ad esempio analizzando l'XML
+    FIDE, mentre SQLite scrive le precedenti.
+
+    Args:
+        row_batches: iterabile di liste di tuple.
+        progress_callback: funzione opzionale chiamata dopo ogni blocco scritto
+                           con il numero di righe inserite fino a quel momento.
+
+    Returns:
+        Numero totale di righe inserite.
+    """
+    count = [0]
+
+    def write_batch(conn, batch):
+        values = _insert_values(batch)
+        conn.executemany(_INSERT_SQL, values)
+        conn.executemany(_FTS_INSERT_SQL, [(row[0], _fts_text(row)) for row in batch])
+        conn.executemany(_TRGM_INSERT_SQL, [(v[0], v[-2]) for v in values])
+        count[0] += len(batch)
+
+    def finish(conn):
+        _refresh_stats(conn)
+        return count[0]
+
+    return _pipelined_write(row_batches, write_batch, finish, progress_callback)
 
 
 def bulk_insert_players(players_iter, progress_callback=None):
@@ -163,83 +704,398 @@ def bulk_insert_players(players_iter, progress_callback=None):
     Returns:
         Numero totale di giocatori inseriti.
     """
-    conn = _get_connection()
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA synchronous=OFF")
-    conn.execute("PRAGMA cache_size=-64000")  # 64 MB di cache
-
-    insert_sql = """
-        INSERT OR REPLACE INTO players
-        (fide_id, first_name, last_name, federation, sex, title,
-         w_title, o_title, foa_title,
-         elo_standard, games, k_factor,
-         elo_rapid, rapid_games, rapid_k,
-         elo_blitz, blitz_games, blitz_k,
-         birth_year, flag)
-        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-    """
-    fts_sql = "INSERT INTO players_fts(rowid, search_text) VALUES (?, ?)"
-
-    batch_size = 5000
-    count = 0
-    batch_p = []
-    batch_f = []
-
-    for p in players_iter:
-        fide_id = p["fide_id"]
-        first_name = p.get("first_name", "")
-        last_name = p.get("last_name", "")
-        federation = p.get("federation", "")
-        birth_year = p.get("birth_year")
-
-        batch_p.append(
-            (
-                fide_id,
-                first_name,
-                last_name,
-                federation,
-                p.get("sex", ""),
-                p.get("title", ""),
-                p.get("w_title", ""),
-                p.get("o_title", ""),
-                p.get("foa_title", ""),
-                p.get("elo_standard", 0),
-                p.get("games", 0),
-                p.get("k_factor"),
-                p.get("elo_rapid", 0),
-                p.get("rapid_games", 0),
-                p.get("rapid_k"),
-                p.get("elo_blitz", 0),
-                p.get("blitz_games", 0),
-                p.get("blitz_k"),
-                birth_year,
-                p.get("flag"),
+
+    def row_batches():
+        batch = []
+        for p in players_iter:
+            batch.append(player_row(p))
+            if len(batch) >= _INSERT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    return bulk_insert_rows(row_batches(), progress_callback=progress_callback)
+
+
+def _phase_clock(timings):
+    """Funzione che registra in 'timings' i secondi trascorsi dalla fase precedente."""
+    last = [time.perf_counter()]
+
+    def phase_done(name):
+        now = time.perf_counter()
+        if timings is not None:
+            timings[name] = now - last[0]
+        last[0] = now
+
+    return phase_done
+
+
+def _add_stats(conn, source_sql, sign=1):
+    """
+    Somma alle tabelle riassuntive il contributo dei giocatori restituiti da
+    'source_sql' (una SELECT sulla tabella players), o lo sottrae se 'sign'
+    è -1. Le righe rimaste a zero vengono eliminate.
+    """
+    conn.execute(
+        "INSERT INTO stats_federation (federation, players, rated, titled) "
+        f"SELECT federation, {sign} * COUNT(*), {sign} * SUM(elo_standard > 0), "
+        f"{sign} * SUM(title != '') FROM ({source_sql}) GROUP BY federation "
+        "ON CONFLICT(federation) DO UPDATE SET "
+        "players = players + excluded.players, rated = rated + excluded.rated, "
+        "titled = titled + excluded.titled"
+    )
+    for category, column in RATING_CATEGORIES:
+        conn.execute(
+            "INSERT INTO stats_rating (category, bucket, players) "
+            f"SELECT '{category}', {column} / {STATS_BUCKET_SIZE} * "
+            f"{STATS_BUCKET_SIZE} AS bucket, {sign} * COUNT(*) "
+            f"FROM ({source_sql}) WHERE {column} > 0 GROUP BY bucket "
+            "ON CONFLICT(category, bucket) DO UPDATE SET "
+            "players = players + excluded.players"
+        )
+    conn.execute(
+        "INSERT INTO stats_title (title, players) "
+        f"SELECT title, {sign} * COUNT(*) FROM ({source_sql}) "
+        "WHERE title != '' GROUP BY title "
+        "ON CONFLICT(title) DO UPDATE SET players = players + excluded.players"
+    )
+    for table in STATS_TABLES:
+        conn.execute(f"DELETE FROM {table} WHERE players = 0")
+
+
+def _refresh_stats(conn):
+    """Ricalcola da zero le tabelle riassuntive, creandole se mancanti."""
+    for sql in _STATS_TABLES_SQL:
+        conn.execute(sql)
+    for table in STATS_TABLES:
+        conn.execute(f"DELETE FROM {table}")
+    _add_stats(conn, "SELECT * FROM players")
+
+
+def _has_stats_tables(conn):
+    found = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN "
+        f"({', '.join('?' * len(STATS_TABLES))})",
+        STATS_TABLES,
+    ).fetchone()[0]
+    return found == len(STATS_TABLES)
+
+
+def build_fide_db(row_batches, progress_callback=None, timings=None):
+    """
+    Ricostruisce da zero il database FIDE senza toccare quello in uso.
+
+    Le righe vengono caricate in tabelle senza indici in un file temporaneo
+    accanto al database; indici secondari e indice FTS sono costruiti alla
+    fine, ciascuno in un solo passaggio, e l'indice FTS viene compattato con
+    'optimize'; infine vengono calcolate le tabelle riassuntive delle
+    statistiche (vedi get_fide_stats). Il nuovo file viene verificato
+    (numero di righe, integrità, ricerche di prova) e solo allora sostituisce
+    atomicamente quello attivo: fino a quel momento, e anche se la
+    ricostruzione fallisce, le ricerche continuano sul database precedente.
+
+    Args:
+        row_batches: iterabile di liste di tuple in formato PLAYER_COLUMNS.
+        progress_callback: come in bulk_insert_rows.
+        timings: dizionario opzionale in cui vengono registrati i secondi
+                 impiegati da ogni fase ('load', 'indexes', 'fts', 'optimize',
+                 'stats', 'validate', 'swap').
+
+    Returns:
+        Numero totale di giocatori inseriti.
+    """
+    new_path = FIDE_DB_LOCAL_FILE + ".new"
+    _remove_db_files(new_path)
+    phase_done = _phase_clock(timings)
+
+    def prepare(conn):
+        conn.executescript(_TABLES_SQL)
+
+    def write_batch(conn, batch):
+        conn.executemany(_INSERT_SQL, _insert_values(batch))
+
+    def finish(conn):
+        phase_done("load")
+        conn.executescript(_INDEXES_SQL)
+        phase_done("indexes")
+        for table in ("players_fts", "players_trgm"):
+            conn.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+        phase_done("fts")
+        for table in ("players_fts", "players_trgm"):
+            conn.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+        phase_done("optimize")
+        _refresh_stats(conn)
+        phase_done("stats")
+        return conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+
+    try:
+        # Il file temporaneo viene scartato in caso di errore: il journal e
+        # la sincronizzazione su disco a ogni transazione non servono
+        count = _pipelined_write(
+            row_batches,
+            write_batch,
+            finish,
+            progress_callback,
+            prepare=prepare,
+            db_path=new_path,
+            journal_mode="OFF",
+            synchronous="OFF",
+        )
+        _validate_fide_db(new_path, count)
+        phase_done("validate")
+        _swap_in_fide_db(new_path)
+        phase_done("swap")
+    except BaseException:
+        _remove_db_files(new_path)
+        raise
+    return count
+
+
+def _remove_db_files(db_path):
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        try:
+            os.remove(db_path + suffix)
+        except OSError:
+            pass
+
+
+def _validate_fide_db(db_path, expected_count):
+    """Controlla un database appena costruito prima di metterlo in uso."""
+    conn = sqlite3.connect(db_path)
+    try:
+        if expected_count <= 0:
+            raise ValueError(_("La nuova lista FIDE non contiene giocatori."))
+        count = conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+        # Documenti effettivamente indicizzati (players_fts conta la vista)
+        fts_count = min(
+            conn.execute(f"SELECT COUNT(*) FROM {table}_docsize").fetchone()[0]
+            for table in ("players_fts", "players_trgm")
+        )
+        if count != expected_count or fts_count != count:
+            raise ValueError(
+                _("Database FIDE incompleto: {count} giocatori su {expected}.").format(
+                    count=min(count, fts_count), expected=expected_count
+                )
             )
+        stats_count = conn.execute(
+            "SELECT COALESCE(SUM(players), 0) FROM stats_federation"
+        ).fetchone()[0]
+        if stats_count != count:
+            raise ValueError(_("Statistiche del database FIDE non allineate."))
+        if conn.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+            raise ValueError(_("Verifica di integrità del database FIDE fallita."))
+
+        # Ricerche di prova su primo, ultimo e un giocatore intermedio
+        low, high = conn.execute(
+            "SELECT MIN(fide_id), MAX(fide_id) FROM players"
+        ).fetchone()
+        for fide_id in (low, (low + high) // 2, high):
+            row = conn.execute(
+                "SELECT fide_id FROM players WHERE fide_id >= ? LIMIT 1", (fide_id,)
+            ).fetchone()
+            found = conn.execute(
+                "SELECT rowid FROM players_fts WHERE players_fts MATCH ?",
+                (f'"{row[0]}"',),
+            ).fetchall()
+            if (row[0],) not in found:
+                raise ValueError(
+                    _("Ricerca di prova fallita sul nuovo database FIDE.")
+                )
+        conn.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        conn.close()
+
+
+def _swap_in_fide_db(new_path):
+    """
+    Sostituisce atomicamente il database attivo con 'new_path'. La
+    sostituzione avviene solo dopo che tutte le connessioni di lettura al
+    vecchio file sono state chiuse (su Windows un file aperto non può essere
+    sostituito), e nessuna viene riaperta prima che sia completata.
+    """
+    with _readers_suspended():
+        if os.path.exists(FIDE_DB_LOCAL_FILE):
+            # Nessun file -wal/-shm del vecchio database deve restare accanto al nuovo
+            conn = sqlite3.connect(FIDE_DB_LOCAL_FILE)
+            try:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.execute("PRAGMA journal_mode=DELETE")
+            finally:
+                conn.close()
+        os.replace(new_path, FIDE_DB_LOCAL_FILE)
+
+
+def supports_incremental_update():
+    """
+    Verifica se il database esistente può essere aggiornato in modo
+    incrementale: deve contenere giocatori e le impronte delle righe, e
+    l'indice FTS deve essere a contenuto esterno. I database creati dalle
+    versioni precedenti vengono invece ricostruiti da zero una volta.
+    """
+    if not os.path.exists(FIDE_DB_LOCAL_FILE):
+        return False
+    try:
+        with _read_connection() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+            if "row_hash" not in columns:
+                return False
+            fts_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'players_fts'"
+            ).fetchone()
+            if fts_sql is None or "content=" not in fts_sql[0]:
+                return False
+            if "name_ascii" not in columns:
+                return False
+            return conn.execute("SELECT 1 FROM players LIMIT 1").fetchone() is not None
+    except Exception:
+        return False
+
+
+def update_players_incremental(row_batches, progress_callback=None, timings=None):
+    """
+    Aggiorna il database con una nuova lista completa applicando solo le
+    differenze: inserisce i nuovi giocatori, aggiorna quelli la cui impronta
+    è cambiata ed elimina quelli non più presenti. L'indice FTS viene
+    toccato solo per i giocatori nuovi, rimossi o con nome, anno di nascita
+    o federazione cambiati. Tutto avviene in un'unica transazione, durante
+    la quale le ricerche continuano a vedere i dati precedenti.
+
+    Args:
+        row_batches: iterabile di liste di tuple in formato PLAYER_COLUMNS.
+        progress_callback: come in bulk_insert_rows.
+        timings: dizionario opzionale per i secondi impiegati dalle fasi
+                 'load' (lettura della nuova lista), 'apply' (differenze) e
+                 'stats' (tabelle riassuntive).
+
+    Returns:
+        Dizionario con il resoconto: 'total' (righe ricevute), 'added',
+        'updated', 'removed', 'renamed' e 'fields' (colonna -> numero di
+        giocatori in cui è cambiata).
+    """
+    data_columns = PLAYER_COLUMNS[1:]
+    insert_incoming_sql = (
+        f"INSERT OR REPLACE INTO temp.incoming ({_COLUMNS_SQL}, row_hash) "
+        f"VALUES ({', '.join('?' * (len(PLAYER_COLUMNS) + 1))})"
+    )
+
+    def prepare(conn):
+        conn.execute("DROP TABLE IF EXISTS temp.incoming")
+        conn.execute(
+            "CREATE TEMP TABLE incoming (fide_id INTEGER PRIMARY KEY, "
+            f"{', '.join(data_columns)}, row_hash INTEGER)"
         )
 
-        search_text = (
-            f"{first_name} {last_name} {birth_year or ''} {federation} {fide_id}"
+    phase_done = _phase_clock(timings)
+
+    def write_batch(conn, batch):
+        conn.executemany(insert_incoming_sql, _hashed(batch))
+
+    def finish(conn):
+        phase_done("load")
+        total = conn.execute("SELECT COUNT(*) FROM temp.incoming").fetchone()[0]
+        if total == 0:
+            raise ValueError(_("La nuova lista FIDE non contiene giocatori."))
+
+        name_changed = " OR ".join(
+            f"i.{col} IS NOT p.{col}"
+            for col in ("first_name", "last_name", "birth_year", "federation")
+        )
+        conn.execute("DROP TABLE IF EXISTS temp.changed")
+        conn.execute(
+            "CREATE TEMP TABLE changed AS "
+            "SELECT i.fide_id AS fide_id, p.fide_id IS NULL AS is_new, "
+            f"p.fide_id IS NOT NULL AND ({name_changed}) AS renamed "
+            "FROM temp.incoming i LEFT JOIN players p ON p.fide_id = i.fide_id "
+            "WHERE p.fide_id IS NULL OR p.row_hash != i.row_hash"
+        )
+        conn.execute("DROP TABLE IF EXISTS temp.removed")
+        conn.execute(
+            "CREATE TEMP TABLE removed AS SELECT fide_id FROM players "
+            "WHERE fide_id NOT IN (SELECT fide_id FROM temp.incoming)"
         )
-        batch_f.append((fide_id, search_text))
-
-        count += 1
-        if count % batch_size == 0:
-            conn.executemany(insert_sql, batch_p)
-            conn.executemany(fts_sql, batch_f)
-            batch_p.clear()
-            batch_f.clear()
-            if progress_callback:
-                progress_callback(count)
-
-    # Inserisce gli ultimi record rimasti nel batch
-    if batch_p:
-        conn.executemany(insert_sql, batch_p)
-        conn.executemany(fts_sql, batch_f)
 
-    conn.commit()
-    conn.execute("PRAGMA synchronous=FULL")
-    conn.close()
-    return count
+        field_counts = conn.execute(
+            "SELECT "
+            + ", ".join(
+                f"COALESCE(SUM(i.{col} IS NOT p.{col}), 0)" for col in data_columns
+            )
+            + " FROM temp.incoming i JOIN players p ON p.fide_id = i.fide_id "
+            "WHERE p.row_hash != i.row_hash"
+        ).fetchone()
+        added, renamed, changed = conn.execute(
+            "SELECT COALESCE(SUM(is_new), 0), COALESCE(SUM(renamed), 0), COUNT(*) "
+            "FROM temp.changed"
+        ).fetchone()
+        removed = conn.execute("SELECT COUNT(*) FROM temp.removed").fetchone()[0]
+
+        # Le statistiche perdono il contributo delle righe rimosse o cambiate
+        # e ricevono quello delle nuove versioni; un database creato prima
+        # delle tabelle riassuntive le calcola invece da zero alla fine
+        stats_ready = _has_stats_tables(conn)
+        if stats_ready:
+            _add_stats(
+                conn,
+                "SELECT * FROM players WHERE fide_id IN ("
+                "SELECT fide_id FROM temp.removed "
+                "UNION ALL SELECT fide_id FROM temp.changed WHERE NOT is_new)",
+                sign=-1,
+            )
+
+        # Indice a contenuto esterno: le voci vanno tolte finché le righe
+        # hanno ancora il vecchio testo, e reinserite dopo l'aggiornamento
+        for table in ("players_fts", "players_trgm"):
+            conn.execute(
+                f"DELETE FROM {table} WHERE rowid IN ("
+                "SELECT fide_id FROM temp.removed "
+                "UNION ALL SELECT fide_id FROM temp.changed WHERE renamed)"
+            )
+        conn.execute(
+            "DELETE FROM players WHERE fide_id IN (SELECT fide_id FROM temp.removed)"
+        )
+        # Il nome traslitterato viene calcolato solo per le righe cambiate
+        conn.create_function("ascii_name", 2, ascii_name, deterministic=True)
+        conn.execute(
+            f"INSERT OR REPLACE INTO players ({_COLUMNS_SQL}, name_ascii, row_hash) "
+            f"SELECT {_COLUMNS_SQL}, ascii_name(first_name, last_name), row_hash "
+            "FROM temp.incoming WHERE fide_id IN (SELECT fide_id FROM temp.changed)"
+        )
+        conn.execute(
+            "INSERT INTO players_fts(rowid, search_text) "
+            "SELECT fide_id, search_text FROM players_search "
+            "WHERE fide_id IN "
+            "(SELECT fide_id FROM temp.changed WHERE is_new OR renamed)"
+        )
+        conn.execute(
+            "INSERT INTO players_trgm(rowid, name_ascii) "
+            "SELECT fide_id, name_ascii FROM players WHERE fide_id IN "
+            "(SELECT fide_id FROM temp.changed WHERE is_new OR renamed)"
+        )
+        phase_done("apply")
+        if stats_ready:
+            _add_stats(
+                conn,
+                "SELECT * FROM players WHERE fide_id IN "
+                "(SELECT fide_id FROM temp.changed)",
+            )
+        else:
+            _refresh_stats(conn)
+        for table in ("incoming", "changed", "removed"):
+            conn.execute(f"DROP TABLE temp.{table}")
+        phase_done("stats")
+
+        return {
+            "total": total,
+            "added": added,
+            "updated": changed - added,
+            "removed": removed,
+            "renamed": renamed,
+            "fields": {col: n for col, n in zip(data_columns, field_counts) if n},
+        }
+
+    return _pipelined_write(
+        row_batches, write_batch, finish, progress_callback, prepare=prepare
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -250,36 +1106,315 @@ def bulk_insert_players(players_iter, progress_callback=None):
 def get_player_by_fide_id(fide_id):
     """Restituisce i dati di un giocatore dato il suo ID FIDE, o None se non trovato."""
     try:
-        conn = _get_connection()
-        cursor = conn.execute(
-            "SELECT * FROM players WHERE fide_id = ?", (int(fide_id),)
-        )
-        row = cursor.fetchone()
-        conn.close()
+        with _read_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM players WHERE fide_id = ?", (int(fide_id),)
+            ).fetchone()
         return _row_to_dict(row) if row else None
     except Exception:
         return None
 
 
+# ID per query: json_each non ha il limite di SQLite sul numero di parametri
+_BULK_ID_CHUNK = 5000
+
+
+def get_players_by_fide_ids(fide_ids, chunk_size=_BULK_ID_CHUNK):
+    """
+    Restituisce {id FIDE (int): dati del giocatore} per un elenco di ID FIDE,
+    con una query ogni 'chunk_size' ID sulla stessa connessione invece di
+    una query per giocatore. Gli ID non numerici o assenti dal DB vengono
+    ignorati.
+    """
+    wanted = []
+    seen = set()
+    for fide_id in fide_ids:
+        fide_id = str(fide_id or "").strip()
+        if not fide_id.isdigit() or int(fide_id) in seen:
+            continue
+        seen.add(int(fide_id))
+        wanted.append(int(fide_id))
+    found = {}
+    if not wanted:
+        return found
+    try:
+        with _read_connection() as conn:
+            for start in range(0, len(wanted), chunk_size):
+                chunk = json.dumps(wanted[start : start + chunk_size])
+                cursor = conn.execute(
+                    "SELECT * FROM players "
+                    "WHERE fide_id IN (SELECT value FROM json_each(?))",
+                    (chunk,),
+                )
+                for row in cursor:
+                    found[row["fide_id"]] = _row_to_dict(row)
+    except Exception:
+        return {}
+    return found
+
+
 def search_players_by_name(first_name, last_name):
     """
     Cerca giocatori per corrispondenza esatta di nome e cognome (case-insensitive).
     Utilizzato dalla sincronizzazione del database personale con il DB FIDE.
     """
     try:
-        conn = _get_connection()
-        cursor = conn.execute(
-            "SELECT * FROM players "
-            "WHERE first_name = ? COLLATE NOCASE AND last_name = ? COLLATE NOCASE",
-            (first_name, last_name),
-        )
-        results = [_row_to_dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return results
+        with _read_connection() as conn:
+            cursor = conn.execute(
+                "SELECT * FROM players "
+                "WHERE first_name = ? COLLATE NOCASE AND last_name = ? COLLATE NOCASE",
+                (first_name, last_name),
+            )
+            return [_row_to_dict(row) for row in cursor.fetchall()]
     except Exception:
         return []
 
 
+def match_players_bulk(lookups, chunk_size=2000):
+    """
+    Risolve in blocco le corrispondenze tra giocatori locali e DB FIDE.
+
+    Le chiavi di ricerca vengono caricate in una tabella temporanea e risolte
+    con due join (per ID FIDE e per nome e cognome) su un'unica connessione,
+    invece di una query e una connessione per giocatore.
+
+    Args:
+        lookups: iterabile di tuple (id_locale, fide_id_str, first_name, last_name).
+                 Se fide_id_str è valorizzato e diverso da "0" si cerca per ID FIDE,
+                 altrimenti per nome e cognome esatti (case-insensitive), come
+                 get_player_by_fide_id e search_players_by_name.
+        chunk_size: numero di giocatori locali per ogni blocco restituito.
+
+    Yields:
+        Liste di tuple (id_locale, per_id_fide, corrispondenze) nell'ordine di
+        ``lookups``, dove corrispondenze è una lista di dizionari giocatore.
+    """
+    with _read_connection() as conn:
+        try:
+            conn.execute("DROP TABLE IF EXISTS temp.sync_lookup")
+            conn.execute(
+                "CREATE TEMP TABLE sync_lookup ("
+                "seq INTEGER PRIMARY KEY, local_id TEXT NOT NULL, "
+                "by_id INTEGER NOT NULL, "
+                "fide_id INTEGER, first_name TEXT, last_name TEXT)"
+            )
+            rows = []
+            for seq, lookup in enumerate(lookups):
+                local_id, fide_id_str, first_name, last_name = lookup
+                fide_id_str = str(fide_id_str or "").strip()
+                if fide_id_str and fide_id_str != "0":
+                    fide_id = int(fide_id_str) if fide_id_str.isdigit() else None
+                    rows.append((seq, local_id, 1, fide_id, None, None))
+                elif first_name and last_name:
+                    rows.append((seq, local_id, 0, None, first_name, last_name))
+                else:
+                    rows.append((seq, local_id, 0, None, None, None))
+            conn.executemany("INSERT INTO sync_lookup VALUES (?,?,?,?,?,?)", rows)
+            # Nessuna transazione resta aperta sulla connessione condivisa
+            conn.commit()
+            del rows
+
+            by_id_sql = (
+                "SELECT l.seq AS seq, p.* FROM sync_lookup l "
+                "JOIN players p ON p.fide_id = l.fide_id "
+                "WHERE l.by_id = 1 AND l.seq BETWEEN ? AND ?"
+            )
+            by_name_sql = (
+                "SELECT l.seq AS seq, p.* FROM sync_lookup l "
+                "JOIN players p ON p.last_name = l.last_name COLLATE NOCASE "
+                "AND p.first_name = l.first_name COLLATE NOCASE "
+                "WHERE l.by_id = 0 AND l.seq BETWEEN ? AND ? "
+                "ORDER BY l.seq, p.fide_id"
+            )
+            total = conn.execute("SELECT COUNT(*) FROM sync_lookup").fetchone()[0]
+            for start in range(0, total, chunk_size):
+                end = start + chunk_size - 1
+                found = {}
+                for sql in (by_id_sql, by_name_sql):
+                    for row in conn.execute(sql, (start, end)):
+                        found.setdefault(row["seq"], []).append(_row_to_dict(row))
+                chunk = conn.execute(
+                    "SELECT seq, local_id, by_id FROM sync_lookup "
+                    "WHERE seq BETWEEN ? AND ? ORDER BY seq",
+                    (start, end),
+                ).fetchall()
+                yield [
+                    (local_id, bool(by_id), found.get(seq, []))
+                    for seq, local_id, by_id in chunk
+                ]
+        finally:
+            try:
+                conn.execute("DROP TABLE IF EXISTS temp.sync_lookup")
+                conn.commit()
+            except Exception:
+                pass
+
+
+SEARCH_PAGE_SIZE = 100
+
+# Rilevanza calcolata da SQLite: cognome che inizia col primo termine, poi nome, poi il resto
+_RANK_SQL = (
+    "CASE WHEN substr(lower(p.last_name), 1, length(:term)) = :term THEN 1 "
+    "WHEN substr(lower(p.first_name), 1, length(:term)) = :term THEN 2 ELSE 3 END"
+)
+_ORDER_KEY_SQL = f"({_RANK_SQL}), lower(p.last_name), lower(p.first_name), p.fide_id"
+_EXCLUDE_SQL = " AND {col} NOT IN (SELECT value FROM json_each(:exclude))"
+
+
+class SearchCursor:
+    """
+    Risultati di una ricerca FIDE letti una pagina alla volta.
+
+    L'ordinamento per rilevanza avviene in SQLite e ogni pagina riparte dalla
+    chiave dell'ultima riga restituita (paginazione a chiave), quindi la prima
+    pagina costa come una query con LIMIT anche con decine di migliaia di
+    corrispondenze e tra una pagina e l'altra non resta aperto alcun cursore.
+    Il totale viene calcolato a parte, solo se richiesto, sull'indice FTS.
+    Con page_size=None la prima pagina contiene tutti i risultati.
+
+    Con fuzzy=True, se la ricerca esatta non trova nulla vengono restituiti
+    i nomi più simili (search_players_fuzzy) e 'approximate' diventa vero.
+    """
+
+    def __init__(
+        self, query, exclude_fide_ids=None, page_size=SEARCH_PAGE_SIZE, fuzzy=False
+    ):
+        self.query = (query or "").strip()
+        self.page_size = page_size
+        self.fuzzy = fuzzy
+        self.approximate = False
+        self._exclude_strs = set(exclude_fide_ids or ())
+        self._exclude = json.dumps(
+            sorted(int(i) for i in self._exclude_strs if str(i).isdigit())
+        )
+        self._after = None
+        self._done = False
+        self._count = None
+        # Risultati già completi (ricerca per ID FIDE o fallback LIKE)
+        self._pending = None
+        self._fts_query = None
+        self._term = _extract_first_term(self.query)
+
+        if len(self.query) < 3:
+            self._set_pending([])
+        elif self.query.isdigit():
+            player = get_player_by_fide_id(self.query)
+            excluded = player and str(player["id_fide"]) in self._exclude_strs
+            self._set_pending([player] if player and not excluded else [])
+        else:
+            self._fts_query = _build_fts_query(self.query)
+            if not self._fts_query:
+                self._set_pending([])
+
+    def _set_pending(self, results):
+        self._pending = results
+        self._count = len(results)
+        self._done = not results
+
+    @property
+    def has_more(self):
+        return not self._done
+
+    def fetch_page(self):
+        """Restituisce la pagina successiva (lista di dizionari giocatore)."""
+        if self._done:
+            return []
+        if self._pending is not None:
+            size = self.page_size or len(self._pending)
+            page, self._pending = self._pending[:size], self._pending[size:]
+            self._done = not self._pending
+            return page
+
+        params = {
+            "fts": self._fts_query,
+            "term": self._term,
+            "exclude": self._exclude,
+            "limit": -1 if self.page_size is None else self.page_size + 1,
+        }
+        # La chiave dell'ultima riga viene letta da SQLite, così coincide con ORDER BY
+        sql = (
+            f"SELECT p.*, ({_RANK_SQL}) AS k_rank, lower(p.last_name) AS k_last, "
+            "lower(p.first_name) AS k_first FROM players_fts fts "
+            "JOIN players p ON p.fide_id = fts.rowid "
+            "WHERE players_fts MATCH :fts"
+        )
+        if self._exclude_strs:
+            sql += _EXCLUDE_SQL.format(col="p.fide_id")
+        if self._after is not None:
+            sql += f" AND ({_ORDER_KEY_SQL}) > (:k_rank, :k_last, :k_first, :k_id)"
+            params.update(self._after)
+        sql += f" ORDER BY {_ORDER_KEY_SQL} LIMIT :limit"
+
+        try:
+            with _read_connection() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        except Exception as e:
+            if is_interrupted(e):
+                raise
+            if self._after is not None:
+                self._done = True
+                return []
+            # Fallback a ricerca LIKE se FTS5 non funziona
+            results = _search_like_fallback(self.query, None, self._exclude_strs)
+            if self._term:
+                results.sort(key=lambda p: _relevance_sort_key(p, self._term))
+            self._set_pending(results)
+            return self.fetch_page()
+
+        if not rows and self._after is None and self._wants_fuzzy():
+            self.approximate = True
+            self._set_pending(
+                search_players_fuzzy(self.query, exclude_fide_ids=self._exclude_strs)
+            )
+            return self.fetch_page()
+
+        if self.page_size is None or len(rows) <= self.page_size:
+            self._done = True
+        rows = rows[: self.page_size]
+        if rows:
+            last = rows[-1]
+            self._after = {
+                "k_rank": last["k_rank"],
+                "k_last": last["k_last"],
+                "k_first": last["k_first"],
+                "k_id": last["fide_id"],
+            }
+        return [_row_to_dict(row) for row in rows]
+
+    def _wants_fuzzy(self):
+        # Con esclusioni o frasi esatte una corrispondenza approssimata non ha senso
+        parts = self.query.split()
+        return (
+            self.fuzzy
+            and not self.query.startswith("=")
+            and not any(part.startswith("-") for part in parts)
+        )
+
+    def count(self):
+        """Numero totale di risultati, calcolato sull'indice FTS senza join."""
+        if self._count is None:
+            sql = "SELECT COUNT(*) FROM players_fts WHERE players_fts MATCH :fts"
+            if self._exclude_strs:
+                sql += _EXCLUDE_SQL.format(col="rowid")
+            try:
+                with _read_connection() as conn:
+                    self._count = conn.execute(
+                        sql, {"fts": self._fts_query, "exclude": self._exclude}
+                    ).fetchone()[0]
+            except Exception as e:
+                if is_interrupted(e):
+                    raise
+                return 0
+        return self._count
+
+
+def open_search(query, exclude_fide_ids=None, page_size=SEARCH_PAGE_SIZE, fuzzy=False):
+    """Avvia una ricerca FIDE paginata (vedi SearchCursor) con gli operatori di search_players."""
+    return SearchCursor(
+        query, exclude_fide_ids=exclude_fide_ids, page_size=page_size, fuzzy=fuzzy
+    )
+
+
 def search_players(query, limit=None, exclude_fide_ids=None):
     """
     Cerca giocatori FIDE usando la stringa di ricerca con supporto operatori.
@@ -297,61 +1432,87 @@ def search_players(query, limit=None, exclude_fide_ids=None):
 
     Returns:
         Lista di dizionari giocatore ordinati per rilevanza.
+        Per leggere i risultati a pagine usare open_search.
     """
-    if not query or len(query.strip()) < 3:
-        return []
+    cursor = open_search(query, exclude_fide_ids=exclude_fide_ids, page_size=limit)
+    return cursor.fetch_page()
 
-    query = query.strip()
 
-    # Ricerca per ID FIDE esatto (stringa numerica)
-    if query.isdigit():
-        player = get_player_by_fide_id(query)
-        if player:
-            fide_id_str = str(player["id_fide"])
-            if exclude_fide_ids and fide_id_str in exclude_fide_ids:
-                return []
-            return [player]
-        return []
+FUZZY_MIN_SIMILARITY = 0.4
+# Candidati letti dall'indice a trigrammi, in ordine bm25, prima del punteggio esatto
+_FUZZY_CANDIDATES = 200
 
-    # Costruisci ed esegui query FTS5
-    fts_query = _build_fts_query(query)
-    results = []
 
-    if fts_query:
-        try:
-            conn = _get_connection()
-            sql = (
-                "SELECT p.* FROM players p "
-                "JOIN players_fts fts ON fts.rowid = p.fide_id "
-                "WHERE players_fts MATCH ? "
-                "ORDER BY fts.rank"
-            )
-            params = [fts_query]
-            if limit is not None:
-                sql += " LIMIT ?"
-                fetch_limit = limit * 3 if exclude_fide_ids else limit
-                params.append(fetch_limit)
-
-            cursor = conn.execute(sql, params)
-            for row in cursor:
-                player = _row_to_dict(row)
-                if exclude_fide_ids and str(player["id_fide"]) in exclude_fide_ids:
-                    continue
-                results.append(player)
-                if limit is not None and len(results) >= limit:
-                    break
-            conn.close()
-        except Exception:
-            # Fallback a ricerca LIKE se FTS5 non funziona
-            results = _search_like_fallback(query, limit, exclude_fide_ids)
+def _trigrams(word):
+    return {word[i : i + 3] for i in range(len(word) - 2)}
+
+
+def _fuzzy_terms(query):
+    """Termini (di almeno 3 lettere) della query traslitterati come name_ascii."""
+    text = re.sub(r"[^a-z0-9]+", " ", ascii_name(query.replace("=", " "), ""))
+    return [term for term in text.split() if len(term) >= 3 and not term.isdigit()]
+
+
+def _name_similarity(term_grams, name):
+    """
+    Media, sui termini della query, della somiglianza di Dice tra i trigrammi
+    del termine e quelli della parola del nome più vicina.
+    """
+    word_grams = [_trigrams(word) for word in name.split() if len(word) >= 3]
+    total = 0.0
+    for grams in term_grams:
+        total += max(
+            (
+                2 * len(grams & other) / (len(grams) + len(other))
+                for other in word_grams
+            ),
+            default=0.0,
+        )
+    return total / len(term_grams)
 
-    # Applica ordinamento per rilevanza (cognomi che iniziano col primo termine prima)
-    if results:
-        first_term = _extract_first_term(query)
-        if first_term:
-            results.sort(key=lambda p: _relevance_sort_key(p, first_term))
 
-    return results
+def search_players_fuzzy(
+    query, limit=20, exclude_fide_ids=None, min_similarity=FUZZY_MIN_SIMILARITY
+):
+    """
+    Ricerca approssimata per nome, tollerante a refusi e traslitterazioni
+    diverse (es. 'Nepomnjaschi' trova 'Nepomniachtchi').
+
+    I candidati vengono letti dall'indice a trigrammi del nome traslitterato
+    in ASCII (players_trgm), mai con una scansione della tabella, e poi
+    ordinati per somiglianza.
+
+    Returns:
+        Lista di dizionari giocatore, i più simili per primi.
+    """
+    terms = _fuzzy_terms(query)
+    if not terms:
+        return []
+    term_grams = [_trigrams(term) for term in terms]
+    grams = sorted(set().union(*term_grams))
+    match = " OR ".join(f'"{gram}"' for gram in grams)
+    try:
+        with _read_connection() as conn:
+            rows = conn.execute(
+                "SELECT p.* FROM (SELECT rowid FROM players_trgm "
+                "WHERE players_trgm MATCH ? ORDER BY rank LIMIT ?) t "
+                "JOIN players p ON p.fide_id = t.rowid",
+                (match, _FUZZY_CANDIDATES),
+            ).fetchall()
+    except Exception as e:
+        if is_interrupted(e):
+            raise
+        return []
+
+    scored = []
+    for row in rows:
+        if exclude_fide_ids and str(row["fide_id"]) in exclude_fide_ids:
+            continue
+        similarity = _name_similarity(term_grams, row["name_ascii"])
+        if similarity >= min_similarity:
+            scored.append((-similarity, row["name_ascii"], row["fide_id"], row))
+    scored.sort(key=lambda item: item[:3])
+    return [_row_to_dict(item[3]) for item in scored[:limit]]
 
 
 # ---------------------------------------------------------------------------
@@ -454,7 +1615,6 @@ def _search_like_fallback(query, limit, exclude_fide_ids=None):
         return []
 
     try:
-        conn = _get_connection()
         where_parts = []
         params = []
 
@@ -472,14 +1632,14 @@ def _search_like_fallback(query, limit, exclude_fide_ids=None):
             sql += " LIMIT ?"
             params.append(limit)
 
-        cursor = conn.execute(sql, params)
+        with _read_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
         results = []
-        for row in cursor:
+        for row in rows:
             player = _row_to_dict(row)
             if exclude_fide_ids and str(player["id_fide"]) in exclude_fide_ids:
                 continue
             results.append(player)
-        conn.close()
         return results
     except Exception:
         return []
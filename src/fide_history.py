@@ -0,0 +1,341 @@
+"""
+Archivio storico mensile dei rating FIDE.
+
+Il DB FIDE locale contiene solo la lista del mese corrente: a ogni
+aggiornamento i rating del mese vengono anche aggiunti a questo archivio,
+così che si possa sapere quale rating aveva un giocatore a una certa data
+(es. all'inizio di un torneo) e seguirne l'andamento.
+
+Ogni mese è diviso in blocchi di HISTORY_BLOCK_SIZE giocatori ordinati per
+ID FIDE. Un blocco memorizza per colonne l'ID FIDE (come differenza dal
+precedente), i rating standard, rapid e blitz, le partite e il fattore K;
+ogni colonna viene scomposta in piani di byte prima della compressione
+zlib, così che gli zeri e i byte alti quasi costanti si comprimano bene.
+La chiave primaria (periodo, primo ID) trova il blocco di un giocatore
+senza leggere gli altri.
+"""
+
+import os
+import sys
+import zlib
+import sqlite3
+import builtins
+from array import array
+from datetime import date, datetime
+from itertools import accumulate
+
+import fide_db
+from config import FIDE_HISTORY_FILE
+
+_ = getattr(builtins, "_", lambda s: s)
+
+HISTORY_BLOCK_SIZE = 4096
+FORMAT_VERSION = 1
+
+# Colonne salvate per ogni giocatore, dopo l'ID FIDE
+HISTORY_COLUMNS = ("elo_standard", "elo_rapid", "elo_blitz", "games", "k_factor")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS months (
+    period       TEXT PRIMARY KEY,
+    player_count INTEGER NOT NULL,
+    archived_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    period    TEXT NOT NULL,
+    first_id  INTEGER NOT NULL,
+    last_id   INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    data      BLOB NOT NULL,
+    PRIMARY KEY (period, first_id)
+) WITHOUT ROWID;
+"""
+
+_ID_TYPE = "I"
+_VALUE_TYPE = "H"
+_VALUE_MAX = 0xFFFF
+_COMPRESS_LEVEL = 6
+
+
+def connect(db_path=None):
+    """Apre l'archivio storico creando le tabelle se mancanti."""
+    conn = sqlite3.connect(db_path or FIDE_HISTORY_FILE)
+    conn.executescript(_SCHEMA)
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('format_version', ?)",
+        (str(FORMAT_VERSION),),
+    )
+    conn.commit()
+    return conn
+
+
+def _open_existing(db_path=None):
+    """Connessione all'archivio per la sola lettura, o None se non è mai stato creato."""
+    db_path = db_path or FIDE_HISTORY_FILE
+    if not os.path.exists(db_path):
+        return None
+    return connect(db_path)
+
+
+def period_of(when):
+    """Periodo 'AAAA-MM' di una data (date, datetime o testo ISO)."""
+    if isinstance(when, (date, datetime)):
+        return when.strftime("%Y-%m")
+    text = str(when).strip()[:7]
+    datetime.strptime(text, "%Y-%m")
+    return text
+
+
+# --- Codifica dei blocchi ---
+
+
+def _planes(values, typecode):
+    """Byte little-endian di 'values' raggruppati per piano (tutti i byte 0, poi gli 1...)."""
+    arr = array(typecode, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    raw = arr.tobytes()
+    width = arr.itemsize
+    return b"".join(raw[i::width] for i in range(width))
+
+
+def _from_planes(data, count, typecode):
+    width = array(typecode).itemsize
+    raw = bytearray(count * width)
+    for i in range(width):
+        raw[i::width] = data[i * count : (i + 1) * count]
+    arr = array(typecode)
+    arr.frombytes(bytes(raw))
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _clamp(value):
+    if not value or value < 0:
+        return 0
+    return min(int(value), _VALUE_MAX)
+
+
+def _encode_block(rows):
+    """Dati compressi di un blocco di righe (fide_id, *HISTORY_COLUMNS) ordinate per ID."""
+    previous = rows[0][0]
+    deltas = []
+    for row in rows:
+        deltas.append(row[0] - previous)
+        previous = row[0]
+    parts = [_planes(deltas, _ID_TYPE)]
+    for column in range(1, len(HISTORY_COLUMNS) + 1):
+        parts.append(_planes([_clamp(row[column]) for row in rows], _VALUE_TYPE))
+    return zlib.compress(b"".join(parts), _COMPRESS_LEVEL)
+
+
+def _decode_block(first_id, row_count, data):
+    """Colonne di un blocco: (lista degli ID, array per ciascuna di HISTORY_COLUMNS)."""
+    raw = zlib.decompress(data)
+    id_size = row_count * array(_ID_TYPE).itemsize
+    deltas = _from_planes(raw[:id_size], row_count, _ID_TYPE)
+    ids = list(accumulate(deltas, initial=first_id))[1:]
+    value_size = row_count * array(_VALUE_TYPE).itemsize
+    columns = []
+    for i in range(len(HISTORY_COLUMNS)):
+        start = id_size + i * value_size
+        columns.append(
+            _from_planes(raw[start : start + value_size], row_count, _VALUE_TYPE)
+        )
+    return ids, columns
+
+
+def _record(period, fide_id, columns, index):
+    record = {"period": period, "id_fide": fide_id}
+    for name, values in zip(HISTORY_COLUMNS, columns):
+        record[name] = values[index]
+    # Il fattore K non è mai zero: zero indica un valore assente
+    record["k_factor"] = record["k_factor"] or None
+    return record
+
+
+# --- Scrittura ---
+
+
+def archive_month(rows, period=None, db_path=None):
+    """
+    Salva nell'archivio i rating di un mese, sostituendo quelli già presenti
+    per lo stesso periodo (di default il mese corrente). 'rows' è un
+    iterabile di tuple (fide_id, *HISTORY_COLUMNS) in ordine crescente di ID.
+    Restituisce il numero di giocatori archiviati.
+    """
+    period = period_of(period or date.today())
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM blocks WHERE period = ?", (period,))
+            total = 0
+            block = []
+            last_id = None
+            for row in rows:
+                if last_id is not None and row[0] <= last_id:
+                    raise ValueError(_("Righe dello storico FIDE non ordinate per ID."))
+                last_id = row[0]
+                block.append(row)
+                if len(block) >= HISTORY_BLOCK_SIZE:
+                    _insert_block(conn, period, block)
+                    total += len(block)
+                    block = []
+            if block:
+                _insert_block(conn, period, block)
+                total += len(block)
+            conn.execute(
+                "INSERT OR REPLACE INTO months (period, player_count, archived_at) "
+                "VALUES (?, ?, ?)",
+                (period, total, datetime.now().isoformat(timespec="seconds")),
+            )
+    finally:
+        conn.close()
+    return total
+
+
+def _insert_block(conn, period, block):
+    conn.execute(
+        "INSERT INTO blocks (period, first_id, last_id, row_count, data) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (period, block[0][0], block[-1][0], len(block), _encode_block(block)),
+    )
+
+
+def archive_current_list(period=None, db_path=None):
+    """Archivia i rating presenti nel DB FIDE locale. Restituisce il numero di giocatori."""
+    with fide_db._read_connection() as conn:
+        cursor = conn.execute(
+            f"SELECT fide_id, {', '.join(HISTORY_COLUMNS)} FROM players ORDER BY fide_id"
+        )
+        return archive_month(cursor, period=period, db_path=db_path)
+
+
+# --- Lettura ---
+
+
+def archived_periods(db_path=None):
+    """Elenco dei periodi archiviati, dal più vecchio: [(periodo, giocatori), ...]."""
+    conn = _open_existing(db_path)
+    if conn is None:
+        return []
+    try:
+        return conn.execute(
+            "SELECT period, player_count FROM months ORDER BY period"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _period_at(conn, when):
+    """Ultimo periodo archiviato non successivo alla data 'when', o None."""
+    row = conn.execute(
+        "SELECT period FROM months WHERE period <= ? ORDER BY period DESC LIMIT 1",
+        (period_of(when),),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _block_for(conn, period, fide_id):
+    return conn.execute(
+        "SELECT first_id, last_id, row_count, data FROM blocks "
+        "WHERE period = ? AND first_id <= ? ORDER BY first_id DESC LIMIT 1",
+        (period, fide_id),
+    ).fetchone()
+
+
+def _lookup(conn, period, fide_ids):
+    """{id: record} per gli ID di 'fide_ids' presenti nel periodo, un blocco alla volta."""
+    found = {}
+    wanted = sorted(set(fide_ids))
+    i = 0
+    while i < len(wanted):
+        block = _block_for(conn, period, wanted[i])
+        if block is None or block[1] < wanted[i]:
+            i += 1
+            continue
+        first_id, last_id, row_count, data = block
+        ids, columns = _decode_block(first_id, row_count, data)
+        positions = {fide_id: index for index, fide_id in enumerate(ids)}
+        while i < len(wanted) and wanted[i] <= last_id:
+            index = positions.get(wanted[i])
+            if index is not None:
+                found[wanted[i]] = _record(period, wanted[i], columns, index)
+            i += 1
+    return found
+
+
+def _valid_ids(fide_ids):
+    ids = []
+    for fide_id in fide_ids:
+        fide_id = str(fide_id or "").strip()
+        if fide_id.isdigit() and fide_id != "0":
+            ids.append(int(fide_id))
+    return ids
+
+
+def ratings_at(fide_ids, when, db_path=None):
+    """
+    Rating dei giocatori indicati in vigore alla data 'when', cioè quelli
+    dell'ultima lista archiviata non successiva a quella data.
+    Restituisce {id FIDE (int): record}; ogni record contiene 'period',
+    'id_fide' e le colonne di HISTORY_COLUMNS.
+    """
+    ids = _valid_ids(fide_ids)
+    conn = _open_existing(db_path) if ids else None
+    if conn is None:
+        return {}
+    try:
+        period = _period_at(conn, when)
+        return _lookup(conn, period, ids) if period else {}
+    finally:
+        conn.close()
+
+
+def rating_at(fide_id, when, db_path=None):
+    """Record del giocatore in vigore alla data 'when', o None."""
+    ids = _valid_ids([fide_id])
+    return ratings_at(ids, when, db_path).get(ids[0]) if ids else None
+
+
+def rating_history(fide_id, db_path=None):
+    """Record del giocatore per ogni mese archiviato, dal più vecchio."""
+    ids = _valid_ids([fide_id])
+    conn = _open_existing(db_path) if ids else None
+    if conn is None:
+        return []
+    try:
+        periods = [row[0] for row in conn.execute("SELECT period FROM months")]
+        history = []
+        for period in sorted(periods):
+            record = _lookup(conn, period, ids).get(ids[0])
+            if record is not None:
+                history.append(record)
+        return history
+    finally:
+        conn.close()
+
+
+def iter_snapshot(period, db_path=None):
+    """Tutti i record di un mese archiviato, in ordine di ID FIDE."""
+    period = period_of(period)
+    conn = _open_existing(db_path)
+    if conn is None:
+        return
+    try:
+        cursor = conn.execute(
+            "SELECT first_id, row_count, data FROM blocks "
+            "WHERE period = ? ORDER BY first_id",
+            (period,),
+        )
+        for first_id, row_count, data in cursor:
+            ids, columns = _decode_block(first_id, row_count, data)
+            for index, fide_id in enumerate(ids):
+                yield _record(period, fide_id, columns, index)
+    finally:
+        conn.close()
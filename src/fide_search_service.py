@@ -0,0 +1,348 @@
+"""
+Ricerca FIDE "mentre si digita" eseguita fuori dal thread dell'interfaccia.
+
+FideSearchService esegue le query di fide_db.open_search su un thread di
+lavoro dedicato. Una nuova ricerca rende superata la precedente: la query
+ancora in corso viene interrotta tramite il progress handler di SQLite e
+i suoi risultati non vengono consegnati.
+
+Se la query non trova nulla vengono proposti i nomi più simili, letti
+dall'indice a trigrammi di fide_db (search_players_fuzzy).
+
+Le ricerche recenti restano in una cache LRU limitata. Quando la nuova query
+restringe una query già letta per intero (es. "ross" -> "rossi" oppure
+"rossi" -> "rossi mario") i risultati vengono filtrati in memoria senza
+interrogare il database.
+"""
+
+import queue
+import threading
+import unicodedata
+from collections import OrderedDict
+
+import fide_db
+from fide_db import SEARCH_PAGE_SIZE, _extract_first_term, is_interrupted, open_search
+
+# Attesa consigliata tra l'ultimo tasto premuto e l'avvio della ricerca
+SEARCH_DEBOUNCE_MS = 150
+
+_CACHE_SIZE = 32
+# Istruzioni della macchina virtuale SQLite tra due controlli di annullamento
+_PROGRESS_STEPS = 1000
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _normalize(text):
+    """Minuscolo e senza segni diacritici, come il tokenizer unicode61 di FTS5."""
+    decomposed = unicodedata.normalize("NFKD", str(text).lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _plain_terms(query):
+    """
+    Termini di una query composta solo da parole alfanumeriche, o None se la
+    query usa operatori o punteggiatura (restringibile solo passando da SQLite).
+    """
+    terms = query.split()
+    if not terms or query.isdigit() or not all(t.isalnum() for t in terms):
+        return None
+    return [_normalize(t) for t in terms]
+
+
+def _narrows(old_terms, new_terms):
+    """Vero se ogni risultato di new_terms è anche un risultato di old_terms."""
+    if len(new_terms) < len(old_terms):
+        return False
+    return all(new.startswith(old) for old, new in zip(old_terms, new_terms))
+
+
+def _player_tokens(player):
+    """Parole indicizzate da FTS5 per un giocatore (vedi fide_db._fts_text)."""
+    text = " ".join(
+        str(player.get(key) or "")
+        for key in ("first_name", "last_name", "birth_year", "federation", "id_fide")
+    )
+    return "".join(c if c.isalnum() else " " for c in _normalize(text)).split()
+
+
+def _sql_sort_key(player, term):
+    """Stessa chiave di ordinamento usata in SQL da fide_db.SearchCursor."""
+    # lower() di SQLite converte solo le lettere ASCII
+    last_name = (player.get("last_name") or "").translate(_ASCII_LOWER)
+    first_name = (player.get("first_name") or "").translate(_ASCII_LOWER)
+    if last_name.startswith(term):
+        rank = 1
+    elif first_name.startswith(term):
+        rank = 2
+    else:
+        rank = 3
+    return (rank, last_name, first_name, player.get("id_fide") or 0)
+
+
+def narrow_results(results, query):
+    """Filtra in memoria i risultati di una query più generale di 'query'."""
+    terms = _plain_terms(query)
+    narrowed = []
+    for player in results:
+        tokens = _player_tokens(player)
+        if all(any(tok.startswith(term) for tok in tokens) for term in terms):
+            narrowed.append(player)
+    term = _extract_first_term(query)
+    narrowed.sort(key=lambda p: _sql_sort_key(p, term))
+    return narrowed
+
+
+class _CachedSearch:
+    """Risultati letti finora per una query e cursore per leggere i successivi."""
+
+    def __init__(self, query, cursor, results, total, approximate=False):
+        self.query = query
+        # I risultati approssimati non valgono per una query più lunga
+        self.terms = None if approximate else _plain_terms(query)
+        self.approximate = approximate
+        self.cursor = cursor
+        self.results = results
+        self.total = total
+
+    @property
+    def complete(self):
+        return self.cursor is None or not self.cursor.has_more
+
+
+class SearchRequest:
+    """
+    Una ricerca inviata al servizio. Dopo ogni consegna 'results' contiene
+    tutti i risultati letti finora, 'total' il loro numero complessivo e
+    'has_more' indica se ne restano altri da leggere con load_more().
+    'approximate' è vero quando, senza corrispondenze esatte, sono stati
+    restituiti i nomi più simili alla query.
+    """
+
+    def __init__(self, query, exclude_fide_ids, callback):
+        self.query = query
+        self.exclude_fide_ids = frozenset(exclude_fide_ids or ())
+        self.callback = callback
+        self.results = []
+        self.total = 0
+        self.has_more = False
+        self.approximate = False
+        self.from_cache = False
+        self.cancelled = False
+        self.error = None
+        self._entry = None
+        self._done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Attende la consegna dei risultati e li restituisce."""
+        self._done.wait(timeout)
+        return self.results
+
+
+class FideSearchService:
+    """
+    Esegue le ricerche FIDE su un thread di lavoro, una alla volta: solo
+    l'ultima richiesta inviata viene servita, le precedenti vengono annullate.
+
+    Le callback vengono chiamate dal thread di lavoro: nell'interfaccia
+    grafica vanno inoltrate al thread principale (es. con wx.CallAfter).
+    """
+
+    def __init__(self, page_size=SEARCH_PAGE_SIZE, cache_size=_CACHE_SIZE):
+        self.page_size = page_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._jobs = queue.Queue()
+        self._current = None
+        self._thread = None
+        # Protegge l'avvio del thread e la cache, che clear_cache() può
+        # svuotare dal thread chiamante mentre il thread di lavoro la usa
+        self._lock = threading.Lock()
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="FideSearch", daemon=True
+                )
+                self._thread.start()
+
+    def search(self, query, callback=None, exclude_fide_ids=None):
+        """Avvia una ricerca rendendo superata quella in corso. Restituisce la SearchRequest."""
+        request = SearchRequest(query.strip(), exclude_fide_ids, callback)
+        self._submit("search", request)
+        return request
+
+    def load_more(self, request, callback=None):
+        """Legge la pagina successiva di 'request', se è ancora la ricerca corrente."""
+        if request is not self._current or not request.has_more:
+            return False
+        if callback is not None:
+            request.callback = callback
+        request.error = None
+        request._done.clear()
+        self._submit("more", request)
+        return True
+
+    def cancel(self):
+        """Annulla la ricerca in corso senza avviarne un'altra."""
+        previous, self._current = self._current, None
+        if previous is not None:
+            previous.cancelled = True
+
+    def close(self):
+        """Annulla la ricerca in corso e termina il thread di lavoro."""
+        self.cancel()
+        if self._thread is not None:
+            self._jobs.put(None)
+
+    def clear_cache(self):
+        """Svuota la cache (le voci di un database sostituito scadono comunque da sole)."""
+        with self._lock:
+            self._cache.clear()
+
+    def _submit(self, kind, request):
+        previous, self._current = self._current, request
+        if previous is not None and previous is not request:
+            previous.cancelled = True
+        self._ensure_thread()
+        self._jobs.put((kind, request))
+
+    # --- Thread di lavoro ---
+
+    def _worker(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            kind, request = job
+            if request is not self._current:
+                request.cancelled = True
+                request._done.set()
+                continue
+            try:
+                # Connessione in uso per tutta la richiesta: se il database
+                # viene sostituito la query è interrotta, non chiusa sotto di lei
+                with fide_db._read_connection() as conn:
+                    conn.set_progress_handler(
+                        lambda: request is not self._current, _PROGRESS_STEPS
+                    )
+                    try:
+                        if kind == "search":
+                            self._run_search(request)
+                        else:
+                            self._run_more(request)
+                    finally:
+                        try:
+                            conn.set_progress_handler(None, 0)
+                        except Exception:
+                            pass
+            except Exception as e:
+                # Interrotta ma ancora attuale: il database è stato sostituito
+                if not is_interrupted(e) or request is self._current:
+                    request.error = e
+            if request is not self._current:
+                # Superata durante l'esecuzione: i risultati possono essere incompleti
+                request.cancelled = True
+                if kind == "search" and not request.from_cache:
+                    self._forget(request)
+                request._done.set()
+                continue
+            request._done.set()
+            if request.callback is not None:
+                request.callback(request)
+
+    def _cache_key(self, query, exclude_fide_ids):
+        return (fide_db.data_generation(), query.lower(), exclude_fide_ids)
+
+    def _forget(self, request):
+        entry = request._entry
+        if entry is not None:
+            key = self._cache_key(entry.query, request.exclude_fide_ids)
+            with self._lock:
+                if self._cache.get(key) is entry:
+                    del self._cache[key]
+
+    def _lookup(self, key):
+        """Voce della cache per 'key', segnata come usata di recente, o None."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+            return entry
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _find_superset(self, query, exclude_fide_ids):
+        """Voce completa della cache di cui 'query' è un restringimento."""
+        terms = _plain_terms(query)
+        if terms is None:
+            return None
+        generation = fide_db.data_generation()
+        with self._lock:
+            cached = list(self._cache.items())
+        best = None
+        for (gen, _query, excluded), entry in cached:
+            if gen != generation or excluded != exclude_fide_ids:
+                continue
+            if entry.complete and entry.terms and _narrows(entry.terms, terms):
+                if best is None or len(entry.results) < len(best.results):
+                    best = entry
+        return best
+
+    def _run_search(self, request):
+        key = self._cache_key(request.query, request.exclude_fide_ids)
+        entry = self._lookup(key)
+        if entry is not None:
+            request.from_cache = True
+        else:
+            superset = self._find_superset(request.query, request.exclude_fide_ids)
+            if superset is not None:
+                results = narrow_results(superset.results, request.query)
+                entry = _CachedSearch(request.query, None, results, len(results))
+                request.from_cache = True
+            else:
+                cursor = open_search(
+                    request.query,
+                    exclude_fide_ids=set(request.exclude_fide_ids),
+                    page_size=self.page_size,
+                    fuzzy=True,
+                )
+                results = cursor.fetch_page()
+                total = cursor.count() if cursor.has_more else len(results)
+                entry = _CachedSearch(
+                    request.query, cursor, results, total, cursor.approximate
+                )
+            self._remember(key, entry)
+        request._entry = entry
+        self._publish(request)
+
+    def _run_more(self, request):
+        entry = request._entry
+        if entry.cursor is not None and entry.cursor.has_more:
+            entry.results = entry.results + entry.cursor.fetch_page()
+        self._publish(request)
+
+    def _publish(self, request):
+        entry = request._entry
+        request.results = entry.results
+        request.total = max(entry.total, len(entry.results))
+        request.has_more = not entry.complete
+        request.approximate = entry.approximate
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def shared_service():
+    """Servizio condiviso da finestre e script, così che la cache sopravviva tra una ricerca e l'altra."""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = FideSearchService()
+        return _shared_service
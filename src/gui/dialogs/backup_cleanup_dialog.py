@@ -1,12 +1,17 @@
 import os
-import sys
-from datetime import datetime
+import tempfile
+from datetime import datetime, timedelta
 import wx
 import builtins
 from gui.settings import apply_visual_settings
 from gui.dialogs.accessible_msg_dialog import AccessibleMsgDialog
 from gui.accessibility import set_accessibility_label
 from utils import play_sound
+from backup_store import (
+    BackupStore,
+    BackupStoreError,
+    move_to_trash as delete_file_to_trash,
+)
 
 _ = getattr(builtins, "_", lambda s: s)
 
@@ -30,68 +35,32 @@ def calculate_age(mtime, today):
         return months, days
 
 
-def delete_file_to_trash(path):
-    """Manda il file specificato nel Cestino di sistema se possibile, altrimenti lo elimina direttamente."""
-    if sys.platform == "win32":
+def trash_backup_entries(store, files):
+    """
+    Esporta le istantanee indicate in file temporanei, li manda nel Cestino
+    e solo allora le elimina dall'archivio, così che un'eliminazione per
+    errore resti recuperabile. Restituisce i nomi delle voci non eliminate.
+    """
+    failed = []
+    trashed = []
+    with tempfile.TemporaryDirectory() as export_dir:
+        for f in files:
+            path = os.path.join(export_dir, os.path.basename(f["name"]))
+            try:
+                store.restore(f["id"], path)
+            except (OSError, BackupStoreError):
+                failed.append(f["name"])
+                continue
+            if delete_file_to_trash(path):
+                trashed.append(f)
+            else:
+                failed.append(f["name"])
+    if trashed:
         try:
-            import ctypes
-            from ctypes import wintypes
-
-            class SHFILEOPSTRUCTW(ctypes.Structure):
-                _fields_ = [
-                    ("hwnd", wintypes.HWND),
-                    ("wFunc", wintypes.UINT),
-                    ("pFrom", wintypes.LPCWSTR),
-                    ("pTo", wintypes.LPCWSTR),
-                    ("fFlags", ctypes.c_ushort),
-                    ("fAnyOperationsAborted", wintypes.BOOL),
-                    ("hNameMappings", wintypes.LPVOID),
-                    ("lpszProgressTitle", wintypes.LPCWSTR),
-                ]
-
-            FO_DELETE = 3
-            FOF_ALLOWUNDO = 0x0040
-            FOF_NOCONFIRMATION = 0x0010
-            FOF_NOERRORUI = 0x0400
-            FOF_SILENT = 0x0004
-
-            path_abs = os.path.abspath(path)
-            # La Shell API richiede una stringa con doppio carattere nullo di terminazione
-            path_double_null = path_abs + "\0\0"
-
-            fileop = SHFILEOPSTRUCTW()
-            fileop.hwnd = None
-            fileop.wFunc = FO_DELETE
-            fileop.pFrom = path_double_null
-            fileop.pTo = None
-            fileop.fFlags = (
-                FOF_ALLOWUNDO | FOF_NOCONFIRMATION | FOF_NOERRORUI | FOF_SILENT
-            )
-            fileop.fAnyOperationsAborted = False
-            fileop.hNameMappings = None
-            fileop.lpszProgressTitle = None
-
-            result = ctypes.windll.shell32.SHFileOperationW(ctypes.byref(fileop))
-            if result == 0:
-                return True
-        except Exception:
-            pass
-
-    # Fallback su send2trash se installato
-    try:
-        from send2trash import send2trash
-
-        send2trash(path)
-        return True
-    except Exception:
-        pass
-
-    # Fallback finale su eliminazione diretta
-    try:
-        os.remove(path)
-        return True
-    except Exception:
-        return False
+            store.delete([f["id"] for f in trashed])
+        except (OSError, BackupStoreError):
+            failed.extend(f["name"] for f in trashed)
+    return failed
 
 
 class BackupCleanupDialog(wx.Dialog):
@@ -111,17 +80,10 @@ class BackupCleanupDialog(wx.Dialog):
         )
 
         self.settings = settings
-        self.backup_dir = "backup"
+        self.store = BackupStore()
         self.files_info = []
         self.old_files_info = []
 
-        # Assicura che la directory di backup esista
-        if not os.path.exists(self.backup_dir):
-            try:
-                os.makedirs(self.backup_dir)
-            except OSError:
-                pass
-
         self._init_ui()
         self.apply_theme()
         self.populate_list()
@@ -165,6 +127,7 @@ class BackupCleanupDialog(wx.Dialog):
         # 4. Pulsanti d'azione
         btn_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
+        self.btn_extract = wx.Button(panel, label=_("Estrai copia..."))
         self.btn_delete_selected = wx.Button(panel, label=_("Elimina questo file"))
         self.btn_delete_old = wx.Button(
             panel, label=_("Elimina consigliati (>18 mesi)")
@@ -172,11 +135,13 @@ class BackupCleanupDialog(wx.Dialog):
         self.btn_empty_folder = wx.Button(panel, label=_("Svuota cartella backup"))
         self.btn_close = wx.Button(panel, wx.ID_CANCEL, label=_("Chiudi"))
 
+        self.btn_extract.Bind(wx.EVT_BUTTON, self.on_extract_selected)
         self.btn_delete_selected.Bind(wx.EVT_BUTTON, self.on_delete_selected)
         self.btn_delete_old.Bind(wx.EVT_BUTTON, self.on_delete_old)
         self.btn_empty_folder.Bind(wx.EVT_BUTTON, self.on_empty_folder)
         self.btn_close.Bind(wx.EVT_BUTTON, self.on_close)
 
+        btn_sizer.Add(self.btn_extract, 1, wx.EXPAND | wx.RIGHT, 5)
         btn_sizer.Add(self.btn_delete_selected, 1, wx.EXPAND | wx.RIGHT, 5)
         btn_sizer.Add(self.btn_delete_old, 1, wx.EXPAND | wx.RIGHT, 5)
         btn_sizer.Add(self.btn_empty_folder, 1, wx.EXPAND | wx.RIGHT, 5)
@@ -191,13 +156,14 @@ class BackupCleanupDialog(wx.Dialog):
         apply_visual_settings(self.stats_text, self.settings)
         apply_visual_settings(self.lbl_list, self.settings)
         apply_visual_settings(self.list_ctrl, self.settings)
+        apply_visual_settings(self.btn_extract, self.settings)
         apply_visual_settings(self.btn_delete_selected, self.settings)
         apply_visual_settings(self.btn_delete_old, self.settings)
         apply_visual_settings(self.btn_empty_folder, self.settings)
         apply_visual_settings(self.btn_close, self.settings)
 
     def load_backup_files(self):
-        """Scansiona i file nella directory di backup e rileva quelli più vecchi di 18 mesi."""
+        """Legge l'indice dell'archivio dei backup e rileva le voci più vecchie di 18 mesi."""
         self.files_info = []
         self.old_files_info = []
         today = datetime.now()
@@ -207,31 +173,29 @@ class BackupCleanupDialog(wx.Dialog):
 
             limit_date = today - relativedelta(months=18)
         except ImportError:
-            limit_date = today - datetime.timedelta(days=548)
+            limit_date = today - timedelta(days=548)
 
-        if os.path.exists(self.backup_dir):
-            try:
-                for filename in os.listdir(self.backup_dir):
-                    filepath = os.path.join(self.backup_dir, filename)
-                    if os.path.isfile(filepath):
-                        stat = os.stat(filepath)
-                        size_bytes = stat.st_size
-                        mtime = datetime.fromtimestamp(stat.st_mtime)
-
-                        f_info = {
-                            "name": filename,
-                            "path": filepath,
-                            "size": size_bytes,
-                            "mtime": mtime,
-                        }
-                        self.files_info.append(f_info)
-                        if mtime < limit_date:
-                            self.old_files_info.append(f_info)
-            except Exception:
-                pass
-
-        # Ordina dal più vecchio al più recente (ascendente)
-        self.files_info.sort(key=lambda x: x["mtime"])
+        try:
+            entries = self.store.list_backups()
+        except BackupStoreError:
+            entries = []
+
+        # Le voci sono già ordinate dalla più vecchia alla più recente
+        for entry in entries:
+            mtime = datetime.fromisoformat(entry["mtime"])
+            f_info = {
+                "id": entry["id"],
+                "name": entry["name"],
+                "size": entry["size"],
+                "mtime": mtime,
+            }
+            self.files_info.append(f_info)
+            if mtime < limit_date:
+                self.old_files_info.append(f_info)
+
+    def _delete_entries(self, files):
+        """Sposta nel Cestino le voci indicate. Restituisce i nomi di quelle non eliminate."""
+        return trash_backup_entries(self.store, files)
 
     def populate_list(self):
         """Ricarica la lista e aggiorna il testo delle statistiche."""
@@ -243,14 +207,20 @@ class BackupCleanupDialog(wx.Dialog):
         total_size_mb = sum(f["size"] for f in self.files_info) / (1024 * 1024)
         old_files_count = len(self.old_files_info)
         old_size_mb = sum(f["size"] for f in self.old_files_info) / (1024 * 1024)
+        try:
+            stored_size_mb = self.store.stored_size() / (1024 * 1024)
+        except BackupStoreError:
+            stored_size_mb = 0.0
 
         stats_msg = _(
             "Statistiche Cartella Backup:\n"
             "- Totale file presenti: {tot_files} (Dimensione totale: {tot_size:.2f} MB)\n"
+            "- Occupazione effettiva su disco (deduplicata e compressa): {stored_size:.2f} MB\n"
             "- Consigliati per l'eliminazione (> 18 mesi): {old_files} (Dimensione: {old_size:.2f} MB)\n"
         ).format(
             tot_files=total_files,
             tot_size=total_size_mb,
+            stored_size=stored_size_mb,
             old_files=old_files_count,
             old_size=old_size_mb,
         )
@@ -274,6 +244,42 @@ class BackupCleanupDialog(wx.Dialog):
                 wx.LIST_STATE_SELECTED | wx.LIST_STATE_FOCUSED,
             )
 
+    def on_extract_selected(self, event):
+        """Estrae una copia integrale del backup selezionato in un file scelto dall'utente."""
+        selected_idx = self.list_ctrl.GetNextItem(
+            -1, wx.LIST_NEXT_ALL, wx.LIST_STATE_SELECTED
+        )
+        if selected_idx == -1:
+            msg = _(
+                "Nessun file selezionato. Seleziona un file dall'elenco per poterlo estrarre."
+            )
+            dlg = AccessibleMsgDialog(self, _("Nessuna Selezione"), msg)
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        file_info = self.files_info[selected_idx]
+        with wx.FileDialog(
+            self,
+            _("Salva copia del backup"),
+            defaultFile=file_info["name"],
+            style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT,
+        ) as file_dlg:
+            if file_dlg.ShowModal() != wx.ID_OK:
+                return
+            dest_path = file_dlg.GetPath()
+
+        try:
+            self.store.restore(file_info["id"], dest_path)
+            play_sound("salvato")
+        except (OSError, BackupStoreError) as e:
+            err_msg = _("Impossibile estrarre il file '{name}': {error}").format(
+                name=file_info["name"], error=e
+            )
+            err_dlg = AccessibleMsgDialog(self, _("Errore"), err_msg)
+            err_dlg.ShowModal()
+            err_dlg.Destroy()
+
     def on_delete_selected(self, event):
         """Elimina il file attualmente selezionato nella lista."""
         selected_idx = self.list_ctrl.GetNextItem(
@@ -290,14 +296,14 @@ class BackupCleanupDialog(wx.Dialog):
 
         file_info = self.files_info[selected_idx]
         msg = _(
-            "Sei sicuro di voler spostare nel cestino il file di backup '{name}'?"
+            "Sei sicuro di voler spostare nel Cestino il file di backup '{name}'?"
         ).format(name=file_info["name"])
         dlg = AccessibleMsgDialog(
             self, _("Conferma Eliminazione"), msg, style=wx.YES_NO
         )
         if dlg.ShowModal() == wx.ID_YES:
             dlg.Destroy()
-            if delete_file_to_trash(file_info["path"]):
+            if not self._delete_entries([file_info]):
                 play_sound("cancellato")
                 self.populate_list()
             else:
@@ -320,17 +326,14 @@ class BackupCleanupDialog(wx.Dialog):
             return
 
         msg = _(
-            "Sei sicuro di voler spostare nel cestino tutti i {count} file di backup più vecchi di 18 mesi?"
+            "Sei sicuro di voler spostare nel Cestino tutti i {count} file di backup più vecchi di 18 mesi?"
         ).format(count=len(self.old_files_info))
         dlg = AccessibleMsgDialog(
             self, _("Conferma Eliminazione Consigliata"), msg, style=wx.YES_NO
         )
         if dlg.ShowModal() == wx.ID_YES:
             dlg.Destroy()
-            failed = []
-            for f in self.old_files_info:
-                if not delete_file_to_trash(f["path"]):
-                    failed.append(f["name"])
+            failed = self._delete_entries(self.old_files_info)
             play_sound("cancellato")
             self.populate_list()
             if failed:
@@ -353,17 +356,14 @@ class BackupCleanupDialog(wx.Dialog):
             return
 
         msg = _(
-            "ATTENZIONE: Sei sicuro di voler spostare nel cestino TUTTI i file di backup contenuti nella cartella?"
+            "ATTENZIONE: Sei sicuro di voler spostare nel Cestino TUTTI i file di backup contenuti nella cartella?"
         )
         dlg = AccessibleMsgDialog(
             self, _("Conferma Svuotamento Cartella"), msg, style=wx.YES_NO
         )
         if dlg.ShowModal() == wx.ID_YES:
             dlg.Destroy()
-            failed = []
-            for f in self.files_info:
-                if not delete_file_to_trash(f["path"]):
-                    failed.append(f["name"])
+            failed = self._delete_entries(self.files_info)
             play_sound("cancellato")
             self.populate_list()
             if failed:
@@ -1,8 +1,9 @@
 import wx
 import builtins
-from fide_db import search_players
+from fide_search_service import SEARCH_DEBOUNCE_MS, shared_service
 from gui.settings import apply_visual_settings
 from gui.dialogs.accessible_msg_dialog import AccessibleMsgDialog
+from gui.virtual_list import VirtualListCtrl
 from utils import play_sound
 
 _ = getattr(builtins, "_", lambda s: s)
@@ -11,8 +12,10 @@ _ = getattr(builtins, "_", lambda s: s)
 class FideQueryDialog(wx.Dialog):
     """
     Finestra di dialogo per la consultazione del Database FIDE locale.
-    Layout a doppia vista: ListBox per la scelta dei risultati a sinistra,
+    Layout a doppia vista: lista virtuale per la scelta dei risultati a sinistra,
     e TextCtrl multi-riga dettagliato a destra per la consultazione dei dati completi.
+    La lista mostra direttamente i risultati letti dal servizio di ricerca e
+    chiede la pagina successiva quando si arriva alle ultime righe.
     """
 
     def __init__(self, parent, players_db, settings):
@@ -27,8 +30,9 @@ class FideQueryDialog(wx.Dialog):
         self.settings = settings
         self.players_db = players_db
 
-        self.all_fide_matches = []
-        self.fide_displayed_count = 0
+        self.fide_request = None
+        self.results_map = []
+        self._search_service = shared_service()
 
         self._search_timer = wx.Timer(self)
         self.Bind(wx.EVT_TIMER, self._on_debounced_search, self._search_timer)
@@ -59,16 +63,25 @@ class FideQueryDialog(wx.Dialog):
         # Area Risultati e Dettaglio (Splitter o HBox)
         hbox_views = wx.BoxSizer(wx.HORIZONTAL)
 
-        # Sizer Sinistra: ListBox dei Risultati
+        # Sizer Sinistra: lista virtuale dei Risultati
         vbox_left = wx.BoxSizer(wx.VERTICAL)
         vbox_left.Add(
             wx.StaticText(panel, label=_("Giocatori Trovati:")), 0, wx.BOTTOM, 5
         )
-        self.list_results = wx.ListBox(panel, style=wx.LB_SINGLE | wx.LB_NEEDED_SB)
+        # Sostituisce la vecchia riga "-- Mostra altri --": totale e righe lette
+        self.lbl_status = wx.StaticText(panel, label="")
+        self.lbl_status.SetName(_("Stato ricerca FIDE"))
+        vbox_left.Add(self.lbl_status, 0, wx.EXPAND | wx.BOTTOM, 5)
+        self.list_results = VirtualListCtrl(
+            panel,
+            _("Giocatori Trovati"),
+            self._result_label,
+            on_near_end=self.load_more_results,
+        )
         self.list_results.SetMinSize((300, -1))
-        self.list_results.Bind(wx.EVT_LISTBOX, self.on_item_selected)
-        self.list_results.Bind(wx.EVT_LISTBOX_DCLICK, self.on_import_player)
-        self.list_results.Bind(wx.EVT_CHAR_HOOK, self.on_list_key)
+        self.list_results.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_item_selected)
+        # Doppio clic e Invio attivano la riga
+        self.list_results.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.on_import_player)
         vbox_left.Add(self.list_results, 1, wx.EXPAND)
 
         hbox_views.Add(vbox_left, 3, wx.EXPAND | wx.RIGHT, 10)
@@ -104,71 +117,91 @@ class FideQueryDialog(wx.Dialog):
 
     def apply_theme(self):
         apply_visual_settings(self.search_input, self.settings)
+        apply_visual_settings(self.lbl_status, self.settings)
         apply_visual_settings(self.list_results, self.settings)
         apply_visual_settings(self.detail_text, self.settings)
 
     def on_search_changed(self, event):
         self._search_timer.Stop()
-        self._search_timer.Start(900, wx.TIMER_ONE_SHOT)
+        self._search_timer.Start(SEARCH_DEBOUNCE_MS, wx.TIMER_ONE_SHOT)
 
     def _on_debounced_search(self, event):
         query = self.search_input.GetValue().strip()
-        self.list_results.Clear()
         self.results_map = []
-        self.all_fide_matches = []
-        self.fide_displayed_count = 0
+        self.list_results.set_items(self.results_map)
+        self.fide_request = None
         self.detail_text.Clear()
+        self.lbl_status.SetLabel("")
 
         if len(query) < 3:
+            self._search_service.cancel()
             return
 
         play_sound("fide_attesa")
-        self.all_fide_matches = search_players(query)
-        self.load_more_results()
-        play_sound("fide_pronto")
+        # La ricerca gira sul thread del servizio e annulla quella ancora in corso
+        self.fide_request = self._search_service.search(
+            query, callback=self._deliver_results
+        )
 
-        if self.list_results.GetCount() > 0:
-            self.list_results.SetSelection(0)
-            self.on_item_selected(None)
+    def _deliver_results(self, request):
+        # Chiamata dal thread di ricerca: l'aggiornamento passa al thread dell'interfaccia
+        wx.CallAfter(self._on_search_results, request)
 
-    def load_more_results(self):
-        # Rimuovi l'eventuale precedente item "Mostra altri..."
-        last_idx = self.list_results.GetCount() - 1
-        if last_idx >= 0 and self.list_results.GetString(last_idx).startswith("--"):
-            self.list_results.Delete(last_idx)
-
-        start = self.fide_displayed_count
-        end = min(start + 100, len(self.all_fide_matches))
-
-        for i in range(start, end):
-            p = self.all_fide_matches[i]
-            fide_id_str = str(p.get("id_fide"))
-            name = f"{p.get('last_name', '')} {p.get('first_name', '')}".strip()
-            elo_std = p.get("elo_standard", 0)
-            elo_rap = p.get("elo_rapid", 0)
-            label = _(
-                "{name} (Std: {elo_std}, Rap: {elo_rap} - ID FIDE: {fide_id} - Anno: {anno} - FED: {fed})"
-            ).format(
-                name=name,
-                elo_std=elo_std,
-                elo_rap=elo_rap,
-                fide_id=fide_id_str,
-                anno=p.get("birth_year", _("N/D")),
-                fed=p.get("federation", _("N/D")),
+    def _on_search_results(self, request):
+        if not self or request is not self.fide_request:
+            return
+        if request.error is not None:
+            # I risultati già mostrati restano; la ricerca fallita viene segnalata
+            play_sound("errore")
+            self.lbl_status.SetLabel(
+                _("Errore durante la ricerca nel database FIDE: {error}").format(
+                    error=request.error
+                )
             )
-            self.list_results.Append(label)
-            self.results_map.append(p)
+            return
+        first_page = not self.results_map
+        # La lista legge direttamente i risultati accumulati dal servizio
+        self.results_map = request.results
+        if first_page:
+            self.list_results.set_items(self.results_map)
+        else:
+            self.list_results.extend_items(self.results_map)
+        self._update_status(request)
+
+        if first_page:
+            play_sound("fide_pronto")
+            if self.list_results.GetCount() > 0:
+                self.list_results.SetSelection(0)
+                self.on_item_selected(None)
 
-        self.fide_displayed_count = end
+    def _update_status(self, request):
+        loaded = len(request.results)
+        if request.has_more:
+            status = _(
+                "{total} giocatori trovati, {loaded} caricati: scorri la lista per vedere gli altri."
+            ).format(total=request.total, loaded=loaded)
+        else:
+            status = _("{total} giocatori trovati.").format(total=loaded)
+        self.lbl_status.SetLabel(status)
 
-        # Se ci sono altri risultati, aggiungi la riga speciale
-        if self.fide_displayed_count < len(self.all_fide_matches):
-            total = len(self.all_fide_matches)
-            rem = total - self.fide_displayed_count
-            lbl = _("-- Mostra altri risultati ({rem} rimanenti su {total}) --").format(
-                rem=rem, total=total
+    def load_more_results(self):
+        """Chiede al servizio la pagina successiva della ricerca corrente."""
+        if self.fide_request is not None and self.fide_request.has_more:
+            self._search_service.load_more(
+                self.fide_request, callback=self._deliver_results
             )
-            self.list_results.Append(lbl)
+
+    def _result_label(self, p):
+        return _(
+            "{name} (Std: {elo_std}, Rap: {elo_rap} - ID FIDE: {fide_id} - Anno: {anno} - FED: {fed})"
+        ).format(
+            name=f"{p.get('last_name', '')} {p.get('first_name', '')}".strip(),
+            elo_std=p.get("elo_standard", 0),
+            elo_rap=p.get("elo_rapid", 0),
+            fide_id=str(p.get("id_fide")),
+            anno=p.get("birth_year", _("N/D")),
+            fed=p.get("federation", _("N/D")),
+        )
 
     def on_item_selected(self, event):
         sel = self.list_results.GetSelection()
@@ -176,11 +209,6 @@ class FideQueryDialog(wx.Dialog):
             self.detail_text.Clear()
             return
 
-        # Ignora se è la riga speciale "Mostra altri..."
-        if self.list_results.GetString(sel).startswith("--"):
-            self.detail_text.Clear()
-            return
-
         p = self.results_map[sel]
 
         details = (
@@ -241,15 +269,6 @@ class FideQueryDialog(wx.Dialog):
         if sel == wx.NOT_FOUND:
             return
 
-        # Gestisci il click su "Mostra altri..."
-        if self.list_results.GetString(sel).startswith("--"):
-            self.load_more_results()
-            new_sel = sel
-            if new_sel < self.list_results.GetCount():
-                self.list_results.SetSelection(new_sel)
-                self.on_item_selected(None)
-            return
-
         fide_player = self.results_map[sel]
         fide_id_str = str(fide_player.get("id_fide"))
 
@@ -318,7 +337,7 @@ class FideQueryDialog(wx.Dialog):
         }
 
         self.players_db[new_id] = new_player
-        save_players_db(self.players_db)
+        save_players_db(self.players_db, changed_ids=[new_id])
 
         msg = _(
             "Giocatore '{name}' importato con successo nel database locale con ID '{id}'."
@@ -329,10 +348,3 @@ class FideQueryDialog(wx.Dialog):
         dlg = AccessibleMsgDialog(self, _("Importazione Completata"), msg)
         dlg.ShowModal()
         dlg.Destroy()
-
-    def on_list_key(self, event):
-        key_code = event.GetKeyCode()
-        if key_code == wx.WXK_RETURN:
-            self.on_import_player(None)
-        else:
-            event.Skip()
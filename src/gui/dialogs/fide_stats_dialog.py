@@ -0,0 +1,55 @@
+import wx
+import builtins
+from db_players import format_fide_stats
+from fide_db import get_fide_stats
+from gui.settings import apply_visual_settings
+
+_ = getattr(builtins, "_", lambda s: s)
+
+
+class FideStatsDialog(wx.Dialog):
+    """
+    Panoramica del database FIDE locale: giocatori per federazione, titoli e
+    distribuzione dei rating. I dati arrivano dalle tabelle riassuntive
+    calcolate durante l'importazione, quindi la finestra si apre subito.
+    Il resoconto è in una TextCtrl di sola lettura, navigabile con le frecce.
+    """
+
+    def __init__(self, parent, settings):
+        super().__init__(
+            parent,
+            title=_("Statistiche Database FIDE"),
+            size=(650, 550),
+            style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER,
+        )
+        self.settings = settings
+
+        self.init_ui()
+        self.apply_theme()
+        self.Centre()
+        wx.CallAfter(self.report_text.SetFocus)
+
+    def init_ui(self):
+        panel = wx.Panel(self)
+        vbox = wx.BoxSizer(wx.VERTICAL)
+
+        report = "\n".join(format_fide_stats(get_fide_stats()))
+        self.report_text = wx.TextCtrl(
+            panel, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH2, value=report
+        )
+        self.report_text.SetName(_("Statistiche del database FIDE"))
+        vbox.Add(self.report_text, 1, wx.EXPAND | wx.ALL, 10)
+
+        self.btn_close = wx.Button(panel, wx.ID_CLOSE, _("Chiudi"))
+        self.btn_close.Bind(wx.EVT_BUTTON, lambda evt: self.EndModal(wx.ID_CLOSE))
+        self.SetEscapeId(wx.ID_CLOSE)
+        vbox.Add(self.btn_close, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+
+        panel.SetSizer(vbox)
+
+    def apply_theme(self):
+        apply_visual_settings(self, self.settings)
+        for child in self.GetChildren():
+            apply_visual_settings(child, self.settings)
+        apply_visual_settings(self.report_text, self.settings)
+        apply_visual_settings(self.btn_close, self.settings)
@@ -1,7 +1,11 @@
 import wx
 import builtins
 import threading
-from db_players import aggiorna_db_fide_locale
+from db_players import (
+    aggiorna_db_fide_locale,
+    format_fide_phase_times,
+    format_fide_update_report,
+)
 from gui.settings import apply_visual_settings
 from gui.dialogs.accessible_msg_dialog import AccessibleMsgDialog
 
@@ -149,6 +153,7 @@ class FideUpdateDialog(wx.Dialog):
             d_time = format_duration(stats.get("download_time", 0.0))
             p_time = format_duration(stats.get("processing_time", 0.0))
             saved_count = stats.get("saved_count", 0)
+            rows_per_second = stats.get("rows_per_second", 0.0)
 
             old_c = stats.get("old_count", 0)
             new_c = stats.get("new_count", 0)
@@ -157,8 +162,13 @@ class FideUpdateDialog(wx.Dialog):
                 "Database FIDE locale aggiornato con successo!\n\n"
                 "Tempo impiegato per il download: {d_time}\n"
                 "Tempo per l'elaborazione del DB SQLite: {p_time}\n"
-                "Totale giocatori salvati: {saved_count}"
-            ).format(d_time=d_time, p_time=p_time, saved_count=saved_count)
+                "Totale giocatori salvati: {saved_count} ({rate:.0f} al secondo)"
+            ).format(
+                d_time=d_time,
+                p_time=p_time,
+                saved_count=saved_count,
+                rate=rows_per_second,
+            )
 
             # Se c'era già un DB con dei record, mostriamo la differenza e la percentuale
             if old_c > 0:
@@ -170,6 +180,16 @@ class FideUpdateDialog(wx.Dialog):
                     "Prima {old_c} giocatori, ora {new_c} = {sign}{diff} ({sign}{perc:.2f}%)"
                 ).format(old_c=old_c, new_c=new_c, sign=sign, diff=diff, perc=perc)
 
+            update_report = stats.get("update_report")
+            if update_report:
+                success_msg += "\n\n" + "\n".join(
+                    format_fide_update_report(update_report)
+                )
+
+            phase_times = stats.get("phase_times")
+            if phase_times:
+                success_msg += "\n\n" + "\n".join(format_fide_phase_times(phase_times))
+
             self.status_label.SetLabel(
                 _("Database FIDE locale aggiornato con successo!")
             )
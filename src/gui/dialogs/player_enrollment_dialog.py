@@ -1,8 +1,9 @@
 import wx
 import builtins
-from fide_db import search_players
+from fide_search_service import SEARCH_DEBOUNCE_MS, shared_service
 from gui.settings import apply_visual_settings
-from utils import match_player_query, play_sound
+from utils import play_sound
+from player_search import search_players as search_local_players
 
 _ = getattr(builtins, "_", lambda s: s)
 
@@ -31,8 +32,10 @@ class PlayerEnrollmentDialog(wx.Dialog):
         # Facciamo una copia dei giocatori iscritti per gestire l'annullamento
         self.enrolled_players = list(enrolled_players)
 
-        self.all_fide_matches = []
-        self.fide_displayed_count = 0
+        self.fide_request = None
+        self._fide_target_sel = None
+        self._fide_more_selection = None
+        self._search_service = shared_service()
 
         self._fide_search_timer = wx.Timer(self)
         self.Bind(wx.EVT_TIMER, self._on_debounced_fide_search, self._fide_search_timer)
@@ -122,7 +125,14 @@ class PlayerEnrollmentDialog(wx.Dialog):
             panel, label=_("Nuovo Giocatore Da Zero (Principiante)")
         )
         self.btn_new_player.Bind(wx.EVT_BUTTON, self.on_create_new_player)
-        btn_left_sizer.Add(self.btn_new_player, 2, wx.EXPAND)
+        btn_left_sizer.Add(self.btn_new_player, 2, wx.EXPAND | wx.RIGHT, 5)
+
+        self.btn_import_file = wx.Button(panel, label=_("Importa da &File..."))
+        self.btn_import_file.SetName(
+            _("Iscrivi i giocatori elencati in un file CSV o TSV")
+        )
+        self.btn_import_file.Bind(wx.EVT_BUTTON, self.on_import_file)
+        btn_left_sizer.Add(self.btn_import_file, 1, wx.EXPAND)
 
         left_vbox.Add(btn_left_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
@@ -215,24 +225,12 @@ class PlayerEnrollmentDialog(wx.Dialog):
         # Mappa per escludere omonimi già iscritti
         enrolled_ids = {p.get("id") for p in self.enrolled_players if p.get("id")}
 
-        matching_with_scores = []
-        for p_id, p in self.players_db.items():
-            if p_id in enrolled_ids:
-                continue
-
-            if not query:
-                # Se la query è vuota, ordiniamo solo alfabeticamente
-                score = (
-                    0,
-                    0,
-                    p.get("last_name", "").lower(),
-                    p.get("first_name", "").lower(),
-                )
-                matching_with_scores.append((score, p))
-            else:
-                score = match_player_query(p, query)
-                if score is not None:
-                    matching_with_scores.append((score, p))
+        # L'indice condiviso restituisce solo i giocatori che soddisfano la query
+        matching_with_scores = [
+            (score, self.players_db[p_id])
+            for p_id, score in search_local_players(self.players_db, query).items()
+            if p_id not in enrolled_ids
+        ]
 
         # Ordina per rilevanza query, poi per ELO decrescente
         matching_with_scores.sort(
@@ -265,7 +263,7 @@ class PlayerEnrollmentDialog(wx.Dialog):
     def on_search_fide_changed(self, event):
         """Filtra e aggiorna i risultati del DB FIDE."""
         self._fide_search_timer.Stop()
-        self._fide_search_timer.Start(900, wx.TIMER_ONE_SHOT)
+        self._fide_search_timer.Start(SEARCH_DEBOUNCE_MS, wx.TIMER_ONE_SHOT)
 
     def _on_debounced_fide_search(self, event):
         self.esegui_ricerca_fide()
@@ -274,10 +272,10 @@ class PlayerEnrollmentDialog(wx.Dialog):
         query = self.search_fide.GetValue().strip()
         self.list_fide_results.Clear()
         self.fide_results_map = []
-        self.all_fide_matches = []
-        self.fide_displayed_count = 0
+        self.fide_request = None
 
         if len(query) < 3:
+            self._search_service.cancel()
             self.lbl_fide_status.SetLabel(_("Digita almeno 3 caratteri per cercare."))
             return
 
@@ -289,18 +287,41 @@ class PlayerEnrollmentDialog(wx.Dialog):
             if p.get("fide_id_num_str")
         }
 
-        self.all_fide_matches = search_players(
-            query, exclude_fide_ids=enrolled_fide_ids
+        # La ricerca gira sul thread del servizio e annulla quella ancora in corso
+        self._fide_target_sel = target_sel
+        self.fide_request = self._search_service.search(
+            query,
+            callback=self._deliver_fide_results,
+            exclude_fide_ids=enrolled_fide_ids,
         )
 
-        self.load_more_fide_results()
+    def _deliver_fide_results(self, request):
+        # Chiamata dal thread di ricerca: l'aggiornamento passa al thread dell'interfaccia
+        wx.CallAfter(self._on_fide_results, request)
 
-        total_found = len(self.all_fide_matches)
-        self.lbl_fide_status.SetLabel(
-            _("Giocatori trovati: {total}").format(total=total_found)
-        )
+    def _on_fide_results(self, request):
+        if not self or request is not self.fide_request:
+            return
+        first_page = not self.fide_results_map
+        self._append_fide_results(request)
+
+        if not first_page:
+            if self._fide_more_selection is not None:
+                if self._fide_more_selection < self.list_fide_results.GetCount():
+                    self.list_fide_results.SetSelection(self._fide_more_selection)
+                self._fide_more_selection = None
+            return
+
+        if request.approximate:
+            status = _("Nessuna corrispondenza esatta: {total} nomi simili").format(
+                total=request.total
+            )
+        else:
+            status = _("Giocatori trovati: {total}").format(total=request.total)
+        self.lbl_fide_status.SetLabel(status)
 
         # Ripristina la selezione se indicata o seleziona il primo elemento
+        target_sel = self._fide_target_sel
         new_count = self.list_fide_results.GetCount()
         if new_count > 0:
             if target_sel is not None:
@@ -316,6 +337,13 @@ class PlayerEnrollmentDialog(wx.Dialog):
         play_sound("fide_pronto")
 
     def load_more_fide_results(self):
+        """Chiede al servizio la pagina successiva della ricerca FIDE corrente."""
+        if self.fide_request is not None:
+            self._search_service.load_more(
+                self.fide_request, callback=self._deliver_fide_results
+            )
+
+    def _append_fide_results(self, request):
         # Rimuovi l'eventuale precedente item "Mostra altri..."
         last_idx = self.list_fide_results.GetCount() - 1
         if last_idx >= 0 and self.list_fide_results.GetString(last_idx).startswith(
@@ -323,11 +351,7 @@ class PlayerEnrollmentDialog(wx.Dialog):
         ):
             self.list_fide_results.Delete(last_idx)
 
-        start = self.fide_displayed_count
-        end = min(start + 100, len(self.all_fide_matches))
-
-        for i in range(start, end):
-            p = self.all_fide_matches[i]
+        for p in request.results[len(self.fide_results_map) :]:
             fide_id_str = str(p.get("id_fide"))
             name = f"{p.get('last_name', '')} {p.get('first_name', '')}".strip()
             elo_std = p.get("elo_standard", 0)
@@ -345,12 +369,10 @@ class PlayerEnrollmentDialog(wx.Dialog):
             self.list_fide_results.Append(label)
             self.fide_results_map.append(p)
 
-        self.fide_displayed_count = end
-
         # Se ci sono altri risultati, aggiungi la riga speciale
-        if self.fide_displayed_count < len(self.all_fide_matches):
-            total = len(self.all_fide_matches)
-            rem = total - self.fide_displayed_count
+        if request.has_more:
+            total = request.total
+            rem = total - len(self.fide_results_map)
             lbl = _("-- Mostra altri risultati ({rem} rimanenti su {total}) --").format(
                 rem=rem, total=total
             )
@@ -395,10 +417,9 @@ class PlayerEnrollmentDialog(wx.Dialog):
 
         # Controlla se è la riga speciale "Mostra altri..."
         if self.list_fide_results.GetString(sel).startswith("--"):
+            # La selezione passa al primo nuovo risultato quando arriva la pagina
+            self._fide_more_selection = sel
             self.load_more_fide_results()
-            new_sel = sel
-            if new_sel < self.list_fide_results.GetCount():
-                self.list_fide_results.SetSelection(new_sel)
             return
 
         fide_player = self.fide_results_map[sel]
@@ -534,6 +555,65 @@ class PlayerEnrollmentDialog(wx.Dialog):
     def get_enrolled_players(self):
         return self.enrolled_players
 
+    def on_import_file(self, event):
+        dlg = wx.FileDialog(
+            self,
+            _("Importa iscritti da file"),
+            wildcard=_("File CSV o TSV (*.csv;*.tsv;*.txt)|*.csv;*.tsv;*.txt"),
+            style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
+        )
+        if dlg.ShowModal() != wx.ID_OK:
+            dlg.Destroy()
+            return
+        path = dlg.GetPath()
+        dlg.Destroy()
+
+        from db_players import importa_iscrizioni
+        from gui.dialogs.accessible_msg_dialog import AccessibleMsgDialog
+
+        try:
+            players, report = importa_iscrizioni(
+                path, self.players_db, self.enrolled_players
+            )
+        except (OSError, ValueError) as e:
+            dlg = AccessibleMsgDialog(
+                self,
+                _("Errore"),
+                _("Impossibile leggere il file: {error}").format(error=e),
+                settings=self.settings,
+            )
+            dlg.ShowModal()
+            dlg.Destroy()
+            return
+
+        self.enrolled_players.extend(players)
+        self.update_enrolled_list()
+        self.on_search_local_changed(None)
+        self.esegui_ricerca_fide()
+        if players:
+            play_sound("aggiunta_giocatore")
+
+        lines = [
+            _("Giocatori iscritti: {count}").format(count=len(players)),
+            _("Dal database personale: {count}").format(count=report["from_db"]),
+            _("Dal database FIDE: {count}").format(count=report["from_fide"]),
+            _("Nuovi giocatori creati: {count}").format(count=report["created"]),
+        ]
+        if report["skipped"]:
+            lines.append("")
+            lines.append(
+                _("Righe saltate: {count}").format(count=len(report["skipped"]))
+            )
+            for line_no, reason in report["skipped"]:
+                lines.append(
+                    _("Riga {line}: {reason}").format(line=line_no, reason=reason)
+                )
+        dlg = AccessibleMsgDialog(
+            self, _("Importazione completata"), "\n".join(lines), settings=self.settings
+        )
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def on_create_new_player(self, event):
         dlg_ln = wx.TextEntryDialog(
             self, _("Inserisci Cognome del nuovo giocatore:"), _("Crea Nuovo Giocatore")
@@ -596,7 +676,7 @@ class PlayerEnrollmentDialog(wx.Dialog):
 
         # Salva nel DB giocatori
         self.players_db[new_id] = new_player
-        save_players_db(self.players_db)
+        save_players_db(self.players_db, changed_ids=[new_id])
 
         # Iscrivi automaticamente al torneo corrente
         self.enrolled_players.append(new_player)
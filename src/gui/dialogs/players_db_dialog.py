@@ -3,7 +3,9 @@ import builtins
 from db_players import load_players_db, save_players_db, generate_player_id
 from gui.settings import apply_visual_settings
 from gui.dialogs.accessible_msg_dialog import AccessibleMsgDialog
+from gui.virtual_list import VirtualListCtrl
 from utils import play_sound
+from player_search import search_players
 
 _ = getattr(builtins, "_", lambda s: s)
 
@@ -12,6 +14,8 @@ class PlayersDbDialog(wx.Dialog):
     """
     Finestra di dialogo per la gestione del Database Giocatori Locale.
     Usa un albero interattivo ed accessibile a destra e una lista con filtri a sinistra.
+    La lista è virtuale: a ogni filtro cambia solo l'elenco degli id e le
+    etichette vengono composte per le sole righe visibili.
     """
 
     def __init__(self, parent, settings):
@@ -45,8 +49,10 @@ class PlayersDbDialog(wx.Dialog):
         self.search_input.Bind(wx.EVT_TEXT, self.on_search_changed)
         left_vbox.Add(self.search_input, 0, wx.EXPAND | wx.ALL, 5)
 
-        self.list_players = wx.ListBox(panel, style=wx.LB_SINGLE | wx.LB_NEEDED_SB)
-        self.list_players.Bind(wx.EVT_LISTBOX, self.on_player_selected)
+        self.list_players = VirtualListCtrl(
+            panel, _("Elenco giocatori"), self._player_label
+        )
+        self.list_players.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_player_selected)
         left_vbox.Add(self.list_players, 1, wx.EXPAND | wx.ALL, 5)
 
         btn_add = wx.Button(panel, label=_("Aggiungi Nuovo Giocatore"))
@@ -85,31 +91,26 @@ class PlayersDbDialog(wx.Dialog):
         apply_visual_settings(self.list_players, self.settings)
         apply_visual_settings(self.tree_ctrl, self.settings)
 
+    def _player_label(self, p_id):
+        p = self.players_db[p_id]
+        name = f"{p.get('last_name', '')} {p.get('first_name', '')}".strip()
+        elo_std = p.get("current_elo", 1399)
+        elo_rap = p.get("elo_rapid", 0)
+        return f"{name} (Std: {elo_std}, Rap: {elo_rap} - ID: {p_id})"
+
     def on_search_changed(self, event):
-        query = self.search_input.GetValue().strip().lower()
-        search_terms = query.split()
+        query = self.search_input.GetValue().strip()
 
-        self.list_players.Clear()
-        self.players_map = []
+        # Indice di ricerca condiviso (operatori +, - e =)
+        scores = search_players(self.players_db, query)
 
-        matching = []
-        for p_id, p in self.players_db.items():
-            full_name = f"{p.get('first_name', '')} {p.get('last_name', '')}".lower()
-            if not search_terms or all(t in full_name for t in search_terms):
-                matching.append((p_id, p))
+        # Ordina per rilevanza, poi per ELO decrescente
+        def sort_key(p_id):
+            elo = self.players_db[p_id].get("current_elo") or 1399
+            return (scores[p_id][:2], -elo, scores[p_id][2:])
 
-        # Ordina per ELO decrescente
-        matching_sorted = sorted(
-            matching, key=lambda item: item[1].get("current_elo", 1399), reverse=True
-        )
-
-        for p_id, p in matching_sorted:
-            name = f"{p.get('last_name', '')} {p.get('first_name', '')}".strip()
-            elo_std = p.get("current_elo", 1399)
-            elo_rap = p.get("elo_rapid", 0)
-            label = f"{name} (Std: {elo_std}, Rap: {elo_rap} - ID: {p_id})"
-            self.list_players.Append(label)
-            self.players_map.append(p_id)
+        self.players_map = sorted(scores, key=sort_key)
+        self.list_players.set_items(self.players_map)
 
         if self.players_map:
             self.list_players.SetSelection(0)
@@ -125,7 +126,11 @@ class PlayersDbDialog(wx.Dialog):
             self.selected_player_id = None
             return
 
-        self.selected_player_id = self.players_map[sel]
+        player_id = self.players_map[sel]
+        # La selezione impostata dal codice arriva anche come evento della lista
+        if player_id == self.selected_player_id and self.tree_ctrl.GetRootItem().IsOk():
+            return
+        self.selected_player_id = player_id
         self.populate_player_tree()
 
     def populate_player_tree(self):
@@ -452,7 +457,7 @@ class PlayersDbDialog(wx.Dialog):
 
             from db_players import save_players_db
 
-            save_players_db(self.players_db)
+            save_players_db(self.players_db, changed_ids=[self.selected_player_id])
             play_sound("timbratura")
 
             # Aggiorna il testo del nodo in-place per preservare il focus dell'albero
@@ -533,17 +538,8 @@ class PlayersDbDialog(wx.Dialog):
                         p_name = f"{p.get('last_name', '')} {p.get('first_name', '')}".strip()
                         self.tree_ctrl.SetItemText(root_item, p_name)
 
-                sel = self.list_players.GetSelection()
-                if sel != wx.NOT_FOUND:
-                    p_id = self.players_map[sel]
-                    name_lbl = (
-                        f"{p.get('last_name', '')} {p.get('first_name', '')}".strip()
-                    )
-                    elo_std = p.get("current_elo", 1399)
-                    elo_rap = p.get("elo_rapid", 0)
-                    self.list_players.SetString(
-                        sel, f"{name_lbl} (Std: {elo_std}, Rap: {elo_rap} - ID: {p_id})"
-                    )
+                # L'etichetta viene ricomposta dal record al ridisegno della riga
+                self.list_players.refresh_row(self.list_players.GetSelection())
 
         dlg.Destroy()
 
@@ -591,7 +587,9 @@ class PlayersDbDialog(wx.Dialog):
                             medal_key = medal_map.get(rank_int)
                             if medal_key and medals.get(medal_key, 0) > 0:
                                 medals[medal_key] -= 1
-                    save_players_db(self.players_db)
+                    save_players_db(
+                        self.players_db, changed_ids=[self.selected_player_id]
+                    )
                     self.populate_player_tree()
                 dlg.Destroy()
             return
@@ -613,7 +611,7 @@ class PlayersDbDialog(wx.Dialog):
         )
         if dlg.ShowModal() == wx.ID_YES:
             del self.players_db[player_id]
-            save_players_db(self.players_db)
+            save_players_db(self.players_db, changed_ids=[])
             play_sound("tornello_rimozione_giocatore")
             self.on_search_changed(None)
         dlg.Destroy()
@@ -670,15 +668,13 @@ class PlayersDbDialog(wx.Dialog):
         }
 
         self.players_db[new_id] = new_player
-        save_players_db(self.players_db)
+        save_players_db(self.players_db, changed_ids=[new_id])
         play_sound("aggiunta_giocatore")
 
         self.search_input.SetValue("")  # Resetta ricerca per mostrare il nuovo
         self.on_search_changed(None)
 
-        # Cerca ed evidenzia il nuovo giocatore aggiunto nella listbox
-        for idx, p_id in enumerate(self.players_map):
-            if p_id == new_id:
-                self.list_players.SetSelection(idx)
-                self.on_player_selected(None)
-                break
+        # Cerca ed evidenzia il nuovo giocatore aggiunto nella lista
+        if new_id in self.players_map:
+            self.list_players.SetSelection(self.players_map.index(new_id))
+            self.on_player_selected(None)
@@ -1,11 +1,7 @@
 import wx
 import builtins
-from db_players import load_players_db, save_players_db
-from fide_db import (
-    fide_db_exists,
-    get_player_by_fide_id,
-    search_players_by_name,
-)
+from db_players import iter_fide_matches, load_players_db, save_players_db
+from fide_db import fide_db_exists
 from gui.settings import apply_visual_settings
 from gui.dialogs.accessible_msg_dialog import AccessibleMsgDialog
 from utils import play_sound
@@ -46,27 +42,14 @@ class SyncDatabaseDialog(wx.Dialog):
         if not self.players_db or not self.fide_db_available:
             return
 
-        for player_id, local_player in self.players_db.items():
-            fide_id_str = local_player.get("fide_id_num_str", "0")
-            fide_record = None
+        # Le ricerche FIDE avvengono in blocco su un'unica connessione
+        for player_id, local_player, fide_record, matches in iter_fide_matches(
+            self.players_db
+        ):
             new_fide_id = None
-            is_ambiguous = False
-            matches = []
-
-            if fide_id_str and fide_id_str != "0":
-                fide_record = get_player_by_fide_id(fide_id_str)
-            else:
-                # Cerca per nome e cognome
-                p_first = local_player.get("first_name", "")
-                p_last = local_player.get("last_name", "")
-
-                if p_first and p_last:
-                    matches = search_players_by_name(p_first, p_last)
-                    if len(matches) == 1:
-                        new_fide_id = str(matches[0]["id_fide"])
-                        fide_record = matches[0]
-                    elif len(matches) > 1:
-                        is_ambiguous = True
+            is_ambiguous = len(matches) > 1
+            if len(matches) == 1:
+                new_fide_id = str(matches[0]["id_fide"])
 
             updates = {}
             if fide_record:
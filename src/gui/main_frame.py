@@ -6,6 +6,7 @@ import builtins
 from version import __version__, __date__
 from gui.settings import apply_visual_settings, save_settings
 from gui.dialogs import AccessibleMsgDialog, VisualSettingsDialog
+from models import PlayerList, PlayersIndex, Tournament
 
 _ = getattr(builtins, "_", lambda s: s)
 
@@ -92,6 +93,7 @@ class MainFrame(wx.Frame):
         self.tree_ctrl.SetName(_("Centro comandi"))
         self.tree_ctrl.Bind(wx.EVT_TREE_SEL_CHANGED, self.on_tree_selection_changed)
         self.tree_ctrl.Bind(wx.EVT_TREE_ITEM_ACTIVATED, self.on_tree_item_activated)
+        self.tree_ctrl.Bind(wx.EVT_TREE_ITEM_EXPANDING, self.on_tree_item_expanding)
         self.tree_ctrl.Bind(wx.EVT_KEY_DOWN, self.on_tree_key_down)
         right_sizer.Add(self.lbl_tree, 0, wx.LEFT | wx.TOP | wx.BOTTOM, 2)
         right_sizer.Add(self.tree_ctrl, 1, wx.EXPAND)
@@ -188,6 +190,9 @@ class MainFrame(wx.Frame):
         self.item_fide_query = tools_menu.Append(
             wx.ID_ANY, _("&Consulta Database FIDE\tCtrl+K")
         )
+        self.item_fide_stats = tools_menu.Append(
+            wx.ID_ANY, _("S&tatistiche Database FIDE")
+        )
         self.item_fide_update = tools_menu.Append(
             wx.ID_ANY, _("&Verifica Aggiornamenti FIDE")
         )
@@ -210,6 +215,7 @@ class MainFrame(wx.Frame):
         self.Bind(wx.EVT_MENU, self.on_preferences, id=wx.ID_PREFERENCES)
         self.Bind(wx.EVT_MENU, self.on_help, id=wx.ID_HELP)
         self.Bind(wx.EVT_MENU, self.on_fide_query, self.item_fide_query)
+        self.Bind(wx.EVT_MENU, self.on_fide_stats, self.item_fide_stats)
         self.Bind(wx.EVT_MENU, self.on_fide_update, self.item_fide_update)
         self.Bind(wx.EVT_MENU, self.on_local_db, self.item_local_db)
         self.Bind(wx.EVT_MENU, self.on_sync_db, self.item_sync_db)
@@ -636,9 +642,11 @@ class MainFrame(wx.Frame):
             )
 
     def _check_backup_on_startup(self):
-        """Scansiona la cartella backup/ alla ricerca di file più vecchi di 18 mesi."""
-        backup_dir = "backup"
-        if not os.path.exists(backup_dir):
+        """Consulta l'indice dei backup alla ricerca di voci più vecchie di 18 mesi."""
+        from backup_store import BackupStore, BackupStoreError
+
+        store = BackupStore()
+        if not os.path.exists(store.backup_dir):
             return
 
         from datetime import datetime
@@ -656,15 +664,9 @@ class MainFrame(wx.Frame):
         else:
             limit_date = today - datetime.timedelta(days=548)  # ~18 mesi
 
-        old_files = []
         try:
-            for item in os.listdir(backup_dir):
-                filepath = os.path.join(backup_dir, item)
-                if os.path.isfile(filepath):
-                    mtime = datetime.fromtimestamp(os.path.getmtime(filepath))
-                    if mtime < limit_date:
-                        old_files.append((filepath, mtime))
-        except Exception:
+            old_files = store.older_than(limit_date)
+        except (OSError, BackupStoreError):
             return
 
         if not old_files:
@@ -689,12 +691,11 @@ class MainFrame(wx.Frame):
             # Mostra la finestra di pulizia
             self.on_backup_cleanup(None)
         else:
-            # Aggiorna mtime a oggi per non riproporlo
-            for filepath, _discard in old_files:
-                try:
-                    os.utime(filepath, None)  # imposta mtime e atime a oggi/ora
-                except Exception:
-                    pass
+            # Aggiorna la data di riferimento a oggi per non riproporlo
+            try:
+                store.touch([entry["id"] for entry in old_files])
+            except (OSError, BackupStoreError):
+                pass
 
     def _scan_and_load_initial_tournament(self):
         """Scansiona i file torneo in corso ed effettua il caricamento automatico se ce n'è solo uno."""
@@ -720,16 +721,13 @@ class MainFrame(wx.Frame):
         try:
             with open(filepath, "r", encoding="utf-8") as f:
                 data = json.load(f)
-            self.current_tournament = data
+            # Il torneo resta nel modello dati: liste versionate e players_dict
+            # vengono mantenuti da Tournament senza ulteriori conversioni
+            self.current_tournament = Tournament.from_dict(data)
             self.active_filename = filepath
 
-            # Ricostruisce players_dict per l'interfaccia grafica
-            self.current_tournament["players_dict"] = {
-                p["id"]: p for p in self.current_tournament.get("players", [])
-            }
-
             # Aggiorna titolo finestra
-            t_name = data.get("name", _("Torneo Sconosciuto"))
+            t_name = self.current_tournament.get("name", _("Torneo Sconosciuto"))
             title_str = f"Tornello - {_('Versione {version} - Data Rilascio {date} - [{name}]').format(version=__version__, date=__date__, name=t_name)}"
             self.SetTitle(title_str)
 
@@ -826,6 +824,7 @@ class MainFrame(wx.Frame):
             if data and isinstance(data, dict) and "action" in data:
                 key = (data.get("action"), data.get("filepath"), data.get("round"))
                 if key in expanded_actions:
+                    self._load_lazy_tree_node(child)
                     self.tree_ctrl.Expand(child)
             self._restore_tree_expansion_state(child, expanded_actions)
             child, cookie = self.tree_ctrl.GetNextChild(parent_node, cookie)
@@ -909,18 +908,21 @@ class MainFrame(wx.Frame):
             and os.path.basename(f) != "Tornello - Settings.json"
         ]
 
+        from serialization import read_tournament_header, tournament_has_rounds
+
+        # Come per i conclusi basta l'intestazione: i sottonodi di ogni torneo
+        # vengono creati (e il file letto per intero) solo all'espansione
         in_prep_files = []
         started_files = []
         for f in active_files:
             try:
-                with open(f, "r", encoding="utf-8") as f_in:
-                    data = json.load(f_in)
-                if data.get("concluded"):
+                header = read_tournament_header(f)
+                if header.get("concluded"):
                     continue
-                if len(data.get("rounds", [])) == 0:
-                    in_prep_files.append((f, data))
+                if tournament_has_rounds(f):
+                    started_files.append((f, header))
                 else:
-                    started_files.append((f, data))
+                    in_prep_files.append((f, header))
             except Exception:
                 pass
 
@@ -931,19 +933,19 @@ class MainFrame(wx.Frame):
         concluded_files = []
         for f in closed_files:
             try:
-                with open(f, "r", encoding="utf-8") as f_in:
-                    data = json.load(f_in)
-                concluded_files.append((f, data))
+                # Solo l'intestazione: il resto del nodo viene caricato all'espansione
+                concluded_files.append((f, read_tournament_header(f)))
             except Exception:
                 pass
 
         # 1. TORNEI IN CORSO (Attivi)
         for f, data in started_files:
-            t_node = self.add_tournament_node(self.tree_root, f, data)
+            t_node = self.add_tournament_node(self.tree_root, f, data, lazy=True)
             if not expanded_actions:
                 if self.active_filename and os.path.abspath(f) == os.path.abspath(
                     self.active_filename
                 ):
+                    self._load_lazy_tree_node(t_node)
                     self.tree_ctrl.Expand(t_node)
                     child, cookie = self.tree_ctrl.GetFirstChild(t_node)
                     while child.IsOk():
@@ -959,11 +961,12 @@ class MainFrame(wx.Frame):
             )
             self.tree_ctrl.SetItemData(prep_parent, {"action": "category_prep"})
             for f, data in in_prep_files:
-                t_node = self.add_tournament_node(prep_parent, f, data)
+                t_node = self.add_tournament_node(prep_parent, f, data, lazy=True)
                 if not expanded_actions:
                     if self.active_filename and os.path.abspath(f) == os.path.abspath(
                         self.active_filename
                     ):
+                        self._load_lazy_tree_node(t_node)
                         self.tree_ctrl.Expand(t_node)
                         self.tree_ctrl.Expand(prep_parent)
 
@@ -1001,7 +1004,7 @@ class MainFrame(wx.Frame):
                         pass
                 label_suffix = month_year
                 t_node = self.add_tournament_node(
-                    closed_parent, f, data, label_suffix=label_suffix
+                    closed_parent, f, data, label_suffix=label_suffix, lazy=True
                 )
                 if not expanded_actions:
                     if self.active_filename and os.path.abspath(f) == os.path.abspath(
@@ -1018,6 +1021,14 @@ class MainFrame(wx.Frame):
             self._restore_tree_expansion_state(self.tree_root, expanded_actions)
 
         if saved_data:
+            # Il nodo da riselezionare può stare sotto un torneo non ancora espanso
+            if isinstance(saved_data, dict) and saved_data.get("filepath"):
+                t_item = self._find_matching_item(
+                    self.tree_root,
+                    {"action": "select_tournament", "filepath": saved_data["filepath"]},
+                )
+                if t_item and t_item.IsOk():
+                    self._load_lazy_tree_node(t_item)
             target_item = self._find_matching_item(self.tree_root, saved_data)
             if target_item and target_item.IsOk():
                 self.tree_ctrl.SelectItem(target_item)
@@ -1030,6 +1041,8 @@ class MainFrame(wx.Frame):
     def add_round_subnodes(
         self, parent_node, r, data, filepath, players_dict, is_concluded
     ):
+        from utils import count_pending_matches, get_matches_by_board
+
         r_num = r.get("round")
         tot_rounds = data.get("total_rounds", 5)
 
@@ -1039,12 +1052,7 @@ class MainFrame(wx.Frame):
         )
         r_label = _("Turno {}").format(r_num)
         if is_current and not is_concluded:
-            all_done = True
-            for m in r.get("matches", []):
-                if m.get("result") is None and m.get("black_player_id") is not None:
-                    all_done = False
-                    break
-            if not all_done:
+            if count_pending_matches(data, r_num) > 0:
                 r_label = _("Turno corrente ({}/{})").format(r_num, tot_rounds)
 
         r_node = self.tree_ctrl.AppendItem(parent_node, r_label)
@@ -1059,9 +1067,13 @@ class MainFrame(wx.Frame):
             {"action": "category_giocate", "filepath": filepath, "round": r_num},
         )
 
+        # Le partite arrivano già in ordine di scacchiera dall'indice dei turni
+        round_matches_sorted = get_matches_by_board(data, r_num)
+        match_id_to_board = data["rounds_index"].boards
+
         matches_played = []
         matches_to_play = []
-        for m in r.get("matches", []):
+        for m in round_matches_sorted:
             if m.get("result") is not None or m.get("black_player_id") is None:
                 matches_played.append(m)
             else:
@@ -1069,20 +1081,11 @@ class MainFrame(wx.Frame):
 
         # Calcola numero e percentuale per le giocate
         played_count = len(matches_played)
-        total_count = len(r.get("matches", []))
+        total_count = len(round_matches_sorted)
         pct = (played_count / total_count * 100.0) if total_count > 0 else 0.0
         giocate_label = f"{_('giocate')} ({played_count}/{total_count}, {pct:.1f}%)"
         self.tree_ctrl.SetItemText(giocate_parent, giocate_label)
 
-        round_matches_sorted = sorted(
-            r.get("matches", []), key=lambda x: x.get("id", 0)
-        )
-        match_id_to_board = {
-            m.get("id"): idx for idx, m in enumerate(round_matches_sorted, 1)
-        }
-
-        matches_played.sort(key=lambda x: match_id_to_board.get(x.get("id"), 0))
-
         from datetime import datetime
         from config import DATE_FORMAT_ISO
 
@@ -1178,13 +1181,57 @@ class MainFrame(wx.Frame):
                     },
                 )
 
-    def add_tournament_node(self, parent, filepath, data, label_suffix=""):
+    def add_tournament_node(
+        self, parent, filepath, data, label_suffix="", lazy=False
+    ):
+        """
+        Aggiunge il nodo di un torneo. Con 'lazy' 'data' può contenere la sola
+        intestazione: i sottonodi vengono creati alla prima espansione.
+        """
         t_name = data.get("name", os.path.basename(filepath))
         t_node = self.tree_ctrl.AppendItem(parent, f"{t_name}{label_suffix}")
+        node_data = {"action": "select_tournament", "filepath": filepath}
+        if lazy:
+            node_data["lazy"] = True
+        self.tree_ctrl.SetItemData(t_node, node_data)
+        if lazy:
+            self.tree_ctrl.SetItemHasChildren(t_node, True)
+            return t_node
+        self._populate_tournament_node(t_node, filepath, data)
+        return t_node
+
+    def _load_lazy_tree_node(self, item):
+        """Crea i sottonodi di un torneo inserito con lazy=True, se non ancora fatto."""
+        node_data = self.tree_ctrl.GetItemData(item)
+        if not isinstance(node_data, dict) or not node_data.get("lazy"):
+            return
+        filepath = node_data.get("filepath")
         self.tree_ctrl.SetItemData(
-            t_node, {"action": "select_tournament", "filepath": filepath}
+            item, {"action": "select_tournament", "filepath": filepath}
         )
+        if (
+            self.current_tournament
+            and self.active_filename
+            and os.path.abspath(filepath) == os.path.abspath(self.active_filename)
+        ):
+            # Il torneo attivo è già in memoria
+            data = self.current_tournament
+        else:
+            try:
+                with open(filepath, "r", encoding="utf-8") as f_in:
+                    data = json.load(f_in)
+            except Exception:
+                self.tree_ctrl.SetItemHasChildren(item, False)
+                return
+        self._populate_tournament_node(item, filepath, data)
 
+    def on_tree_item_expanding(self, event):
+        item = event.GetItem()
+        if item.IsOk():
+            self._load_lazy_tree_node(item)
+        event.Skip()
+
+    def _populate_tournament_node(self, t_node, filepath, data):
         dati_node = self.tree_ctrl.AppendItem(t_node, _("Dati"))
         self.tree_ctrl.SetItemData(
             dati_node, {"action": "show_data", "filepath": filepath}
@@ -1358,7 +1405,7 @@ class MainFrame(wx.Frame):
             turni_node, {"action": "show_rounds", "filepath": filepath}
         )
 
-        players_dict = {p["id"]: p for p in players}
+        players_dict = PlayersIndex(players)
         is_concluded = data.get("concluded", False)
 
         if len(rounds) > 0:
@@ -1448,11 +1495,11 @@ class MainFrame(wx.Frame):
         self.tree_ctrl.SetItemData(
             partite_pgn_node, {"action": "show_pgn_matches_list", "filepath": filepath}
         )
+        from utils import get_matches_by_board
+
         for r in rounds:
             r_num = r.get("round")
-            round_matches_sorted = sorted(
-                r.get("matches", []), key=lambda x: x.get("id", 0)
-            )
+            round_matches_sorted = get_matches_by_board(data, r_num)
 
             # Check if there is any match in this round with PGN
             has_pgn_in_round = any(m.get("pgn") for m in round_matches_sorted)
@@ -1472,9 +1519,7 @@ class MainFrame(wx.Frame):
                 },
             )
 
-            match_id_to_board = {
-                m.get("id"): idx for idx, m in enumerate(round_matches_sorted, 1)
-            }
+            match_id_to_board = data["rounds_index"].boards
             for m in round_matches_sorted:
                 if m.get("pgn"):
                     w_id = m.get("white_player_id")
@@ -1505,8 +1550,6 @@ class MainFrame(wx.Frame):
                         },
                     )
 
-        return t_node
-
     def on_tree_selection_changed(self, event):
         if not self or not getattr(self, "tree_ctrl", None) or not self.tree_ctrl:
             return
@@ -2000,19 +2043,17 @@ class MainFrame(wx.Frame):
             info.append(_("RACCOLTA PARTITE PGN"))
         info.append("=" * 50)
 
+        from utils import get_matches_by_board
+
         has_pgn = False
         for r in self.current_tournament.get("rounds", []):
             r_num = r.get("round")
             if round_num is not None and r_num != round_num:
                 continue
-            round_matches_sorted = sorted(
-                r.get("matches", []), key=lambda x: x.get("id", 0)
-            )
-            match_id_to_board = {
-                m.get("id"): idx for idx, m in enumerate(round_matches_sorted, 1)
-            }
+            round_matches_sorted = get_matches_by_board(self.current_tournament, r_num)
+            match_id_to_board = self.current_tournament["rounds_index"].boards
 
-            for m in r.get("matches", []):
+            for m in round_matches_sorted:
                 if m.get("pgn"):
                     has_pgn = True
                     w_id = m.get("white_player_id")
@@ -2050,15 +2091,12 @@ class MainFrame(wx.Frame):
     def get_board_num(self, match, round_num):
         if not self.current_tournament or not match:
             return 1
-        rounds = self.current_tournament.get("rounds", [])
-        r_data = next((r for r in rounds if r.get("round") == round_num), None)
-        if not r_data:
+        from utils import get_match_by_id, get_board_number
+
+        r_data, _m = get_match_by_id(self.current_tournament, match.get("id"))
+        if not r_data or r_data.get("round") != round_num:
             return 1
-        round_matches = sorted(r_data.get("matches", []), key=lambda x: x.get("id", 0))
-        for idx, m in enumerate(round_matches, 1):
-            if m.get("id") == match.get("id"):
-                return idx
-        return 1
+        return get_board_number(self.current_tournament, match.get("id")) or 1
 
     def show_match_detail_verbose(self, m, round_num, board_num=None):
         if not m or not self.current_tournament:
@@ -2144,18 +2182,10 @@ class MainFrame(wx.Frame):
             else False
         )
 
+        from utils import count_pending_matches, get_round, has_scheduled_matches
+
         # Gestione abilitazione esportazione ICS
-        has_scheduled = False
-        for r in rounds:
-            for m in r.get("matches", []):
-                if m.get("is_scheduled") and m.get("schedule_info"):
-                    sched = m["schedule_info"]
-                    if sched.get("date") and sched.get("time"):
-                        has_scheduled = True
-                        break
-            if has_scheduled:
-                break
-        self.item_export_ics.Enable(has_scheduled)
+        self.item_export_ics.Enable(has_scheduled_matches(self.current_tournament))
 
         # Iscrizione abilitata solo se non iniziato e non concluso
         self.item_enroll.Enable(not is_started and not is_concluded)
@@ -2173,18 +2203,11 @@ class MainFrame(wx.Frame):
             curr_round = self.current_tournament.get("current_round", 1)
             tot_rounds = self.current_tournament.get("total_rounds", 5)
             if curr_round == tot_rounds:
-                r_data = next((r for r in rounds if r.get("round") == curr_round), None)
+                r_data = get_round(self.current_tournament, curr_round)
                 if r_data:
-                    all_done = True
-                    for m in r_data.get("matches", []):
-                        if (
-                            m.get("result") is None
-                            and m.get("black_player_id") is not None
-                        ):
-                            all_done = False
-                            break
-                    if all_done:
-                        can_finalize = True
+                    can_finalize = (
+                        count_pending_matches(self.current_tournament, curr_round) == 0
+                    )
 
         self.item_finalize.Enable(can_finalize)
 
@@ -2564,17 +2587,19 @@ class MainFrame(wx.Frame):
 
     def create_tournament_from_wizard(self, enrolled):
         from stats import get_initial_elo_for_tournament
-        from models import Tournament, Player, RoundDate
+        from models import Player, RoundDate
         from tournament import generate_pairings_for_round
         from utils import sanitize_filename
 
         category = self.creation_data.get("tournament_category", "standard")
         for p in enrolled:
             p["initial_elo"] = get_initial_elo_for_tournament(p, category)
+        # Rating FIDE in vigore alla data di inizio, se presente nello storico
+        from db_players import applica_elo_storici
 
-        players = []
-        for p in enrolled:
-            players.append(Player.from_dict(p))
+        applica_elo_storici(enrolled, category, self.creation_data.get("start_date"))
+
+        players = PlayerList(Player.from_dict(p) for p in enrolled)
 
         save_dir = self.creation_data["save_path"]
         from utils import resolve_and_verify_save_path
@@ -2615,32 +2640,26 @@ class MainFrame(wx.Frame):
 
             color_setting = random.choice(["white1", "black1"])
 
-        t_dict = {
-            "name": self.creation_data["name"],
-            "tournament_id": sanitized.upper(),
-            "site": self.creation_data["site"] or "N/D",
-            "start_date": self.creation_data["start_date"],
-            "end_date": self.creation_data["end_date"],
-            "total_rounds": self.creation_data["rounds"],
-            "current_round": 1,
-            "time_control": tc_parsed,
-            "chief_arbiter": self.creation_data["chief_arbiter"] or "N/D",
-            "deputy_chief_arbiters": self.creation_data["deputy_chief_arbiters"] or "",
-            "federation_code": self.creation_data["federation_code"] or "ITA",
-            "initial_board1_color_setting": color_setting,
-            "round_dates": [
-                rd.to_dict() for rd in [RoundDate.from_dict(x) for x in round_dates_raw]
-            ],
-            "players": [p.to_dict() for p in players],
-            "rounds": [],
-            "custom_save_path": save_dir,
-            "save_path": save_dir,
-            "bye_value": self.creation_data["bye_value"],
-            "tournament_category": tournament_category,
-        }
-
-        tournament = Tournament.from_dict(t_dict)
-        tournament.update_players_dict()
+        tournament = Tournament(
+            name=self.creation_data["name"],
+            tournament_id=sanitized.upper(),
+            site=self.creation_data["site"] or "N/D",
+            start_date=self.creation_data["start_date"],
+            end_date=self.creation_data["end_date"],
+            total_rounds=int(self.creation_data["rounds"]),
+            current_round=1,
+            time_control=tc_parsed,
+            chief_arbiter=self.creation_data["chief_arbiter"] or "N/D",
+            deputy_chief_arbiters=self.creation_data["deputy_chief_arbiters"] or "",
+            federation_code=self.creation_data["federation_code"] or "ITA",
+            initial_board1_color_setting=color_setting,
+            round_dates=[RoundDate.from_dict(x) for x in round_dates_raw],
+            players=players,
+            custom_save_path=save_dir,
+            save_path=save_dir,
+            bye_value=float(self.creation_data["bye_value"]),
+            tournament_category=tournament_category,
+        )
 
         msg = _(
             "Vuoi avviare il torneo generando subito gli abbinamenti per il Turno 1?\n\n"
@@ -2652,7 +2671,7 @@ class MainFrame(wx.Frame):
         dlg_start.Destroy()
 
         if start_now:
-            matches = generate_pairings_for_round(tournament.to_dict())
+            matches = generate_pairings_for_round(tournament)
             if matches is None:
                 wx.MessageBox(
                     _("Errore nella generazione degli abbinamenti con bbpPairings."),
@@ -2664,10 +2683,7 @@ class MainFrame(wx.Frame):
 
             round_obj = Round(round=1, matches=[Match.from_dict(m) for m in matches])
             tournament.rounds.append(round_obj)
-            self.current_tournament = tournament.to_dict()
-            self.current_tournament["players_dict"] = {
-                p["id"]: p for p in self.current_tournament.get("players", [])
-            }
+            self.current_tournament = tournament
             self._save_state()
             self.creation_mode = False
             self._tree_restore_target = {
@@ -2678,10 +2694,7 @@ class MainFrame(wx.Frame):
             self.load_tournament(self.active_filename)
             self.set_status(_("Torneo avviato. Generati abbinamenti per il Turno 1."))
         else:
-            self.current_tournament = tournament.to_dict()
-            self.current_tournament["players_dict"] = {
-                p["id"]: p for p in self.current_tournament.get("players", [])
-            }
+            self.current_tournament = tournament
             self._save_state()
             self.creation_mode = False
             self._tree_restore_target = {
@@ -2812,15 +2825,15 @@ class MainFrame(wx.Frame):
                 )
                 if to_remove:
                     players.remove(to_remove)
-                    t_data["players_dict"] = {p["id"]: p for p in players}
 
-                    with open(filepath, "w", encoding="utf-8") as f_out:
-                        json.dump(t_data, f_out, indent=4)
+                    from serialization import dump_to_file
+
+                    dump_to_file(t_data, filepath)
 
                     if self.active_filename and os.path.abspath(
                         self.active_filename
                     ) == os.path.abspath(filepath):
-                        self.current_tournament = t_data
+                        self.current_tournament = Tournament.from_dict(t_data)
 
                     self._tree_restore_target = {
                         "action": "show_players",
@@ -2855,8 +2868,12 @@ class MainFrame(wx.Frame):
     def load_concluded_tournament_report(self, filepath):
         """Visualizza i report e la classifica di un torneo concluso nell'area centrale."""
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            from serialization import read_json_keys
+
+            # Turni e PGN non servono al riepilogo: vengono saltati senza decodificarli
+            data = read_json_keys(
+                filepath, ("name", "start_date", "end_date", "players")
+            )
             t_name = data.get("name", _("Torneo Concluso"))
 
             self.main_text.Clear()
@@ -2917,8 +2934,9 @@ class MainFrame(wx.Frame):
             t_type = _("attivo")
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f_in:
-                data = json.load(f_in)
+            from serialization import read_json_keys
+
+            data = read_json_keys(filepath, ("name", "custom_save_path", "save_path"))
         except Exception as e:
             wx.MessageBox(
                 _("Impossibile leggere il file del torneo: {}").format(e),
@@ -3337,6 +3355,13 @@ class MainFrame(wx.Frame):
         dlg.ShowModal()
         dlg.Destroy()
 
+    def on_fide_stats(self, event):
+        from gui.dialogs.fide_stats_dialog import FideStatsDialog
+
+        dlg = FideStatsDialog(self, self.settings)
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def on_backup_cleanup(self, event):
         from gui.dialogs.backup_cleanup_dialog import BackupCleanupDialog
 
@@ -3482,15 +3507,18 @@ class MainFrame(wx.Frame):
             category = self.current_tournament.get("tournament_category", "standard")
             for p in enrolled:
                 p["initial_elo"] = get_initial_elo_for_tournament(p, category)
+            from db_players import applica_elo_storici
+
+            applica_elo_storici(
+                enrolled, category, self.current_tournament.get("start_date")
+            )
 
             from models import Player
 
-            self.current_tournament["players"] = [
-                Player.from_dict(p).to_dict() for p in enrolled
-            ]
-            self.current_tournament["players_dict"] = {
-                p["id"]: p for p in self.current_tournament["players"]
-            }
+            # I giocatori già iscritti sono oggetti del modello e restano tali
+            self.current_tournament["players"] = PlayerList(
+                p if isinstance(p, Player) else Player.from_dict(p) for p in enrolled
+            )
             self._save_state()
             self.populate_tree()
             self.show_current_round_report()
@@ -3942,14 +3970,16 @@ class MainFrame(wx.Frame):
         # Find the actual match in the currently loaded tournament to avoid referencing stale objects
         match_id = match.get("id")
         round_num = match.get("round", 1)
-        actual_match = None
-        for r in self.current_tournament.get("rounds", []):
-            if r.get("round") == round_num:
-                for m in r.get("matches", []):
-                    if m.get("id") == match_id:
-                        actual_match = m
-                        break
-                break
+        from utils import (
+            count_pending_matches,
+            get_match_by_id,
+            get_matches_by_board,
+            get_round,
+        )
+
+        r, actual_match = get_match_by_id(self.current_tournament, match_id)
+        if r is None or r.get("round") != round_num:
+            actual_match = None
         if not actual_match:
             actual_match = match
 
@@ -3977,26 +4007,11 @@ class MainFrame(wx.Frame):
         # Determinazione se il turno è concluso o il torneo è closed/concluded
         is_tournament_concluded = self.current_tournament.get("concluded", False)
         is_round_concluded = False
-        round_obj = next(
-            (
-                r
-                for r in self.current_tournament.get("rounds", [])
-                if r.get("round") == round_num
-            ),
-            None,
-        )
+        round_obj = get_round(self.current_tournament, round_num)
         if round_obj:
-            all_done = True
-            for m in round_obj.get("matches", []):
-                if (
-                    m.get("result") is None
-                    and m.get("black_player_id") is not None
-                    and m.get("black_player_id") != "BYE_PLAYER_ID"
-                ):
-                    all_done = False
-                    break
-            if all_done:
-                is_round_concluded = True
+            is_round_concluded = (
+                count_pending_matches(self.current_tournament, round_num) == 0
+            )
 
         disable_result_change = is_tournament_concluded or is_round_concluded
 
@@ -4145,9 +4160,8 @@ class MainFrame(wx.Frame):
 
                             # Ricalcola la posizione ottimale per il focus
                             if round_obj:
-                                round_matches = round_obj.get("matches", [])
-                                round_matches_sorted = sorted(
-                                    round_matches, key=lambda x: x.get("id", 0)
+                                round_matches_sorted = get_matches_by_board(
+                                    self.current_tournament, round_num
                                 )
                                 remaining_unplayed = [
                                     m
@@ -4166,9 +4180,9 @@ class MainFrame(wx.Frame):
                                         ),
                                         remaining_unplayed[0],
                                     )
-                                    board_num_next = (
-                                        round_matches_sorted.index(next_match) + 1
-                                    )
+                                    board_num_next = self.current_tournament[
+                                        "rounds_index"
+                                    ].boards.get(next_match.get("id"), 1)
                                     self._tree_restore_target = {
                                         "action": "activate_match",
                                         "filepath": self.active_filename,
@@ -4260,14 +4274,9 @@ class MainFrame(wx.Frame):
 
         # Gestione suoni e completamento del turno
         curr_round_num = self.current_tournament.get("current_round", 1)
-        round_data = next(
-            (
-                r
-                for r in self.current_tournament.get("rounds", [])
-                if r.get("round") == curr_round_num
-            ),
-            None,
-        )
+        from utils import get_round
+
+        round_data = get_round(self.current_tournament, curr_round_num)
         if round_data and all(
             m.get("result") is not None for m in round_data.get("matches", [])
         ):
@@ -4387,7 +4396,7 @@ class MainFrame(wx.Frame):
         from models import Round, Match
 
         round_obj = Round(round=1, matches=[Match.from_dict(m) for m in matches])
-        self.current_tournament.setdefault("rounds", []).append(round_obj.to_dict())
+        self.current_tournament["rounds"].append(round_obj)
         self._save_state()
 
         play_sound("nuovo_turno", self.current_tournament)
@@ -4420,18 +4429,17 @@ class MainFrame(wx.Frame):
             )
             return
 
-        r_curr = next((r for r in rounds if r.get("round") == curr_round), None)
-        if r_curr:
-            for m in r_curr.get("matches", []):
-                if m.get("result") is None and m.get("black_player_id") is not None:
-                    wx.MessageBox(
-                        _(
-                            "Impossibile generare il turno successivo: ci sono ancora partite senza risultato nel turno corrente."
-                        ),
-                        _("Errore"),
-                        wx.ICON_ERROR,
-                    )
-                    return
+        from utils import count_pending_matches
+
+        if count_pending_matches(self.current_tournament, curr_round) > 0:
+            wx.MessageBox(
+                _(
+                    "Impossibile generare il turno successivo: ci sono ancora partite senza risultato nel turno corrente."
+                ),
+                _("Errore"),
+                wx.ICON_ERROR,
+            )
+            return
 
         next_round_num = curr_round + 1
         filepath = self.active_filename
@@ -4451,25 +4459,25 @@ class MainFrame(wx.Frame):
             )
             return
 
+        from models import Round, Match, ResultEntry
+
         players_dict = self.current_tournament.get("players_dict", {})
         for p_id, p in players_dict.items():
             if p.get("withdrawn"):
                 p.setdefault("results_history", []).append(
-                    {
-                        "round": next_round_num,
-                        "opponent_id": "BYE_PLAYER_ID",
-                        "color": None,
-                        "result": "BYE",
-                        "score": 0.0,
-                    }
+                    ResultEntry(
+                        round=next_round_num,
+                        opponent_id="BYE_PLAYER_ID",
+                        color=None,
+                        result="BYE",
+                        score=0.0,
+                    )
                 )
 
-        from models import Round, Match
-
         round_obj = Round(
             round=next_round_num, matches=[Match.from_dict(m) for m in next_matches]
         )
-        self.current_tournament.setdefault("rounds", []).append(round_obj.to_dict())
+        self.current_tournament["rounds"].append(round_obj)
         self._save_state()
 
         play_sound("nuovo_turno", self.current_tournament)
@@ -4491,19 +4499,10 @@ class MainFrame(wx.Frame):
         if not self.current_tournament:
             return
 
-        # Controlla se ci sono partite pianificate
-        has_scheduled = False
-        for r in self.current_tournament.get("rounds", []):
-            for m in r.get("matches", []):
-                if m.get("is_scheduled") and m.get("schedule_info"):
-                    sched = m["schedule_info"]
-                    if sched.get("date") and sched.get("time"):
-                        has_scheduled = True
-                        break
-            if has_scheduled:
-                break
+        from utils import has_scheduled_matches
 
-        if not has_scheduled:
+        # Controlla se ci sono partite pianificate
+        if not has_scheduled_matches(self.current_tournament):
             wx.MessageBox(
                 _("Non ci sono partite pianificate in questo torneo."),
                 _("Esporta Calendario"),
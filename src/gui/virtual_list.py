@@ -0,0 +1,94 @@
+import wx
+from gui.accessibility import set_accessibility_label
+
+
+class VirtualListCtrl(wx.ListCtrl):
+    """
+    Lista a colonna singola in modalità virtuale (LC_VIRTUAL): le righe sono
+    lette da una sequenza di elementi e l'etichetta di ciascuna viene
+    formattata solo quando il controllo la deve mostrare, quindi sostituire
+    decine di migliaia di risultati costa quanto cambiarne il numero.
+
+    Espone GetSelection/SetSelection/GetCount come la ListBox che sostituisce.
+    Se 'on_near_end' è indicata, viene chiamata (una volta per ogni nuova
+    lunghezza della sequenza) quando si mostra una delle ultime righe:
+    serve a caricare la pagina successiva dei risultati.
+    """
+
+    PREFETCH_ROWS = 20
+
+    def __init__(self, parent, name, formatter, on_near_end=None):
+        super().__init__(
+            parent,
+            style=wx.LC_REPORT
+            | wx.LC_VIRTUAL
+            | wx.LC_SINGLE_SEL
+            | wx.LC_NO_HEADER
+            | wx.BORDER_SUNKEN,
+        )
+        self._items = []
+        self._formatter = formatter
+        self._on_near_end = on_near_end
+        self._near_end_notified = None
+
+        self.InsertColumn(0, name)
+        # Nome letto dagli screen reader per la lista; le righe restano native
+        self.SetName(name)
+        set_accessibility_label(self, name)
+        self.Bind(wx.EVT_SIZE, self._on_size)
+
+    @property
+    def items(self):
+        return self._items
+
+    def set_items(self, items):
+        """Sostituisce le righe mostrate, togliendo la selezione."""
+        self._items = items
+        self._near_end_notified = None
+        selected = self.GetFirstSelected()
+        if selected != -1:
+            self.Select(selected, on=False)
+        self.SetItemCount(len(items))
+        self.Refresh()
+
+    def extend_items(self, items):
+        """Aggiorna le righe quando la sequenza è cresciuta, mantenendo la selezione."""
+        self._items = items
+        self.SetItemCount(len(items))
+        self.Refresh()
+
+    def refresh_row(self, index):
+        """Ridisegna una riga il cui elemento è stato modificato."""
+        if 0 <= index < len(self._items):
+            self.RefreshItem(index)
+
+    def OnGetItemText(self, item, column):
+        if item >= len(self._items):
+            return ""
+        if (
+            self._on_near_end is not None
+            and item >= len(self._items) - self.PREFETCH_ROWS
+            and self._near_end_notified != len(self._items)
+        ):
+            self._near_end_notified = len(self._items)
+            # Fuori dal ridisegno: la callback può modificare la lista
+            wx.CallAfter(self._on_near_end)
+        return self._formatter(self._items[item])
+
+    def GetCount(self):
+        return self.GetItemCount()
+
+    def GetSelection(self):
+        return self.GetFirstSelected()
+
+    def SetSelection(self, index):
+        self.Select(index)
+        self.Focus(index)
+        self.EnsureVisible(index)
+
+    def _on_size(self, event):
+        # L'unica colonna occupa tutta la larghezza disponibile
+        width = self.GetClientSize().width
+        if width > 0:
+            self.SetColumnWidth(0, width)
+        event.Skip()
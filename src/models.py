@@ -1,37 +1,352 @@
-from dataclasses import dataclass, field
+import copy
+from collections.abc import MutableMapping
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Any, Optional, Set
 
+# Nomi dei campi esposti dalla vista dizionario, calcolati una volta per classe
+_MODEL_KEYS: Dict[type, tuple] = {}
+# Stessi nomi in un frozenset, per i controlli di appartenenza in tempo costante
+_MODEL_KEY_SETS: Dict[type, frozenset] = {}
+
+
+def _model_keys(cls) -> tuple:
+    keys = _MODEL_KEYS.get(cls)
+    if keys is None:
+        keys = tuple(f.name for f in fields(cls) if not f.name.startswith("_"))
+        keys += cls._PROPERTY_KEYS
+        _MODEL_KEYS[cls] = keys
+    return keys
+
+
+def _model_key_set(cls) -> frozenset:
+    keys = _MODEL_KEY_SETS.get(cls)
+    if keys is None:
+        keys = frozenset(_model_keys(cls))
+        _MODEL_KEY_SETS[cls] = keys
+    return keys
+
+
+def _extra_keys(cls, d: Dict[str, Any], ignore=()) -> Optional[Dict[str, Any]]:
+    """Restituisce le chiavi di 'd' non modellate dalla classe, per non perderle nelle conversioni."""
+    known = _model_key_set(cls)
+    extra = {k: v for k, v in d.items() if k not in known and k not in ignore}
+    return extra or None
+
+
+def _elo_value(d: Dict[str, Any], key: str, fallback_key: str) -> float:
+    """
+    Legge un Elo dal dizionario ripiegando su 'fallback_key' e poi su 1399
+    solo se il valore manca: lo 0 dei giocatori senza Elo resta tale.
+    """
+    for k in (key, fallback_key):
+        value = d.get(k)
+        if value is not None and value != "":
+            return float(value)
+    return 1399.0
+
+
+class DictView(MutableMapping):
+    """
+    Vista compatibile con dict sui campi di un modello.
+    Permette al codice che lavora con i dizionari (GUI, tournament.py, stats.py,
+    reports.py) di usare direttamente gli oggetti del modello senza conversioni.
+    Le chiavi non modellate vengono conservate in '_extra'; i campi elencati in
+    _OPTIONAL_KEYS risultano assenti quando valgono None, come nel formato salvato.
+    """
+
+    __slots__ = ()
+    _OPTIONAL_KEYS: frozenset = frozenset()
+    _PROPERTY_KEYS: tuple = ()
+
+    def __getitem__(self, key):
+        if key in _model_key_set(type(self)):
+            value = getattr(self, key)
+            if value is None and key in self._OPTIONAL_KEYS:
+                raise KeyError(key)
+            return value
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        if key in _model_key_set(type(self)):
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._OPTIONAL_KEYS:
+            # Un campo opzionale a None risulta già assente, come in un dict
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        elif key in _model_key_set(type(self)):
+            raise TypeError(f"Il campo '{key}' non può essere rimosso")
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        for key in _model_keys(type(self)):
+            if key in self._OPTIONAL_KEYS and getattr(self, key) is None:
+                continue
+            yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        """Copia superficiale, come dict.copy()."""
+        clone = copy.copy(self)
+        if self._extra is not None:
+            clone._extra = dict(self._extra)
+        return clone
+
+    def _with_extra(self, d: Dict[str, Any]) -> Dict[str, Any]:
+        if self._extra:
+            d.update(self._extra)
+        return d
+
+
+class VersionedList(list):
+    """Lista con un contatore di versione incrementato a ogni modifica strutturale."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self.version = 0
+
+    def _bump(self):
+        self.version += 1
+
+    def append(self, item):
+        super().append(item)
+        self._bump()
+
+    def extend(self, iterable):
+        super().extend(iterable)
+        self._bump()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._bump()
+
+    def remove(self, item):
+        super().remove(item)
+        self._bump()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._bump()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._bump()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._bump()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._bump()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._bump()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._bump()
+        return result
+
+
+# Contatore globale delle modifiche a turni e partite (campi di Match e Round,
+# liste 'matches'). RoundsIndex lo confronta per accorgersi in tempo costante
+# delle modifiche sul posto, che non cambiano la versione della lista dei turni.
+_match_edits = 0
+
+
+def _note_match_edit():
+    global _match_edits
+    _match_edits += 1
+
+
+class PlayerList(VersionedList):
+    """Lista versionata dei giocatori di un torneo."""
+
+    __slots__ = ()
+
+
+class RoundList(VersionedList):
+    """Lista versionata dei turni di un torneo."""
+
+    __slots__ = ()
+
+
+class MatchList(VersionedList):
+    """Lista versionata delle partite di un turno; ogni modifica invalida RoundsIndex."""
+
+    __slots__ = ()
+
+    def _bump(self):
+        self.version += 1
+        _note_match_edit()
+
+
+class PlayersIndex(dict):
+    """
+    Indice id -> giocatore costruito su una lista di giocatori.
+    Tiene un riferimento alla lista di origine e ne ricorda la versione, così
+    da rilevare in tempo costante quando va ricostruito. Il confronto è per
+    identità sull'oggetto e non sul suo id(), che CPython riusa per una lista
+    nuova allocata dove stava quella scartata.
+    """
+
+    __slots__ = ("source", "version")
+
+    def __init__(self, players=()):
+        super().__init__((p["id"], p) for p in players)
+        self.source = players
+        self.version = getattr(players, "version", None)
+
+    def is_current(self, players) -> bool:
+        if self.source is not players:
+            return False
+        version = getattr(players, "version", None)
+        if version is None:
+            # Liste semplici (non versionate): ripiego sul controllo della lunghezza
+            return len(self) == len(players)
+        return version == self.version
 
-@dataclass
-class ResultEntry:
+
+class RoundsIndex:
+    """
+    Indici dei turni di un torneo: turno per numero, partite in ordine di
+    scacchiera, partita e numero di scacchiera per id, partite ancora da
+    giocare per turno e, per il turno corrente, partita per giocatore.
+    Come PlayersIndex tiene un riferimento alla lista dei turni e ne ricorda
+    la versione; ricorda anche il contatore delle modifiche alle partite, così
+    che risultati, abbinamenti o pianificazioni cambiati sul posto lo rendano
+    non più valido. Con turni e partite come semplici dizionari le modifiche
+    sul posto non sono rilevabili: va ricostruito con rebuild=True.
+    """
+
+    __slots__ = (
+        "source",
+        "version",
+        "length",
+        "edits",
+        "current_round",
+        "rounds",
+        "board_order",
+        "matches",
+        "boards",
+        "pending",
+        "scheduled",
+        "player_matches",
+    )
+
+    def __init__(self, rounds=(), current_round=None):
+        self.source = rounds
+        self.version = getattr(rounds, "version", None)
+        self.length = len(rounds)
+        self.edits = _match_edits
+        self.current_round = current_round
+        self.rounds = {}
+        self.board_order = {}
+        self.matches = {}
+        self.boards = {}
+        self.pending = {}
+        self.scheduled = 0
+        self.player_matches = {}
+        for r in rounds:
+            round_num = r.get("round")
+            self.rounds[round_num] = r
+            # Il numero di scacchiera è la posizione della partita ordinata per id
+            ordered = sorted(r.get("matches", []), key=lambda x: x.get("id", 0))
+            self.board_order[round_num] = ordered
+            pending = 0
+            for board_num, m in enumerate(ordered, 1):
+                match_id = m.get("id")
+                self.matches[match_id] = (r, m)
+                self.boards[match_id] = board_num
+                black_id = m.get("black_player_id")
+                if m.get("result") is None and black_id not in (None, "BYE_PLAYER_ID"):
+                    pending += 1
+                sched = m.get("schedule_info") if m.get("is_scheduled") else None
+                if sched and sched.get("date") and sched.get("time"):
+                    self.scheduled += 1
+                if round_num == current_round:
+                    for player_id in (m.get("white_player_id"), black_id):
+                        if player_id and player_id != "BYE_PLAYER_ID":
+                            self.player_matches[player_id] = m
+            self.pending[round_num] = pending
+
+    def is_current(self, rounds, current_round=None) -> bool:
+        if self.source is not rounds or self.current_round != current_round:
+            return False
+        if self.edits != _match_edits:
+            return False
+        version = getattr(rounds, "version", None)
+        if version is None:
+            return self.length == len(rounds)
+        return version == self.version
+
+
+@dataclass(slots=True)
+class ResultEntry(DictView):
     round: int
     opponent_id: str
     color: Optional[str]  # "white", "black", or None (for BYE)
     result: str  # "1-0", "0-1", "1/2-1/2", etc.
     score: float
+    _extra: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "round": self.round,
-            "opponent_id": self.opponent_id,
-            "color": self.color,
-            "result": self.result,
-            "score": self.score,
-        }
+        return self._with_extra(
+            {
+                "round": self.round,
+                "opponent_id": self.opponent_id,
+                "color": self.color,
+                "result": self.result,
+                "score": self.score,
+            }
+        )
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "ResultEntry":
-        return cls(
+        entry = cls(
             round=d.get("round", 0),
             opponent_id=d.get("opponent_id", ""),
             color=d.get("color"),
             result=d.get("result", ""),
             score=float(d.get("score", 0.0)),
         )
+        entry._extra = _extra_keys(cls, d)
+        return entry
 
 
-@dataclass
-class Player:
+@dataclass(slots=True)
+class Player(DictView):
+    # 'final_rank' esiste solo a torneo concluso: i report ne verificano la presenza
+    _OPTIONAL_KEYS = frozenset({"final_rank"})
+
     id: str
     first_name: str
     last_name: str
@@ -53,6 +368,7 @@ class Player:
     received_bye_in_round: List[int] = field(default_factory=list)
     buchholz: float = 0.0
     buchholz_cut1: Optional[float] = None
+    aro: Optional[float] = None
     performance_rating: Optional[float] = None
     elo_change: Optional[float] = None
     k_factor: Optional[int] = None
@@ -78,54 +394,63 @@ class Player:
     flag: str = ""
     current_elo: float = 1399.0
     gender: str = "M"
+    _extra: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "initial_elo": self.initial_elo,
-            "fide_title": self.fide_title,
-            "sex": self.sex,
-            "gender": self.gender,
-            "federation": self.federation,
-            "fide_id_num_str": self.fide_id_num_str,
-            "birth_date": self.birth_date,
-            "points": self.points,
-            "results_history": [r.to_dict() for r in self.results_history],
-            "opponents": list(self.opponents),
-            "white_games": self.white_games,
-            "black_games": self.black_games,
-            "last_color": self.last_color,
-            "consecutive_white": self.consecutive_white,
-            "consecutive_black": self.consecutive_black,
-            "received_bye_count": self.received_bye_count,
-            "received_bye_in_round": self.received_bye_in_round,
-            "buchholz": self.buchholz,
-            "buchholz_cut1": self.buchholz_cut1,
-            "performance_rating": self.performance_rating,
-            "elo_change": self.elo_change,
-            "k_factor": self.k_factor,
-            "games_this_tournament": self.games_this_tournament,
-            "downfloat_count": self.downfloat_count,
-            "final_rank": self.final_rank,
-            "withdrawn": self.withdrawn,
-            "display_rank": self.display_rank,
-            "elo_club": self.elo_club,
-            "elo_rapid": self.elo_rapid,
-            "elo_blitz": self.elo_blitz,
-            "fide_k_factor": self.fide_k_factor,
-            "fide_rapid_k": self.fide_rapid_k,
-            "fide_blitz_k": self.fide_blitz_k,
-            "fide_standard_games": self.fide_standard_games,
-            "fide_rapid_games": self.fide_rapid_games,
-            "fide_blitz_games": self.fide_blitz_games,
-            "w_title": self.w_title,
-            "o_title": self.o_title,
-            "foa_title": self.foa_title,
-            "flag": self.flag,
-            "current_elo": self.current_elo,
-        }
+        d = self._with_extra(
+            {
+                "id": self.id,
+                "first_name": self.first_name,
+                "last_name": self.last_name,
+                "initial_elo": self.initial_elo,
+                "fide_title": self.fide_title,
+                "sex": self.sex,
+                "gender": self.gender,
+                "federation": self.federation,
+                "fide_id_num_str": self.fide_id_num_str,
+                "birth_date": self.birth_date,
+                "points": self.points,
+                "results_history": [_as_dict(r) for r in self.results_history],
+                "opponents": sorted(self.opponents),
+                "white_games": self.white_games,
+                "black_games": self.black_games,
+                "last_color": self.last_color,
+                "consecutive_white": self.consecutive_white,
+                "consecutive_black": self.consecutive_black,
+                "received_bye_count": self.received_bye_count,
+                "received_bye_in_round": self.received_bye_in_round,
+                "buchholz": self.buchholz,
+                "buchholz_cut1": self.buchholz_cut1,
+                "aro": self.aro,
+                "performance_rating": self.performance_rating,
+                "elo_change": self.elo_change,
+                "k_factor": self.k_factor,
+                "games_this_tournament": self.games_this_tournament,
+                "downfloat_count": self.downfloat_count,
+                "final_rank": self.final_rank,
+                "withdrawn": self.withdrawn,
+                "display_rank": self.display_rank,
+                "elo_club": self.elo_club,
+                "elo_rapid": self.elo_rapid,
+                "elo_blitz": self.elo_blitz,
+                "fide_k_factor": self.fide_k_factor,
+                "fide_rapid_k": self.fide_rapid_k,
+                "fide_blitz_k": self.fide_blitz_k,
+                "fide_standard_games": self.fide_standard_games,
+                "fide_rapid_games": self.fide_rapid_games,
+                "fide_blitz_games": self.fide_blitz_games,
+                "w_title": self.w_title,
+                "o_title": self.o_title,
+                "foa_title": self.foa_title,
+                "flag": self.flag,
+                "current_elo": self.current_elo,
+            }
+        )
+        if self.final_rank is None:
+            del d["final_rank"]
+        return d
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "Player":
@@ -140,11 +465,11 @@ class Player:
         gender_val = "W" if sex_val in ("w", "f") else "M"
         sex_val = "w" if gender_val == "W" else "m"
 
-        return cls(
+        player = cls(
             id=d.get("id", ""),
             first_name=d.get("first_name", ""),
             last_name=d.get("last_name", ""),
-            initial_elo=float(d.get("initial_elo") or d.get("current_elo") or 1399.0),
+            initial_elo=_elo_value(d, "initial_elo", "current_elo"),
             fide_title=d.get("fide_title", ""),
             sex=sex_val,
             gender=gender_val,
@@ -163,6 +488,7 @@ class Player:
             received_bye_in_round=list(d.get("received_bye_in_round", [])),
             buchholz=float(d.get("buchholz", 0.0)),
             buchholz_cut1=d.get("buchholz_cut1"),
+            aro=d.get("aro"),
             performance_rating=d.get("performance_rating"),
             elo_change=d.get("elo_change"),
             k_factor=d.get("k_factor"),
@@ -184,12 +510,16 @@ class Player:
             o_title=d.get("o_title", ""),
             foa_title=d.get("foa_title", ""),
             flag=d.get("flag", ""),
-            current_elo=float(d.get("current_elo") or d.get("initial_elo") or 1399.0),
+            current_elo=_elo_value(d, "current_elo", "initial_elo"),
         )
+        player._extra = _extra_keys(cls, d)
+        return player
 
 
-@dataclass
-class Match:
+@dataclass(slots=True)
+class Match(DictView):
+    _OPTIONAL_KEYS = frozenset({"schedule_info", "pgn"})
+
     id: int
     round: int
     white_player_id: str
@@ -200,6 +530,13 @@ class Match:
     is_scheduled: bool = False
     schedule_info: Optional[Dict[str, Any]] = None
     pgn: Optional[str] = None
+    _extra: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        _note_match_edit()
 
     def to_dict(self) -> Dict[str, Any]:
         d = {
@@ -214,11 +551,11 @@ class Match:
             d["schedule_info"] = self.schedule_info
         if self.pgn is not None:
             d["pgn"] = self.pgn
-        return d
+        return self._with_extra(d)
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "Match":
-        return cls(
+        match = cls(
             id=d.get("id", 0),
             round=d.get("round", 0),
             white_player_id=d.get("white_player_id", ""),
@@ -228,47 +565,77 @@ class Match:
             schedule_info=d.get("schedule_info"),
             pgn=d.get("pgn"),
         )
+        match._extra = _extra_keys(cls, d)
+        return match
 
 
-@dataclass
-class RoundDate:
+@dataclass(slots=True)
+class RoundDate(DictView):
     round: int
     start_date: str
     end_date: str
+    _extra: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "round": self.round,
-            "start_date": self.start_date,
-            "end_date": self.end_date,
-        }
+        return self._with_extra(
+            {
+                "round": self.round,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+            }
+        )
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "RoundDate":
-        return cls(
+        round_date = cls(
             round=d.get("round", 0),
             start_date=d.get("start_date", ""),
             end_date=d.get("end_date", ""),
         )
+        round_date._extra = _extra_keys(cls, d)
+        return round_date
 
 
-@dataclass
-class Round:
+@dataclass(slots=True)
+class Round(DictView):
     round: int
-    matches: List[Match] = field(default_factory=list)
+    matches: List[Match] = field(default_factory=MatchList)
+    _extra: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name, value):
+        if name == "matches" and not isinstance(value, MatchList):
+            value = MatchList(value)
+        object.__setattr__(self, name, value)
+        _note_match_edit()
 
     def to_dict(self) -> Dict[str, Any]:
-        return {"round": self.round, "matches": [m.to_dict() for m in self.matches]}
+        return self._with_extra(
+            {"round": self.round, "matches": [_as_dict(m) for m in self.matches]}
+        )
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "Round":
         matches_list = d.get("matches", [])
         matches = [Match.from_dict(m) for m in matches_list]
-        return cls(round=d.get("round", 0), matches=matches)
+        round_obj = cls(round=d.get("round", 0), matches=matches)
+        round_obj._extra = _extra_keys(cls, d)
+        return round_obj
 
 
-@dataclass
-class Tournament:
+def _as_dict(item) -> Dict[str, Any]:
+    """Converte un oggetto del modello in dizionario; i dizionari restano invariati."""
+    to_dict = getattr(item, "to_dict", None)
+    return to_dict() if to_dict is not None else item
+
+
+@dataclass(slots=True)
+class Tournament(DictView):
+    _PROPERTY_KEYS = ("players_dict", "rounds_index")
+
     name: str
     tournament_id: str
     start_date: str
@@ -281,8 +648,8 @@ class Tournament:
     time_control: Any = "Standard"  # Issue #12: string or dict
     initial_board1_color_setting: str = "white1"
     round_dates: List[RoundDate] = field(default_factory=list)
-    players: List[Player] = field(default_factory=list)
-    rounds: List[Round] = field(default_factory=list)
+    players: List[Player] = field(default_factory=PlayerList)
+    rounds: List[Round] = field(default_factory=RoundList)
     next_match_id: int = 1
     bye_value: float = 0.5
     launch_count: int = 0
@@ -292,44 +659,82 @@ class Tournament:
     concluded: bool = False
     custom_save_path: str = ""
     save_path: str = ""
+    _extra: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
-    # players_dict is a cache of player objects, not saved directly to file
-    players_dict: Dict[str, Player] = field(
-        default_factory=dict, init=False, repr=False
+    # Indice versionato dei giocatori, non salvato su file (vedi players_dict)
+    _players_index: Optional[PlayersIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Indici dei turni, non salvati su file (vedi rounds_index)
+    _rounds_index: Optional[RoundsIndex] = field(
+        default=None, init=False, repr=False, compare=False
     )
 
     def __post_init__(self):
+        if not isinstance(self.rounds, RoundList):
+            self.rounds = RoundList(self.rounds)
         self.update_players_dict()
 
     def update_players_dict(self):
-        self.players_dict = {p.id: p for p in self.players}
+        """Ricostruisce l'indice dei giocatori, assicurando che la lista sia versionata."""
+        if not isinstance(self.players, PlayerList):
+            self.players = PlayerList(self.players)
+        self._players_index = PlayersIndex(self.players)
+
+    @property
+    def players_dict(self) -> Dict[str, Player]:
+        """Indice id -> Player, ricostruito solo quando la lista dei giocatori cambia."""
+        index = self._players_index
+        if not isinstance(index, PlayersIndex) or not index.is_current(self.players):
+            self.update_players_dict()
+        return self._players_index
+
+    @players_dict.setter
+    def players_dict(self, value):
+        # Un dizionario assegnato dall'esterno viene sostituito dall'indice versionato
+        # alla prima lettura; un PlayersIndex ancora valido viene mantenuto.
+        self._players_index = value
+
+    @property
+    def rounds_index(self) -> Optional[RoundsIndex]:
+        """Ultimo indice dei turni costruito (vedi utils._ensure_rounds_index)."""
+        return self._rounds_index
+
+    @rounds_index.setter
+    def rounds_index(self, value):
+        self._rounds_index = value
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "launch_count": self.launch_count,
-            "name": self.name,
-            "tournament_id": self.tournament_id,
-            "start_date": self.start_date,
-            "end_date": self.end_date,
-            "total_rounds": self.total_rounds,
-            "site": self.site,
-            "federation_code": self.federation_code,
-            "chief_arbiter": self.chief_arbiter,
-            "deputy_chief_arbiters": self.deputy_chief_arbiters,
-            "time_control": self.time_control,
-            "initial_board1_color_setting": self.initial_board1_color_setting,
-            "round_dates": [rd.to_dict() for rd in self.round_dates],
-            "players": [p.to_dict() for p in self.players],
-            "rounds": [r.to_dict() for r in self.rounds],
-            "next_match_id": self.next_match_id,
-            "bye_value": self.bye_value,
-            "schema_version": self.schema_version,
-            "tournament_category": self.tournament_category,
-            "current_round": self.current_round,
-            "concluded": self.concluded,
-            "custom_save_path": self.custom_save_path,
-            "save_path": self.save_path,
-        }
+        return self._with_extra(
+            {
+                "launch_count": self.launch_count,
+                "name": self.name,
+                "tournament_id": self.tournament_id,
+                "start_date": self.start_date,
+                "end_date": self.end_date,
+                "total_rounds": self.total_rounds,
+                "site": self.site,
+                "federation_code": self.federation_code,
+                "chief_arbiter": self.chief_arbiter,
+                "deputy_chief_arbiters": self.deputy_chief_arbiters,
+                "time_control": self.time_control,
+                "initial_board1_color_setting": self.initial_board1_color_setting,
+                "round_dates": [_as_dict(rd) for rd in self.round_dates],
+                "players": [_as_dict(p) for p in self.players],
+                "rounds": [_as_dict(r) for r in self.rounds],
+                "next_match_id": self.next_match_id,
+                "bye_value": self.bye_value,
+                "schema_version": self.schema_version,
+                "tournament_category": self.tournament_category,
+                "current_round": self.current_round,
+                "concluded": self.concluded,
+                "custom_save_path": self.custom_save_path,
+                "save_path": self.save_path,
+            }
+        )
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "Tournament":
@@ -337,12 +742,12 @@ class Tournament:
         round_dates = [RoundDate.from_dict(rd) for rd in rd_list]
 
         p_list = d.get("players", [])
-        players = [Player.from_dict(p) for p in p_list]
+        players = PlayerList(Player.from_dict(p) for p in p_list)
 
         r_list = d.get("rounds", [])
-        rounds = [Round.from_dict(r) for r in r_list]
+        rounds = RoundList(Round.from_dict(r) for r in r_list)
 
-        return cls(
+        tournament = cls(
             name=d.get("name", "Torneo Sconosciuto"),
             tournament_id=d.get("tournament_id", ""),
             start_date=d.get("start_date", ""),
@@ -369,3 +774,5 @@ class Tournament:
             custom_save_path=d.get("custom_save_path", ""),
             save_path=d.get("save_path", ""),
         )
+        tournament._extra = _extra_keys(cls, d)
+        return tournament
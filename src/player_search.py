@@ -0,0 +1,226 @@
+"""
+Ricerca dei giocatori nel database personale.
+
+Le query usano gli operatori di match_player_query (+ obbligatorio,
+- escluso, = frase esatta) e cercano per sottostringa su nome, cognome,
+anno di nascita, federazione, titolo FIDE, ID FIDE e ID personale.
+PlayerSearchIndex mantiene in memoria i trigrammi del testo di ricerca di
+ogni giocatore: una query verifica solo i giocatori che contengono tutti i
+trigrammi dei suoi termini invece di scorrere l'intero database.
+"""
+
+from collections import defaultdict
+
+
+def player_search_text(player, extended=True):
+    """
+    Testo minuscolo su cui vengono cercati i termini della query.
+    Con 'extended' falso contiene solo nome, cognome, anno di nascita,
+    federazione e ID FIDE, i campi storici di utils.match_player_query:
+    titolo e ID personale servono alla ricerca nel database personale.
+    """
+    first_name = player.get("first_name", "") or ""
+    last_name = player.get("last_name", "") or ""
+
+    # Estrae l'anno di nascita (da birth_year o birth_date)
+    birth_yr = player.get("birth_year")
+    if not birth_yr and player.get("birth_date"):
+        birth_yr = player["birth_date"][:4]
+    birth = str(birth_yr or "")
+
+    fed = player.get("federation", "") or ""
+    fide_id = str(player.get("id_fide") or player.get("fide_id_num_str") or "")
+    if not extended:
+        return f"{first_name} {last_name} {birth} {fed} {fide_id}".lower()
+
+    title = player.get("fide_title", "") or ""
+    player_id = player.get("id", "") or ""
+
+    return (
+        f"{first_name} {last_name} {birth} {fed} {title} {fide_id} {player_id}".lower()
+    )
+
+
+def parse_player_query(query):
+    """
+    Scompone la query nei suoi termini.
+    Ritorna (frasi esatte, termini esclusi, obbligatori, opzionali, primo termine).
+    """
+    exact_phrases = []
+    forbidden_terms = []
+    mandatory_terms = []
+    optional_terms = []
+
+    temp_query = query.strip()
+    if temp_query.startswith("="):
+        phrase = temp_query.replace("=", " ").strip().lower()
+        if phrase:
+            exact_phrases.append(phrase)
+    else:
+        parts = temp_query.split()
+        for part in parts:
+            if part.startswith("+"):
+                term = part[1:].strip().lower()
+                if term:
+                    mandatory_terms.append(term)
+            elif part.startswith("-"):
+                term = part[1:].strip().lower()
+                if term:
+                    forbidden_terms.append(term)
+            else:
+                term = part.strip().lower()
+                if term:
+                    optional_terms.append(term)
+
+    # Primo termine per calcolo rilevanza starts-with
+    first_query_term = ""
+    if query.strip().startswith("="):
+        parts_seq = query.replace("=", " ").strip().split()
+        if parts_seq:
+            first_query_term = parts_seq[0].lower()
+    else:
+        for part in query.split():
+            clean = part.lstrip("+-").lower()
+            if clean:
+                first_query_term = clean
+                break
+
+    return (
+        exact_phrases,
+        forbidden_terms,
+        mandatory_terms,
+        optional_terms,
+        first_query_term,
+    )
+
+
+def relevance_score(total_matched, first_query_term, last_name_l, first_name_l):
+    """Tupla di ordinamento: più termini trovati, poi cognome e nome che iniziano col primo termine."""
+    rel_score = 3
+    if first_query_term:
+        if last_name_l.startswith(first_query_term):
+            rel_score = 1
+        elif first_name_l.startswith(first_query_term):
+            rel_score = 2
+    return (-total_matched, rel_score, last_name_l, first_name_l)
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class PlayerSearchIndex:
+    """
+    Indice a trigrammi del database personale, aggiornabile giocatore per giocatore.
+    I termini di uno o due caratteri non hanno trigrammi e vengono verificati
+    direttamente sul testo dei candidati.
+    """
+
+    def __init__(self, players=None):
+        self._texts = {}
+        self._names = {}
+        self._postings = defaultdict(set)
+        if players:
+            for player_id, player in players.items():
+                self.add(player_id, player)
+
+    def __len__(self):
+        return len(self._texts)
+
+    def add(self, player_id, player):
+        """Inserisce o aggiorna un giocatore nell'indice."""
+        text = player_search_text(player)
+        old_text = self._texts.get(player_id)
+        if old_text == text:
+            return
+        if old_text is not None:
+            self.remove(player_id)
+        self._texts[player_id] = text
+        self._names[player_id] = (
+            (player.get("last_name", "") or "").lower(),
+            (player.get("first_name", "") or "").lower(),
+        )
+        for gram in _trigrams(text):
+            self._postings[gram].add(player_id)
+
+    def remove(self, player_id):
+        text = self._texts.pop(player_id, None)
+        if text is None:
+            return
+        del self._names[player_id]
+        for gram in _trigrams(text):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(player_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def _containing(self, term, within=None):
+        """ID dei giocatori il cui testo contiene 'term', eventualmente tra 'within'."""
+        candidates = within
+        if len(term) >= 3:
+            postings = sorted(
+                (self._postings.get(gram, ()) for gram in _trigrams(term)), key=len
+            )
+            for ids in postings:
+                if not ids:
+                    return set()
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return set()
+        if candidates is None:
+            candidates = self._texts.keys()
+        texts = self._texts
+        return {i for i in candidates if term in texts[i]}
+
+    def search(self, query):
+        """
+        Restituisce {id: punteggio} dei giocatori che soddisfano la query,
+        con lo stesso punteggio di utils.match_player_query.
+        """
+        phrases, forbidden, mandatory, optional, first_term = parse_player_query(query)
+
+        candidates = None
+        for term in phrases + mandatory:
+            candidates = self._containing(term, candidates)
+            if not candidates:
+                return {}
+
+        matched = defaultdict(int)
+        if candidates is None and optional:
+            # Solo termini opzionali: basta che ne corrisponda almeno uno
+            for term in optional:
+                for player_id in self._containing(term):
+                    matched[player_id] += 1
+            candidates = set(matched)
+        else:
+            if candidates is None:
+                candidates = set(self._texts)
+            for term in optional:
+                for player_id in self._containing(term, candidates):
+                    matched[player_id] += 1
+
+        for term in forbidden:
+            if not candidates:
+                break
+            candidates -= self._containing(term, candidates)
+
+        base = len(mandatory) + len(phrases)
+        names = self._names
+        return {
+            player_id: relevance_score(
+                base + matched.get(player_id, 0), first_term, *names[player_id]
+            )
+            for player_id in candidates
+        }
+
+
+def search_players(players_db, query):
+    """
+    Cerca nel database personale e restituisce {id: punteggio}.
+    Usa l'indice mantenuto dall'archivio se disponibile.
+    """
+    index = getattr(players_db, "search_index", None)
+    if index is None:
+        index = PlayerSearchIndex(players_db)
+    return index.search(query)
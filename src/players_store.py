@@ -0,0 +1,307 @@
+"""
+Archivio SQLite del database personale dei giocatori.
+
+Ogni giocatore occupa una riga (id, cognome, nome, FIDE ID e record JSON
+completo): i salvataggi scrivono in un'unica transazione solo le righe
+aggiunte, modificate o eliminate invece di riscrivere l'intero file.
+PlayersDb espone l'archivio come un dizionario id -> record e carica i
+record dal disco solo quando vengono richiesti.
+
+La tabella id_counters conserva per ogni prefisso di ID (es. 'BATGA') il
+numero progressivo più alto assegnato, così che un nuovo ID si ottenga
+senza sondare BATGA001, BATGA002, ... uno alla volta.
+"""
+
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+
+from player_search import PlayerSearchIndex
+
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    id         TEXT PRIMARY KEY,
+    last_name  TEXT NOT NULL DEFAULT '',
+    first_name TEXT NOT NULL DEFAULT '',
+    fide_id    TEXT NOT NULL DEFAULT '',
+    data       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_name
+    ON players(last_name COLLATE NOCASE, first_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_players_fide ON players(fide_id);
+CREATE TABLE IF NOT EXISTS id_counters (
+    prefix TEXT PRIMARY KEY,
+    last   INTEGER NOT NULL
+);
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO players (id, last_name, first_name, fide_id, data)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        last_name = excluded.last_name,
+        first_name = excluded.first_name,
+        fide_id = excluded.fide_id,
+        data = excluded.data
+"""
+
+
+def connect(db_path):
+    """Apre l'archivio creando tabelle e indici se mancanti."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.executescript(_SCHEMA)
+    conn.execute(
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+        (str(SCHEMA_VERSION),),
+    )
+    conn.commit()
+    return conn
+
+
+def encode_record(record):
+    """Testo JSON con cui un record viene salvato nell'archivio."""
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+def _row_values(player_id, record, text):
+    return (
+        player_id,
+        str(record.get("last_name") or ""),
+        str(record.get("first_name") or ""),
+        str(record.get("fide_id_num_str") or ""),
+        text,
+    )
+
+
+class PlayersDb(MutableMapping):
+    """
+    Dizionario id -> record del database personale, appoggiato su SQLite.
+    I record modificati sul posto vengono riconosciuti al salvataggio
+    confrontandoli con il testo letto dal disco; save() accetta anche
+    l'elenco degli id toccati per limitare il confronto a quelli.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.RLock()
+        self._rows = {}
+        # Testo JSON dell'ultima versione su disco, per riconoscere le modifiche
+        self._saved = {}
+        self._ids = None
+        self._deleted = set()
+        self._complete = False
+        self._search_index = None
+
+    def _connection(self):
+        if self._conn is None:
+            self._conn = connect(self.db_path)
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _load_ids(self):
+        if self._ids is None:
+            with self._lock:
+                cursor = self._connection().execute(
+                    "SELECT id FROM players ORDER BY rowid"
+                )
+                ids = dict.fromkeys(
+                    row[0] for row in cursor if row[0] not in self._deleted
+                )
+                for player_id in self._rows:
+                    ids.setdefault(player_id)
+                self._ids = ids
+        return self._ids
+
+    def _load_all(self):
+        """Materializza con una sola query tutti i record non ancora caricati."""
+        if self._complete:
+            return
+        ids = self._load_ids()
+        with self._lock:
+            cursor = self._connection().execute("SELECT id, data FROM players")
+            for player_id, text in cursor:
+                if player_id in self._rows or player_id not in ids:
+                    continue
+                self._rows[player_id] = json.loads(text)
+                self._saved[player_id] = text
+        self._complete = True
+
+    def __getitem__(self, player_id):
+        record = self._rows.get(player_id)
+        if record is not None:
+            return record
+        if self._complete or player_id in self._deleted:
+            raise KeyError(player_id)
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT data FROM players WHERE id = ?", (player_id,))
+                .fetchone()
+            )
+        if row is None:
+            raise KeyError(player_id)
+        record = json.loads(row[0])
+        self._rows[player_id] = record
+        self._saved[player_id] = row[0]
+        return record
+
+    def __setitem__(self, player_id, record):
+        self._load_ids()[player_id] = None
+        self._rows[player_id] = record
+        self._deleted.discard(player_id)
+        if self._search_index is not None:
+            self._search_index.add(player_id, record)
+
+    def __delitem__(self, player_id):
+        ids = self._load_ids()
+        if player_id not in ids:
+            raise KeyError(player_id)
+        del ids[player_id]
+        self._rows.pop(player_id, None)
+        self._deleted.add(player_id)
+        if self._search_index is not None:
+            self._search_index.remove(player_id)
+
+    def __contains__(self, player_id):
+        return player_id in self._load_ids()
+
+    def __iter__(self):
+        return iter(list(self._load_ids()))
+
+    def __len__(self):
+        return len(self._load_ids())
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    @property
+    def search_index(self):
+        """Indice di ricerca costruito al primo uso e aggiornato a ogni modifica salvata."""
+        if self._search_index is None:
+            self._search_index = PlayerSearchIndex(self)
+        return self._search_index
+
+    def ids_by_fide_id(self, fide_ids):
+        """
+        Restituisce {ID FIDE: id del giocatore} per i giocatori dell'archivio
+        con uno degli ID FIDE indicati, con un'unica query sull'indice.
+        """
+        wanted = {str(f).strip() for f in fide_ids if str(f or "").strip()}
+        found = {}
+        if not wanted:
+            return found
+        with self._lock:
+            cursor = self._connection().execute(
+                "SELECT fide_id, id FROM players "
+                "WHERE fide_id IN (SELECT value FROM json_each(?))",
+                (json.dumps(sorted(wanted)),),
+            )
+            rows = cursor.fetchall()
+        for fide_id, player_id in rows:
+            # I record in memoria prevalgono sulla versione su disco
+            if player_id not in self._deleted and player_id not in self._rows:
+                found.setdefault(fide_id, player_id)
+        for player_id, record in self._rows.items():
+            fide_id = str(record.get("fide_id_num_str") or "")
+            if fide_id in wanted:
+                found.setdefault(fide_id, player_id)
+        return found
+
+    def _highest_suffix(self, conn, prefix):
+        """Numero progressivo più alto già usato con 'prefix', su disco o in memoria."""
+        # Gli ID sono ASCII: l'intervallo [prefix, prefix + DEL) usa la chiave primaria
+        cursor = conn.execute(
+            "SELECT id FROM players WHERE id >= ? AND id < ?", (prefix, prefix + "\x7f")
+        )
+        candidates = [row[0] for row in cursor]
+        candidates.extend(i for i in self._rows if i.startswith(prefix))
+        highest = 0
+        for player_id in candidates:
+            suffix = player_id[len(prefix) :]
+            if suffix.isdigit():
+                highest = max(highest, int(suffix))
+        return highest
+
+    def reserve_ids(self, prefix, count=1):
+        """
+        Riserva 'count' ID consecutivi con il prefisso indicato e li restituisce
+        (es. ['BATGA004', 'BATGA005']). La riserva viene salvata subito, quindi
+        gli stessi numeri non verranno più assegnati.
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                row = conn.execute(
+                    "SELECT last FROM id_counters WHERE prefix = ?", (prefix,)
+                ).fetchone()
+                last = row[0] if row else self._highest_suffix(conn, prefix)
+                conn.execute(
+                    "INSERT INTO id_counters (prefix, last) VALUES (?, ?) "
+                    "ON CONFLICT(prefix) DO UPDATE SET last = excluded.last",
+                    (prefix, last + count),
+                )
+        return [f"{prefix}{n:03d}" for n in range(last + 1, last + count + 1)]
+
+    def save(self, changed_ids=None):
+        """
+        Scrive in un'unica transazione le eliminazioni e i record nuovi o
+        modificati. Con 'changed_ids' vengono controllati solo quei record.
+        Restituisce il numero di righe scritte o eliminate.
+        """
+        candidates = self._rows if changed_ids is None else changed_ids
+        pending = []
+        for player_id in candidates:
+            record = self._rows.get(player_id)
+            if record is None:
+                continue
+            text = encode_record(record)
+            if self._saved.get(player_id) != text:
+                pending.append(_row_values(player_id, record, text))
+        deleted = list(self._deleted)
+        if not pending and not deleted:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if deleted:
+                    conn.executemany(
+                        "DELETE FROM players WHERE id = ?", [(i,) for i in deleted]
+                    )
+                if pending:
+                    conn.executemany(_UPSERT_SQL, pending)
+        for values in pending:
+            self._saved[values[0]] = values[4]
+            if self._search_index is not None:
+                # Le modifiche sul posto diventano visibili alla ricerca al salvataggio
+                self._search_index.add(values[0], self._rows[values[0]])
+        for player_id in deleted:
+            self._saved.pop(player_id, None)
+        self._deleted.clear()
+        return len(pending) + len(deleted)
+
+    def replace_all(self, records):
+        """Rende il contenuto dell'archivio uguale al dizionario 'records'."""
+        for player_id in list(self):
+            if player_id not in records:
+                del self[player_id]
+        for player_id, record in records.items():
+            self[player_id] = record
+        return self.save(list(records))
@@ -6,6 +6,7 @@ from utils import (
     format_date_locale,
     format_points,
     sanitize_filename,
+    get_round,
     _ensure_players_dict,
 )
 from stats import (
@@ -68,10 +69,7 @@ def get_current_round_report_text(torneo, round_num=None):
             round_data = rnd
             break
 
-    if "players_dict" not in torneo or len(torneo["players_dict"]) != len(
-        torneo.get("players", [])
-    ):
-        torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
+    _ensure_players_dict(torneo)
     players_dict = torneo["players_dict"]
 
     round_dates_info = torneo.get("round_dates", [])
@@ -719,8 +717,7 @@ def get_standings_text(torneo, final=False):
     if not players:
         return _("Attenzione: Nessun giocatore per generare la classifica.")
 
-    if "players_dict" not in torneo or len(torneo["players_dict"]) != len(players):
-        torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
+    _ensure_players_dict(torneo)
 
     # --- CALCOLO SEEDING (ORDINE DI PARTENZA) ---
     def get_effective_elo(p):
@@ -1171,16 +1168,13 @@ def display_status(torneo):
         )
     # Conta partite pendenti nel turno corrente
     pending_match_count = 0
-    found_current_round_data = False
-    for r in torneo.get("rounds", []):
-        if r.get("round") == current_r:
-            found_current_round_data = True
-            if "matches" in r:
-                for m in r["matches"]:
-                    # Pendente se non ha risultato e non è un BYE
-                    if m.get("result") is None and m.get("black_player_id") is not None:
-                        pending_match_count += 1
-            break  # Trovato il round corrente, esci dal loop
+    current_round_data = get_round(torneo, current_r)
+    found_current_round_data = current_round_data is not None
+    if found_current_round_data:
+        for m in current_round_data.get("matches", []):
+            # Pendente se non ha risultato e non è un BYE
+            if m.get("result") is None and m.get("black_player_id") is not None:
+                pending_match_count += 1
     if found_current_round_data:
         if pending_match_count > 0:
             print(
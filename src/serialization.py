@@ -0,0 +1,311 @@
+"""
+Serializzazione JSON in streaming dei dati di Tornello.
+
+L'encoder conosce i tipi usati dal programma (set, dataclass di models.py,
+chiavi transitorie come 'players_dict') e li converte al volo durante la
+scrittura, senza dover prima copiare l'intera struttura del torneo.
+L'output viene scritto a blocchi su un file bufferizzato e sostituito
+atomicamente al file finale solo a scrittura completata.
+
+Per l'albero e le scansioni all'avvio è disponibile anche una lettura
+parziale (read_json_keys, read_tournament_header) che decodifica solo le
+chiavi richieste e salta le altre senza costruirne gli oggetti.
+"""
+
+import os
+import re
+import json
+import builtins
+import dataclasses
+from collections.abc import Mapping
+
+_ = getattr(builtins, "_", lambda s: s)
+
+# Chiavi di primo livello ricalcolabili al caricamento e quindi mai salvate
+TRANSIENT_KEYS = frozenset({"players_dict", "rounds_index"})
+
+# Campi di intestazione del torneo, scritti per primi e in quest'ordine così
+# che la lettura parziale possa fermarsi prima di giocatori e turni.
+# 'concluded' viene sempre scritto e chiude l'intestazione.
+HEADER_KEYS = (
+    "name",
+    "site",
+    "start_date",
+    "end_date",
+    "creation_suspended",
+    "current_round",
+    "total_rounds",
+    "concluded",
+)
+# Campi presenti in ogni torneo salvato: trovati questi, l'intestazione è completa
+_HEADER_REQUIRED = frozenset(
+    {"name", "start_date", "end_date", "current_round", "total_rounds", "concluded"}
+)
+
+# Numero di frammenti accumulati prima di ogni scrittura su file
+_CHUNKS_PER_WRITE = 2048
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+class TornelloJSONEncoder(json.JSONEncoder):
+    """Encoder JSON che comprende set e dataclass del modello dati di Tornello."""
+
+    def default(self, o):
+        if isinstance(o, (set, frozenset)):
+            try:
+                return sorted(o)
+            except TypeError:
+                return list(o)
+        if dataclasses.is_dataclass(o) and not isinstance(o, type):
+            # Le dataclass di models.py definiscono il proprio formato di salvataggio;
+            # il dizionario viene creato per un oggetto alla volta e subito scartato.
+            to_dict = getattr(o, "to_dict", None)
+            if to_dict is not None:
+                return to_dict()
+            return {f.name: getattr(o, f.name) for f in dataclasses.fields(o) if f.init}
+        return super().default(o)
+
+
+def _without_transient_keys(obj):
+    """Restituisce una vista di primo livello priva delle chiavi transitorie (copia superficiale)."""
+    if isinstance(obj, Mapping) and not TRANSIENT_KEYS.isdisjoint(obj):
+        return {k: obj[k] for k in obj if k not in TRANSIENT_KEYS}
+    return obj
+
+
+def _header_first(obj):
+    """Riordina le chiavi di primo livello di un torneo mettendo in testa l'intestazione."""
+    if not isinstance(obj, Mapping) or "players" not in obj:
+        return obj
+    ordered = {k: obj[k] for k in HEADER_KEYS if k in obj}
+    ordered.setdefault("concluded", False)
+    for k, v in obj.items():
+        if k not in ordered:
+            ordered[k] = v
+    return ordered
+
+
+def _make_encoder(compact):
+    if compact:
+        return TornelloJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    return TornelloJSONEncoder(ensure_ascii=False, indent=1)
+
+
+def dump(obj, fp, compact=False):
+    """
+    Scrive 'obj' in formato JSON sul file di testo 'fp' in streaming.
+    In modalità compatta (per file letti solo dal programma, come indici e
+    cache) non vengono scritti indentazione e spazi dopo i separatori.
+    """
+    obj = _header_first(_without_transient_keys(obj))
+    pending = []
+    for chunk in _make_encoder(compact).iterencode(obj):
+        pending.append(chunk)
+        if len(pending) >= _CHUNKS_PER_WRITE:
+            fp.write("".join(pending))
+            pending.clear()
+    if pending:
+        fp.write("".join(pending))
+
+
+def dumps(obj, compact=False):
+    """Restituisce la rappresentazione JSON di 'obj' come stringa."""
+    return _make_encoder(compact).encode(_header_first(_without_transient_keys(obj)))
+
+
+def dump_to_file(obj, filepath, compact=False, fsync=False):
+    """
+    Salva 'obj' in 'filepath' scrivendo prima su un file temporaneo nella stessa
+    cartella, così che un errore a metà scrittura non danneggi il file esistente.
+    Con fsync=True il file temporaneo viene forzato su disco prima della sostituzione.
+    """
+    tmp_path = filepath + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            dump(obj, f, compact=compact)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# --- Lettura parziale ---
+
+_READ_CHUNK_SIZE = 1 << 14
+_WS_RE = re.compile(r"[ \t\n\r]*")
+# Stringhe complete o delimitatori; un '"' isolato indica una stringa troncata
+_SKIP_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|["\[\]{}]')
+_SCALAR_RE = re.compile(r"[^,}\]\s]*")
+_decoder = json.JSONDecoder()
+
+# Intestazioni già lette, per percorso, validate con mtime e dimensione del file
+_header_cache = {}
+# Presenza di turni nei file dei tornei, con la stessa validazione
+_rounds_flag_cache = {}
+
+
+class _NeedMoreData(Exception):
+    pass
+
+
+def _skip_value(buf, pos, eof):
+    """Ritorna la posizione successiva al valore JSON che inizia in 'pos', senza decodificarlo."""
+    first = buf[pos : pos + 1]
+    if not first:
+        raise _NeedMoreData
+    if first not in '[{"':
+        end = _SCALAR_RE.match(buf, pos).end()
+        if end == len(buf) and not eof:
+            raise _NeedMoreData
+        return end
+
+    depth = 0
+    for tok in _SKIP_TOKEN_RE.finditer(buf, pos):
+        t = tok.group()
+        if t == '"':
+            break
+        if t in "[{":
+            depth += 1
+        elif t in "]}":
+            depth -= 1
+        if depth == 0:
+            return tok.end()
+    if eof:
+        raise ValueError(_("Valore JSON non terminato"))
+    raise _NeedMoreData
+
+
+def _decode_at(buf, pos, eof):
+    try:
+        return _decoder.raw_decode(buf, pos)
+    except json.JSONDecodeError:
+        if eof:
+            raise
+        raise _NeedMoreData
+
+
+def _has_items(buf, pos, eof):
+    """
+    Indica se il valore JSON in 'pos' è "pieno": per array e oggetti guarda solo
+    il primo carattere dopo la parentesi, gli altri valori vengono decodificati.
+    """
+    first = buf[pos : pos + 1]
+    if first in ("[", "{"):
+        inner = _WS_RE.match(buf, pos + 1).end()
+        if inner >= len(buf):
+            if not eof:
+                raise _NeedMoreData
+            raise ValueError(_("Valore JSON non terminato"))
+        return buf[inner] not in "]}"
+    return bool(_decode_at(buf, pos, eof)[0])
+
+
+def _scan_object(buf, eof, keys, required, result, peek=frozenset()):
+    """
+    Analizza l'oggetto di primo livello in 'buf' fermandosi appena possibile.
+    Se prima delle chiavi in 'required' compare una chiave non cercata, il file
+    non è stato scritto con l'intestazione in testa (salvataggi precedenti):
+    la lettura prosegue allora fino a trovare tutte le 'keys' o la fine.
+    Per le chiavi in 'peek' (comprese in 'keys') il valore non viene decodificato:
+    il risultato dice solo se è pieno (vedi _has_items).
+    """
+    skipped = False
+    pos = _WS_RE.match(buf, 0).end()
+    if buf[pos : pos + 1] != "{":
+        if pos >= len(buf) and not eof:
+            raise _NeedMoreData
+        raise ValueError(_("Il file non contiene un oggetto JSON"))
+    pos += 1
+    while True:
+        pos = _WS_RE.match(buf, pos).end()
+        ch = buf[pos : pos + 1]
+        if ch == "}":
+            return
+        if ch == ",":
+            pos = _WS_RE.match(buf, pos + 1).end()
+        key, pos = _decode_at(buf, pos, eof)
+        pos = _WS_RE.match(buf, pos).end()
+        if buf[pos : pos + 1] != ":":
+            if pos >= len(buf) and not eof:
+                raise _NeedMoreData
+            raise ValueError(_("Separatore ':' mancante nel JSON"))
+        pos = _WS_RE.match(buf, pos + 1).end()
+        if key in keys:
+            if key in peek:
+                result[key] = _has_items(buf, pos, eof)
+                pos = _skip_value(buf, pos, eof)
+            else:
+                result[key], pos = _decode_at(buf, pos, eof)
+            if required.issubset(result) and (not skipped or keys.issubset(result)):
+                return
+        else:
+            skipped = True
+            pos = _skip_value(buf, pos, eof)
+
+
+def read_json_keys(filepath, keys, required=None, peek=()):
+    """
+    Legge da un file JSON solo le chiavi di primo livello indicate in 'keys',
+    saltando gli altri valori senza decodificarli. La lettura si interrompe
+    appena sono state trovate tutte le chiavi in 'required' (di default 'keys'),
+    purché precedano ogni altra chiave; altrimenti prosegue fino a trovare
+    tutte le 'keys' o la fine del file. Per le chiavi in 'peek' si ottiene solo
+    True o False a seconda che il valore sia pieno o vuoto.
+    """
+    peek = frozenset(peek)
+    keys = frozenset(keys) | peek
+    required = keys if required is None else frozenset(required)
+    with open(filepath, "r", encoding="utf-8") as f:
+        buf = f.read(_READ_CHUNK_SIZE)
+        eof = len(buf) < _READ_CHUNK_SIZE
+        while True:
+            result = {}
+            try:
+                _scan_object(buf, eof, keys, required, result, peek)
+                return result
+            except _NeedMoreData:
+                # Letture di dimensione crescente: le rianalisi restano O(n)
+                more = f.read(max(_READ_CHUNK_SIZE, len(buf)))
+                if not more:
+                    eof = True
+                buf += more
+
+
+def read_tournament_header(filepath):
+    """
+    Restituisce i campi di intestazione del torneo presenti nel file (HEADER_KEYS)
+    senza decodificare giocatori, turni e PGN. Il risultato resta in memoria
+    finché il file non cambia.
+    """
+    st = os.stat(filepath)
+    cache_key = os.path.abspath(filepath)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _header_cache.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return dict(cached[1])
+    header = read_json_keys(filepath, HEADER_KEYS, required=_HEADER_REQUIRED)
+    _header_cache[cache_key] = (stamp, header)
+    return dict(header)
+
+
+def tournament_has_rounds(filepath):
+    """
+    Indica se nel file del torneo sono già stati generati dei turni, guardando
+    solo l'inizio della lista 'rounds' senza decodificarla. Come l'intestazione,
+    il risultato resta in memoria finché il file non cambia.
+    """
+    st = os.stat(filepath)
+    cache_key = os.path.abspath(filepath)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _rounds_flag_cache.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    has_rounds = read_json_keys(filepath, (), peek=("rounds",)).get("rounds", False)
+    _rounds_flag_cache[cache_key] = (stamp, has_rounds)
+    return has_rounds
@@ -3,7 +3,7 @@ from typing import Optional
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from config import DEFAULT_K_FACTOR, DEFAULT_ELO, DATE_FORMAT_ISO
-from utils import format_points, get_player_by_id
+from utils import format_points, get_player_by_id, _ensure_players_dict
 
 
 def get_k_factor(player_data_dict, tournament_start_date_str):
@@ -330,9 +330,7 @@ def compute_buchholz(player_id, torneo):
     if not player:
         return 0.0
     # Assicura che il dizionario dei giocatori sia aggiornato
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
     # Usa lo storico risultati per trovare gli avversari reali
     opponent_ids_encountered = (
         set()
@@ -380,9 +378,7 @@ def compute_buchholz_cut1(player_id, torneo):
     player = get_player_by_id(torneo, player_id)
     if not player:
         return 0.0
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
     opponent_ids_encountered = set()  # Evita doppio conteggio se storico errato
 
     for result_entry in player.get("results_history", []):
@@ -426,9 +422,7 @@ def compute_aro(player_id, torneo):
     player = get_player_by_id(torneo, player_id)
     if not player:
         return None  # Non possiamo calcolare ARO
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
     opponent_ids_encountered = set()
 
     for result_entry in player.get("results_history", []):
@@ -550,9 +544,7 @@ def compute_sonneborn_berger(player_id, torneo):
     player = get_player_by_id(torneo, player_id)
     if not player:
         return 0.0
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
     opponent_ids_encountered = set()
     for result_entry in player.get("results_history", []):
         opponent_id = result_entry.get("opponent_id")
@@ -741,9 +733,7 @@ def compute_buchholz_generic(
     if not player:
         return 0.0
 
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
 
     opponent_scores = []
     forfeit_scores = []  # Punteggi avversari da turni con sconfitta per forfeit
@@ -1028,9 +1018,7 @@ def compute_fore_buchholz(player_id, torneo, cut1=False):
     if not player:
         return 0.0
 
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
 
     # Determina il turno corrente
     current_round = torneo.get("current_round", 1)
@@ -1109,9 +1097,7 @@ def compute_sonneborn_berger_generic(player_id, torneo, cut1=False):
     if not player:
         return 0.0
 
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
 
     contributions = []
     for result_entry in player.get("results_history", []):
@@ -1158,9 +1144,7 @@ def compute_aro_generic(player_id, torneo, cut1=False):
     if not player:
         return 0
 
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
 
     opponent_elos = []
     for result_entry in player.get("results_history", []):
@@ -1302,9 +1286,7 @@ def compute_tpr(player_id, torneo):
     if not player:
         return 0
 
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
 
     try:
         initial_elo = float(player.get("initial_elo", DEFAULT_ELO))
@@ -1360,9 +1342,7 @@ def compute_ptp(player_id, torneo):
     if not player:
         return 0
 
-    players_dict = torneo.get(
-        "players_dict", {p["id"]: p for p in torneo.get("players", [])}
-    )
+    players_dict = _ensure_players_dict(torneo)
 
     opponent_elos = []
     total_score = 0.0
@@ -8,7 +8,9 @@ from utils import (
     sanitize_filename,
     create_backup,
     get_player_by_id,
+    get_match_by_id,
     _ensure_players_dict,
+    _ensure_rounds_index,
 )
 from engine import (
     handle_bbpairings_failure,
@@ -16,6 +18,8 @@ from engine import (
     run_bbpairings_engine,
     parse_bbpairings_couples_output,
 )
+from serialization import dump_to_file
+from models import PlayerList, PlayersIndex, RoundList
 
 
 def _ricalcola_stato_giocatore_da_storico(player_obj):
@@ -130,9 +134,9 @@ def time_machine_torneo(torneo):
             )
 
     # Azzera lo stato futuro (rimuove i round >= target_round)
-    torneo["rounds"] = [
+    torneo["rounds"] = RoundList(
         r for r in torneo.get("rounds", []) if r.get("round", 0) < target_round
-    ]
+    )
     for player in torneo.get("players", []):
         player["results_history"] = [
             res
@@ -197,7 +201,7 @@ def time_machine_torneo(torneo):
     )
 
     # Ricostruisci il dizionario cache per coerenza
-    torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
+    torneo["players_dict"] = PlayersIndex(torneo.get("players", []))
 
     print(_("\nRiavvolgimento completato con successo!"))
     prompt_template_5 = _(
@@ -262,8 +266,9 @@ def rollback_to_previous_round(torneo):
                 max_id = m.get("id", 0)
     torneo["next_match_id"] = max_id + 1
 
-    # Ricostruisci il dizionario cache per coerenza
-    torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
+    # Ricostruisci gli indici per coerenza
+    torneo["players_dict"] = PlayersIndex(torneo.get("players", []))
+    _ensure_rounds_index(torneo, rebuild=True)
 
     from utils import play_sound
 
@@ -298,7 +303,9 @@ def load_tournament(filename_to_load):
                 torneo_data.setdefault("deputy_chief_arbiters", "")
                 torneo_data.setdefault("time_control", "Standard")
                 torneo_data.setdefault("bye_value", 0.5)
+                torneo_data["rounds"] = RoundList(torneo_data.get("rounds", []))
                 if "players" in torneo_data:
+                    torneo_data["players"] = PlayerList(torneo_data["players"])
                     for p in torneo_data["players"]:
                         p["opponents"] = set(p.get("opponents", []))
                         p.setdefault("white_games", 0)
@@ -307,9 +314,9 @@ def load_tournament(filename_to_load):
                             "received_bye_count", 0
                         )  # Esempio se avevi aggiunto questo
                         p.setdefault("received_bye_in_round", [])
-                torneo_data["players_dict"] = {
-                    p["id"]: p for p in torneo_data.get("players", [])
-                }
+                torneo_data["players_dict"] = PlayersIndex(
+                    torneo_data.get("players", [])
+                )
                 return torneo_data
         except (json.JSONDecodeError, IOError) as e:
             print(
@@ -322,7 +329,10 @@ def load_tournament(filename_to_load):
 
 
 def save_tournament(torneo, filepath=None):
-    """Salva lo stato corrente del torneo nel file JSON."""
+    """
+    Salva lo stato corrente del torneo nel file JSON.
+    La serializzazione avviene in streaming, senza copiare torneo e giocatori.
+    """
     tournament_name_for_file = None  # Inizializza a None
     dynamic_tournament_filename = None  # Inizializza a None
     try:
@@ -335,21 +345,9 @@ def save_tournament(torneo, filepath=None):
             dynamic_tournament_filename = filepath
         else:
             dynamic_tournament_filename = f"Tornello - {sanitized_name}.json"
-        torneo_to_save = torneo.copy()
-        # Prepara i dati per il salvataggio JSON
-        if "players" in torneo_to_save:
-            temp_players = []
-            for p in torneo_to_save["players"]:
-                player_copy = p.copy()
-                # Converti set in lista PRIMA di salvare
-                player_copy["opponents"] = list(player_copy.get("opponents", set()))
-                temp_players.append(player_copy)
-            torneo_to_save["players"] = temp_players
-        # Rimuovi il dizionario cache che non è serializzabile o necessario salvare
-        if "players_dict" in torneo_to_save:
-            del torneo_to_save["players_dict"]
-        with open(dynamic_tournament_filename, "w", encoding="utf-8") as f:
-            json.dump(torneo_to_save, f, indent=1, ensure_ascii=False)
+        # I set (es. 'opponents') vengono convertiti in liste e il dizionario
+        # cache 'players_dict' viene escluso direttamente dall'encoder
+        dump_to_file(torneo, dynamic_tournament_filename)
     except IOError as e:
         print(
             _("Errore durante il salvataggio del torneo ({filename}): {error}").format(
@@ -620,14 +618,10 @@ def _apply_match_result_to_players(torneo, match_obj, result_str, w_score, b_sco
     )
 
     # 3. Aggiorna l'oggetto 'match' originale nella lista dei round
-    for r in torneo.get("rounds", []):
-        if r.get("round") == current_round_num:
-            for i, m in enumerate(r.get("matches", [])):
-                if m.get("id") == match_obj.get("id"):
-                    r["matches"][i]["result"] = result_str
-                    # Rimuovi la pianificazione se c'era
-                    if r["matches"][i].get("is_scheduled"):
-                        r["matches"][i]["is_scheduled"] = False
-                    break
-            break
+    r, m = get_match_by_id(torneo, match_obj.get("id"))
+    if m is not None and r.get("round") == current_round_num:
+        m["result"] = result_str
+        # Rimuovi la pianificazione se c'era
+        if m.get("is_scheduled"):
+            m["is_scheduled"] = False
     print(_("\nRisultato registrato con successo."))
@@ -6,7 +6,6 @@ from datetime import datetime
 from config import (
     DEFAULT_ELO,
     DATE_FORMAT_ISO,
-    PLAYER_DB_FILE,
     DEFAULT_K_FACTOR,
     ARCHIVED_TOURNAMENTS_DIR,
 )
@@ -17,11 +16,16 @@ from utils import (
     sanitize_filename,
     create_backup,
     play_sound,
+    get_round,
+    _ensure_players_dict,
 )
+from models import PlayersIndex
+from player_search import search_players as search_local_players
 from db_players import (
     _cerca_giocatore_nel_db_fide,
     crea_nuovo_giocatore_nel_db,
     save_players_db,
+    players_db_file,
     allinea_giocatori_con_database,
 )
 from tournament import (
@@ -119,7 +123,7 @@ def _conferma_lista_giocatori_torneo(torneo, players_db):
             # Allinea eventuali aggiornamenti del database (Elo, Titoli) prima di cristallizzare la lista
             category = torneo.get("tournament_category", "standard")
             aggiornati = allinea_giocatori_con_database(
-                torneo["players"], players_db, category
+                torneo["players"], players_db, category, as_of=torneo.get("start_date")
             )
 
             if aggiornati > 0:
@@ -155,7 +159,7 @@ def _conferma_lista_giocatori_torneo(torneo, players_db):
                             )
                         )
                         # Aggiorna anche players_dict se necessario (o fallo alla fine una volta)
-                        torneo["players_dict"] = {p["id"]: p for p in torneo["players"]}
+                        torneo["players_dict"] = PlayersIndex(torneo["players"])
                     else:
                         print(_("Rimozione annullata."))
                 else:
@@ -364,9 +368,7 @@ def input_players(
                         _("\nSospensione inserimento. Salvataggio stato del torneo...")
                     )
                     torneo_obj["players"] = players_in_tournament
-                    torneo_obj["players_dict"] = {
-                        p["id"]: p for p in players_in_tournament
-                    }
+                    torneo_obj["players_dict"] = PlayersIndex(players_in_tournament)
                     # Aggiungiamo un flag esplicito per indicare che la creazione è sospesa
                     torneo_obj["creation_suspended"] = True
                     save_tournament(torneo_obj)
@@ -407,15 +409,12 @@ def input_players(
                 continue
             player_id_to_add = potential_id_input
         else:
-            search_terms = data_input.lower().split()
+            # Tutti i termini sono obbligatori; l'indice evita di scorrere l'intero DB
+            found_ids = search_local_players(
+                players_db, " ".join("+" + t for t in data_input.split())
+            )
             matches_in_personal_db = [
-                p
-                for p in players_db.values()
-                if all(
-                    term
-                    in f"{p.get('first_name', '')} {p.get('last_name', '')} {p.get('id', '')}".lower()
-                    for term in search_terms
-                )
+                players_db[p_id] for p_id in players_db if p_id in found_ids
             ]
             if matches_in_personal_db:
                 print(
@@ -814,19 +813,9 @@ def update_match_result(torneo):
     any_changes_made_in_this_session = False
     while True:
         current_round_num = torneo["current_round"]
-        if "players_dict" not in torneo or len(torneo["players_dict"]) != len(
-            torneo.get("players", [])
-        ):
-            torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
+        _ensure_players_dict(torneo)
         players_dict = torneo["players_dict"]
-        current_round_data = next(
-            (
-                r
-                for r in torneo.get("rounds", [])
-                if r.get("round") == current_round_num
-            ),
-            None,
-        )
+        current_round_data = get_round(torneo, current_round_num)
         if not current_round_data:
             print(
                 _("ERRORE: Dati turno {round_num} non trovati.").format(
@@ -1471,7 +1460,7 @@ def finalize_tournament(torneo, players_db, current_tournament_filename):
 
     # --- Creazione backup pre-finalizzazione ---
     print(_("Creazione backup di sicurezza prima dell'archiviazione..."))
-    backup_db_ok = create_backup(PLAYER_DB_FILE, "pre_finalize_db")
+    backup_db_ok = create_backup(players_db_file(), "pre_finalize_db")
     backup_torneo_ok = True
     if current_tournament_filename and os.path.exists(current_tournament_filename):
         backup_torneo_ok = create_backup(
@@ -1487,10 +1476,7 @@ def finalize_tournament(torneo, players_db, current_tournament_filename):
     else:
         print(_("Backup di sicurezza creati con successo."))
 
-    if "players_dict" not in torneo or len(torneo["players_dict"]) != len(
-        torneo.get("players", [])
-    ):
-        torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
+    _ensure_players_dict(torneo)
     num_players = len(torneo.get("players", []))
     if num_players == 0:
         print(_("Nessun giocatore nel torneo, impossibile finalizzare."))
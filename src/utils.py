@@ -1,37 +1,27 @@
 import datetime
 import re
 import os
-import shutil
 from babel.dates import format_date
 from config import _, lingua_rilevata, DATE_FORMAT_ISO
 from GBUtils import key
+from backup_store import BackupStore, BackupStoreError
+from models import PlayersIndex, RoundsIndex
+from player_search import parse_player_query, player_search_text, relevance_score
 
 
 def create_backup(filepath, context="backup"):
     """
-    Crea una copia di backup del file specificato nella cartella 'backup'.
-    Aggiunge un timestamp e il contesto al nome del file per non sovrascrivere backup precedenti.
+    Salva un'istantanea del file specificato nell'archivio dei backup (cartella 'backup').
+    I contenuti identici vengono memorizzati una sola volta e le versioni successive
+    dello stesso file come delta compressi rispetto alla precedente.
     """
     if not os.path.exists(filepath):
         return False
 
-    backup_dir = "backup"
-    if not os.path.exists(backup_dir):
-        try:
-            os.makedirs(backup_dir)
-        except OSError:
-            return False
-
-    filename = os.path.basename(filepath)
-    name, ext = os.path.splitext(filename)
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_filename = f"{name}_{context}_{timestamp}{ext}"
-    backup_path = os.path.join(backup_dir, backup_filename)
-
     try:
-        shutil.copy2(filepath, backup_path)
+        BackupStore().add(filepath, context)
         return True
-    except Exception:
+    except (OSError, BackupStoreError):
         return False
 
 
@@ -157,7 +147,7 @@ def play_sound(event_name, torneo=None, sync=False):
     except Exception:
         pass
 
-    if torneo and isinstance(torneo, dict):
+    if torneo is not None and hasattr(torneo, "get"):
         base_volume = torneo.get("base_volume", base_volume)
 
     # Mappatura eventi su preset
@@ -241,12 +231,17 @@ def play_sound(event_name, torneo=None, sync=False):
 
 
 def _ensure_players_dict(torneo):
-    """Assicura che il dizionario cache dei giocatori sia presente e aggiornato."""
-    if "players_dict" not in torneo or len(torneo["players_dict"]) != len(
-        torneo.get("players", [])
-    ):
-        torneo["players_dict"] = {p["id"]: p for p in torneo.get("players", [])}
-    return torneo["players_dict"]
+    """
+    Assicura che il dizionario cache dei giocatori sia presente e aggiornato.
+    L'indice ricorda identità e versione della lista 'players' da cui è stato
+    costruito, quindi la verifica di validità è a tempo costante.
+    """
+    players = torneo.get("players", [])
+    index = torneo.get("players_dict")
+    if not isinstance(index, PlayersIndex) or not index.is_current(players):
+        index = PlayersIndex(players)
+        torneo["players_dict"] = index
+    return index
 
 
 def get_player_by_id(torneo, player_id):
@@ -255,6 +250,79 @@ def get_player_by_id(torneo, player_id):
     return torneo["players_dict"].get(player_id)
 
 
+def _ensure_rounds_index(torneo, rebuild=False):
+    """
+    Assicura che gli indici dei turni (per numero di turno, per id partita e,
+    nel turno corrente, per giocatore) siano presenti e aggiornati.
+    Con turni e partite del modello dati le modifiche sul posto vengono
+    rilevate da sole; con semplici dizionari va forzata la ricostruzione con
+    'rebuild' dopo averne modificato le partite.
+    """
+    rounds = torneo.get("rounds", [])
+    current_round = torneo.get("current_round")
+    index = torneo.get("rounds_index")
+    if (
+        rebuild
+        or not isinstance(index, RoundsIndex)
+        or not index.is_current(rounds, current_round)
+    ):
+        index = RoundsIndex(rounds, current_round)
+        torneo["rounds_index"] = index
+    return index
+
+
+def get_round(torneo, round_num):
+    """Restituisce i dati del turno dato il suo numero, o None."""
+    round_data = _ensure_rounds_index(torneo).rounds.get(round_num)
+    if round_data is not None and round_data.get("round") == round_num:
+        return round_data
+    return _ensure_rounds_index(torneo, rebuild=True).rounds.get(round_num)
+
+
+def get_match_by_id(torneo, match_id):
+    """
+    Restituisce la coppia (turno, partita) con l'id indicato, o (None, None).
+    Un indice non più allineato viene ricostruito una sola volta.
+    """
+    entry = _ensure_rounds_index(torneo).matches.get(match_id)
+    if entry is None or entry[1].get("id") != match_id:
+        entry = _ensure_rounds_index(torneo, rebuild=True).matches.get(match_id)
+    return entry if entry is not None else (None, None)
+
+
+def get_board_number(torneo, match_id):
+    """Restituisce il numero di scacchiera della partita nel suo turno, o None."""
+    if get_match_by_id(torneo, match_id)[1] is None:
+        return None
+    return torneo["rounds_index"].boards.get(match_id)
+
+
+def get_matches_by_board(torneo, round_num):
+    """Restituisce le partite del turno in ordine di scacchiera (lista vuota se assente)."""
+    return _ensure_rounds_index(torneo).board_order.get(round_num, [])
+
+
+def count_pending_matches(torneo, round_num):
+    """Numero di partite del turno ancora senza risultato (BYE esclusi)."""
+    return _ensure_rounds_index(torneo).pending.get(round_num, 0)
+
+
+def has_scheduled_matches(torneo):
+    """Indica se almeno una partita del torneo ha data e ora pianificate."""
+    return _ensure_rounds_index(torneo).scheduled > 0
+
+
+def get_current_match_for_player(torneo, player_id):
+    """Restituisce la partita del giocatore nel turno corrente, o None."""
+    match = _ensure_rounds_index(torneo).player_matches.get(player_id)
+    if match is not None and player_id in (
+        match.get("white_player_id"),
+        match.get("black_player_id"),
+    ):
+        return match
+    return _ensure_rounds_index(torneo, rebuild=True).player_matches.get(player_id)
+
+
 def get_relevance_score(player, query_terms):
     last_name = player.get("last_name", "").lower()
     first_name = player.get("first_name", "").lower()
@@ -272,46 +340,13 @@ def match_player_query(player, query):
     Effettua una ricerca flessibile basata su operatori (+ per obbligatorio, - per escluso, = per frase esatta).
     Cerca su Cognome, Nome, Anno di Nascita, Federazione e ID FIDE.
     Ritorna None se non corrisponde, o una tupla (score, rel_score, last_name, first_name) per l'ordinamento.
+    Per filtrare un intero database usare player_search.search_players, che usa
+    l'indice e cerca anche su titolo FIDE e ID personale.
     """
-    first_name = player.get("first_name", "") or ""
-    last_name = player.get("last_name", "") or ""
-
-    # Estrae l'anno di nascita (da birth_year o birth_date)
-    birth_yr = player.get("birth_year")
-    if not birth_yr and player.get("birth_date"):
-        birth_yr = player["birth_date"][:4]
-    birth = str(birth_yr or "")
-
-    fed = player.get("federation", "") or ""
-    fide_id = str(player.get("id_fide") or player.get("fide_id_num_str") or "")
-
-    search_text = f"{first_name} {last_name} {birth} {fed} {fide_id}".lower()
-
-    exact_phrases = []
-    forbidden_terms = []
-    mandatory_terms = []
-    optional_terms = []
-
-    temp_query = query.strip()
-    if temp_query.startswith("="):
-        phrase = temp_query.replace("=", " ").strip().lower()
-        if phrase:
-            exact_phrases.append(phrase)
-    else:
-        parts = temp_query.split()
-        for part in parts:
-            if part.startswith("+"):
-                term = part[1:].strip().lower()
-                if term:
-                    mandatory_terms.append(term)
-            elif part.startswith("-"):
-                term = part[1:].strip().lower()
-                if term:
-                    forbidden_terms.append(term)
-            else:
-                term = part.strip().lower()
-                if term:
-                    optional_terms.append(term)
+    search_text = player_search_text(player, extended=False)
+    exact_phrases, forbidden_terms, mandatory_terms, optional_terms, first_term = (
+        parse_player_query(query)
+    )
 
     # Verifiche
     for term in forbidden_terms:
@@ -340,30 +375,12 @@ def match_player_query(player, query):
         return None
 
     total_matched = len(mandatory_terms) + matched_optionals + len(exact_phrases)
-
-    # Primo termine per calcolo rilevanza starts-with
-    first_query_term = ""
-    if query.strip().startswith("="):
-        parts_seq = query.replace("=", " ").strip().split()
-        if parts_seq:
-            first_query_term = parts_seq[0].lower()
-    else:
-        for part in query.split():
-            clean = part.lstrip("+-").lower()
-            if clean:
-                first_query_term = clean
-                break
-
-    rel_score = 3
-    last_name_l = last_name.lower()
-    first_name_l = first_name.lower()
-    if first_query_term:
-        if last_name_l.startswith(first_query_term):
-            rel_score = 1
-        elif first_name_l.startswith(first_query_term):
-            rel_score = 2
-
-    return (-total_matched, rel_score, last_name_l, first_name_l)
+    return relevance_score(
+        total_matched,
+        first_term,
+        (player.get("last_name", "") or "").lower(),
+        (player.get("first_name", "") or "").lower(),
+    )
 
 
 def resolve_and_verify_save_path(path, default_fallback="."):
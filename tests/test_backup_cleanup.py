@@ -8,7 +8,13 @@ sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
 )
 
-from gui.dialogs.backup_cleanup_dialog import calculate_age, delete_file_to_trash
+import gui.dialogs.backup_cleanup_dialog as cleanup_dialog
+from backup_store import BackupStore
+from gui.dialogs.backup_cleanup_dialog import (
+    calculate_age,
+    delete_file_to_trash,
+    trash_backup_entries,
+)
 
 
 def test_calculate_age():
@@ -44,3 +50,33 @@ def test_delete_file_to_trash():
     success = delete_file_to_trash(tmp_path)
     assert success
     assert not os.path.exists(tmp_path)
+
+
+def test_trash_backup_entries_exports_before_deleting(tmp_path, monkeypatch):
+    source = tmp_path / "Tornello - Test.json"
+    source.write_text('{"name": "Test"}', encoding="utf-8")
+    store = BackupStore(str(tmp_path / "backup"))
+    entry = store.add(str(source), "pre_rollback")
+
+    trashed = []
+
+    def fake_trash(path):
+        with open(path, "rb") as f:
+            trashed.append((os.path.basename(path), f.read()))
+        return True
+
+    monkeypatch.setattr(cleanup_dialog, "delete_file_to_trash", fake_trash)
+    assert trash_backup_entries(store, [entry]) == []
+    assert trashed == [(entry["name"], b'{"name": "Test"}')]
+    assert store.list_backups() == []
+
+
+def test_trash_failure_keeps_entry(tmp_path, monkeypatch):
+    source = tmp_path / "Tornello - Test.json"
+    source.write_text("{}", encoding="utf-8")
+    store = BackupStore(str(tmp_path / "backup"))
+    entry = store.add(str(source), "pre_rollback")
+
+    monkeypatch.setattr(cleanup_dialog, "delete_file_to_trash", lambda path: False)
+    assert trash_backup_entries(store, [entry]) == [entry["name"]]
+    assert [e["id"] for e in store.list_backups()] == [entry["id"]]
@@ -0,0 +1,123 @@
+import os
+import json
+from datetime import datetime
+
+import backup_store
+from backup_store import BackupStore, encode_delta, apply_delta
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _tournament_text(rounds):
+    data = {
+        "name": "Test",
+        "rounds": [{"round": r, "matches": []} for r in range(rounds)],
+    }
+    return json.dumps(data, indent=4)
+
+
+def test_delta_roundtrip():
+    base = b"riga 1\nriga 2\nriga 3\n"
+    target = b"riga 0\nriga 1\nriga 3\nriga 4"
+    assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_identical_content_is_stored_once(tmp_path):
+    src = tmp_path / "Tornello - Test.json"
+    _write(src, _tournament_text(3))
+    store = BackupStore(str(tmp_path / "backup"))
+
+    e1 = store.add(str(src), "pre_rollback", when=datetime(2026, 1, 1, 10, 0, 0))
+    e2 = store.add(str(src), "pre_rollback", when=datetime(2026, 1, 1, 10, 0, 0))
+
+    assert e1["hash"] == e2["hash"]
+    assert e1["id"] != e2["id"]
+    assert len(store.list_backups()) == 2
+    assert len(store._load_index()["objects"]) == 1
+
+
+def test_versions_are_stored_as_deltas_and_restored(tmp_path):
+    src = tmp_path / "Tornello - Test.json"
+    store = BackupStore(str(tmp_path / "backup"))
+    contents = []
+    for n in range(1, 6):
+        text = _tournament_text(n * 20)
+        contents.append(text)
+        _write(src, text)
+        store.add(str(src), "pre_timemachine", when=datetime(2026, 1, n))
+
+    objects = store._load_index()["objects"]
+    assert sum(1 for o in objects.values() if o["base"]) == 4
+
+    # Un nuovo store rilegge solo l'indice
+    reopened = BackupStore(str(tmp_path / "backup"))
+    for entry, text in zip(reopened.list_backups(), contents):
+        assert reopened.read(entry["id"]).decode("utf-8") == text
+
+    dest = tmp_path / "restored.json"
+    reopened.restore(reopened.list_backups()[2]["id"], str(dest))
+    assert dest.read_text(encoding="utf-8") == contents[2]
+
+
+def test_delete_keeps_delta_bases_and_collects_garbage(tmp_path):
+    src = tmp_path / "Tornello - Test.json"
+    store = BackupStore(str(tmp_path / "backup"))
+    for n in range(1, 4):
+        _write(src, _tournament_text(n * 20))
+        store.add(str(src), "pre_rollback", when=datetime(2026, 1, n))
+
+    first, second, last = store.list_backups()
+    store.delete([first["id"], second["id"]])
+
+    assert [e["id"] for e in store.list_backups()] == [last["id"]]
+    assert store.read(last["id"]).decode("utf-8") == _tournament_text(60)
+
+    store.delete([last["id"]])
+    assert store._load_index()["objects"] == {}
+    assert store.stored_size() == 0
+
+
+def test_older_than_and_touch(tmp_path):
+    src = tmp_path / "Tornello - Test.json"
+    _write(src, _tournament_text(1))
+    store = BackupStore(str(tmp_path / "backup"))
+    old = store.add(str(src), "pre_rollback", when=datetime(2024, 1, 1))
+    store.add(str(src), "pre_rollback", when=datetime(2026, 1, 1))
+
+    limit = datetime(2025, 1, 1)
+    assert [e["id"] for e in store.older_than(limit)] == [old["id"]]
+
+    store.touch([old["id"]], when=datetime(2026, 2, 1))
+    assert store.older_than(limit) == []
+
+
+def test_loose_legacy_files_are_imported(tmp_path, monkeypatch):
+    trashed = []
+
+    def fake_trash(path):
+        trashed.append(os.path.basename(path))
+        os.remove(path)
+        return True
+
+    monkeypatch.setattr(backup_store, "move_to_trash", fake_trash)
+    backup_dir = tmp_path / "backup"
+    backup_dir.mkdir()
+    legacy = backup_dir / "Tornello - Test_pre_rollback_20250101_120000.json"
+    _write(legacy, _tournament_text(2))
+
+    store = BackupStore(str(backup_dir))
+    entries = store.list_backups()
+
+    assert len(entries) == 1
+    assert entries[0]["name"] == legacy.name
+    assert entries[0]["source"] == "Tornello - Test.json"
+    assert entries[0]["context"] == "pre_rollback"
+    # Verificata l'importazione, l'originale finisce nel Cestino
+    assert trashed == [legacy.name]
+    assert not legacy.exists()
+    assert len(BackupStore(str(backup_dir)).list_backups()) == 1
+    assert store.read(entries[0]["id"]).decode("utf-8") == _tournament_text(2)
+    assert os.path.exists(store.index_path)
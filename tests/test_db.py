@@ -40,11 +40,243 @@ def test_db_migration(tmp_path, monkeypatch):
     assert p["medals"]["gold"] == 1
     assert p["medals"]["silver"] == 0  # Default v1
 
-    # Leggi il file scritto per confermare che sia in formato v2
-    with open(db_file, "r", encoding="utf-8") as f:
-        saved_data = json.load(f)
-
-    assert isinstance(saved_data, dict)
-    assert saved_data["schema_version"] == 2
-    assert len(saved_data["players"]) == 1
-    assert saved_data["players"][0]["id"] == "TEST001"
+    # Il JSON è stato importato nell'archivio SQLite e conservato a parte
+    assert not db_file.exists()
+    assert (tmp_path / "Tornello - Players_db.json.migrato").exists()
+
+    from players_store import PlayersDb
+
+    store = PlayersDb(str(tmp_path / "Tornello - Players_db.sqlite"))
+    assert list(store) == ["TEST001"]
+    assert store["TEST001"]["medals"]["silver"] == 0
+    store.close()
+
+
+def test_players_db_txt_reuses_unchanged_blocks(tmp_path, monkeypatch):
+    import db_players
+
+    txt_file = tmp_path / "Tornello - Players_DB.txt"
+    monkeypatch.setattr(db_players, "PLAYER_DB_TXT_FILE", str(txt_file))
+    rendered = []
+    original_render = db_players._render_player_txt_block
+
+    def counting_render(player, current_date_iso):
+        rendered.append(player["id"])
+        return original_render(player, current_date_iso)
+
+    monkeypatch.setattr(db_players, "_render_player_txt_block", counting_render)
+    players = {
+        "ROSMA001": {"id": "ROSMA001", "first_name": "Mario", "last_name": "Rossi"},
+        "BIALU001": {"id": "BIALU001", "first_name": "Luca", "last_name": "Bianchi"},
+    }
+    db_players.save_players_db_txt(players)
+    players["ROSMA001"]["current_elo"] = 1800
+    db_players.save_players_db_txt(players)
+
+    # Al secondo giro viene riformattato solo il giocatore modificato
+    assert sorted(rendered) == ["BIALU001", "ROSMA001", "ROSMA001"]
+    text = txt_file.read_text(encoding="utf-8-sig")
+    assert text.index("Bianchi") < text.index("Rossi")
+    assert "Elo Standard: 1800" in text
+
+
+def test_schedule_players_db_txt_does_not_wait_for_render(tmp_path, monkeypatch):
+    import threading
+    import db_players
+
+    monkeypatch.setattr(db_players, "PLAYER_DB_FILE", str(tmp_path / "db.json"))
+    monkeypatch.setattr(db_players, "PLAYER_DB_TXT_FILE", str(tmp_path / "db.txt"))
+    monkeypatch.setattr(db_players, "_TXT_IDLE_DELAY", 60.0)
+
+    # Con un report in scrittura, un salvataggio pianifica il successivo senza attese
+    with db_players._txt_render_lock:
+        worker = threading.Thread(target=db_players.schedule_players_db_txt)
+        worker.start()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+    assert db_players._txt_pending == (
+        db_players.players_db_file(),
+        str(tmp_path / "db.txt"),
+    )
+    db_players._txt_timer.cancel()
+    monkeypatch.setattr(db_players, "_txt_pending", None)
+
+
+def test_fide_zip_download_resumes_with_range(tmp_path, monkeypatch):
+    import hashlib
+    import db_players
+
+    payload = bytes(range(256)) * 4000
+    requests_seen = []
+
+    class FakeResponse:
+        def __init__(self, status, body, fail_after=None):
+            self.status_code = status
+            self.headers = {"content-length": str(len(body)), "ETag": '"v1"'}
+            self._body = body
+            self._fail_after = fail_after
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            for pos in range(0, len(self._body), chunk_size):
+                if self._fail_after is not None and pos >= self._fail_after:
+                    raise db_players.requests.exceptions.ConnectionError("reset")
+                yield self._body[pos : pos + chunk_size]
+
+    def fake_get(url, headers, timeout, stream):
+        requests_seen.append(dict(headers))
+        if "Range" not in headers:
+            return FakeResponse(200, payload, fail_after=len(payload) // 2)
+        start = int(headers["Range"][len("bytes=") : -1])
+        return FakeResponse(206, payload[start:])
+
+    monkeypatch.setattr(db_players.requests, "get", fake_get)
+    dest = tmp_path / "fide.zip"
+    checksum = db_players._scarica_zip_fide("http://example/fide.zip", str(dest))
+
+    assert dest.read_bytes() == payload
+    assert checksum == hashlib.sha256(payload).hexdigest()
+    assert requests_seen[1]["If-Range"] == '"v1"'
+    assert not (tmp_path / "fide.zip.part").exists()
+
+
+def test_importa_iscrizioni_da_csv(tmp_path, monkeypatch):
+    import db_players
+    from fide_db import bulk_insert_players, create_fide_db
+    from players_store import PlayersDb
+    from test_fide_db import SAMPLE_PLAYERS
+
+    import fide_db
+
+    monkeypatch.setattr(fide_db, "FIDE_DB_LOCAL_FILE", str(tmp_path / "fide.db"))
+    monkeypatch.setattr(
+        db_players, "PLAYER_DB_FILE", str(tmp_path / "Tornello - Players_db.json")
+    )
+    monkeypatch.setattr(
+        db_players, "PLAYER_DB_TXT_FILE", str(tmp_path / "Tornello - Players_DB.txt")
+    )
+    create_fide_db()
+    bulk_insert_players(iter(SAMPLE_PLAYERS))
+
+    store = PlayersDb(db_players.players_db_file())
+    store["CARMA001"] = {
+        "id": "CARMA001",
+        "first_name": "Magnus",
+        "last_name": "Carlsen",
+        "fide_id_num_str": "1503014",
+    }
+    store["VERLU001"] = {"id": "VERLU001", "first_name": "Luca", "last_name": "Verdi"}
+    store.save()
+
+    csv_file = tmp_path / "iscritti.csv"
+    csv_file.write_text(
+        "Cognome;Nome;ID FIDE;Elo\n"
+        "Carlsen;Magnus;1503014;\n"
+        "Caruana;Fabiano;4100018;\n"
+        "verdi;luca;;\n"
+        "Neri;Anna;;1520\n"
+        "Carlsen;Magnus;1503014;\n"
+        ";;77777777;\n"
+        "Bianchi;Paolo;;\n"
+        "Neri;Anna;;1520\n"
+        "Gialli;Marco;99999999;\n"
+        "Gialli;Marco;99999999;\n",
+        encoding="utf-8",
+    )
+    enrolled = [{"id": "BIAPA001", "first_name": "Paolo", "last_name": "Bianchi"}]
+    store["BIAPA001"] = dict(enrolled[0])
+
+    players, report = db_players.importa_iscrizioni(str(csv_file), store, enrolled)
+
+    names = [(p["last_name"], p["id"]) for p in players]
+    assert names[0] == ("Carlsen", "CARMA001")
+    assert names[1] == ("Caruana", "CARFA001")
+    assert names[2] == ("Verdi", "VERLU001")
+    assert names[3] == ("Neri", "NERAN001")
+    # Le righe ripetute, anche senza ID FIDE o con un ID sconosciuto, non
+    # creano un secondo giocatore
+    assert names[4] == ("Gialli", "GIAMA001")
+    assert len(players) == 5
+    assert report["from_db"] == 2
+    assert report["from_fide"] == 1
+    assert report["created"] == 2
+    assert [line for line, _reason in report["skipped"]] == [6, 7, 8, 9, 11]
+    assert players[1]["current_elo"] == SAMPLE_PLAYERS[1]["elo_standard"]
+    assert players[1]["experienced"] is True
+    assert players[3]["current_elo"] == 1520
+    store.close()
+
+    # I nuovi giocatori sono già salvati nell'archivio
+    reopened = PlayersDb(db_players.players_db_file())
+    assert reopened.ids_by_fide_id(["4100018"]) == {"4100018": "CARFA001"}
+    assert reopened["NERAN001"]["first_name"] == "Anna"
+    reopened.close()
+    db_players.flush_players_db_txt()
+    assert "Neri" in (tmp_path / "Tornello - Players_DB.txt").read_text(
+        encoding="utf-8-sig"
+    )
+    fide_db.invalidate_connections()
+
+
+def test_leggi_file_iscrizioni_tsv_senza_intestazioni(tmp_path):
+    from db_players import leggi_file_iscrizioni
+
+    tsv_file = tmp_path / "iscritti.tsv"
+    tsv_file.write_text("1503014\tCarlsen\tMagnus\n\n4100018\tCaruana\t\n")
+
+    assert leggi_file_iscrizioni(str(tsv_file)) == [
+        (1, {"fide_id": "1503014", "last_name": "Carlsen", "first_name": "Magnus"}),
+        (3, {"fide_id": "4100018", "last_name": "Caruana"}),
+    ]
+
+
+def test_fide_zip_download_restarts_after_416(tmp_path, monkeypatch):
+    import json
+    import db_players
+
+    payload = b"fide" * 1000
+    dest = tmp_path / "fide.zip"
+    # Download precedente già completo: la richiesta Range va oltre la fine
+    (tmp_path / "fide.zip.part").write_bytes(payload)
+    (tmp_path / "fide.zip.part.json").write_text(json.dumps({"etag": '"v1"'}))
+    requests_seen = []
+
+    class FakeResponse:
+        def __init__(self, status, body):
+            self.status_code = status
+            self.headers = {"content-length": str(len(body)), "ETag": '"v1"'}
+            self._body = body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise db_players.requests.exceptions.HTTPError(self.status_code)
+
+        def iter_content(self, chunk_size):
+            yield self._body
+
+    def fake_get(url, headers, timeout, stream):
+        requests_seen.append(dict(headers))
+        if "Range" in headers:
+            return FakeResponse(416, b"")
+        return FakeResponse(200, payload)
+
+    monkeypatch.setattr(db_players.requests, "get", fake_get)
+    db_players._scarica_zip_fide("http://example/fide.zip", str(dest))
+
+    assert dest.read_bytes() == payload
+    assert "Range" in requests_seen[0] and "Range" not in requests_seen[1]
+    assert not (tmp_path / "fide.zip.part.json").exists()
@@ -79,7 +79,6 @@ def test_e2e_tournament_flow(tmp_path, monkeypatch):
     monkeypatch.setattr(db_players, "PLAYER_DB_TXT_FILE", str(db_txt))
     monkeypatch.setattr(config, "PLAYER_DB_FILE", str(db_file))
     monkeypatch.setattr(config, "ARCHIVED_TOURNAMENTS_DIR", str(closed_dir))
-    monkeypatch.setattr(ui, "PLAYER_DB_FILE", str(db_file))
     monkeypatch.setattr(ui, "ARCHIVED_TOURNAMENTS_DIR", str(closed_dir))
 
     # 2. Inizializza un nuovo torneo
@@ -233,7 +232,6 @@ def test_e2e_complex_tournament_flow_bye_withdrawals(tmp_path, monkeypatch):
     monkeypatch.setattr(db_players, "PLAYER_DB_TXT_FILE", str(db_txt))
     monkeypatch.setattr(config, "PLAYER_DB_FILE", str(db_file))
     monkeypatch.setattr(config, "ARCHIVED_TOURNAMENTS_DIR", str(closed_dir))
-    monkeypatch.setattr(ui, "PLAYER_DB_FILE", str(db_file))
     monkeypatch.setattr(ui, "ARCHIVED_TOURNAMENTS_DIR", str(closed_dir))
 
     # 2. Inizializza un nuovo torneo con 29 giocatori e 7 turni
@@ -1,20 +1,35 @@
 """Test per il modulo fide_db (database FIDE SQLite con FTS5)."""
 
 import os
+import sqlite3
+import time
 import pytest
 from fide_db import (
     _build_fts_query,
     _extract_first_term,
     _relevance_sort_key,
     _sanitize_fts_term,
+    ascii_name,
+    build_fide_db,
     bulk_insert_players,
+    bulk_insert_rows,
     cleanup_legacy_json,
     create_fide_db,
     fide_db_exists,
+    get_fide_stats,
     get_player_by_fide_id,
     get_player_count,
+    get_players_by_fide_ids,
+    invalidate_connections,
+    is_interrupted,
+    match_players_bulk,
+    open_search,
+    player_row,
     search_players,
     search_players_by_name,
+    search_players_fuzzy,
+    supports_incremental_update,
+    update_players_incremental,
 )
 
 
@@ -117,12 +132,17 @@ SAMPLE_PLAYERS = [
 def fide_db_path(tmp_path, monkeypatch):
     """Crea un database FIDE temporaneo e patcha i percorsi."""
     import fide_db
+    import fide_history
 
     db_path = str(tmp_path / "fide_ratings.db")
     json_legacy_path = str(tmp_path / "fide_ratings_local.json")
 
     monkeypatch.setattr(fide_db, "FIDE_DB_LOCAL_FILE", db_path)
     monkeypatch.setattr(fide_db, "FIDE_DB_JSON_LEGACY", json_legacy_path)
+    # Lo storico dei rating scritto dagli aggiornamenti resta nella cartella del test
+    monkeypatch.setattr(
+        fide_history, "FIDE_HISTORY_FILE", str(tmp_path / "fide_history.db")
+    )
 
     return db_path, json_legacy_path
 
@@ -174,6 +194,355 @@ class TestGetPlayerCount:
         assert get_player_count() == len(SAMPLE_PLAYERS)
 
 
+class TestShadowBuild:
+    def test_old_db_serves_lookups_until_swap(self, populated_fide_db):
+        db_path, _ = populated_fide_db
+        seen_during_build = []
+
+        def batches():
+            yield [player_row(SAMPLE_PLAYERS[0])]
+            # Il nuovo DB è ancora in costruzione: le ricerche usano quello attuale
+            seen_during_build.append(get_player_count())
+            seen_during_build.append(len(search_players("Caruana")))
+            yield [player_row(dict(SAMPLE_PLAYERS[1], fide_id=555))]
+
+        assert build_fide_db(batches()) == 2
+        assert seen_during_build == [len(SAMPLE_PLAYERS), 1]
+        assert get_player_count() == 2
+        assert get_player_by_fide_id(4100018) is None
+        assert [p["id_fide"] for p in search_players("Caruana")] == [555]
+        assert not os.path.exists(db_path + ".new")
+
+    def test_failed_build_keeps_current_db(self, populated_fide_db):
+        db_path, _ = populated_fide_db
+
+        def batches():
+            yield [player_row(SAMPLE_PLAYERS[0])]
+            raise ValueError("download interrotto")
+
+        with pytest.raises(ValueError):
+            build_fide_db(batches())
+        with pytest.raises(ValueError):
+            build_fide_db([])
+        assert get_player_count() == len(SAMPLE_PLAYERS)
+        assert not os.path.exists(db_path + ".new")
+
+    def test_external_content_index_and_phase_times(self, fide_db_path):
+        db_path, _ = fide_db_path
+        timings = {}
+
+        assert build_fide_db([[player_row(p) for p in SAMPLE_PLAYERS]], timings=timings)
+        assert list(timings) == [
+            "load", "indexes", "fts", "optimize", "stats", "validate", "swap"
+        ]
+        assert all(seconds >= 0 for seconds in timings.values())
+
+        conn = sqlite3.connect(db_path)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+        # Il testo di ricerca non viene salvato una seconda volta dall'indice FTS
+        assert "players_fts_content" not in tables
+        _assert_fts_consistent(conn)
+        conn.close()
+        assert [p["id_fide"] for p in search_players("Caruana")] == [4100018]
+
+
+def _assert_fts_consistent(conn):
+    """Fallisce se l'indice FTS non corrisponde al contenuto della tabella players."""
+    for table in ("players_fts", "players_trgm"):
+        conn.execute(
+            f"INSERT INTO {table}({table}, rank) VALUES ('integrity-check', 1)"
+        )
+
+
+class TestIncrementalUpdate:
+    def test_applies_only_differences(self, populated_fide_db):
+        assert supports_incremental_update() is True
+        incoming = [dict(p) for p in SAMPLE_PLAYERS[1:]]
+        incoming[0]["elo_standard"] = 2800  # Caruana
+        incoming[1]["last_name"] = "Lirenn"  # Ding
+        incoming.append(dict(SAMPLE_PLAYERS[0], fide_id=999, last_name="Nuovo"))
+
+        timings = {}
+        report = update_players_incremental(
+            [[player_row(p) for p in incoming]], timings=timings
+        )
+
+        assert list(timings) == ["load", "apply", "stats"]
+        assert report["total"] == len(incoming)
+        assert report["added"] == 1
+        assert report["removed"] == 1
+        assert report["updated"] == 2
+        assert report["renamed"] == 1
+        assert report["fields"] == {"last_name": 1, "elo_standard": 1}
+
+        assert get_player_by_fide_id(1503014) is None
+        assert get_player_by_fide_id(4100018)["elo_standard"] == 2800
+        assert get_player_count() == len(incoming)
+        # L'indice FTS segue nomi nuovi, rimossi e modificati
+        assert search_players("Carlsen") == []
+        assert [p["id_fide"] for p in search_players("Nuovo")] == [999]
+        assert [p["id_fide"] for p in search_players("Lirenn")] == [8603677]
+        assert [p["id_fide"] for p in search_players("Caruana")] == [4100018]
+        conn = sqlite3.connect(populated_fide_db[0])
+        _assert_fts_consistent(conn)
+        conn.close()
+
+    def test_legacy_fts_schema_requires_rebuild(self, populated_fide_db):
+        conn = sqlite3.connect(populated_fide_db[0])
+        conn.executescript(
+            "DROP TABLE players_fts; "
+            "CREATE VIRTUAL TABLE players_fts USING fts5(search_text);"
+        )
+        conn.close()
+        invalidate_connections()
+        assert supports_incremental_update() is False
+
+    def test_unchanged_list_touches_nothing(self, populated_fide_db):
+        report = update_players_incremental(
+            [[player_row(p) for p in SAMPLE_PLAYERS]]
+        )
+        assert (report["added"], report["updated"], report["removed"]) == (0, 0, 0)
+        assert get_player_count() == len(SAMPLE_PLAYERS)
+
+    def test_update_restores_journal_mode(self, populated_fide_db):
+        import threading
+
+        # Un lettore inattivo su un altro thread non impedisce di uscire dal WAL
+        t = threading.Thread(target=get_player_count)
+        t.start()
+        t.join()
+        incoming = [dict(p) for p in SAMPLE_PLAYERS]
+        incoming[0]["elo_standard"] = 2850
+        update_players_incremental([[player_row(p) for p in incoming]])
+
+        conn = sqlite3.connect(populated_fide_db[0])
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        conn.close()
+        assert not os.path.exists(populated_fide_db[0] + "-wal")
+        assert get_player_by_fide_id(1503014)["elo_standard"] == 2850
+
+    def test_empty_list_is_rejected(self, populated_fide_db):
+        with pytest.raises(ValueError):
+            update_players_incremental([])
+        assert get_player_count() == len(SAMPLE_PLAYERS)
+
+
+def _stats_tables(db_path):
+    conn = sqlite3.connect(db_path)
+    tables = {
+        table: sorted(conn.execute(f"SELECT * FROM {table}").fetchall())
+        for table in ("stats_federation", "stats_rating", "stats_title")
+    }
+    conn.close()
+    return tables
+
+
+class TestFideStats:
+    def test_build_computes_aggregates(self, fide_db_path):
+        build_fide_db([[player_row(p) for p in SAMPLE_PLAYERS]])
+
+        stats = get_fide_stats()
+        assert (stats["total"], stats["rated"], stats["titled"]) == (4, 4, 3)
+        assert [f["federation"] for f in stats["federations"]] == [
+            "CHN", "ITA", "NOR", "USA"
+        ]
+        assert stats["titles"] == [("GM", 3)]
+        assert stats["ratings"]["standard"] == [(1800, 1), (2700, 2), (2800, 1)]
+        assert stats["ratings"]["blitz"] == [(1700, 1), (2700, 2), (2800, 1)]
+
+    def test_incremental_update_matches_full_recompute(
+        self, fide_db_path, tmp_path, monkeypatch
+    ):
+        import fide_db
+
+        build_fide_db([[player_row(p) for p in SAMPLE_PLAYERS]])
+        incoming = [dict(p) for p in SAMPLE_PLAYERS[1:]]
+        incoming[0]["elo_standard"] = 2690  # Caruana cambia fascia
+        incoming[1]["federation"] = "SGP"  # Ding cambia federazione
+        incoming.append(
+            dict(SAMPLE_PLAYERS[3], fide_id=777, title="IM", elo_rapid=0)
+        )
+        rows = [player_row(p) for p in incoming]
+
+        update_players_incremental([rows])
+        incremental = _stats_tables(fide_db_path[0])
+
+        full_path = str(tmp_path / "full.db")
+        monkeypatch.setattr(fide_db, "FIDE_DB_LOCAL_FILE", full_path)
+        build_fide_db([rows])
+        assert incremental == _stats_tables(full_path)
+        # Le righe rimaste a zero vengono eliminate
+        assert ("NOR", 0, 0, 0) not in incremental["stats_federation"]
+
+    def test_legacy_db_gets_aggregates_on_update(self, populated_fide_db):
+        conn = sqlite3.connect(populated_fide_db[0])
+        conn.executescript(
+            "DROP TABLE stats_federation; DROP TABLE stats_rating; "
+            "DROP TABLE stats_title;"
+        )
+        conn.close()
+        invalidate_connections()
+        assert get_fide_stats() is None
+
+        update_players_incremental([[player_row(p) for p in SAMPLE_PLAYERS]])
+        assert get_fide_stats()["total"] == len(SAMPLE_PLAYERS)
+
+    def test_missing_db_has_no_stats(self, fide_db_path):
+        assert get_fide_stats() is None
+
+
+class TestReadConnectionPool:
+    def test_connection_reused_in_thread(self, populated_fide_db):
+        import fide_db
+
+        conn = fide_db._get_read_connection()
+        assert get_player_by_fide_id(1503014) is not None
+        assert fide_db._get_read_connection() is conn
+
+    def test_connection_per_thread(self, populated_fide_db):
+        import threading
+        import fide_db
+
+        conn = fide_db._get_read_connection()
+        other = []
+        t = threading.Thread(
+            target=lambda: other.append(fide_db._get_read_connection())
+        )
+        t.start()
+        t.join()
+        assert other[0] is not conn
+
+    def test_invalidation_closes_other_threads_connection(self, populated_fide_db):
+        import threading
+        import fide_db
+
+        conn = fide_db._get_read_connection()
+        t = threading.Thread(target=invalidate_connections)
+        t.start()
+        t.join()
+        # La connessione inattiva non tiene più aperto il file...
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        # ...e viene sostituita alla richiesta successiva
+        assert fide_db._get_read_connection() is not conn
+        assert get_player_count() == len(SAMPLE_PLAYERS)
+
+    def test_connection_in_use_is_closed_when_released(self, populated_fide_db):
+        import threading
+        import fide_db
+
+        with fide_db._read_connection() as conn:
+            t = threading.Thread(target=invalidate_connections)
+            t.start()
+            t.join()
+            # Nessuna query era in corso: il blocco può continuare a usarla
+            count = conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+            assert count == len(SAMPLE_PLAYERS)
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        assert not any(e.conn is conn for e in fide_db._pool_entries)
+
+    def test_swap_interrupts_query_on_other_thread(self, populated_fide_db):
+        import threading
+        import fide_db
+
+        started = threading.Event()
+        held = {}
+
+        def reader():
+            try:
+                with fide_db._read_connection() as conn:
+                    held["conn"] = conn
+                    started.set()
+                    # Termina solo se la sostituzione del database la interrompe
+                    conn.execute(
+                        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL "
+                        "SELECT x + 1 FROM c) SELECT COUNT(*) FROM c"
+                    ).fetchone()
+            except sqlite3.OperationalError as e:
+                held["error"] = e
+
+        t = threading.Thread(target=reader, daemon=True)
+        t.start()
+        assert started.wait(5)
+        time.sleep(0.2)
+
+        build_fide_db([[player_row(p) for p in SAMPLE_PLAYERS[:2]]])
+        t.join(5)
+        assert not t.is_alive()
+        assert is_interrupted(held["error"])
+        with pytest.raises(sqlite3.ProgrammingError):
+            held["conn"].execute("SELECT 1")
+        assert get_player_count() == 2
+        # Nel pool restano solo connessioni al nuovo database
+        generation = fide_db.data_generation()
+        assert all(e.generation == generation for e in fide_db._pool_entries)
+
+    def test_swap_waits_for_connection_in_use(self, populated_fide_db, monkeypatch):
+        import shutil
+        import threading
+        import fide_db
+
+        new_path = populated_fide_db[0] + ".new"
+        shutil.copyfile(populated_fide_db[0], new_path)
+        holding = threading.Event()
+        release = threading.Event()
+
+        def reader():
+            # Connessione in uso ma senza query in corso, come tra un blocco e
+            # l'altro di match_players_bulk
+            with fide_db._read_connection():
+                holding.set()
+                release.wait(5)
+
+        open_at_replace = []
+        real_replace = os.replace
+
+        def checking_replace(src, dst):
+            open_at_replace.append(len(fide_db._pool_entries))
+            real_replace(src, dst)
+
+        monkeypatch.setattr(os, "replace", checking_replace)
+        t = threading.Thread(target=reader, daemon=True)
+        t.start()
+        assert holding.wait(5)
+        swap = threading.Thread(
+            target=fide_db._swap_in_fide_db, args=(new_path,), daemon=True
+        )
+        swap.start()
+        swap.join(1)
+        # La sostituzione attende invece di rinunciare dopo un tempo fisso
+        assert swap.is_alive()
+        assert open_at_replace == []
+
+        release.set()
+        swap.join(5)
+        t.join(5)
+        assert not swap.is_alive()
+        assert open_at_replace == [0]
+        assert not os.path.exists(new_path)
+        assert get_player_count() == len(SAMPLE_PLAYERS)
+
+    def test_invalidated_on_rebuild(self, populated_fide_db):
+        import fide_db
+
+        conn = fide_db._get_read_connection()
+        invalidate_connections()
+        assert fide_db._get_read_connection() is not conn
+
+        create_fide_db()
+        assert get_player_count() == 0
+        bulk_insert_players(iter(SAMPLE_PLAYERS[:2]))
+        assert get_player_count() == 2
+
+    def test_read_only(self, populated_fide_db):
+        import sqlite3
+        import fide_db
+
+        with pytest.raises(sqlite3.OperationalError):
+            fide_db._get_read_connection().execute("DELETE FROM players")
+
+
 # -- Test: Creazione e popolazione -------------------------------------------
 
 
@@ -223,6 +592,17 @@ class TestCreateAndPopulate:
         assert count == 5001
         assert len(progress_counts) >= 1  # Almeno un callback a 5000
 
+    def test_bulk_insert_rows_rolls_back_on_producer_error(self, fide_db_path):
+        create_fide_db()
+
+        def failing_batches():
+            yield [player_row(p) for p in SAMPLE_PLAYERS]
+            raise ValueError("XML non valido")
+
+        with pytest.raises(ValueError):
+            bulk_insert_rows(failing_batches())
+        assert get_player_count() == 0
+
     def test_recreate_db_drops_old_data(self, populated_fide_db):
         assert get_player_count() == len(SAMPLE_PLAYERS)
         create_fide_db()  # Ricrea il DB
@@ -278,6 +658,21 @@ class TestGetPlayerByFideId:
         assert set(player.keys()) == expected_keys
 
 
+class TestGetPlayersByFideIds:
+    def test_bulk_lookup(self, populated_fide_db):
+        found = get_players_by_fide_ids(["1503014", 4100018, "123", "abc", ""])
+        assert set(found) == {1503014, 4100018}
+        assert found[4100018] == get_player_by_fide_id(4100018)
+
+    def test_chunks_and_duplicates(self, populated_fide_db):
+        ids = [p["fide_id"] for p in SAMPLE_PLAYERS] * 3
+        found = get_players_by_fide_ids(ids, chunk_size=2)
+        assert set(found) == {p["fide_id"] for p in SAMPLE_PLAYERS}
+
+    def test_empty(self, populated_fide_db):
+        assert get_players_by_fide_ids([]) == {}
+
+
 # -- Test: Ricerca per nome -------------------------------------------------
 
 
@@ -296,6 +691,41 @@ class TestSearchPlayersByName:
         assert len(results) == 0
 
 
+class TestMatchPlayersBulk:
+    def test_matches_by_id_and_name(self, populated_fide_db):
+        lookups = [
+            ("L1", "1503014", "", ""),
+            ("L2", "0", "fabiano", "CARUANA"),
+            ("L3", "", "Nonexistent", "Player"),
+            ("L4", "999", "Magnus", "Carlsen"),
+            ("L5", "0", "", "Liren"),
+        ]
+        chunks = list(match_players_bulk(lookups, chunk_size=2))
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        results = {local_id: (by_id, m) for c in chunks for local_id, by_id, m in c}
+
+        assert results["L1"][0] is True
+        assert [p["id_fide"] for p in results["L1"][1]] == [1503014]
+        assert results["L2"][0] is False
+        assert [p["id_fide"] for p in results["L2"][1]] == [4100018]
+        assert results["L3"] == (False, [])
+        # Con un ID FIDE valorizzato non si cerca per nome
+        assert results["L4"] == (True, [])
+        # Senza nome e cognome non si cerca
+        assert results["L5"] == (False, [])
+
+    def test_same_results_as_single_lookups(self, populated_fide_db):
+        lookups = [(str(p["fide_id"]), "0", p["first_name"], p["last_name"])
+                   for p in SAMPLE_PLAYERS]
+        for chunk in match_players_bulk(lookups):
+            for local_id, _by_id, matches in chunk:
+                player = get_player_by_fide_id(local_id)
+                expected = search_players_by_name(
+                    player["first_name"], player["last_name"]
+                )
+                assert matches == expected
+
+
 # -- Test: Ricerca full-text (FTS5) ------------------------------------------
 
 
@@ -373,6 +803,95 @@ class TestSearchOperators:
         assert results[0]["last_name"] == "Carlsen"
 
 
+class TestSearchCursor:
+    @pytest.fixture()
+    def many_rossi(self, fide_db_path):
+        create_fide_db()
+        base = SAMPLE_PLAYERS[-1]
+        players = [
+            dict(base, fide_id=900000 + i, first_name=first, last_name=last)
+            for i, (first, last) in enumerate(
+                (first, last)
+                for last in ("Rossi", "Rossini", "Bianchi")
+                for first in ("Mario", "Rossella", "Luca", "Anna")
+            )
+        ]
+        bulk_insert_players(iter(players))
+        return players
+
+    def test_pages_cover_full_ranking(self, many_rossi):
+        cursor = open_search("ross", page_size=5)
+        pages = []
+        while cursor.has_more:
+            pages.append(cursor.fetch_page())
+        assert all(len(page) == 5 for page in pages[:-1])
+        results = [p for page in pages for p in page]
+        assert results == search_players("ross")
+        # Prima i cognomi che iniziano col termine, poi chi ha il nome che inizia col termine
+        assert len({p["id_fide"] for p in results}) == len(results) == 9
+        assert cursor.count() == 9
+        assert [p["first_name"] for p in results[-1:]] == ["Rossella"]
+        assert cursor.fetch_page() == []
+
+    def test_count_without_reading_pages(self, many_rossi):
+        cursor = open_search("ross -rossini", page_size=5)
+        assert cursor.count() == 5
+        assert len(cursor.fetch_page()) == 5
+        assert not cursor.has_more
+
+    def test_exclusions_applied_in_query(self, many_rossi):
+        excluded = {str(p["fide_id"]) for p in many_rossi[:4]}
+        cursor = open_search("ross", exclude_fide_ids=excluded, page_size=100)
+        results = cursor.fetch_page()
+        assert not cursor.has_more
+        assert cursor.count() == len(results) == 5
+        assert not excluded & {str(p["id_fide"]) for p in results}
+
+    def test_fide_id_lookup(self, many_rossi):
+        cursor = open_search("900003")
+        assert [p["id_fide"] for p in cursor.fetch_page()] == [900003]
+        assert cursor.count() == 1
+        assert not cursor.has_more
+
+
+class TestFuzzySearch:
+    @pytest.fixture()
+    def with_nepo(self, populated_fide_db):
+        base = SAMPLE_PLAYERS[0]
+        extra = [
+            dict(base, fide_id=4168119, first_name="Ian", last_name="Nepomniachtchi"),
+            dict(base, fide_id=4100000, first_name="Jürgen", last_name="Müller"),
+        ]
+        bulk_insert_players(iter(extra))
+        return populated_fide_db
+
+    def test_ascii_name(self):
+        assert ascii_name("Jürgen", "Müller") == "jurgen muller"
+        assert ascii_name("Ian", "Nepomniachtchi") == "ian nepomniachtchi"
+
+    def test_transliteration_variant(self, with_nepo):
+        results = search_players_fuzzy("Nepomnjaschi")
+        assert results[0]["last_name"] == "Nepomniachtchi"
+        assert search_players("Nepomnjaschi") == []
+
+    def test_typo_and_transliterated_query(self, with_nepo):
+        assert search_players_fuzzy("Carlsem")[0]["last_name"] == "Carlsen"
+        assert search_players_fuzzy("Непомнящий")[0]["id_fide"] == 4168119
+
+    def test_exclusions_and_threshold(self, with_nepo):
+        assert search_players_fuzzy("Nepomnjaschi", exclude_fide_ids={"4168119"}) == []
+        assert search_players_fuzzy("zzzzqqq") == []
+
+    def test_cursor_falls_back_to_similar_names(self, with_nepo):
+        exact_only = open_search("Nepomnjaschi")
+        assert exact_only.fetch_page() == [] and not exact_only.approximate
+
+        cursor = open_search("Nepomnjaschi", fuzzy=True)
+        assert cursor.fetch_page()[0]["id_fide"] == 4168119
+        assert cursor.approximate
+        assert not open_search("Carlsen", fuzzy=True).approximate
+
+
 # -- Test: Funzioni interne -------------------------------------------------
 
 
@@ -488,6 +1007,12 @@ class TestFideUpdateLocale:
                 self.status_code = 200
                 self.headers = {"content-length": str(len(zip_bytes))}
 
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
             def raise_for_status(self):
                 pass
 
@@ -539,3 +1064,175 @@ class TestFideUpdateLocale:
         assert player["elo_standard"] == 2830
         assert player["birth_year"] == 1990
 
+
+
+# -- Test: Lista FIDE in formato TXT ----------------------------------------
+
+FIDE_TXT_HEADER = (
+    "ID Number      Name                                                         "
+    "Fed Sex Tit  WTit OTit                                        FOA SRtng SGm SK "
+    "RRtng RGm Rk BRtng BGm BK B-day Flag "
+)
+
+
+def _fide_txt_line(values):
+    """Riga a colonne fisse allineata all'intestazione FIDE_TXT_HEADER."""
+    import re
+
+    starts = [m.start() for m in re.finditer(r"(?<!\S)\S", FIDE_TXT_HEADER)]
+    starts.remove(FIDE_TXT_HEADER.index("Number"))
+    widths = [b - a for a, b in zip(starts, starts[1:])] + [5]
+    return "".join(str(v).ljust(w) for v, w in zip(values, widths)).rstrip()
+
+
+FIDE_TXT_ROWS = [
+    ("1503014", "Carlsen, Magnus", "NOR", "M", "GM", "", "", "", "2830", "50",
+     "10", "2830", "20", "10", "2886", "30", "10", "1990", ""),
+    ("4100018", "Caruana, Fabiano", "USA", "M", "GM", "", "", "", "2786", "40",
+     "10", "", "", "", "", "", "", "1992", "i"),
+    ("9999998", "Müller, Jürgen", "GER", "M", "", "", "FA", "", "1850", "",
+     "20", "", "", "", "", "", "", "0", "wi"),
+]
+
+
+class TestFideTxtList:
+    def _write(self, path, encoding="utf-8", newline="\n"):
+        lines = [FIDE_TXT_HEADER] + [_fide_txt_line(r) for r in FIDE_TXT_ROWS]
+        with open(path, "w", encoding=encoding, newline=newline) as f:
+            f.write("\n".join(lines) + "\n")
+
+    @pytest.mark.parametrize(
+        "encoding,newline", [("utf-8", "\n"), ("latin-1", "\r\n")]
+    )
+    def test_rows_match_xml_format(self, tmp_path, encoding, newline):
+        from db_players import iter_fide_txt_batches
+
+        txt = tmp_path / "players_list_foa.txt"
+        self._write(txt, encoding, newline)
+        batches = list(iter_fide_txt_batches(str(txt), batch_size=2))
+
+        assert [len(b) for b in batches] == [2, 1]
+        rows = [r for b in batches for r in b]
+        assert rows[0] == (
+            1503014, "Magnus", "Carlsen", "NOR", "M", "GM", "", "", "",
+            2830, 50, 10, 2830, 20, 10, 2886, 30, 10, 1990, None,
+        )
+        assert rows[1][9:12] == (2786, 40, 10)
+        assert rows[1][12:15] == (0, 0, None)
+        assert rows[1][-1] == "i"
+        # Nome accentato: le colonne successive restano allineate
+        assert rows[2][1:4] == ("Jürgen", "Müller", "GER")
+        assert rows[2][7] == "FA"
+        assert rows[2][9:12] == (1850, 0, 20)
+        assert rows[2][-2:] == (0, "wi")
+
+    def test_unknown_header(self, tmp_path):
+        from db_players import iter_fide_txt_batches
+
+        txt = tmp_path / "players.txt"
+        txt.write_text("qualcosa di diverso\n123 Rossi\n")
+        with pytest.raises(ValueError):
+            list(iter_fide_txt_batches(str(txt)))
+
+    def test_archive_format_detection(self):
+        from db_players import _fide_list_member
+
+        names = ["readme.pdf", "players_list_foa.txt", "players_list_xml.xml"]
+        assert _fide_list_member(names, "txt") == ("players_list_foa.txt", "txt")
+        assert _fide_list_member(names, "xml") == ("players_list_xml.xml", "xml")
+        # Formato richiesto assente: si usa quello contenuto nell'archivio
+        assert _fide_list_member(names[:2], "xml") == ("players_list_foa.txt", "txt")
+        assert _fide_list_member(["readme.pdf"], "xml") == (None, None)
+
+    def test_aggiorna_db_fide_locale_txt(self, fide_db_path, tmp_path, monkeypatch):
+        import io
+        import zipfile
+        import requests
+        import db_players
+
+        txt = tmp_path / "players_list_foa.txt"
+        self._write(txt)
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.write(txt, "players_list_foa.txt")
+        zip_bytes = zip_buffer.getvalue()
+        urls = []
+
+        class MockResponse:
+            status_code = 200
+            headers = {"content-length": str(len(zip_bytes))}
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def raise_for_status(self):
+                pass
+
+            def iter_content(self, chunk_size=1024):
+                yield zip_bytes
+
+        def mock_get(url, *args, **kwargs):
+            urls.append(url)
+            return MockResponse()
+
+        monkeypatch.setattr(requests, "get", mock_get)
+        monkeypatch.setattr(db_players, "FIDE_DB_LOCAL_FILE", fide_db_path[0])
+
+        stats = {}
+        assert db_players.aggiorna_db_fide_locale(
+            stats_output=stats, list_format="txt"
+        )
+        assert urls == [db_players.FIDE_TXT_DOWNLOAD_URL]
+        assert stats["list_format"] == "txt"
+        assert stats["saved_count"] == 3
+        assert "extract" in stats["phase_times"]
+        assert "history" in stats["phase_times"]
+        assert get_player_by_fide_id(9999998)["last_name"] == "Müller"
+        assert not os.path.exists(fide_db_path[0] + ".txt")
+
+
+# -- Test: Ricerche da file di consulta.py -----------------------------------
+
+
+class TestConsultaBatch:
+    @staticmethod
+    def _load_consulta():
+        import importlib.util
+
+        path = os.path.join(os.path.dirname(__file__), "..", "consulta.py")
+        spec = importlib.util.spec_from_file_location("consulta", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_esegui_batch_writes_tsv(self, populated_fide_db, tmp_path):
+        import io
+
+        consulta = self._load_consulta()
+        query_file = tmp_path / "query.txt"
+        query_file.write_text(
+            "# ricerche di prova\nCarlsen\n\ncar\nzzzzz\n", encoding="utf-8"
+        )
+        queries = consulta.leggi_query_batch(str(query_file))
+        assert queries == ["Carlsen", "car", "zzzzz"]
+
+        out = io.StringIO()
+        assert consulta.esegui_batch(queries, out=out) == 1
+        lines = out.getvalue().splitlines()
+        assert lines[0].split("\t") == ["query"] + list(consulta.BATCH_COLUMNS)
+        rows = [line.split("\t") for line in lines[1:]]
+        assert all(len(row) == len(consulta.BATCH_COLUMNS) + 1 for row in rows)
+        assert rows[0][:4] == ["Carlsen", "1503014", "Carlsen", "Magnus"]
+        assert sorted(row[2] for row in rows if row[0] == "car") == [
+            "Carlsen",
+            "Caruana",
+        ]
+
+        # Con --limit ogni query stampa al più N giocatori
+        out = io.StringIO()
+        assert consulta.esegui_batch(queries, limit=1, out=out) == 1
+        rows = [line.split("\t") for line in out.getvalue().splitlines()[1:]]
+        assert [row[0] for row in rows] == ["Carlsen", "car"]
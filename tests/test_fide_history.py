@@ -0,0 +1,154 @@
+"""Test per l'archivio storico mensile dei rating FIDE."""
+
+import pytest
+
+import fide_history
+from fide_db import bulk_insert_players, create_fide_db
+from fide_history import (
+    archive_current_list,
+    archive_month,
+    archived_periods,
+    iter_snapshot,
+    rating_at,
+    rating_history,
+    ratings_at,
+)
+
+from test_fide_db import SAMPLE_PLAYERS, fide_db_path  # noqa: F401
+
+
+@pytest.fixture()
+def history_path(tmp_path):
+    return str(tmp_path / "fide_history.db")
+
+
+def _month(offset, count=10000):
+    """Righe di un mese: ID non contigui, rating che cambiano col mese."""
+    rows = []
+    for i in range(count):
+        fide_id = 100000 + i * 7 + (i % 5)
+        std = 0 if i % 3 == 0 else 1500 + (i + offset) % 900
+        rows.append(
+            (fide_id, std, i % 2 and 1600, 0, (i + offset) % 8, 20 if std else None)
+        )
+    return rows
+
+
+def test_round_trip_across_blocks(history_path):
+    rows = _month(0)
+    assert archive_month(rows, "2026-08", db_path=history_path) == len(rows)
+
+    snapshot = list(iter_snapshot("2026-08", db_path=history_path))
+    assert [
+        (
+            r["id_fide"],
+            r["elo_standard"],
+            r["elo_rapid"],
+            r["elo_blitz"],
+            r["games"],
+            r["k_factor"],
+        )
+        for r in snapshot
+    ] == [(f, s, r or 0, b, g, k) for f, s, r, b, g, k in rows]
+
+
+def test_rating_at_date_uses_latest_month_not_after(history_path):
+    archive_month(_month(0), "2026-08", db_path=history_path)
+    archive_month(_month(1), "2026-09", db_path=history_path)
+    fide_id = _month(0)[1][0]
+
+    assert rating_at(fide_id, "2026-07-31", db_path=history_path) is None
+    assert (
+        rating_at(fide_id, "2026-08-20", db_path=history_path)["elo_standard"] == 1501
+    )
+    record = rating_at(str(fide_id), "2026-10-02", db_path=history_path)
+    assert record["period"] == "2026-09"
+    assert record["elo_standard"] == 1502
+    assert rating_at(999, "2026-10-02", db_path=history_path) is None
+
+    history = rating_history(fide_id, db_path=history_path)
+    assert [(r["period"], r["elo_standard"]) for r in history] == [
+        ("2026-08", 1501),
+        ("2026-09", 1502),
+    ]
+    assert archived_periods(db_path=history_path) == [
+        ("2026-08", 10000),
+        ("2026-09", 10000),
+    ]
+
+
+def test_field_snapshot(history_path):
+    rows = _month(0)
+    archive_month(rows, "2026-08", db_path=history_path)
+    wanted = [rows[i][0] for i in (0, 4095, 4096, 9999)] + ["0", "", "abc", 5]
+
+    found = ratings_at(wanted, "2026-08-01", db_path=history_path)
+    assert sorted(found) == [rows[i][0] for i in (0, 4095, 4096, 9999)]
+    assert found[rows[0][0]]["k_factor"] is None
+    assert found[rows[4096][0]]["k_factor"] == 20
+
+
+def test_month_is_replaced_and_order_checked(history_path):
+    archive_month(_month(0), "2026-08", db_path=history_path)
+    archive_month(_month(0, count=5), "2026-08", db_path=history_path)
+    assert archived_periods(db_path=history_path) == [("2026-08", 5)]
+
+    with pytest.raises(ValueError):
+        archive_month(
+            [(10, 1500, 0, 0, 0, None), (9, 1500, 0, 0, 0, None)],
+            "2026-09",
+            db_path=history_path,
+        )
+    assert archived_periods(db_path=history_path) == [("2026-08", 5)]
+
+
+def test_missing_archive(history_path):
+    assert ratings_at([1503014], "2026-08-01", db_path=history_path) == {}
+    assert list(iter_snapshot("2026-08", db_path=history_path)) == []
+
+
+def test_archive_current_list_and_tournament_alignment(
+    fide_db_path, monkeypatch
+):  # noqa: F811
+    import db_players
+
+    create_fide_db()
+    bulk_insert_players(iter(SAMPLE_PLAYERS))
+    assert archive_current_list("2026-08") == len(SAMPLE_PLAYERS)
+    # Il mese dopo Carlsen ha un rating diverso nel DB personale
+    players_db = {
+        "CARMA001": {
+            "id": "CARMA001",
+            "current_elo": 2800,
+            "elo_blitz": 2900,
+            "fide_id_num_str": "1503014",
+        },
+        "ROSMA001": {"id": "ROSMA001", "current_elo": 1500},
+    }
+    players = [
+        {"id": "CARMA001", "initial_elo": 2800},
+        {"id": "ROSMA001", "initial_elo": 1500},
+    ]
+
+    assert (
+        db_players.allinea_giocatori_con_database(
+            players, players_db, "standard", as_of="2026-08-15"
+        )
+        == 1
+    )
+    assert players[0]["initial_elo"] == 2830
+    assert players[1]["initial_elo"] == 1500
+
+    # Senza storico per la data si usa il DB personale
+    assert (
+        db_players.allinea_giocatori_con_database(
+            players, players_db, "blitz", as_of="2026-07-15"
+        )
+        == 1
+    )
+    assert players[0]["initial_elo"] == 2900
+
+    enrolled = [{"fide_id_num_str": "1503014", "initial_elo": 2900}, {"initial_elo": 1}]
+    assert db_players.applica_elo_storici(enrolled, "blitz", "2026-09-01") == 1
+    assert enrolled[0]["initial_elo"] == 2886
+    assert fide_history.archived_periods() == [("2026-08", len(SAMPLE_PLAYERS))]
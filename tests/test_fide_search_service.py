@@ -0,0 +1,145 @@
+"""Test per il servizio di ricerca FIDE su thread di lavoro."""
+
+import pytest
+
+import fide_search_service
+from fide_db import bulk_insert_players, create_fide_db, search_players
+from fide_search_service import FideSearchService, narrow_results
+
+from test_fide_db import SAMPLE_PLAYERS, fide_db_path  # noqa: F401
+
+
+@pytest.fixture()
+def rossi_db(fide_db_path):  # noqa: F811
+    create_fide_db()
+    base = SAMPLE_PLAYERS[-1]
+    players = [
+        dict(base, fide_id=900000 + i, first_name=first, last_name=last)
+        for i, (first, last) in enumerate(
+            (first, last)
+            for last in ("Rossi", "Rossini", "Rößler", "Bianchi")
+            for first in ("Mario", "Rossella", "Luca", "Émile")
+        )
+    ]
+    bulk_insert_players(iter(players))
+    return players
+
+
+@pytest.fixture()
+def service():
+    service = FideSearchService(page_size=5)
+    yield service
+    service.close()
+
+
+def _count_queries(monkeypatch):
+    calls = []
+    real_open_search = fide_search_service.open_search
+
+    def counting_open_search(query, **kwargs):
+        calls.append(query)
+        return real_open_search(query, **kwargs)
+
+    monkeypatch.setattr(fide_search_service, "open_search", counting_open_search)
+    return calls
+
+
+def test_results_delivered_to_callback(rossi_db, service):
+    delivered = []
+    request = service.search("ross", callback=delivered.append)
+    request.wait(5)
+
+    assert delivered == [request]
+    assert len(request.results) == 5
+    assert request.has_more
+    assert request.total == len(search_players("ross"))
+
+    assert service.load_more(request)
+    request.wait(5)
+    assert request.results == search_players("ross")[: len(request.results)]
+    assert len(delivered) == 2
+
+
+@pytest.mark.parametrize("query", ["rossi", "rossi mario", "ross emile", "rossi 1985"])
+def test_narrowing_matches_database(rossi_db, query):
+    superset = search_players("ros")
+    assert narrow_results(superset, query) == search_players(query)
+
+
+def test_extended_prefix_served_from_cache(rossi_db, service, monkeypatch):
+    calls = _count_queries(monkeypatch)
+
+    service.search("rossini").wait(5)
+    narrowed = service.search("rossini mario")
+    narrowed.wait(5)
+    repeated = service.search("Rossini")
+    repeated.wait(5)
+
+    assert calls == ["rossini"]
+    assert narrowed.from_cache and repeated.from_cache
+    assert narrowed.results == search_players("rossini mario")
+
+    # Una query troncata a una pagina non basta per restringere
+    service.search("ross").wait(5)
+    service.search("rossi").wait(5)
+    assert calls == ["rossini", "ross", "rossi"]
+
+
+def test_superseded_search_is_not_delivered(rossi_db, service, monkeypatch):
+    import threading
+
+    started = threading.Event()
+    release = threading.Event()
+    real_open_search = fide_search_service.open_search
+
+    def slow_open_search(query, **kwargs):
+        if query == "ross":
+            started.set()
+            release.wait(5)
+        return real_open_search(query, **kwargs)
+
+    monkeypatch.setattr(fide_search_service, "open_search", slow_open_search)
+
+    delivered = []
+    first = service.search("ross", callback=delivered.append)
+    started.wait(5)
+    second = service.search("bianchi", callback=delivered.append)
+    release.set()
+    second.wait(5)
+    first.wait(5)
+
+    assert first.cancelled
+    assert delivered == [second]
+    assert {p["last_name"] for p in second.results} == {"Bianchi"}
+
+
+def test_cancel_interrupts_running_query(rossi_db, service, monkeypatch):
+    import threading
+
+    import fide_db
+
+    started = threading.Event()
+    errors = []
+
+    def endless_open_search(query, **kwargs):
+        started.set()
+        try:
+            # Termina solo se il progress handler interrompe la query
+            fide_db._get_read_connection().execute(
+                "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+                "SELECT COUNT(*) FROM c"
+            ).fetchone()
+        except Exception as e:
+            errors.append(e)
+            raise
+
+    monkeypatch.setattr(fide_search_service, "open_search", endless_open_search)
+
+    delivered = []
+    request = service.search("ross", callback=delivered.append)
+    started.wait(5)
+    service.cancel()
+    request.wait(5)
+
+    assert request.cancelled and request.error is None and not delivered
+    assert len(errors) == 1 and fide_db.is_interrupted(errors[0])
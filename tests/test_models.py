@@ -1,3 +1,4 @@
+import pytest
 from models import Tournament
 
 
@@ -52,3 +53,180 @@ def test_rollback_to_previous_round(sample_tournament_dict):
 
     assert len(t_dict.get("rounds", [])) == 0
     assert t_dict["current_round"] == 1
+
+
+def test_models_expose_dict_compatible_view(sample_tournament_dict):
+    tournament = Tournament.from_dict(sample_tournament_dict)
+    player = tournament.players_dict["BATGA001"]
+
+    # Lettura e scrittura come dizionario, senza conversioni
+    assert player["first_name"] == player.first_name == "Gabriele"
+    player["points"] = 3.5
+    assert player.points == 3.5
+    assert tournament["rounds"][0]["matches"][0].get("schedule_info", {}) is not None
+
+    # Le chiavi non modellate vengono conservate e salvate
+    player["medals"] = {"gold": 1}
+    assert player.to_dict()["medals"] == {"gold": 1}
+    assert "medals" in player
+
+    # Gli slot impediscono attributi arbitrari
+    assert not hasattr(player, "__dict__")
+
+
+def test_players_dict_index_is_versioned(sample_tournament_dict):
+    from models import Player, PlayersIndex
+
+    tournament = Tournament.from_dict(sample_tournament_dict)
+    index = tournament.players_dict
+    assert isinstance(index, PlayersIndex)
+    assert tournament.players_dict is index
+
+    # Sostituzione a parità di lunghezza: l'indice va comunque ricostruito
+    old_id = tournament.players[0].id
+    tournament.players[0] = Player.from_dict({"id": "NEW001", "first_name": "Nuovo"})
+    assert "NEW001" in tournament.players_dict
+    assert old_id not in tournament.players_dict
+    assert len(tournament.players_dict) == 28
+
+
+def test_players_index_detects_replaced_list(sample_tournament_dict):
+    from models import PlayerList, PlayersIndex
+
+    tournament = Tournament.from_dict(sample_tournament_dict)
+    players = [p.to_dict() for p in tournament.players]
+
+    # Liste sostituite più volte con lo stesso contenuto e la stessa versione:
+    # l'indice resta valido solo per la lista da cui è stato costruito
+    first = PlayerList(players)
+    index = PlayersIndex(first)
+    assert index.is_current(first)
+    del first
+    second = PlayerList(players)
+    assert not index.is_current(second)
+    del second
+    third = PlayerList(players)
+    assert not index.is_current(third)
+
+
+def test_delitem_absent_optional_key_raises_keyerror():
+    from models import Match
+
+    match = Match.from_dict(
+        {"id": 1, "round": 1, "white_player_id": "A", "black_player_id": "B"}
+    )
+    with pytest.raises(KeyError):
+        del match["pgn"]
+
+    match["pgn"] = "1. e4 *"
+    del match["pgn"]
+    assert "pgn" not in match
+    with pytest.raises(TypeError):
+        del match["round"]
+
+
+def test_rounds_index_follows_round_list(sample_tournament_dict):
+    from models import Round, RoundList, RoundsIndex
+
+    tournament = Tournament.from_dict(sample_tournament_dict)
+    assert isinstance(tournament.rounds, RoundList)
+    index = RoundsIndex(tournament.rounds)
+
+    first_match = tournament.rounds[0].matches[0]
+    round_obj, match = index.matches[first_match.id]
+    assert match is first_match and round_obj.round == 1
+    assert index.rounds[3] is tournament.rounds[2]
+    assert index.is_current(tournament.rounds)
+
+    # Il numero di scacchiera segue l'ordine degli id nel turno
+    ids = sorted(m.id for m in tournament.rounds[0].matches)
+    assert index.boards[ids[0]] == 1
+    assert index.boards[ids[-1]] == len(ids)
+
+    # Rollback e nuovo turno invalidano l'indice
+    tournament.rounds.pop()
+    assert not index.is_current(tournament.rounds)
+    index = RoundsIndex(tournament.rounds)
+    tournament.rounds.append(Round.from_dict({"round": 5, "matches": []}))
+    assert not index.is_current(tournament.rounds)
+
+
+def test_match_lookup_after_rounds_replaced(sample_tournament_dict):
+    from models import Round, RoundList
+    from utils import get_match_by_id
+
+    def make_rounds(label):
+        match = {
+            "id": 1,
+            "round": 1,
+            "white_player_id": "BATGA001",
+            "black_player_id": "X",
+            "result": None,
+            "pgn": label,
+        }
+        return RoundList([Round.from_dict({"round": 1, "matches": [match]})])
+
+    # La lista dei turni viene sostituita due volte con liste equivalenti
+    # (stessa lunghezza e versione): la ricerca deve seguire quella attuale
+    torneo = {"rounds": make_rounds("primo")}
+    assert get_match_by_id(torneo, 1)[1]["pgn"] == "primo"
+    torneo["rounds"] = make_rounds("secondo")
+    assert get_match_by_id(torneo, 1)[1]["pgn"] == "secondo"
+    torneo["rounds"] = make_rounds("terzo")
+    round_obj, match = get_match_by_id(torneo, 1)
+    assert match["pgn"] == "terzo"
+    assert round_obj is torneo["rounds"][0]
+
+
+def test_player_load_keeps_unrated_elo_and_absent_final_rank():
+    from models import Player
+
+    player = Player.from_dict(
+        {"id": "AAA001", "initial_elo": 0, "current_elo": 0, "final_rank": None}
+    )
+
+    assert player["initial_elo"] == 0 and player["current_elo"] == 0
+    # Come nei file salvati a torneo in corso, 'final_rank' a None è assente
+    assert "final_rank" not in player
+    assert "final_rank" not in player.to_dict()
+    player["final_rank"] = 3
+    assert player.to_dict()["final_rank"] == 3
+
+
+def test_rounds_index_follows_in_place_match_edits(sample_tournament_dict):
+    from models import Match
+    from utils import (
+        count_pending_matches,
+        get_board_number,
+        get_current_match_for_player,
+        get_matches_by_board,
+    )
+
+    torneo = Tournament.from_dict(sample_tournament_dict)
+    last = torneo.rounds[-1]
+    torneo.current_round = last.round
+    played = next(m for m in last.matches if m.black_player_id)
+
+    assert count_pending_matches(torneo, last.round) == 0
+    assert get_current_match_for_player(torneo, played.white_player_id) is played
+    index = torneo.rounds_index
+
+    # Un risultato annullato sul posto rende l'indice non più valido
+    played["result"] = None
+    assert not index.is_current(torneo.rounds, torneo.current_round)
+    assert count_pending_matches(torneo, last.round) == 1
+
+    # Una partita aggiunta al turno riceve il suo numero di scacchiera
+    max_id = max(m.id for r in torneo.rounds for m in r.matches)
+    extra = Match(
+        id=max_id + 1, round=last.round, white_player_id="X1", black_player_id="X2"
+    )
+    last.matches.append(extra)
+    assert get_board_number(torneo, extra.id) == len(last.matches)
+    assert get_matches_by_board(torneo, last.round)[-1] is extra
+    assert get_current_match_for_player(torneo, "X2") is extra
+
+    # Un abbinamento cambiato sul posto aggiorna l'indice per giocatore
+    extra["black_player_id"] = "X3"
+    assert get_current_match_for_player(torneo, "X3") is extra
+    assert get_current_match_for_player(torneo, "X2") is None
@@ -0,0 +1,65 @@
+from player_search import PlayerSearchIndex, search_players
+from players_store import PlayersDb
+
+
+def _player(pid, first, last, **extra):
+    return {"id": pid, "first_name": first, "last_name": last, **extra}
+
+
+PLAYERS = {
+    "ROSMA001": _player("ROSMA001", "Mario", "Rossi", birth_date="1980-05-01"),
+    "BIALU001": _player("BIALU001", "Luigi", "Bianchi", federation="SUI"),
+    "ROSAN001": _player("ROSAN001", "Anna", "Rossini", id_fide="815123"),
+    "VEMA001": _player("VEMA001", "Mario", "Verdi"),
+}
+
+
+def test_operators_and_ranking():
+    index = PlayerSearchIndex(PLAYERS)
+
+    assert set(index.search("ross")) == {"ROSMA001", "ROSAN001"}
+    assert set(index.search("+mario -verdi")) == {"ROSMA001"}
+    assert set(index.search("=mario rossi")) == {"ROSMA001"}
+    assert set(index.search("sui")) == {"BIALU001"}
+    assert set(index.search("815123")) == {"ROSAN001"}
+    assert set(index.search("1980")) == {"ROSMA001"}
+    # Termini corti (senza trigrammi) verificati sul testo
+    assert set(index.search("+an +ro")) == {"ROSAN001"}
+    assert index.search("+zzz") == {}
+
+    # Più termini trovati vengono prima; a parità, il cognome che inizia col termine
+    scores = index.search("mario rossi")
+    ranked = sorted(scores, key=scores.get)
+    assert ranked[0] == "ROSMA001"
+    assert scores["VEMA001"][0] == -1
+
+
+def test_match_player_query_keeps_its_fields():
+    from utils import match_player_query
+
+    player = _player("ROSMA001", "Mario", "Rossi", fide_title="FM")
+    # L'indice del database personale trova anche titolo e ID personale...
+    assert set(PlayerSearchIndex({"ROSMA001": player}).search("001")) == {"ROSMA001"}
+    # ...match_player_query resta su nome, anno, federazione e ID FIDE
+    assert match_player_query(player, "001") is None
+    assert match_player_query(player, "fm") is None
+    assert match_player_query(player, "rossi") is not None
+
+
+def test_index_follows_players_db(tmp_path):
+    db = PlayersDb(str(tmp_path / "players.sqlite"))
+    db.replace_all({pid: dict(p) for pid, p in PLAYERS.items()})
+
+    assert set(search_players(db, "mario")) == {"ROSMA001", "VEMA001"}
+
+    db["NEGIO001"] = _player("NEGIO001", "Giovanni", "Neri")
+    del db["VEMA001"]
+    assert set(search_players(db, "mario")) == {"ROSMA001"}
+    assert set(search_players(db, "neri")) == {"NEGIO001"}
+
+    # Modifica sul posto: visibile alla ricerca dopo il salvataggio
+    db["ROSMA001"]["first_name"] = "Marco"
+    db.save(["ROSMA001"])
+    assert search_players(db, "mario") == {}
+    assert set(search_players(db, "marco")) == {"ROSMA001"}
+    db.close()
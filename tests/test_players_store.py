@@ -0,0 +1,79 @@
+import sqlite3
+
+from players_store import PlayersDb
+
+
+def _record(player_id, last_name, elo=1500):
+    return {
+        "id": player_id,
+        "first_name": "Anna",
+        "last_name": last_name,
+        "current_elo": elo,
+        "medals": {"gold": 0},
+        "fide_id_num_str": "",
+    }
+
+
+def _stored_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute("SELECT id, data FROM players").fetchall())
+    finally:
+        conn.close()
+
+
+def test_players_db_writes_only_changed_rows(tmp_path):
+    db_path = str(tmp_path / "players.sqlite")
+    store = PlayersDb(db_path)
+    store.replace_all({"ROSAN001": _record("ROSAN001", "Rossi")})
+    store["BIAAN001"] = _record("BIAAN001", "Bianchi")
+    assert store.save() == 1
+    store.close()
+
+    # Nuova istanza: i record vengono letti solo quando servono
+    store = PlayersDb(db_path)
+    assert len(store) == 2 and "ROSAN001" in store
+    assert store._rows == {}
+    store["ROSAN001"]["medals"]["gold"] += 1
+    assert store.save() == 1
+    assert store.save() == 0
+
+    del store["BIAAN001"]
+    assert store.save(changed_ids=[]) == 1
+    assert "BIAAN001" not in store
+    store.close()
+
+    rows = _stored_rows(db_path)
+    assert list(rows) == ["ROSAN001"]
+    assert '"gold":1' in rows["ROSAN001"]
+
+
+def test_players_db_values_load_everything_once(tmp_path):
+    db_path = str(tmp_path / "players.sqlite")
+    records = {f"GIO{i:05d}": _record(f"GIO{i:05d}", f"Cognome{i}") for i in range(50)}
+    PlayersDb(db_path).replace_all(records)
+
+    store = PlayersDb(db_path)
+    values = list(store.values())
+    assert [v["id"] for v in values] == list(records)
+    assert store._complete
+    assert dict(store.items()) == records
+
+
+def test_reserve_ids_continues_from_existing_suffixes(tmp_path):
+    db_path = str(tmp_path / "players.sqlite")
+    store = PlayersDb(db_path)
+    store.replace_all(
+        {
+            "ROSAN001": _record("ROSAN001", "Rossi"),
+            "ROSAN007": _record("ROSAN007", "Rossi"),
+            "ROSANNA01": _record("ROSANNA01", "Rossanna"),
+        }
+    )
+    assert store.reserve_ids("ROSAN") == ["ROSAN008"]
+    assert store.reserve_ids("ROSAN", 3) == ["ROSAN009", "ROSAN010", "ROSAN011"]
+    assert store.reserve_ids("BIALU") == ["BIALU001"]
+    store.close()
+
+    # Il contatore è persistente: i numeri riservati non vengono riassegnati
+    assert PlayersDb(db_path).reserve_ids("ROSAN") == ["ROSAN012"]
@@ -0,0 +1,168 @@
+import io
+import json
+
+from models import Player, Tournament
+from serialization import (
+    dump,
+    dump_to_file,
+    dumps,
+    read_json_keys,
+    read_tournament_header,
+    tournament_has_rounds,
+)
+
+
+def _sample_tournament():
+    players = [
+        {"id": "AAA001", "first_name": "Anna", "opponents": {"BBB001", "CCC001"}},
+        {"id": "BBB001", "first_name": "Bruno", "opponents": set()},
+    ]
+    return {
+        "name": "Test",
+        "players": players,
+        "players_dict": {p["id"]: p for p in players},
+        "rounds": [],
+    }
+
+
+def test_dump_converts_sets_and_drops_transient_keys():
+    torneo = _sample_tournament()
+    buf = io.StringIO()
+    dump(torneo, buf)
+    data = json.loads(buf.getvalue())
+
+    assert "players_dict" not in data
+    assert data["players"][0]["opponents"] == ["BBB001", "CCC001"]
+    # L'oggetto originale non viene modificato
+    assert isinstance(torneo["players"][0]["opponents"], set)
+    assert "players_dict" in torneo
+
+
+def test_compact_mode_streams_without_indentation():
+    class CountingWriter(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    torneo = _sample_tournament()
+    torneo["players"] = [
+        {"id": f"P{i:05d}", "opponents": {"A", "B"}} for i in range(3000)
+    ]
+    buf = CountingWriter()
+    dump(torneo, buf, compact=True)
+    text = buf.getvalue()
+
+    assert buf.writes > 1
+    assert "\n" not in text and ", " not in text
+    assert text == dumps(torneo, compact=True)
+    assert json.loads(text)["players"][1]["opponents"] == ["A", "B"]
+
+
+def test_dataclasses_are_serialized_with_their_format():
+    player = Player(id="AAA001", first_name="Anna", last_name="Rossi", initial_elo=1500)
+    player.opponents.add("BBB001")
+    torneo = Tournament(
+        name="Test",
+        tournament_id="T1",
+        start_date="2026-01-01",
+        end_date="2026-01-02",
+        total_rounds=2,
+        players=[player],
+    )
+    data = json.loads(dumps(torneo))
+
+    assert data == json.loads(json.dumps(torneo.to_dict()))
+    assert "players_dict" not in data
+
+
+def test_dump_to_file_is_atomic_on_error(tmp_path):
+    target = tmp_path / "Tornello - Test.json"
+    target.write_text('{"name": "old"}', encoding="utf-8")
+
+    try:
+        dump_to_file({"name": "new", "bad": object()}, str(target))
+    except TypeError:
+        pass
+
+    assert json.loads(target.read_text(encoding="utf-8")) == {"name": "old"}
+    assert not (tmp_path / "Tornello - Test.json.tmp").exists()
+
+    dump_to_file(_sample_tournament(), str(target))
+    assert json.loads(target.read_text(encoding="utf-8"))["name"] == "Test"
+
+
+def test_header_is_written_first_and_read_without_full_parse(tmp_path):
+    torneo = _sample_tournament()
+    torneo["rounds"] = [{"round": 1, "matches": [{"id": 1, "pgn": '1. e4 {"}"} *'}]}]
+    torneo.update(start_date="2026-01-01", end_date="2026-01-02")
+    torneo.update(current_round=1, total_rounds=3)
+    target = tmp_path / "Tornello - Test.json"
+    dump_to_file(torneo, str(target))
+
+    keys = list(json.loads(target.read_text(encoding="utf-8")))
+    assert keys[:6] == [
+        "name",
+        "start_date",
+        "end_date",
+        "current_round",
+        "total_rounds",
+        "concluded",
+    ]
+    header = read_tournament_header(str(target))
+    assert header["name"] == "Test" and header["concluded"] is False
+    assert "players" not in header
+
+    # Le chiavi successive vengono trovate saltando stringhe con delimitatori
+    data = read_json_keys(str(target), ("rounds", "missing"))
+    assert data == {"rounds": torneo["rounds"]}
+
+
+def test_header_of_legacy_file_finds_creation_suspended(tmp_path):
+    # Vecchio ordine: intestazione mescolata ai giocatori e flag in fondo
+    legacy = {
+        "name": "Vecchio",
+        "start_date": "2025-01-01",
+        "end_date": "2025-01-02",
+        "players": [{"id": "A"}],
+        "current_round": 1,
+        "total_rounds": 5,
+        "concluded": False,
+        "rounds": [],
+        "creation_suspended": True,
+    }
+    target = tmp_path / "Tornello - Vecchio.json"
+    target.write_text(json.dumps(legacy), encoding="utf-8")
+
+    header = read_tournament_header(str(target))
+    assert header["creation_suspended"] is True
+    assert "players" not in header
+
+
+def test_tournament_model_is_saved_header_first(tmp_path, sample_tournament_dict):
+    torneo = Tournament.from_dict(sample_tournament_dict)
+    torneo.players[0].opponents = {"ZZZ001", "AAA001"}
+    target = tmp_path / "Tornello - Test.json"
+    dump_to_file(torneo, str(target))
+
+    data = json.loads(target.read_text(encoding="utf-8"))
+    assert list(data)[:2] == ["name", "site"]
+    assert "players_dict" not in data and "rounds_index" not in data
+    assert data["players"][0]["opponents"] == ["AAA001", "ZZZ001"]
+    assert read_tournament_header(str(target))["name"] == torneo.name
+
+
+def test_rounds_presence_is_read_without_decoding(tmp_path):
+    torneo = _sample_tournament()
+    target = tmp_path / "Tornello - Test.json"
+    dump_to_file(torneo, str(target))
+    assert tournament_has_rounds(str(target)) is False
+
+    torneo["rounds"] = [{"round": 1, "matches": [{"id": 1, "pgn": "]"}]}]
+    dump_to_file(torneo, str(target), compact=True)
+    assert tournament_has_rounds(str(target)) is True
+    assert read_json_keys(str(target), ("name",), peek=("players",)) == {
+        "name": "Test",
+        "players": True,
+    }